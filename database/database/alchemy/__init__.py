@@ -1,5 +1,6 @@
 from .core import session, soft_deleted_select
 from .model import Gender, Group, User, UserGroup
+from .repository import GroupRepository, Repository, UserRepository
 
 __all__ = [
     "session",
@@ -9,6 +10,9 @@ __all__ = [
     "Group",
     "User",
     "UserGroup",
+    "Repository",
+    "UserRepository",
+    "GroupRepository",
 ]
 
 
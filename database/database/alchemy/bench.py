@@ -0,0 +1,157 @@
+"""
+关系属性加载性能测试
+
+分别以延迟加载 (N+1 次查询) 和 `selectinload` 批量加载的方式, 查询用户及其所属的组,
+对比执行的 SQL 语句数量和耗时; 同时对比逐个添加实体对象和批量插入的耗时
+
+执行方式:
+
+```bash
+python -m database.alchemy.bench [用户数]
+```
+"""
+
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+
+from . import initialize_tables
+from .core import engine, session
+from .model import Gender, User
+from .repository import GroupRepository, LoadStrategy, UserRepository
+
+# 用户组数量
+_GROUPS = 100
+
+# 每个用户所属的组数量
+_GROUPS_PER_USER = 2
+
+
+class _StatementCounter:
+    """统计执行 SQL 语句数量的计数器"""
+
+    def __init__(self) -> None:
+        """构造器"""
+        self.count = 0
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        """在执行 SQL 语句前调用"""
+        self.count += 1
+
+
+def _user_rows(n: int) -> List[Dict[str, Any]]:
+    """生成用户数据
+
+    Args:
+        - `n` (`int`): 用户数量
+
+    Returns:
+        `List[Dict[str, Any]]`: 用户数据集合
+    """
+    return [
+        {
+            "id_num": f"{i:018d}",
+            "name": f"user-{i}",
+            "gender": Gender.MALE if i % 2 else Gender.FEMALE,
+        }
+        for i in range(n)
+    ]
+
+
+def _measure(fn: Callable[[], Any]) -> Tuple[float, int]:
+    """执行函数, 统计其耗时和执行的 SQL 语句数量
+
+    Args:
+        - `fn` (`Callable[[], Any]`): 要执行的函数
+
+    Returns:
+        `Tuple[float, int]`: 耗时 (秒) 和 SQL 语句数量
+    """
+    counter = _StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start, counter.count
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+def bench_insert(n: int) -> None:
+    """对比通过 Unit of Work 逐个添加实体对象和批量插入的耗时
+
+    Args:
+        - `n` (`int`): 用户数量
+    """
+    rows = _user_rows(n)
+
+    def add_all() -> None:
+        session.add_all(User(**row) for row in rows)
+        session.commit()
+
+    def bulk_insert() -> None:
+        UserRepository().bulk_insert(rows)
+        session.commit()
+
+    for name, fn in [("add_all", add_all), ("bulk_insert", bulk_insert)]:
+        initialize_tables()
+        seconds, statements = _measure(fn)
+        print(f"{name:<12}{n:>10}{statements:>12}{seconds:>10.2f}")
+
+    session.close()
+
+
+def bench_load(n: int) -> None:
+    """对比不同加载策略查询用户及其所属组的耗时
+
+    Args:
+        - `n` (`int`): 用户数量
+    """
+    initialize_tables()
+
+    users = UserRepository()
+    groups = GroupRepository()
+
+    users.bulk_insert(_user_rows(n))
+    groups.bulk_insert({"name": f"group-{i}"} for i in range(_GROUPS))
+    groups.bulk_add_users(
+        (u, (u * _GROUPS_PER_USER + i) % _GROUPS + 1)
+        for u in range(1, n + 1)
+        for i in range(_GROUPS_PER_USER)
+    )
+    session.commit()
+
+    strategies: List[LoadStrategy] = ["lazy", "selectin", "subquery", "joined"]
+    for strategy in strategies:
+        # 清空 Session 中缓存的实体对象, 保证每种策略都从数据库加载
+        session.expunge_all()
+
+        def load() -> None:
+            for user in users.find_with_groups(strategy=strategy):
+                # 访问关系属性, 对于延迟加载会在此处产生一次查询
+                assert len(user.groups) == _GROUPS_PER_USER
+
+        seconds, statements = _measure(load)
+        print(f"{strategy:<12}{n:>10}{statements:>12}{seconds:>10.2f}")
+
+    session.close()
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    # 关闭 SQL 日志输出, 避免日志输出影响测试结果
+    engine.echo = False
+
+    print(f"{'insert':<12}{'users':>10}{'statements':>12}{'seconds':>10}")
+    bench_insert(n)
+
+    print()
+    print(f"{'strategy':<12}{'users':>10}{'statements':>12}{'seconds':>10}")
+    bench_load(n)
+
+
+if __name__ == "__main__":
+    main()
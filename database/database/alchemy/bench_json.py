@@ -0,0 +1,91 @@
+"""
+JSON 序列化性能测试
+
+对比如下几种方式将查询结果序列化为 JSON 数组的耗时:
+
+- `jsonify`: 调用实体对象的 `jsonify` 方法, 并通过 `ObjectEncoder` 序列化
+- `compiled+json`: 通过编译的序列化函数转为字典, 并通过标准库 json 序列化
+- `compiled+orjson`: 通过编译的序列化函数转为字典, 并通过 orjson 序列化 (需安装 orjson)
+- `stream`: 通过 `stream_query` 分批查询并流式输出
+
+执行方式:
+
+```bash
+python -m database.alchemy.bench_json [行数]
+```
+"""
+
+import json
+import sys
+import time
+import timeit
+from datetime import date
+from typing import Callable, List, Tuple
+
+from sqlalchemy import select
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+from . import initialize_tables
+from .core import engine, session
+from .encoder import ObjectEncoder
+from .model import Gender, User
+from .repository import UserRepository
+from .serializer import dumps, serialize_all, stream_query
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    engine.echo = False
+    initialize_tables()
+
+    UserRepository().bulk_insert(
+        {
+            "id_num": f"{i:018d}",
+            "name": f"user-{i}",
+            "gender": Gender.MALE if i % 2 else Gender.FEMALE,
+            "birthday": date(1980 + i % 30, i % 12 + 1, i % 28 + 1),
+        }
+        for i in range(n)
+    )
+    session.commit()
+
+    # 预先加载所有实体对象, 以便只比较序列化的耗时
+    users = list(session.scalars(select(User)))
+    assert len(users) == n
+
+    cases: List[Tuple[str, Callable[[], bytes]]] = [
+        (
+            "jsonify",
+            lambda: json.dumps([u.jsonify() for u in users], cls=ObjectEncoder).encode(),
+        ),
+        ("compiled+json", lambda: dumps(serialize_all(users, User), "json")),
+    ]
+    if orjson is not None:
+        cases.append(("compiled+orjson", lambda: dumps(serialize_all(users, User), "orjson")))
+
+    print(f"{'mode':<18}{'rows':>10}{'seconds':>10}{'MB':>8}")
+    for name, fn in cases:
+        data = fn()
+        # 重复执行多次, 取耗时最短的一次, 以减少机器负载波动的影响
+        seconds = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f"{name:<18}{n:>10}{seconds:>10.3f}{len(data) / 1024 / 1024:>8.1f}")
+
+    # 流式输出包含查询的耗时
+    session.expunge_all()
+    del users
+
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in stream_query(select(User), User))
+    seconds = time.perf_counter() - start
+    print(f"{'stream (+query)':<18}{n:>10}{seconds:>10.3f}{size / 1024 / 1024:>8.1f}")
+
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
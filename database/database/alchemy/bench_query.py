@@ -0,0 +1,146 @@
+"""
+软删除查询性能测试
+
+对比如下几种方式下, 每条查询语句在 Python 端的开销 (构建语句, 编译或命中编译缓存, 执行并获取结果):
+
+- `legacy+echo`: 原有方式, 构建查询时遍历实体类型附加软删除条件, 且开启 `echo` 输出 SQL 日志
+- `legacy`: 原有方式, 关闭 `echo`
+- `hook`: 通过 `do_orm_execute` 事件统一附加软删除条件
+
+执行方式:
+
+```bash
+python -m database.alchemy.bench_query [查询次数]
+```
+"""
+
+import contextlib
+import io
+import sys
+import time
+from typing import Any, Callable, Dict, Optional, Type
+
+from sqlalchemy import Select, event, select
+from sqlalchemy.engine.default import DefaultExecutionContext
+
+from . import initialize_tables
+from .core import WITH_DELETED, engine, session
+from .mixin import SoftDeleteMixin
+from .model import Gender, User
+
+# 每种方式执行的轮数
+_ROUNDS = 5
+
+
+def _legacy_select(*entities: Any) -> Select[Any]:
+    """原有的软删除查询实现, 每次构建查询时遍历实体类型
+
+    Args:
+        - `entities` (`Any`): 要查询的实体类型
+
+    Returns:
+        `Select[Any]`: `select` 查询对象
+    """
+    soft_deleted_entity: Optional[Type[SoftDeleteMixin]] = None
+    for e in entities:
+        if isinstance(e, type) and issubclass(e, SoftDeleteMixin):
+            soft_deleted_entity = e
+
+    sel = select(*entities)
+    if soft_deleted_entity:
+        sel = sel.where(soft_deleted_entity.deleted == False)  # noqa
+
+    # 跳过事件监听器附加的软删除条件, 只保留原有方式附加的条件
+    return sel.execution_options(**{WITH_DELETED: True})
+
+
+class _CacheCounter:
+    """统计编译缓存命中次数的计数器"""
+
+    def __init__(self) -> None:
+        """构造器"""
+        self.hits = 0
+        self.total = 0
+
+    def __call__(self, conn: Any, cursor: Any, statement: str, parameters: Any,
+                 context: DefaultExecutionContext, executemany: bool) -> None:
+        """在执行 SQL 语句前调用"""
+        self.total += 1
+        if context.cache_hit == context.cache_hit.CACHE_HIT:
+            self.hits += 1
+
+
+def _run(build: Callable[[int], Select[Any]], n: int, user_id: int) -> Dict[str, Any]:
+    """执行 `n` 次查询, 统计耗时和编译缓存命中率
+
+    Args:
+        - `build` (`Callable[[int], Select[Any]]`): 构建查询语句的函数
+        - `n` (`int`): 查询次数
+        - `user_id` (`int`): 查询的用户 ID
+
+    Returns:
+        `Dict[str, Any]`: 测试结果
+    """
+    counter = _CacheCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        start = time.perf_counter()
+        for _ in range(n):
+            user = session.scalars(build(user_id)).one_or_none()
+            assert user is not None
+
+        seconds = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+    return {
+        "us_per_query": seconds / n * 1_000_000,
+        "cache_hit": counter.hits / counter.total if counter.total else 0.0,
+    }
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    initialize_tables()
+
+    user = User(id_num="610104198103032101", name="Alvin", gender=Gender.MALE)
+    session.add(user)
+    session.commit()
+
+    user_id = user.id
+    session.expunge_all()
+
+    def legacy(id_: int) -> Select[Any]:
+        return _legacy_select(User).where(User.id == id_)
+
+    def hook(id_: int) -> Select[Any]:
+        return select(User).where(User.id == id_)
+
+    cases = [("legacy+echo", legacy, True), ("legacy", legacy, False), ("hook", hook, False)]
+
+    print(f"{'mode':<14}{'queries':>10}{'us/query':>12}{'cache hit':>12}")
+    for name, build, echo in cases:
+        # 开启 echo 时, 将 SQL 日志输出到内存, 避免干扰测试结果的输出
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine.echo = echo
+
+            # 预热, 使语句编译结果进入缓存
+            _run(build, 10, user_id)
+
+            # 分多轮执行, 取耗时最短的一轮, 以减少机器负载波动的影响
+            r = min(
+                (_run(build, n // _ROUNDS, user_id) for _ in range(_ROUNDS)),
+                key=lambda x: x["us_per_query"],
+            )
+
+            engine.echo = False
+
+            # 关闭 Session 以归还连接, 连接对象在创建时会记录 `echo` 状态
+            session.close()
+
+        print(f"{name:<14}{n:>10}{r['us_per_query']:>12.1f}{r['cache_hit']:>12.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,111 +1,103 @@
-from typing import Any, Optional, Self, Tuple, Type
+from functools import lru_cache
+from typing import Any, Self
+
+from sqlalchemy import Select, create_engine, event, pool, select
+from sqlalchemy.orm import (
+    ORMExecuteState,
+    Query,
+    scoped_session,
+    sessionmaker,
+    with_loader_criteria,
+)
 
-from sqlalchemy import Select, create_engine, pool, select
-from sqlalchemy.orm import Query, scoped_session, sessionmaker
+# 跳过软删除条件的执行选项名称, 例如: `select(User).execution_options(with_deleted=True)`
+WITH_DELETED = "with_deleted"
 
 
 class ExtQuery(Query[Any]):
-    """扩展查询类, 继承原查询类"""
+    """扩展查询类, 继承原查询类
+
+    软删除条件统一由 `do_orm_execute` 事件监听器 (参见 `_soft_delete_listener` 函数) 附加,
+    故构造查询对象时无需再逐个检查查询的实体类型
+    """
 
-    def __new__(cls, *args: Any, **kwargs: Any) -> Self:
-        """实例化查询对象
+    def with_deleted(self) -> Self:
+        """在本次查询中包含已被软删除的记录
 
         Returns:
-            ExtQuery: 实例化的查询对象
+            `ExtQuery`: 返回查询对象
         """
-        query = super().__new__(cls)
+        return self.execution_options(**{WITH_DELETED: True})
 
-        # 判断是否携带参数
-        if args and len(args) > 0:
-            # 对 soft delete 进行处理
-            query = query._add_soft_delete_filter(args[0])
 
-        return query
+def soft_deleted_select(*entities: Any, **__kw: Any) -> Select[Any]:
+    """创建一个会排除软删除记录的 `select` 查询对象
 
-    def _add_soft_delete_filter(self, query_types: Tuple[Type[Any]]) -> Self:
-        """尝试增加 Soft Delete 查询条件
+    软删除条件由 `do_orm_execute` 事件监听器在语句执行时统一附加, 本函数保留以兼容原有的调用方式
 
-        Args:
-            - `query_types` (`Tuple[Type]`): 要查询的实体类型
+    Args:
+        - `entities` (`Any`): 要查询的实体类型
 
-        Returns:
-            `ExtQuery`: 返回查询对象
-        """
-        from .mixin import SoftDeleteMixin
+    Returns:
+        `Select[Any]`: `select` 查询对象
+    """
+    return select(*entities, **__kw)
 
-        for t in query_types:
-            # 判断实体类型是否支持 soft delete
-            if isinstance(t, type) and issubclass(t, SoftDeleteMixin):
-                # 增加 soft delete 查询条件
-                return self.filter(t.deleted == False)  # noqa
 
-        return self
+@lru_cache(maxsize=None)
+def _soft_delete_option() -> Any:
+    """创建软删除加载条件选项 (仅创建一次)
 
+    `with_loader_criteria` 会为所有继承自 `SoftDeleteMixin` 的实体 (包括别名和关系属性加载) 附加
+    `deleted = False` 条件, 其 lambda 条件会按实体类型被 SQLAlchemy 分析并缓存, 且选项对象本身参与语句
+    的缓存键计算, 所以同一结构的语句只会编译一次, 之后都会命中编译缓存
 
-def soft_deleted_select(*entities: Any, **__kw: Any) -> Select[Any]:
+    Returns:
+        `LoaderCriteriaOption`: 加载条件选项
+    """
     from .mixin import SoftDeleteMixin
 
-    soft_deleted_entity: Optional[Type[SoftDeleteMixin]] = None
-    for e in entities:
-        if isinstance(e, type) and issubclass(e, SoftDeleteMixin):
-            soft_deleted_entity = e
-
-    sel = select(*entities, **__kw)
-    if soft_deleted_entity:
-        sel = sel.where(soft_deleted_entity.deleted == False)  # noqa
+    return with_loader_criteria(
+        SoftDeleteMixin,
+        lambda cls: cls.deleted == False,  # noqa
+        include_aliases=True,
+    )
+
+
+def _soft_delete_listener(state: ORMExecuteState) -> None:
+    """在 ORM 查询语句执行前, 为语句附加软删除条件
+
+    Args:
+        - `state` (`ORMExecuteState`): ORM 语句执行状态对象
+    """
+    if (
+        not state.is_select
+        or state.is_column_load
+        or state.is_relationship_load
+        or state.execution_options.get(WITH_DELETED, False)
+    ):
+        # 对于非查询语句, 以及对已加载实体的属性刷新和关系加载 (加载条件会自动从主查询传递), 不做处理
+        return
 
-    return sel
+    state.statement = state.statement.options(_soft_delete_option())
 
 
 # 创建数据库连接引擎
+# 关闭 `echo`, 避免在每次执行语句时格式化并输出 SQL 日志; 如需查看 SQL, 可将
+# `logging.getLogger("sqlalchemy.engine")` 的日志级别设置为 `INFO`
 engine = create_engine(
     url="sqlite:///:memory:",
-    echo=True,
+    echo=False,
     pool_size=5,
     max_overflow=0,
     poolclass=pool.QueuePool,
 )
 
-# 创建 Session, scoped_session 函数用于在 Locale 范围中创建 session 对象
-# 指定查询类为 ExtQuery, 对原查询做扩展
-session = scoped_session(
-    sessionmaker(bind=engine, autocommit=False, query_cls=ExtQuery)
-)
+# 创建 Session 工厂, 指定查询类为 ExtQuery, 对原查询做扩展
+session_factory = sessionmaker(bind=engine, autocommit=False, query_cls=ExtQuery)
 
+# 在 Session 工厂上监听 `do_orm_execute` 事件, 为所有 ORM 查询附加软删除条件
+event.listen(session_factory, "do_orm_execute", _soft_delete_listener)
 
-""" 以下代码演示了如何增加监听器, 在语句执行前执行处理
-Statement = TypeVar(
-    "Statement", bound=Union[Select, FromStatement, CompoundSelect, Executable]
-)
-
-
-def soft_delete_rewriter(stmt: Statement) -> Statement:
-    if not isinstance(stmt, Select):
-        return stmt
-
-    if stmt.get_execution_options().get("with_deleted"):
-        return stmt
-
-    for from_obj in stmt.get_final_froms():
-        if not isinstance(from_obj, Table):
-            continue
-
-        column_obj = from_obj.columns.get("deleted")
-        if column_obj is None:
-            continue
-
-        # do something
-
-    return stmt
-
-@listens_for(Session, identifier="do_orm_execute")
-def execution_listener(state: ORMExecuteState):
-    if not state.is_select:
-        return
-
-    # Rewrite the statement
-    adapted = soft_delete_rewriter(state.statement)
-
-    # Replace the statement
-    state.statement = adapted
-"""
+# 创建 Session, scoped_session 函数用于在 Locale 范围中创建 session 对象
+session = scoped_session(session_factory)
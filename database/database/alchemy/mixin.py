@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, ClassVar, Dict, Tuple
 
 from sqlalchemy import Boolean, DateTime, Integer, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -16,6 +16,9 @@ class BaseModel(DeclarativeBase):
         "sqlite_autoincrement": True,
     }
 
+    # 转为字典 (JSON) 时包含的字段
+    __json_fields__: ClassVar[Tuple[str, ...]] = ("id", "created_at")
+
     # 主键, ID 字段
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
@@ -32,10 +35,7 @@ class BaseModel(DeclarativeBase):
         Returns:
             `Dict[str, Any]`: 返回的字典对象
         """
-        return {
-            "id": self.id,
-            "created_at": self.created_at,
-        }
+        return {name: getattr(self, name) for name in self.__json_fields__}
 
 
 class SoftDeleteMixin:
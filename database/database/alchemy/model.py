@@ -1,7 +1,7 @@
 import enum
 import json
 from datetime import date
-from typing import Any, Dict, List
+from typing import List
 
 from sqlalchemy import Date, Enum, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -21,6 +21,9 @@ class User(BaseModel, SoftDeleteMixin):
     # 对应的表名称
     __tablename__ = "user"
 
+    # 转为字典 (JSON) 时包含的字段
+    __json_fields__ = BaseModel.__json_fields__ + ("id_num", "name", "gender", "birthday")
+
     # 身份证字段
     id_num: Mapped[str] = mapped_column(String(length=50), nullable=False)
 
@@ -48,21 +51,6 @@ class User(BaseModel, SoftDeleteMixin):
         back_populates="users",  # `back_populates` 表示显式对应 `Group` 实体中的 `users` 属性
     )
 
-    def jsonify(self) -> Dict[str, Any]:
-        """当前对象转为字段
-
-        Returns:
-            `Dict[str, Any]`: 返回的字典对象
-        """
-
-        return {
-            **super().jsonify(),
-            "id_num": self.id_num,
-            "name": self.name,
-            "gender": self.gender,
-            "birthday": self.birthday,
-        }
-
     def __str__(self) -> str:
         """当前对象转为字符串
 
@@ -78,6 +66,9 @@ class Group(BaseModel):
     # 对应的表名称
     __tablename__ = "`group`"
 
+    # 转为字典 (JSON) 时包含的字段
+    __json_fields__ = BaseModel.__json_fields__ + ("name",)
+
     # 组名称
     name: Mapped[str] = mapped_column(String(length=50), nullable=False)
 
@@ -96,18 +87,6 @@ class Group(BaseModel):
         back_populates="groups",  # `back_populates` 表示显式对应 `User` 实体中的 `groups` 属性
     )
 
-    def jsonify(self) -> Dict[str, Any]:
-        """当前对象转为字段
-
-        Returns:
-            `Dict[str, Any]`: 返回的字典对象
-        """
-
-        return {
-            **super().jsonify(),
-            "name": self.name,
-        }
-
     def __str__(self) -> str:
         """当前对象转为字符串
 
@@ -0,0 +1,203 @@
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence, Type
+
+from sqlalchemy import ColumnElement, insert
+from sqlalchemy.orm import (
+    joinedload,
+    lazyload,
+    raiseload,
+    scoped_session,
+    selectinload,
+    subqueryload,
+)
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from .core import session as default_session
+from .core import soft_deleted_select
+from .mixin import BaseModel
+from .model import Group, User, UserGroup
+
+# 关系属性的加载策略
+#   - `lazy`: 访问属性时才执行查询, 遍历结果集时会产生 N+1 次查询
+#   - `selectin`: 主查询完成后, 通过一条 `WHERE ... IN (...)` 查询批量加载所有关联对象
+#   - `joined`: 在主查询中通过 `LEFT OUTER JOIN` 同时加载关联对象
+#   - `subquery`: 主查询完成后, 通过一条包含原查询作为子查询的语句批量加载关联对象
+#   - `raise`: 禁止加载, 访问属性时抛出异常, 用于检查代码中是否存在意外的延迟加载
+LoadStrategy = Literal["lazy", "selectin", "joined", "subquery", "raise"]
+
+# 加载策略名称和加载函数的对应关系
+_LOADERS: Dict[str, Callable[..., _AbstractLoad]] = {
+    "lazy": lazyload,
+    "selectin": selectinload,
+    "joined": joinedload,
+    "subquery": subqueryload,
+    "raise": raiseload,
+}
+
+# 批量插入的默认批次大小
+DEFAULT_BATCH_SIZE = 500
+
+
+def load_options(
+    model: Type[Any], paths: Sequence[str], strategy: LoadStrategy = "selectin"
+) -> List[_AbstractLoad]:
+    """根据关系属性路径生成加载选项
+
+    属性路径可以通过 `.` 连接多级关系, 例如 `"user_groups.group"`, 每一级均使用相同的加载策略
+
+    Args:
+        - `model` (`Type[Any]`): 查询的实体类型
+        - `paths` (`Sequence[str]`): 关系属性路径集合
+        - `strategy` (`LoadStrategy`, optional): 加载策略. Defaults to `"selectin"`.
+
+    Returns:
+        `List[_AbstractLoad]`: 加载选项集合, 用于 `select(...).options(...)`
+
+    Raises:
+        - `ValueError`: 加载策略不存在
+    """
+    loader = _LOADERS.get(strategy)
+    if loader is None:
+        raise ValueError(f"Unknown load strategy: {strategy}")
+
+    options: List[_AbstractLoad] = []
+    for path in paths:
+        entity = model
+        option: Optional[_AbstractLoad] = None
+
+        for name in path.split("."):
+            attr = getattr(entity, name)
+            # 第一级关系通过加载函数创建选项, 后续级别在选项上链式调用
+            option = loader(attr) if option is None else getattr(option, loader.__name__)(attr)
+            entity = attr.property.mapper.class_
+
+        if option is not None:
+            options.append(option)
+
+    return options
+
+
+class Repository[T: BaseModel]:
+    """实体仓储类, 提供批量插入和可选加载策略的查询"""
+
+    def __init__(self, model: Type[T], session: scoped_session[Any] = default_session) -> None:
+        """构造器
+
+        Args:
+            - `model` (`Type[T]`): 实体类型
+            - `session` (`scoped_session`, optional): 数据库会话对象. Defaults to `alchemy.core.session`.
+        """
+        self._model = model
+        self._session = session
+
+    def bulk_insert(
+        self, rows: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> int:
+        """批量插入数据
+
+        每批数据通过 `session.execute(insert(model), [...])` 执行, 绕过 Session 的 Unit of Work 机制,
+        不会创建实体对象, 也不会在 Session 中跟踪这些记录
+
+        和 `insert(model).values([...])` 相比, 这种方式同样会被 SQLAlchemy 合并为多行 `INSERT` 语句
+        (insertmanyvalues), 但语句只需编译一次即可缓存复用, 而 `values([...])` 会因每批参数不同而反复编译
+
+        注意: 不会自动提交事务
+
+        Args:
+            - `rows` (`Iterable[Dict[str, Any]]`): 要插入的数据, 每行为一个 `字段名 -> 值` 字典
+            - `batch_size` (`int`, optional): 每批插入的行数. Defaults to `500`.
+
+        Returns:
+            `int`: 插入的总行数
+
+        Raises:
+            - `ValueError`: 参数 `batch_size` 小于 `1`
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be greater than 0")
+
+        count = 0
+        it = iter(rows)
+
+        stmt = insert(self._model)
+        while batch := list(islice(it, batch_size)):
+            self._session.execute(stmt, batch)
+            count += len(batch)
+
+        return count
+
+    def find_all(
+        self,
+        *criteria: ColumnElement[bool],
+        load: Sequence[str] = (),
+        strategy: LoadStrategy = "selectin",
+    ) -> List[T]:
+        """查询实体对象, 并按指定策略加载关系属性
+
+        Args:
+            - `criteria` (`ColumnElement[bool]`): 查询条件
+            - `load` (`Sequence[str]`, optional): 需要加载的关系属性路径. Defaults to `()`.
+            - `strategy` (`LoadStrategy`, optional): 关系属性的加载策略. Defaults to `"selectin"`.
+
+        Returns:
+            `List[T]`: 实体对象列表
+        """
+        stmt = soft_deleted_select(self._model).where(*criteria)
+        if load:
+            stmt = stmt.options(*load_options(self._model, load, strategy))
+
+        return list(self._session.scalars(stmt).unique())
+
+
+class UserRepository(Repository[User]):
+    """用户实体仓储类"""
+
+    def __init__(self, session: scoped_session[Any] = default_session) -> None:
+        """构造器
+
+        Args:
+            - `session` (`scoped_session`, optional): 数据库会话对象. Defaults to `alchemy.core.session`.
+        """
+        super().__init__(User, session)
+
+    def find_with_groups(
+        self, *criteria: ColumnElement[bool], strategy: LoadStrategy = "selectin"
+    ) -> List[User]:
+        """查询用户, 同时加载用户所属的组
+
+        Args:
+            - `criteria` (`ColumnElement[bool]`): 查询条件
+            - `strategy` (`LoadStrategy`, optional): 加载策略. Defaults to `"selectin"`.
+
+        Returns:
+            `List[User]`: 用户实体对象列表
+        """
+        return self.find_all(*criteria, load=["groups"], strategy=strategy)
+
+
+class GroupRepository(Repository[Group]):
+    """用户组实体仓储类"""
+
+    def __init__(self, session: scoped_session[Any] = default_session) -> None:
+        """构造器
+
+        Args:
+            - `session` (`scoped_session`, optional): 数据库会话对象. Defaults to `alchemy.core.session`.
+        """
+        super().__init__(Group, session)
+
+    def bulk_add_users(
+        self, pairs: Iterable[Sequence[int]], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> int:
+        """批量将用户加入用户组
+
+        Args:
+            - `pairs` (`Iterable[Sequence[int]]`): `(user_id, group_id)` 集合
+            - `batch_size` (`int`, optional): 每批插入的行数. Defaults to `500`.
+
+        Returns:
+            `int`: 插入的总行数
+        """
+        return Repository(UserGroup, self._session).bulk_insert(
+            ({"user_id": u, "group_id": g} for u, g in pairs), batch_size
+        )
@@ -0,0 +1,245 @@
+import enum
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Type
+
+from sqlalchemy import Date, DateTime, Enum, Select, Time
+from sqlalchemy.orm import DeclarativeBase, scoped_session
+
+from .core import session as default_session
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# 序列化后端
+#   - `auto`: 如果安装了 orjson 则使用 orjson, 否则使用标准库 json
+#   - `orjson`: 使用 orjson
+#   - `json`: 使用标准库 json
+Backend = Literal["auto", "orjson", "json"]
+
+# 流式输出时, 每批序列化的对象数量
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _value_expr(model: Type[DeclarativeBase], name: str, source: str) -> str:
+    """生成读取并转换一个字段值的表达式代码
+
+    Args:
+        - `model` (`Type[DeclarativeBase]`): 实体类型
+        - `name` (`str`): 字段名
+        - `source` (`str`): 读取字段值的表达式代码
+
+    Returns:
+        `str`: 表达式代码
+    """
+    column = model.__mapper__.columns.get(name)
+
+    # 日期时间类型转为 ISO 格式字符串, 枚举类型转为枚举值
+    if column is None:
+        return source
+    if isinstance(column.type, (Date, DateTime, Time)):
+        convert = ".isoformat()"
+    elif isinstance(column.type, Enum) and column.type.enum_class is not None:
+        convert = ".value"
+    else:
+        return source
+
+    # 对象尚未持久化时, 即便是非空字段也可能为 `None`, 故统一判断空值
+    return f"(None if (v := {source}) is None else v{convert})"
+
+
+def json_fields(model: Type[DeclarativeBase]) -> Tuple[str, ...]:
+    """获取实体类型要序列化的字段
+
+    优先使用实体类型的 `__json_fields__` 属性, 否则使用所有数据表字段
+
+    Args:
+        - `model` (`Type[DeclarativeBase]`): 实体类型
+
+    Returns:
+        `Tuple[str, ...]`: 字段名集合
+    """
+    fields = getattr(model, "__json_fields__", None)
+    if fields is not None:
+        return tuple(fields)
+
+    return tuple(attr.key for attr in model.__mapper__.column_attrs)
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(
+    model: Type[DeclarativeBase], fields: Optional[Tuple[str, ...]] = None
+) -> Callable[[Any], Dict[str, Any]]:
+    """为实体类型生成序列化函数
+
+    根据实体类型的字段定义生成 Python 代码并编译为函数, 函数将实体对象转为只包含 JSON 基本类型的字典:
+    日期时间字段转为 ISO 格式字符串, 枚举字段转为枚举值, 所以序列化时无需为每个值做类型判断
+
+    生成的函数按 `(model, fields)` 缓存, 每个实体类型只需编译一次
+
+    Args:
+        - `model` (`Type[DeclarativeBase]`): 实体类型
+        - `fields` (`Optional[Tuple[str, ...]]`, optional): 要序列化的字段, `None` 表示使用 `json_fields`. Defaults to `None`.
+
+    Returns:
+        `Callable[[Any], Dict[str, Any]]`: 序列化函数
+    """
+    if fields is None:
+        fields = json_fields(model)
+
+    # 已加载的字段值保存在实体对象的 `__dict__` 中, 直接读取可以跳过属性描述符 (InstrumentedAttribute)
+    # 的开销; 如果有字段尚未加载 (例如已过期或延迟加载的字段), 则回退为通过属性读取, 以触发加载
+    fast = ",\n".join(
+        f"            {name!r}: {_value_expr(model, name, f'd[{name!r}]')}" for name in fields
+    )
+    slow = ",\n".join(
+        f"            {name!r}: {_value_expr(model, name, f'o.{name}')}" for name in fields
+    )
+    source = (
+        "def serialize(o):\n"
+        "    d = o.__dict__\n"
+        "    try:\n"
+        f"        return {{\n{fast}\n        }}\n"
+        "    except KeyError:\n"
+        f"        return {{\n{slow}\n        }}\n"
+    )
+
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<serializer {model.__name__}>", "exec"), namespace)
+
+    fn: Callable[[Any], Dict[str, Any]] = namespace["serialize"]
+    fn.__doc__ = source
+    return fn
+
+
+def _default(o: Any) -> Any:
+    """标准库 json 无法序列化的对象的转换规则
+
+    Args:
+        - `o` (`Any`): 任意对象
+
+    Returns:
+        `Any`: 转换后的对象
+    """
+    if isinstance(o, enum.Enum):
+        return o.value
+    if hasattr(o, "isoformat"):
+        return o.isoformat()
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, backend: Backend = "auto") -> bytes:
+    """将对象序列化为 JSON 字节串
+
+    Args:
+        - `obj` (`Any`): 要序列化的对象
+        - `backend` (`Backend`, optional): 序列化后端. Defaults to `"auto"`.
+
+    Returns:
+        `bytes`: JSON 字节串
+
+    Raises:
+        - `RuntimeError`: 指定使用 orjson 但未安装
+    """
+    if backend == "orjson" or (backend == "auto" and orjson is not None):
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+
+        return orjson.dumps(obj, default=_default)
+
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+def serialize_all(
+    objs: Iterable[Any], model: Type[DeclarativeBase], fields: Optional[Tuple[str, ...]] = None
+) -> List[Dict[str, Any]]:
+    """将一组实体对象转为字典列表
+
+    Args:
+        - `objs` (`Iterable[Any]`): 实体对象集合
+        - `model` (`Type[DeclarativeBase]`): 实体类型
+        - `fields` (`Optional[Tuple[str, ...]]`, optional): 要序列化的字段. Defaults to `None`.
+
+    Returns:
+        `List[Dict[str, Any]]`: 字典列表
+    """
+    return list(map(compile_serializer(model, fields), objs))
+
+
+def stream_json_array(
+    objs: Iterable[Any],
+    model: Type[DeclarativeBase],
+    fields: Optional[Tuple[str, ...]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: Backend = "auto",
+) -> Iterator[bytes]:
+    """将一组实体对象以 JSON 数组的形式流式输出
+
+    每次只序列化 `chunk_size` 个对象, 输出的各段字节串依次拼接即为完整的 JSON 数组
+
+    Args:
+        - `objs` (`Iterable[Any]`): 实体对象集合
+        - `model` (`Type[DeclarativeBase]`): 实体类型
+        - `fields` (`Optional[Tuple[str, ...]]`, optional): 要序列化的字段. Defaults to `None`.
+        - `chunk_size` (`int`, optional): 每批序列化的对象数量. Defaults to `1000`.
+        - `backend` (`Backend`, optional): 序列化后端. Defaults to `"auto"`.
+
+    Yields:
+        `bytes`: JSON 数组的一段字节串
+    """
+    serialize = compile_serializer(model, fields)
+
+    yield b"["
+
+    first = True
+    chunk: List[Dict[str, Any]] = []
+
+    def flush() -> bytes:
+        # 将一批对象序列化为 JSON 数组后去掉首尾的 `[` 和 `]`, 作为外层数组的一部分
+        data = dumps(chunk, backend)[1:-1]
+        chunk.clear()
+        return data if first else b"," + data
+
+    for obj in objs:
+        chunk.append(serialize(obj))
+        if len(chunk) >= chunk_size:
+            yield flush()
+            first = False
+
+    if chunk:
+        yield flush()
+
+    yield b"]"
+
+
+def stream_query(
+    stmt: Select[Any],
+    model: Type[DeclarativeBase],
+    fields: Optional[Tuple[str, ...]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: Backend = "auto",
+    session: scoped_session[Any] = default_session,
+) -> Iterator[bytes]:
+    """执行查询, 并将查询结果以 JSON 数组的形式流式输出
+
+    查询通过 `yield_per` 执行选项分批获取结果, 不会一次性将所有实体对象载入内存
+
+    Args:
+        - `stmt` (`Select[Any]`): 查询语句
+        - `model` (`Type[DeclarativeBase]`): 实体类型
+        - `fields` (`Optional[Tuple[str, ...]]`, optional): 要序列化的字段. Defaults to `None`.
+        - `chunk_size` (`int`, optional): 每批获取和序列化的对象数量. Defaults to `1000`.
+        - `backend` (`Backend`, optional): 序列化后端. Defaults to `"auto"`.
+        - `session` (`scoped_session`, optional): 数据库会话对象. Defaults to `alchemy.core.session`.
+
+    Yields:
+        `bytes`: JSON 数组的一段字节串
+    """
+    result = session.scalars(stmt.execution_options(yield_per=chunk_size))
+    try:
+        yield from stream_json_array(result, model, fields, chunk_size, backend)
+    finally:
+        result.close()
@@ -1,4 +1,4 @@
-from .core import context, mongodb
+from .core import context, mongodb, prefetch_references
 from .models import Department, Employee, Gender, Org, Role
 from .utils import clear_db, ensure_indexes, run_once
 
@@ -13,6 +13,7 @@ __all__ = [
     "clear_db",
     "ensure_indexes",
     "run_once",
+    "prefetch_references",
 ]
 
 # 连接数据库
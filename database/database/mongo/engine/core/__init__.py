@@ -1,7 +1,8 @@
 from .context import Tenant, context
 from .db import mongodb
 from .fields import ProxyLazyReferenceField, StringEnumField
-from .models import AuditedMixin, BaseModel, MultiTenantMixin
+from .models import AuditedMixin, BaseModel, MultiTenantMixin, tenant_filter, tenant_index
+from .prefetch import PrefetchResult, prefetch_references
 
 __all__ = [
     "mongodb",
@@ -12,4 +13,8 @@ __all__ = [
     "BaseModel",
     "Tenant",
     "MultiTenantMixin",
+    "tenant_filter",
+    "tenant_index",
+    "PrefetchResult",
+    "prefetch_references",
 ]
@@ -1,13 +1,56 @@
+from contextvars import ContextVar
 from datetime import datetime, UTC
-from typing import Any, Type, cast
+from typing import Any, Dict, Optional, Tuple, Type, cast
 
 from mongoengine import Document, Q, QuerySet, signals
 from mongoengine.fields import DateTimeField
 from pymongo.collection import Collection
 
-from .context import context
+from .context import Tenant, context
 from .fields import ProxyLazyReferenceField
 
+# 缓存当前租户及其对应的查询条件, 即 `(租户对象, 查询条件)`
+#
+# 同一个请求 (上下文) 内租户不变, 故查询条件只需构建一次, 之后所有查询集合对象共用;
+# 存储在 `ContextVar` 中, 不同的线程或 asyncio 任务之间不会相互影响
+_tenant_filter: ContextVar[Optional[Tuple[Optional[Tenant], Q]]] = ContextVar(
+    "tenant_filter", default=None
+)
+
+
+def tenant_filter() -> Q:
+    """获取当前租户的查询条件
+
+    租户对象未发生变化时, 返回缓存的查询条件对象
+
+    Returns:
+        `Q`: 租户查询条件
+    """
+    tenant = context.get_current_tenant()
+
+    cached = _tenant_filter.get()
+    if cached is not None and cached[0] is tenant:
+        return cached[1]
+
+    q = Q(org=tenant)
+    _tenant_filter.set((tenant, q))
+    return q
+
+
+def tenant_index(*fields: str, **options: Any) -> Dict[str, Any]:
+    """生成以租户字段开头的复合索引定义
+
+    多租户文档的所有查询都会带有 `org` 条件, 所以索引的第一个字段必须为 `org`, 否则查询无法有效利用索引
+
+    Args:
+        - `fields` (`str`): 租户字段之后的索引字段
+        - `options` (`Any`): 其它索引选项, 例如 `unique=True`
+
+    Returns:
+        `Dict[str, Any]`: 索引定义, 可用于文档 `meta` 的 `indexes` 属性
+    """
+    return {"fields": ["org", *fields], **options}
+
 
 class TenantAwareQuerySet(QuerySet):
     """定义支持多租户的查询集合类型"""
@@ -15,13 +58,9 @@ class TenantAwareQuerySet(QuerySet):
     def __init__(self, doc: Type[Document], collection: Collection[Any]) -> None:
         super().__init__(doc, collection)
 
-        q = Q()
-
         # 加入租户查询条件
         if issubclass(doc, MultiTenantMixin):
-            q &= Q(org=context.get_current_tenant())
-
-        self._query_obj = q
+            self._query_obj = tenant_filter()
 
 
 class BaseModel(Document):
@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set, Type
+
+from bson import ObjectId
+from mongoengine import Document
+
+from .fields import ProxyLazyReference
+
+
+@dataclass
+class PrefetchResult:
+    """批量加载引用文档的结果"""
+
+    # 加载完成的文档对象
+    documents: List[Document] = field(default_factory=list)
+
+    # 待加载的引用数量, 即逐个加载时需要的查询次数
+    references: int = 0
+
+    # 实际执行的查询次数
+    queries: int = 0
+
+    # 被引用但未能查询到的文档数量 (例如已被删除, 或不属于当前租户)
+    missing: int = 0
+
+    @property
+    def saved(self) -> int:
+        """节省的查询次数
+
+        Returns:
+            `int`: 逐个加载时需要的查询次数与实际查询次数之差
+        """
+        return self.references - self.queries
+
+
+def prefetch_references(docs: Iterable[Document], *fields: str) -> PrefetchResult:
+    """批量加载文档集合中 `ProxyLazyReferenceField` 类型字段引用的文档
+
+    `ProxyLazyReference` 在第一次访问属性时, 会通过一次 `objects.get(id=...)` 查询加载被引用的文档,
+    遍历 N 个文档并访问其引用字段会产生 N 次查询
+
+    本函数先收集所有文档中尚未加载的引用, 按被引用的文档类型 (即集合) 分组, 每组只执行一次
+    `{"_id": {"$in": [...]}}` 查询, 然后将查询结果写入各引用对象的 `_cached_doc` 属性,
+    之后访问引用字段就不会再查询数据库
+
+    Args:
+        - `docs` (`Iterable[Document]`): 文档集合, 可以是 `QuerySet` 对象, 会被转为列表
+        - `fields` (`str`): 要加载的引用字段名称
+
+    Returns:
+        `PrefetchResult`: 加载结果, 其中 `documents` 为文档列表
+    """
+    result = PrefetchResult(documents=list(docs))
+
+    # 按文档类型分组, 记录每个文档主键对应的引用对象集合
+    pending: Dict[Type[Document], Dict[ObjectId, List[ProxyLazyReference]]] = {}
+
+    for doc in result.documents:
+        for name in fields:
+            # 通过 `_data` 获取字段值, 避免触发字段的懒加载
+            ref = doc._data.get(name)
+            if not isinstance(ref, ProxyLazyReference) or ref._cached_doc is not None:
+                continue
+
+            pending.setdefault(ref.document_type, {}).setdefault(ref.id, []).append(ref)
+            result.references += 1
+
+    for document_type, refs in pending.items():
+        # 每种文档类型只执行一次查询
+        loaded: Set[Any] = set()
+        for target in document_type.objects(id__in=list(refs.keys())):
+            loaded.add(target.pk)
+            for ref in refs[target.pk]:
+                object.__setattr__(ref, "_cached_doc", target)
+
+        result.queries += 1
+        result.missing += len(refs.keys() - loaded)
+
+    return result
@@ -11,6 +11,7 @@ from .core import (
     ProxyLazyReferenceField,
     StringEnumField,
     Tenant,
+    tenant_index,
 )
 
 
@@ -39,13 +40,8 @@ class Department(BaseModel, MultiTenantMixin, AuditedMixin):
 
     meta: Dict[str, Any] = {
         "indexes": [
-            {
-                "fields": [
-                    "org",
-                    "name",
-                ],
-                "unique": True,
-            }
+            tenant_index("name", unique=True),
+            tenant_index("level"),
         ]
     }
 
@@ -64,13 +60,7 @@ class Department(BaseModel, MultiTenantMixin, AuditedMixin):
 class Role(BaseModel, MultiTenantMixin):
     meta: Dict[str, Any] = {
         "indexes": [
-            {
-                "fields": [
-                    "org",
-                    "name",
-                ],
-                "unique": True,
-            }
+            tenant_index("name", unique=True),
         ]
     }
 
@@ -86,13 +76,8 @@ class Gender(Enum):
 class Employee(BaseModel, MultiTenantMixin, AuditedMixin):
     meta: Dict[str, Any] = {
         "indexes": [
-            {
-                "fields": [
-                    "org",
-                    "name",
-                ],
-                "unique": True,
-            }
+            tenant_index("name", unique=True),
+            tenant_index("department"),
         ]
     }
 
@@ -1,9 +1,20 @@
-from .pymongo import CityModel, UserModel, clear_all, create_user, find_user
+from .bulk import ImportResult, import_users
+from .pymongo import (
+    CityModel,
+    UserModel,
+    clear_all,
+    create_user,
+    find_user,
+    find_user_stream,
+)
 
 __all__ = [
     "CityModel",
     "UserModel",
     "create_user",
     "find_user",
+    "find_user_stream",
     "clear_all",
+    "ImportResult",
+    "import_users",
 ]
@@ -0,0 +1,104 @@
+"""
+批量导入性能测试
+
+对比逐个调用 `create_user` 和通过 `import_users` 批量导入用户文档的吞吐量 (文档/秒)
+
+执行方式:
+
+```bash
+# 连接本地 mongod (需为副本集, 以支持 `create_user` 中的事务)
+python -m database.mongo.pymongo.bench [用户数] [城市数]
+
+# 使用 mongomock 模拟 (需安装 mongomock, 不支持事务, 故只测试批量导入)
+python -m database.mongo.pymongo.bench [用户数] [城市数] --mongomock
+```
+"""
+
+import sys
+import time
+from datetime import date
+from typing import List, cast
+
+from pymongo.database import Database
+
+from .bulk import ensure_city_index, import_users
+from .pymongo import DocType, UserModel, client, create_user, mongo_db
+
+
+def _users(n: int, cities: int) -> List[UserModel]:
+    """生成用户实体对象
+
+    Args:
+        - `n` (`int`): 用户数量
+        - `cities` (`int`): 城市数量
+
+    Returns:
+        `List[UserModel]`: 用户实体对象列表
+    """
+    return [
+        cast(
+            UserModel,
+            {
+                "name": f"user-{i}",
+                "birthday": date(1980 + i % 30, i % 12 + 1, i % 28 + 1),
+                "city": {"name": f"city-{i % cities}", "country": "China"},
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def _clear(db: Database[DocType]) -> None:
+    """删除测试用的文档集合
+
+    Args:
+        - `db` (`Database[DocType]`): 数据库对象
+    """
+    db.drop_collection("user")
+    db.drop_collection("city")
+
+
+def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(args[0]) if len(args) > 0 else 100_000
+    cities = int(args[1]) if len(args) > 1 else 1000
+
+    db = mongo_db
+    use_mongomock = "--mongomock" in sys.argv
+    if use_mongomock:
+        import mongomock
+
+        db = mongomock.MongoClient().study_python_mongo
+
+    print(f"{'mode':<14}{'users':>10}{'seconds':>10}{'docs/s':>12}")
+
+    if not use_mongomock:
+        # `create_user` 使用模块级的数据库对象, 且每个用户执行一次事务
+        _clear(db)
+        users = _users(n, cities)
+
+        start = time.perf_counter()
+        for user in users:
+            create_user(user)
+        seconds = time.perf_counter() - start
+        print(f"{'create_user':<14}{n:>10}{seconds:>10.2f}{n / seconds:>12.0f}")
+
+    _clear(db)
+    ensure_city_index(db)
+    users = _users(n, cities)
+
+    start = time.perf_counter()
+    result = import_users(users, db=db)
+    seconds = time.perf_counter() - start
+    print(f"{'import_users':<14}{result.users:>10}{seconds:>10.2f}{result.users / seconds:>12.0f}")
+    print(
+        f"cities created={result.cities_created} matched={result.cities_matched} "
+        f"batches={result.batches}"
+    )
+
+    if not use_mongomock:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
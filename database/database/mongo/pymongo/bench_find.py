@@ -0,0 +1,103 @@
+"""
+用户查询性能测试
+
+对比 `find_user` (客户端关联城市) 和 `find_user_stream` (服务端 `$lookup` 关联, 流式读取) 的
+耗时, 首个结果的延迟以及 Python 内存峰值
+
+执行方式 (需连接本地 mongod):
+
+```bash
+python -m database.mongo.pymongo.bench_find [用户数]
+```
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import date
+from typing import Any, Callable, Iterable, List, Tuple, cast
+
+from .bench import _clear
+from .bulk import ensure_city_index, import_users
+from .pymongo import UserModel, client, find_user, find_user_stream, mongo_db
+
+# 用户名称的数量, 按名称查询时, 每个名称匹配 `用户数 / _NAMES` 个用户
+_NAMES = 10
+
+# 城市数量
+_CITIES = 1000
+
+
+def _prepare(n: int) -> None:
+    """导入测试数据
+
+    Args:
+        - `n` (`int`): 用户数量
+    """
+    _clear(mongo_db)
+    ensure_city_index(mongo_db)
+    mongo_db.user.create_index("name")
+
+    import_users(
+        cast(
+            UserModel,
+            {
+                "name": f"user-{i % _NAMES}",
+                "birthday": date(1980 + i % 30, i % 12 + 1, i % 28 + 1),
+                "city": {"name": f"city-{i % _CITIES}", "country": "China"},
+            },
+        )
+        for i in range(n)
+    )
+
+
+def _measure(query: Callable[[], Iterable[Any]]) -> Tuple[int, float, float, float]:
+    """执行查询并遍历结果, 统计结果数量, 首个结果延迟, 总耗时和内存峰值
+
+    Args:
+        - `query` (`Callable[[], Iterable[Any]]`): 查询函数
+
+    Returns:
+        `Tuple[int, float, float, float]`: 结果数量, 首个结果延迟 (秒), 总耗时 (秒) 和内存峰值 (MB)
+    """
+    tracemalloc.start()
+    try:
+        count = 0
+        first = 0.0
+
+        start = time.perf_counter()
+        for _ in query():
+            if count == 0:
+                first = time.perf_counter() - start
+            count += 1
+
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return count, first, seconds, peak / 1024 / 1024
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Prepare {n} users")
+    _prepare(n)
+
+    cases: List[Tuple[str, Callable[[], Iterable[Any]]]] = [
+        ("find_user", lambda: find_user(name="user-3")),
+        ("stream", lambda: find_user_stream(name="user-3")),
+        ("stream(name)", lambda: find_user_stream(name="user-3", fields=["name"])),
+    ]
+
+    print(f"{'mode':<14}{'rows':>10}{'first(s)':>10}{'total(s)':>10}{'peak(MB)':>10}")
+    for name, query in cases:
+        count, first, seconds, peak = _measure(query)
+        print(f"{name:<14}{count:>10}{first:>10.3f}{seconds:>10.2f}{peak:>10.1f}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+from dataclasses import dataclass
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Tuple
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+from .pymongo import DocType, UserModel, mongo_db
+
+# 每批插入的默认用户文档数量
+DEFAULT_CHUNK_SIZE = 1000
+
+# 城市的默认国家
+_DEFAULT_COUNTRY = "China"
+
+# 表示城市唯一性的键, 即 `(城市名称, 国家名称)`
+CityKey = Tuple[str, str]
+
+# 违反唯一索引的错误码
+_DUPLICATE_KEY = 11000
+
+
+@dataclass
+class ImportResult:
+    """批量导入的结果"""
+
+    # 插入的用户文档数量
+    users: int = 0
+
+    # 新创建的城市文档数量
+    cities_created: int = 0
+
+    # 已存在的城市文档数量
+    cities_matched: int = 0
+
+    # 插入用户文档时执行的 `insert_many` 次数
+    batches: int = 0
+
+
+def ensure_city_index(db: Database[DocType] = mongo_db) -> None:
+    """为城市文档集合创建 `(name, country)` 唯一索引
+
+    批量 upsert 城市文档依赖该索引保证并发导入时不会产生重复的城市文档; 索引已存在时不做任何操作,
+    `import_users` 每次导入前都会调用该函数
+
+    Args:
+        - `db` (`Database[DocType]`, optional): 数据库对象. Defaults to `mongo_db`.
+    """
+    db.city.create_index([("name", ASCENDING), ("country", ASCENDING)], unique=True)
+
+
+def _city_key(user: UserModel) -> CityKey:
+    """获取用户所在城市的唯一键
+
+    Args:
+        - `user` (`UserModel`): 用户实体对象
+
+    Returns:
+        `CityKey`: 城市唯一键
+    """
+    city = user["city"]
+    return city["name"], city.get("country") or _DEFAULT_COUNTRY
+
+
+def upsert_cities(
+    keys: Iterable[CityKey], db: Database[DocType] = mongo_db
+) -> Tuple[Dict[CityKey, Any], int]:
+    """通过一次 `bulk_write` 批量创建不存在的城市文档, 并返回所有城市文档的 id
+
+    多个导入过程并发 upsert 同一个城市时, 在 `(name, country)` 唯一索引的保证下只有一个 upsert 能插入文档,
+    其余的 upsert 因违反唯一索引而失败; 这些城市已被其它导入过程创建, 和已存在的城市一样通过查询获取 id
+
+    Args:
+        - `keys` (`Iterable[CityKey]`): 城市唯一键集合 (已去重)
+        - `db` (`Database[DocType]`, optional): 数据库对象. Defaults to `mongo_db`.
+
+    Returns:
+        `Tuple[Dict[CityKey, Any], int]`: `城市唯一键 -> 城市文档 id` 字典, 以及新创建的城市文档数量
+    """
+    keys = list(keys)
+    if not keys:
+        return {}, 0
+
+    # 城市存在时不做任何修改, 不存在时插入城市文档
+    requests = [
+        UpdateOne(
+            {"name": name, "country": country},
+            {"$setOnInsert": {"name": name, "country": country}},
+            upsert=True,
+        )
+        for name, country in keys
+    ]
+
+    # 新创建的城市文档 id 可以直接从结果中获取
+    ids: Dict[CityKey, Any] = {}
+    try:
+        result = db.city.bulk_write(requests, ordered=False)
+        for i, _id in (result.upserted_ids or {}).items():
+            ids[keys[i]] = _id
+    except BulkWriteError as e:
+        # 只忽略违反唯一索引的错误, 对应的城市在之后通过查询获取 id
+        if any(err.get("code") != _DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+            raise
+
+        for upserted in e.details.get("upserted", []):
+            ids[keys[upserted["index"]]] = upserted["_id"]
+
+    created = len(ids)
+
+    # 已存在的城市文档, 通过一次查询获取 id
+    matched = [k for k in keys if k not in ids]
+    if matched:
+        for city in db.city.find(
+            {"$or": [{"name": name, "country": country} for name, country in matched]},
+            projection={"name": True, "country": True},
+        ):
+            ids[(city["name"], city["country"])] = city["_id"]
+
+    return ids, created
+
+
+def import_users(
+    users: Iterable[UserModel],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    db: Database[DocType] = mongo_db,
+) -> ImportResult:
+    """批量导入用户文档
+
+    和逐个调用 `create_user` 函数相比:
+
+    1. 在内存中对用户所在的城市去重, 通过一次 `bulk_write` 批量 upsert 城市文档,
+       而不是为每个用户执行一次 `find_one` 和 `insert_one`
+    2. 用户文档通过无序 (`ordered=False`) 的 `insert_many` 分批插入, 服务端可以并行写入,
+       且某个文档写入失败不会中断后续文档的写入
+    3. 不使用事务, 故导入过程中途失败时, 已导入的数据不会回滚
+
+    导入前会通过 `ensure_city_index` 创建城市文档的唯一索引, 保证并发导入时不会产生重复的城市文档
+
+    传入的用户实体对象不会被修改
+
+    Args:
+        - `users` (`Iterable[UserModel]`): 用户实体对象集合
+        - `chunk_size` (`int`, optional): 每批插入的用户文档数量. Defaults to `1000`.
+        - `db` (`Database[DocType]`, optional): 数据库对象. Defaults to `mongo_db`.
+
+    Returns:
+        `ImportResult`: 导入结果
+
+    Raises:
+        - `ValueError`: 参数 `chunk_size` 小于 `1`
+        - `BulkWriteError`: 有用户文档写入失败, 其余文档仍会被写入
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be greater than 0")
+
+    users = list(users)
+    result = ImportResult()
+
+    ensure_city_index(db)
+
+    # 在内存中对城市去重, 保持首次出现的顺序
+    keys = list(dict.fromkeys(_city_key(u) for u in users))
+
+    city_ids, result.cities_created = upsert_cities(keys, db)
+    result.cities_matched = len(keys) - result.cities_created
+
+    it = iter(users)
+    while chunk := list(islice(it, chunk_size)):
+        docs: List[DocType] = []
+        for user in chunk:
+            birthday = user["birthday"]
+            docs.append(
+                {
+                    **user,
+                    # 将用户的生日转为字符串类型, 和 `create_user` 保持一致
+                    "birthday": birthday.isoformat() if isinstance(birthday, date) else birthday,
+                    # 在用户文档中设置城市文档的 id
+                    "city": city_ids[_city_key(user)],
+                }
+            )
+
+        try:
+            result.users += len(db.user.insert_many(docs, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            result.users += e.details.get("nInserted", 0)
+            raise
+        finally:
+            result.batches += 1
+
+    return result
@@ -1,5 +1,16 @@
 from datetime import date
-from typing import Any, Dict, List, Optional, Set, TypedDict, Union, cast
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypedDict,
+    Union,
+    cast,
+)
 
 from pymongo import MongoClient
 
@@ -146,9 +157,9 @@ def find_user(
             city_ids.add(user["city"])
 
         if city_ids:
-            # 根据城市文档 id 集合查询城市文档集合
+            # 根据城市文档 id 集合查询城市文档集合, 并去掉城市文档的 `_id` 字段
             cities = {
-                c["_id"]: c
+                c.pop("_id"): c
                 for c in mongo_db.city.find({"_id": {"$in": list(city_ids)}})
             }
 
@@ -156,8 +167,123 @@ def find_user(
             for user in users:
                 city = cities.get(user["city"])
                 if city:
-                    del city["_id"]
                     user["city"] = city
 
     # 返回用户实体集合
     return cast(List[UserModel], users)
+
+
+def _user_filter(
+    name: Optional[str], birthday: Optional[Union[date, str]]
+) -> Dict[str, Any]:
+    """生成用户查询过滤器
+
+    Args:
+        - `name` (`Optional[str]`): 要匹配的用户名称
+        - `birthday` (`Optional[Union[date, str]]`): 要匹配的用户生日
+
+    Returns:
+        `Dict[str, Any]`: 查询过滤器字典
+    """
+    filter_: Dict[str, Any] = {}
+    if name:
+        filter_["name"] = name
+
+    if birthday:
+        filter_["birthday"] = birthday.isoformat() if isinstance(birthday, date) else birthday
+
+    return filter_
+
+
+def _user_projection(fields: Optional[Sequence[str]], with_id: bool) -> Dict[str, Any]:
+    """生成聚合管道的字段投影
+
+    Args:
+        - `fields` (`Optional[Sequence[str]]`): 要返回的字段, `None` 表示返回所有字段, 空列表表示不返回任何字段
+        - `with_id` (`bool`): 是否返回 `_id` 字段
+
+    Returns:
+        `Dict[str, Any]`: 投影字典, 不返回任何字段时为 `{"_id": True}`
+    """
+    if fields is None:
+        # 排除城市文档的 `_id` 字段
+        projection: Dict[str, Any] = {"city._id": False}
+    else:
+        projection = {}
+        for f in fields:
+            if f == "city":
+                # 城市只返回名称和国家, 不返回城市文档的 `_id` 字段
+                projection.update({"city.name": True, "city.country": True})
+            else:
+                projection[f] = True
+
+    if not projection:
+        # `$project` 至少需要一个输出字段, 不返回任何字段时保留 `_id` 字段, 由调用方决定是否删除
+        return {"_id": True}
+
+    if not with_id:
+        projection["_id"] = False
+
+    return projection
+
+
+def find_user_stream(
+    *,
+    name: Optional[str] = None,
+    birthday: Optional[Union[date, str]] = None,
+    fields: Optional[Sequence[str]] = None,
+    with_id: bool = False,
+    batch_size: int = 1000,
+) -> Iterator[UserModel]:
+    """通过聚合管道查询用户文档, 并以流的方式返回查询结果
+
+    和 `find_user` 函数相比:
+
+    1. 通过 `$lookup` 在服务端关联城市文档, 无需再执行一次 `$in` 查询并在客户端逐个关联
+    2. 通过 `$project` 只返回需要的字段, 如果不需要城市字段, 则不会执行 `$lookup`
+    3. 查询结果从游标中按批 (`batch_size`) 读取并逐个返回, 而不是一次性读入列表, 内存占用和结果集大小无关
+    4. 不指定任何过滤条件时, 返回所有用户文档 (`find_user` 函数返回空列表)
+
+    Args:
+        - `name` (`Optional[str]`, optional): 要匹配的用户名称. Defaults to `None`.
+        - `birthday` (`Optional[Union[date, str]]`, optional): 要匹配的用户生日. Defaults to `None`.
+        - `fields` (`Optional[Sequence[str]]`, optional): 要返回的字段, 例如 `["name", "city"]`, `None` 表示返回所有字段. Defaults to `None`.
+        - `with_id` (`bool`, optional): 查询结果中是否要包含 id 值. Defaults to `False`.
+        - `batch_size` (`int`, optional): 每批从服务端读取的文档数量. Defaults to `1000`.
+
+    Yields:
+        `UserModel`: 用户实体对象
+    """
+    pipeline: List[Dict[str, Any]] = [{"$match": _user_filter(name, birthday)}]
+
+    if fields is None or "city" in fields:
+        pipeline += [
+            # 根据用户文档中的城市 id 关联城市文档, 关联结果为数组
+            {
+                "$lookup": {
+                    "from": "city",
+                    "localField": "city",
+                    "foreignField": "_id",
+                    "as": "city",
+                }
+            },
+            # 将城市数组展开为单个文档, 城市不存在时保留用户文档
+            {"$unwind": {"path": "$city", "preserveNullAndEmptyArrays": True}},
+        ]
+
+    projection = _user_projection(fields, with_id)
+    pipeline.append({"$project": projection})
+
+    # 投影中只能保留 `_id` 字段时, 在客户端删除不需要的 `_id` 字段
+    drop_id = not with_id and projection.get("_id") is True
+
+    with mongo_db.user.aggregate(pipeline, batchSize=batch_size) as cursor:
+        for user in cursor:
+            if drop_id:
+                del user["_id"]
+
+            # 将用户生日转为日期类型
+            if user.get("birthday"):
+                user["birthday"] = date.fromisoformat(user["birthday"])
+
+            yield cast(UserModel, user)
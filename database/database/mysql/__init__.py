@@ -1,5 +1,7 @@
 from .conn import get_connection, get_pooled_connection
 from .curd import delete_user, get_user, insert_user, update_user, get_all_tables
+from .pool import InstrumentedPool, PoolStats
+from .stream import stream_rows, stream_table
 
 __all__ = [
     "get_connection",
@@ -9,4 +11,8 @@ __all__ = [
     "insert_user",
     "update_user",
     "get_all_tables",
+    "InstrumentedPool",
+    "PoolStats",
+    "stream_rows",
+    "stream_table",
 ]
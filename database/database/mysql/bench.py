@@ -0,0 +1,159 @@
+"""
+流式读取性能测试
+
+分别以 `fetchall` 方式和服务端游标流式方式扫描一张大表, 对比耗时和进程内存峰值 (Peak RSS)
+
+每种读取方式在独立的子进程中执行, 以保证各自的内存峰值互不影响, 执行方式:
+
+```bash
+python -m database.mysql.bench [行数] [每批行数]
+```
+"""
+
+import multiprocessing as mp
+import resource
+import sys
+import time
+from typing import Any, Dict, List, cast
+
+from pymysql import Connection, connect  # type: ignore[import-untyped]
+from pymysql.cursors import DictCursor  # type: ignore[import-untyped]
+
+from .conn import _conn_options
+from .stream import RowFormat, stream_table
+
+# 性能测试使用的数据表
+_TABLE = "stream_bench"
+
+# 参与测试的读取方式
+_MODES: List[str] = ["fetchall", "dict", "tuple", "columns", "numpy"]
+
+
+def _connect() -> Connection:
+    """创建数据库连接
+
+    Returns:
+        `Connection`: 数据库连接对象
+    """
+    return connect(**_conn_options)
+
+
+def prepare_table(conn: Connection, rows: int) -> None:
+    """创建测试数据表, 并填充指定行数的数据
+
+    通过 `INSERT ... SELECT` 语句让表数据量成倍增长, 以减少客户端和服务端的交互次数
+
+    Args:
+        - `conn` (`Connection`): 数据库连接对象
+        - `rows` (`int`): 数据行数
+    """
+    with conn.cursor() as c:
+        c.execute(f"DROP TABLE IF EXISTS `{_TABLE}`")
+        c.execute(
+            f"""
+            CREATE TABLE `{_TABLE}` (
+                `id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+                `name` VARCHAR(50) NOT NULL,
+                `value` DOUBLE NOT NULL,
+                `created_at` DATETIME NOT NULL,
+                PRIMARY KEY (`id`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
+        )
+        c.execute(
+            f"INSERT INTO `{_TABLE}` (`name`, `value`, `created_at`) VALUES ('row', RAND(), NOW())"
+        )
+
+        count = 1
+        while count < rows:
+            c.execute(
+                f"INSERT INTO `{_TABLE}` (`name`, `value`, `created_at`) "
+                f"SELECT CONCAT('row-', `id`), RAND(), NOW() FROM `{_TABLE}` LIMIT %s",
+                (min(count, rows - count),),
+            )
+            conn.commit()
+            count += c.rowcount
+
+
+def _peak_rss_kb() -> int:
+    """获取当前进程的内存峰值
+
+    Returns:
+        `int`: 内存峰值, 单位为 KB
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _scan(mode: str, batch_size: int, result: Dict[str, Any]) -> None:
+    """在子进程中以指定方式扫描测试数据表
+
+    Args:
+        - `mode` (`str`): 读取方式
+        - `batch_size` (`int`): 每批读取的行数
+        - `result` (`Dict[str, Any]`): 用于返回测试结果的共享字典
+    """
+    conn = _connect()
+    try:
+        base_rss = _peak_rss_kb()
+        start = time.perf_counter()
+
+        count = 0
+        if mode == "fetchall":
+            # 将整个结果集读入内存
+            with conn.cursor(DictCursor) as c:
+                c.execute(f"SELECT * FROM `{_TABLE}`")
+                count = len(c.fetchall())
+        else:
+            # 通过服务端游标分批读取结果集
+            for batch in stream_table(
+                conn, _TABLE, batch_size=batch_size, row_format=cast(RowFormat, mode)
+            ):
+                count += len(batch) if mode in ("dict", "tuple") else len(batch["id"])
+
+        result[mode] = {
+            "rows": count,
+            "seconds": time.perf_counter() - start,
+            "base_rss_kb": base_rss,
+            "peak_rss_kb": _peak_rss_kb(),
+        }
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    conn = _connect()
+    try:
+        print(f"Prepare {rows} rows in table `{_TABLE}`")
+        prepare_table(conn, rows)
+    finally:
+        conn.close()
+
+    # 使用 spawn 方式创建子进程, 避免子进程继承父进程的内存
+    ctx = mp.get_context("spawn")
+
+    with ctx.Manager() as manager:
+        result = manager.dict()
+
+        for mode in _MODES:
+            p = ctx.Process(target=_scan, args=(mode, batch_size, result))
+            p.start()
+            p.join()
+
+        print(f"{'mode':<10}{'rows':>12}{'seconds':>10}{'base RSS(MB)':>14}{'peak RSS(MB)':>14}")
+        for mode in _MODES:
+            r = result.get(mode)
+            if not r:
+                print(f"{mode:<10}{'failed':>12}")
+                continue
+
+            print(
+                f"{mode:<10}{r['rows']:>12}{r['seconds']:>10.2f}"
+                f"{r['base_rss_kb'] / 1024:>14.1f}{r['peak_rss_kb'] / 1024:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,11 @@
+import threading
 from typing import Any, cast
 
-import pymysql  # type: ignore[import-untyped]
-from dbutils.pooled_db import PooledDB
-from pymysql import Connection, connect
+from pymysql import Connection, connect  # type: ignore[import-untyped]
 from pymysql.cursors import DictCursor  # type: ignore[import-untyped]
 
 from .curd import init_tables
+from .pool import InstrumentedPool
 
 # 连接配置
 _conn_options = {
@@ -38,6 +38,30 @@ def _init_tables(conn: Connection) -> None:
         raise
 
 
+# 数据表是否已初始化
+_tables_initialized = False
+
+# 保证数据表只初始化一次的锁
+_init_lock = threading.Lock()
+
+
+def _ensure_tables(conn: Connection) -> None:
+    """保证在当前进程中只初始化一次数据表
+
+    Args:
+        - `conn` (`Connection`): 数据库连接对象
+    """
+    global _tables_initialized
+
+    if _tables_initialized:
+        return
+
+    with _init_lock:
+        if not _tables_initialized:
+            _init_tables(conn)
+            _tables_initialized = True
+
+
 def get_connection() -> Connection:
     """
     获取数据库连接
@@ -50,14 +74,19 @@ def get_connection() -> Connection:
     # 关闭自动提交
     conn.autocommit(False)
 
-    # 初始化数据表
-    _init_tables(conn)
+    # 初始化数据表 (仅第一次获取连接时执行)
+    _ensure_tables(conn)
 
     return conn
 
 
-# 创建连接池对象
-pool = PooledDB(pymysql, 5, **_conn_options)
+# 创建连接池对象, 第一次获取连接时初始化数据表
+pool = InstrumentedPool(
+    _conn_options,
+    max_connections=20,
+    min_cached=5,
+    bootstrap=_ensure_tables,
+)
 
 
 def get_pooled_connection() -> Connection:
@@ -67,12 +96,9 @@ def get_pooled_connection() -> Connection:
     Returns:
         `Connection`: 连接对象
     """
-    # 通过连接池获取连接对象
+    # 通过连接池获取连接对象, 连接池会在首次获取连接时初始化数据表
     conn: Connection = cast(Any, pool.connection())
     # 关闭自动提交
     conn.autocommit_mode = False  # type: ignore
 
-    # 初始化数据表
-    _init_tables(conn)
-
     return conn
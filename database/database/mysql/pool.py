@@ -0,0 +1,313 @@
+import threading
+import time
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Callable, Dict, Optional, Type
+
+import pymysql  # type: ignore[import-untyped]
+from dbutils.pooled_db import PooledDB
+from pymysql import Connection  # type: ignore[import-untyped]
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """连接池统计信息快照"""
+
+    # 连接池允许的最大连接数, `0` 表示不限制
+    max_connections: int
+
+    # 正在被使用的连接数
+    in_use: int
+
+    # 连接池中空闲的连接数
+    idle: int
+
+    # 累计创建的物理连接数
+    opened: int
+
+    # 累计获取连接的次数
+    checkouts: int
+
+    # 获取连接的累计等待时间 (秒)
+    total_wait: float
+
+    # 获取连接的最长等待时间 (秒)
+    max_wait: float
+
+    # 因超过最大存活时间而被重建的连接数
+    recycled: int
+
+    # 预检查 (pre-ping) 失败而被重建的连接数
+    ping_failures: int
+
+    @property
+    def avg_wait(self) -> float:
+        """获取连接的平均等待时间 (秒)"""
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+
+class _Creator:
+    """连接创建器, 在创建物理连接时记录连接的创建时间
+
+    `PooledDB` 通过 `creator.connect` 创建连接, 并通过 `creator.dbapi` 获取 DB-API 模块
+    """
+
+    dbapi = pymysql
+    threadsafety = pymysql.threadsafety
+
+    def __init__(self, on_open: Callable[[], None]) -> None:
+        """构造器
+
+        Args:
+            - `on_open` (`Callable[[], None]`): 创建物理连接后的回调函数
+        """
+        self._on_open = on_open
+
+    def connect(self, *args: Any, **kwargs: Any) -> Connection:
+        """创建物理连接
+
+        Returns:
+            `Connection`: 数据库连接对象
+        """
+        conn = pymysql.connect(*args, **kwargs)
+        # 记录连接的创建时间, 用于按存活时间回收连接
+        conn._created_at = time.monotonic()
+
+        self._on_open()
+        return conn
+
+
+class PooledConnection:
+    """从 `InstrumentedPool` 获取的连接代理对象
+
+    所有属性和方法都代理到 `PooledDB` 返回的连接对象上, 调用 `close` 方法会将连接归还连接池;
+    未调用 `close` 方法的代理对象被回收时, 也会归还连接并更新连接池的统计信息
+    """
+
+    def __init__(self, pool: "InstrumentedPool", conn: Any) -> None:
+        """构造器
+
+        Args:
+            - `pool` (`InstrumentedPool`): 连接所属的连接池
+            - `conn` (`Any`): `PooledDB` 返回的连接对象
+        """
+        self.__dict__["_pool"] = pool
+        self.__dict__["_conn"] = conn
+
+    def __getattr__(self, name: str) -> Any:
+        """代理连接对象的属性
+
+        Args:
+            - `name` (`str`): 属性名
+
+        Returns:
+            `Any`: 属性值
+        """
+        return getattr(self.__dict__["_conn"], name)
+
+    def close(self) -> None:
+        """将连接归还连接池, 重复调用无副作用"""
+        conn = self.__dict__.get("_conn")
+        if conn is not None:
+            self.__dict__["_conn"] = None
+            try:
+                conn.close()
+            finally:
+                self.__dict__["_pool"]._checkin()
+
+    def __del__(self) -> None:
+        """代理对象被回收时归还连接, 以免正在使用的连接数只增不减"""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class InstrumentedPool:
+    """带有监控指标和健康检查的连接池
+
+    在 `PooledDB` 的基础上增加了如下能力:
+
+    - 记录获取连接的等待时间, 以及正在使用和空闲的连接数, 便于根据实际指标调整连接池大小
+    - 连接超过最大存活时间后, 在下一次被获取时重建
+    - 获取连接时执行一条低开销的验证 SQL (pre-ping), 失败则重建连接
+    - 在第一次获取连接时执行一次数据表初始化 (schema bootstrap)
+    """
+
+    def __init__(
+        self,
+        options: Dict[str, Any],
+        max_connections: int = 0,
+        min_cached: int = 0,
+        max_cached: int = 0,
+        max_age: Optional[float] = 3600.0,
+        ping_sql: Optional[str] = "SELECT 1",
+        bootstrap: Optional[Callable[[Connection], None]] = None,
+    ) -> None:
+        """构造器
+
+        Args:
+            - `options` (`Dict[str, Any]`): 数据库连接配置
+            - `max_connections` (`int`, optional): 最大连接数, `0` 表示不限制. Defaults to `0`.
+            - `min_cached` (`int`, optional): 初始创建的空闲连接数. Defaults to `0`.
+            - `max_cached` (`int`, optional): 最大空闲连接数, `0` 表示不限制. Defaults to `0`.
+            - `max_age` (`Optional[float]`, optional): 连接最大存活时间 (秒), `None` 表示不回收. Defaults to `3600.0`.
+            - `ping_sql` (`Optional[str]`, optional): 获取连接时执行的验证 SQL, `None` 表示不验证. Defaults to `"SELECT 1"`.
+            - `bootstrap` (`Optional[Callable[[Connection], None]]`, optional): 只执行一次的初始化函数. Defaults to `None`.
+        """
+        self._lock = threading.Lock()
+        self._max_connections = max_connections
+        self._max_age = max_age
+        self._ping_sql = ping_sql
+
+        self._bootstrap = bootstrap
+        self._bootstrapped = bootstrap is None
+        self._bootstrap_lock = threading.Lock()
+
+        self._in_use = 0
+        self._opened = 0
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recycled = 0
+        self._ping_failures = 0
+
+        # 连接池满时阻塞等待 (blocking), 而不是抛出异常, 以便统计等待时间
+        # 关闭 PooledDB 自带的 ping, 改为在获取连接时执行验证 SQL
+        self._pool = PooledDB(
+            _Creator(self._on_open),
+            mincached=min_cached,
+            maxcached=max_cached,
+            maxconnections=max_connections,
+            blocking=True,
+            failures=(pymysql.OperationalError, pymysql.InterfaceError, pymysql.InternalError),
+            ping=0,
+            **options,
+        )
+
+    def _on_open(self) -> None:
+        """创建物理连接后的回调"""
+        with self._lock:
+            self._opened += 1
+
+    def _checkin(self) -> None:
+        """连接归还连接池后的回调"""
+        with self._lock:
+            self._in_use -= 1
+
+    def connection(self) -> PooledConnection:
+        """从连接池获取连接
+
+        Returns:
+            `PooledConnection`: 连接代理对象
+        """
+        start = time.perf_counter()
+        # 连接池满时, 会在此处阻塞等待其它连接归还
+        conn = self._pool.connection(shareable=False)
+        wait = time.perf_counter() - start
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+        pooled = PooledConnection(self, conn)
+        try:
+            self._check(conn._con)
+            self._run_bootstrap(conn)
+        except Exception:
+            pooled.close()
+            raise
+
+        return pooled
+
+    def _check(self, steady: Any) -> None:
+        """检查连接的存活时间和可用性, 必要时重建连接
+
+        Args:
+            - `steady` (`SteadyDBConnection`): `PooledDB` 内部持有的连接对象
+        """
+        raw = steady.dbapi_connection
+
+        # 连接超过最大存活时间, 重建连接
+        if self._max_age is not None:
+            created_at = getattr(raw, "_created_at", None)
+            if created_at is not None and time.monotonic() - created_at > self._max_age:
+                self._reconnect(steady)
+                with self._lock:
+                    self._recycled += 1
+                return
+
+        # 执行验证 SQL, 失败则重建连接
+        if self._ping_sql:
+            try:
+                with raw.cursor() as c:
+                    c.execute(self._ping_sql)
+                    c.fetchall()
+            except Exception:
+                self._reconnect(steady)
+                with self._lock:
+                    self._ping_failures += 1
+
+    @staticmethod
+    def _reconnect(steady: Any) -> None:
+        """关闭连接对象中的物理连接, 并创建新的物理连接替代之
+
+        Args:
+            - `steady` (`SteadyDBConnection`): `PooledDB` 内部持有的连接对象
+        """
+        conn = steady._create()
+        steady._close()
+        steady._store(conn)
+
+    def _run_bootstrap(self, conn: Any) -> None:
+        """执行一次初始化函数
+
+        Args:
+            - `conn` (`Any`): 用于执行初始化的连接对象
+        """
+        if self._bootstrapped:
+            return
+
+        with self._bootstrap_lock:
+            if self._bootstrapped:
+                return
+
+            assert self._bootstrap is not None
+            self._bootstrap(conn)
+            self._bootstrapped = True
+
+    def stats(self) -> PoolStats:
+        """获取连接池统计信息
+
+        Returns:
+            `PoolStats`: 统计信息快照
+        """
+        with self._lock:
+            return PoolStats(
+                max_connections=self._max_connections,
+                in_use=self._in_use,
+                idle=len(self._pool._idle_cache),
+                opened=self._opened,
+                checkouts=self._checkouts,
+                total_wait=self._total_wait,
+                max_wait=self._max_wait,
+                recycled=self._recycled,
+                ping_failures=self._ping_failures,
+            )
+
+    def close(self) -> None:
+        """关闭连接池中所有空闲的连接"""
+        self._pool.close()
@@ -0,0 +1,124 @@
+from typing import Any, Dict, Generator, List, Literal, Optional, Sequence, Tuple, cast
+
+from pymysql import Connection  # type: ignore[import-untyped]
+from pymysql.cursors import SSCursor, SSDictCursor  # type: ignore[import-untyped]
+
+# 每批读取的默认行数
+DEFAULT_BATCH_SIZE = 1000
+
+# 每批数据的输出格式
+#   - `dict`: 每行为一个字典对象
+#   - `tuple`: 每行为一个元组对象
+#   - `columns`: 每批数据按列组织, 每列为一个 `list` 对象
+#   - `numpy`: 每批数据按列组织, 每列为一个 `numpy.ndarray` 对象 (需安装 numpy)
+RowFormat = Literal["dict", "tuple", "columns", "numpy"]
+
+
+def stream_rows(
+    conn: Connection,
+    sql: str,
+    args: Optional[Sequence[Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    row_format: RowFormat = "dict",
+) -> Generator[Any, None, None]:
+    """通过服务端游标 (Server Side Cursor) 流式读取查询结果
+
+    普通游标 (`Cursor`/`DictCursor`) 在执行查询后会将整个结果集读入客户端内存, 而服务端游标
+    (`SSCursor`/`SSDictCursor`) 则按需从网络连接中读取数据行, 每次只在内存中保留一批数据,
+    故适合导出大表等需要扫描大量数据的场景
+
+    注意: 在结果集被完全读取 (或生成器被关闭) 之前, 该连接无法执行其它 SQL 语句
+
+    Args:
+        - `conn` (`Connection`): 数据库连接对象
+        - `sql` (`str`): 要执行的查询 SQL 语句
+        - `args` (`Optional[Sequence[Any]]`, optional): SQL 语句参数. Defaults to `None`.
+        - `batch_size` (`int`, optional): 每批读取的行数. Defaults to `1000`.
+        - `row_format` (`RowFormat`, optional): 每批数据的输出格式. Defaults to `"dict"`.
+
+    Yields:
+        `Any`: 每批数据, `dict`/`tuple` 格式为行列表, `columns`/`numpy` 格式为 `列名 -> 列数据` 字典
+
+    Raises:
+        - `ValueError`: 参数 `batch_size` 小于 `1`
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be greater than 0")
+
+    # 根据输出格式选择游标类型, 只有 `dict` 格式需要字典游标
+    cursor_class = SSDictCursor if row_format == "dict" else SSCursor
+
+    c = conn.cursor(cursor_class)
+    try:
+        c.execute(sql, args)
+
+        # 获取结果集的列名
+        columns = [d[0] for d in c.description or ()]
+
+        while True:
+            # 每次从连接中读取一批数据行
+            rows = c.fetchmany(batch_size)
+            if not rows:
+                break
+
+            if row_format in ("dict", "tuple"):
+                yield rows
+            else:
+                yield _to_columns(columns, rows, row_format == "numpy")
+    finally:
+        # 关闭游标, 会将连接中尚未读取的数据行读取并丢弃, 以便连接可以继续使用
+        c.close()
+
+
+def stream_table(
+    conn: Connection,
+    table: str,
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    row_format: RowFormat = "dict",
+) -> Generator[Any, None, None]:
+    """流式读取整张数据表
+
+    Args:
+        - `conn` (`Connection`): 数据库连接对象
+        - `table` (`str`): 数据表名称
+        - `columns` (`Optional[Sequence[str]]`, optional): 要读取的列名, `None` 表示所有列. Defaults to `None`.
+        - `batch_size` (`int`, optional): 每批读取的行数. Defaults to `1000`.
+        - `row_format` (`RowFormat`, optional): 每批数据的输出格式. Defaults to `"dict"`.
+
+    Yields:
+        `Any`: 每批数据, 参见 `stream_rows` 函数
+    """
+    fields = ", ".join(f"`{c}`" for c in columns) if columns else "*"
+
+    yield from stream_rows(
+        conn,
+        f"SELECT {fields} FROM `{table}`",
+        batch_size=batch_size,
+        row_format=row_format,
+    )
+
+
+def _to_columns(
+    columns: List[str], rows: Sequence[Tuple[Any, ...]], as_numpy: bool
+) -> Dict[str, Any]:
+    """将一批数据行转为按列组织的数据
+
+    Args:
+        - `columns` (`List[str]`): 列名列表
+        - `rows` (`Sequence[Tuple[Any, ...]]`): 数据行集合
+        - `as_numpy` (`bool`): 是否将每列转为 `numpy.ndarray` 对象
+
+    Returns:
+        `Dict[str, Any]`: `列名 -> 列数据` 字典
+    """
+    # 通过 zip 对数据行进行转置
+    values = cast(List[Tuple[Any, ...]], list(zip(*rows)))
+
+    if not as_numpy:
+        return {name: list(col) for name, col in zip(columns, values)}
+
+    # 按需导入 numpy, 仅在使用 `numpy` 格式时才需要安装
+    import numpy as np
+
+    return {name: np.asarray(col) for name, col in zip(columns, values)}
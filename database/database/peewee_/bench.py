@@ -0,0 +1,86 @@
+"""
+批量插入性能测试
+
+在 SQLite 内存数据库中, 对比如下几种方式插入部门记录 (带审计和租户字段) 的耗时:
+
+- `create`: 在一个事务中逐条调用 `Department.create`
+- `bulk_create`: 通过 `Department.bulk_create` 批量插入模型对象
+- `bulk_insert`: 通过 `Department.bulk_insert` 以字典形式批量插入记录
+- `bulk_update`: 通过 `Department.bulk_update` 批量更新已插入的模型对象
+
+执行方式:
+
+```bash
+python -m database.peewee_.bench [行数]
+```
+"""
+
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from .core import context, db
+from .models import Department, Employee, Org, Role
+
+
+def _reset() -> None:
+    """重建数据表"""
+    db.drop_tables([Org, Department, Employee, Role])
+    db.create_tables([Org, Department, Employee, Role])
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    _reset()
+
+    org = Org.create(name="Bench")
+    with context.with_tenant_context(org):
+        role = Role.create(name="admin")
+        user = Employee.create(name="Alvin", role=role)
+
+    departments: List[Department] = []
+
+    def create() -> None:
+        with db.atomic():
+            for i in range(n):
+                Department.create(name=f"D{i}", level=i % 10)
+
+    def bulk_create() -> None:
+        departments[:] = [Department(name=f"D{i}", level=i % 10) for i in range(n)]
+        Department.bulk_create(departments)
+
+    def bulk_insert() -> None:
+        Department.bulk_insert({"name": f"D{i}", "level": i % 10} for i in range(n))
+
+    def bulk_update() -> None:
+        for department in departments:
+            department.level += 1
+
+        Department.bulk_update(departments, ["level"])
+
+    cases: List[Tuple[str, Callable[[], None]]] = [
+        ("create", create),
+        ("bulk_insert", bulk_insert),
+        ("bulk_create", bulk_create),
+        # 更新 `bulk_create` 插入的模型对象, 故必须在其之后执行
+        ("bulk_update", bulk_update),
+    ]
+
+    print(f"{'mode':<14}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+    with context.with_tenant_context(org), context.with_current_user(user):
+        for name, fn in cases:
+            # 插入操作前清空部门表, 保证每种方式的初始数据量一致
+            if name != "bulk_update":
+                Department.delete().execute()
+
+            start = time.perf_counter()
+            fn()
+            seconds = time.perf_counter() - start
+
+            assert Department.select().count() == n
+            print(f"{name:<14}{n:>10}{seconds:>10.2f}{n / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
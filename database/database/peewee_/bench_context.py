@@ -0,0 +1,101 @@
+"""
+上下文对象属性访问性能测试
+
+对比如下两种上下文实现读写属性的耗时:
+
+- `local`: 原有实现, 所有属性存储在 werkzeug 的 `Local` 对象中, 读取不存在的属性时通过捕获
+  `AttributeError` 异常返回默认值
+- `contextvar`: 当前实现, 租户和用户各自存储在一个 `ContextVar` 中, 其它属性存储在 `ContextVar`
+  保存的只读字典中
+
+执行方式:
+
+```bash
+python -m database.peewee_.bench_context [操作次数]
+```
+"""
+
+import sys
+import timeit
+from typing import Any, Callable, List, Tuple
+
+from werkzeug.local import Local
+
+from .core.context import Context, Tenant
+
+# 每种操作执行的轮数
+_ROUNDS = 5
+
+
+class _LocalContext:
+    """原有的上下文实现, 基于 werkzeug 的 `Local` 对象"""
+
+    def __init__(self) -> None:
+        """构造器"""
+        self.__dict__["_ctx"] = Local()
+
+    def __getattr__(self, key: str, default: Any = None) -> Any:
+        """获取上下文属性"""
+        local = self.__dict__["_ctx"]
+        try:
+            return local.__getattr__(key)
+        except AttributeError:
+            return default
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        """设置上下文属性"""
+        local = self.__dict__["_ctx"]
+        local.__setattr__(key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        """以下标形式获取上下文属性"""
+        return self.__getattr__(key)
+
+    def get_current_tenant(self) -> Tenant:
+        """获取上下文中存储的当前租户"""
+        return self["_tenant"]  # type: ignore[no-any-return]
+
+
+def _cases(ctx: Any) -> List[Tuple[str, Callable[[], Any]]]:
+    """生成要测试的操作
+
+    Args:
+        - `ctx` (`Any`): 上下文对象
+
+    Returns:
+        `List[Tuple[str, Callable[[], Any]]]`: 操作名称和执行操作的函数
+    """
+    ctx._tenant = Tenant()
+    ctx.name = "Alvin"
+
+    def set_attr() -> None:
+        ctx.value = 1
+
+    return [
+        ("get tenant", ctx.get_current_tenant),
+        ("get attr", lambda: ctx.name),
+        ("get missing", lambda: ctx.missing),
+        ("set attr", set_attr),
+    ]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    results = {
+        name: dict(_cases(ctx))
+        for name, ctx in [("local", _LocalContext()), ("contextvar", Context())]
+    }
+
+    print(f"{'operation':<14}{'local ns':>12}{'contextvar ns':>16}{'speedup':>10}")
+    for op in results["local"]:
+        # 分多轮执行, 取耗时最短的一轮, 以减少机器负载波动的影响
+        ns = [
+            min(timeit.repeat(results[impl][op], number=n, repeat=_ROUNDS)) / n * 1e9
+            for impl in ("local", "contextvar")
+        ]
+        print(f"{op:<14}{ns[0]:>12.1f}{ns[1]:>16.1f}{ns[0] / ns[1]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
 from .context import Tenant, User, context
-from .db import db
-from .models import AuditAtMixin, AuditByMixin, BaseModel, MultiTenantMixin
+from .db import PoolStats, create_database, db, use_profile
+from .models import AuditAtMixin, AuditByMixin, BaseModel, MultiTenantMixin, tenant_index
 
 __all__ = [
     "Tenant",
     "User",
     "context",
     "db",
+    "PoolStats",
+    "create_database",
+    "use_profile",
     "AuditAtMixin",
     "AuditByMixin",
     "BaseModel",
     "MultiTenantMixin",
+    "tenant_index",
 ]
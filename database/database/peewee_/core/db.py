@@ -1,11 +1,319 @@
+import heapq
 import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Optional, Set
 
-from peewee import SqliteDatabase
+from peewee import Database, DatabaseProxy, SqliteDatabase
+from playhouse.pool import MaxConnectionsExceeded, PooledPostgresqlDatabase, PooledSqliteDatabase
 
-# 实例化数据库连接
-db = SqliteDatabase(
-    database=":memory:",
-)
+# 数据库配置
+#   - `memory`: SQLite 内存数据库, 用于测试
+#   - `sqlite`: 基于文件的 SQLite 数据库, 开启 WAL 日志并调优缓存
+#   - `pooled-sqlite`: 同 `sqlite`, 并通过连接池管理连接
+#   - `pooled-postgres`: 通过连接池管理的 PostgreSQL 数据库
+Profile = Literal["memory", "sqlite", "pooled-sqlite", "pooled-postgres"]
+
+# 生产环境下 SQLite 数据库的 PRAGMA 设置, 在每个连接创建时执行
+SQLITE_PRAGMAS: Dict[str, Any] = {
+    # 使用 WAL 日志, 读操作和写操作可以并发执行
+    "journal_mode": "wal",
+    # WAL 模式下只在检查点同步磁盘, 既保证数据库不会损坏, 又减少 fsync 次数
+    "synchronous": "normal",
+    # 通过内存映射读取数据库文件, 单位为字节, 即 256MB
+    "mmap_size": 256 * 1024 * 1024,
+    # 页缓存大小, 负数的单位为 KB, 即 64MB
+    "cache_size": -64 * 1024,
+    # 临时表和索引存储在内存中
+    "temp_store": "memory",
+    # 数据库被锁定时最长等待 5 秒, 而不是立即报错
+    "busy_timeout": 5000,
+    "foreign_keys": 1,
+}
+
+# 连接池默认最大连接数
+DEFAULT_MAX_CONNECTIONS = 20
+
+# 连接池中的连接默认最大存活时间 (秒), 超过该时间的连接会被关闭
+DEFAULT_STALE_TIMEOUT = 300
+
+# 连接池已满时等待空闲连接的默认最长时间 (秒), 超时后抛出 `MaxConnectionsExceeded` 异常
+DEFAULT_WAIT_TIMEOUT = 10
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """连接池统计信息快照"""
+
+    # 连接池允许的最大连接数, `0` 表示不限制
+    max_connections: int
+
+    # 正在被使用的连接数
+    in_use: int
+
+    # 连接池中空闲的连接数
+    idle: int
+
+    # 累计创建的物理连接数
+    opened: int
+
+    # 累计获取连接的次数
+    checkouts: int
+
+    # 获取连接的累计耗时 (秒), 包括连接池已满时等待其它连接归还, 以及创建新连接的时间
+    total_wait: float
+
+    # 获取连接的最长耗时 (秒)
+    max_wait: float
+
+    # 连接池已满, 且等待超时而未能获取连接的次数
+    timeouts: int
+
+    # 累计关闭的物理连接数, 包括因超过最大存活时间而被关闭的连接
+    closed: int
+
+    @property
+    def avg_wait(self) -> float:
+        """获取连接的平均耗时 (秒), 包括等待超时的情况"""
+        attempts = self.checkouts + self.timeouts
+        return self.total_wait / attempts if attempts else 0.0
+
+
+class _PoolMetricsMixin:
+    """为 peewee 连接池加入统计信息和过期连接回收功能的混入类型
+
+    peewee 连接池只会在获取和归还连接时检查连接是否过期, 长时间未被使用的空闲连接会一直存在, 需要定期调用
+    `reap` 方法回收
+    """
+
+    # 以下属性由 `playhouse.pool.PooledDatabase` 定义
+    _connections: Any
+    _in_use: Dict[int, Any]
+    _max_connections: Optional[int]
+    _stale_timeout: Optional[int]
+    _pool_lock: threading.RLock
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """构造器"""
+        super().__init__(*args, **kwargs)
+
+        self._metrics_lock = threading.Lock()
+        self._opened_keys: Set[int] = set()
+        self._opened = 0
+        self._closed = 0
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+
+    def connect(self, reuse_if_open: bool = False) -> bool:
+        """从连接池获取连接, 并记录获取连接的次数和耗时
+
+        连接池已满时, peewee 会在该方法中循环等待其它连接归还, 故在此处计时才能包含等待的时间
+
+        Args:
+            - `reuse_if_open` (`bool`, optional): 当前线程已打开连接时是否直接复用. Defaults to `False`.
+
+        Returns:
+            `bool`: 是否获取了新的连接, 复用已打开的连接时返回 `False`
+
+        Raises:
+            - `MaxConnectionsExceeded`: 连接池已满, 且等待超时
+        """
+        start = time.perf_counter()
+        try:
+            connected: bool = super().connect(reuse_if_open)  # type: ignore[misc]
+        except MaxConnectionsExceeded:
+            self._record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+
+        if connected:
+            self._record_wait(time.perf_counter() - start)
+
+        return connected
+
+    def _record_wait(self, wait: float, timed_out: bool = False) -> None:
+        """记录一次获取连接的耗时
+
+        Args:
+            - `wait` (`float`): 获取连接的耗时 (秒)
+            - `timed_out` (`bool`, optional): 是否等待超时. Defaults to `False`.
+        """
+        with self._metrics_lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def _connect(self) -> Any:
+        """从连接池获取连接, 并记录创建的物理连接数
+
+        Returns:
+            `Any`: 数据库连接对象
+        """
+        conn = super()._connect()  # type: ignore[misc]
+
+        with self._metrics_lock:
+            # 连接池中没有可用的连接时会创建新的物理连接
+            if id(conn) not in self._opened_keys:
+                self._opened_keys.add(id(conn))
+                self._opened += 1
+
+        return conn
+
+    def _close_raw(self, conn: Any) -> None:
+        """关闭物理连接, 并记录关闭的连接数
+
+        连接池在获取或归还连接时发现连接已过期, 或回收过期连接时, 都会通过该方法关闭连接
+
+        Args:
+            - `conn` (`Any`): 数据库连接对象
+        """
+        super()._close_raw(conn)  # type: ignore[misc]
+
+        with self._metrics_lock:
+            self._opened_keys.discard(id(conn))
+            self._closed += 1
+
+    def reap(self) -> int:
+        """关闭连接池中已超过最大存活时间的空闲连接
+
+        正在被使用的连接不会被关闭, 即使已超过最大存活时间, 这类连接在归还连接池时由 peewee 关闭
+
+        Returns:
+            `int`: 被关闭的连接数
+        """
+        if not self._stale_timeout:
+            return 0
+
+        with self._pool_lock:
+            now = time.time()
+            keep: List[Any] = []
+            n = 0
+            for item in self._connections:
+                # 连接池中的空闲连接为 `(创建时间, 序号, 连接对象)` 元组
+                if now - item[0] > self._stale_timeout:
+                    self._close_raw(item[2])
+                    n += 1
+                else:
+                    keep.append(item)
+
+            # 剩余的空闲连接需重新调整为堆结构
+            heapq.heapify(keep)
+            self._connections[:] = keep
+
+        return n
+
+    def stats(self) -> PoolStats:
+        """获取连接池统计信息快照
+
+        Returns:
+            `PoolStats`: 统计信息
+        """
+        with self._pool_lock, self._metrics_lock:
+            return PoolStats(
+                max_connections=self._max_connections or 0,
+                in_use=len(self._in_use),
+                idle=len(self._connections),
+                opened=self._opened,
+                checkouts=self._checkouts,
+                total_wait=self._total_wait,
+                max_wait=self._max_wait,
+                timeouts=self._timeouts,
+                closed=self._closed,
+            )
+
+
+class MeteredPooledSqliteDatabase(_PoolMetricsMixin, PooledSqliteDatabase):
+    """带统计信息的 SQLite 连接池"""
+
+
+class MeteredPooledPostgresqlDatabase(_PoolMetricsMixin, PooledPostgresqlDatabase):
+    """带统计信息的 PostgreSQL 连接池"""
+
+
+def create_database(
+    profile: Profile = "memory",
+    database: str = "study_python_peewee.db",
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    stale_timeout: int = DEFAULT_STALE_TIMEOUT,
+    wait_timeout: int = DEFAULT_WAIT_TIMEOUT,
+    **options: Any,
+) -> Database:
+    """根据配置创建数据库对象
+
+    Args:
+        - `profile` (`Profile`, optional): 数据库配置. Defaults to `"memory"`.
+        - `database` (`str`, optional): SQLite 数据库文件路径或 PostgreSQL 数据库名称,
+          `memory` 配置下忽略. Defaults to `"study_python_peewee.db"`.
+        - `max_connections` (`int`, optional): 连接池最大连接数. Defaults to `20`.
+        - `stale_timeout` (`int`, optional): 连接池中连接的最大存活时间 (秒). Defaults to `300`.
+        - `wait_timeout` (`int`, optional): 连接池已满时等待空闲连接的最长时间 (秒). Defaults to `10`.
+        - `options` (`Any`): 其它数据库连接参数, 例如 PostgreSQL 的 `host`, `user` 和 `password`
+
+    Returns:
+        `Database`: 数据库对象
+
+    Raises:
+        - `ValueError`: 不支持的数据库配置
+    """
+    if profile == "memory":
+        return SqliteDatabase(":memory:", **options)
+
+    if profile == "sqlite":
+        return SqliteDatabase(database, pragmas=SQLITE_PRAGMAS, **options)
+
+    if profile == "pooled-sqlite":
+        # SQLite 连接可能在不同线程中被获取, 故需关闭 `check_same_thread` 检查
+        return MeteredPooledSqliteDatabase(
+            database,
+            pragmas=SQLITE_PRAGMAS,
+            max_connections=max_connections,
+            stale_timeout=stale_timeout,
+            timeout=wait_timeout,
+            check_same_thread=False,
+            **options,
+        )
+
+    if profile == "pooled-postgres":
+        return MeteredPooledPostgresqlDatabase(
+            database,
+            max_connections=max_connections,
+            stale_timeout=stale_timeout,
+            timeout=wait_timeout,
+            **options,
+        )
+
+    raise ValueError(f"Unsupported database profile: {profile}")
+
+
+def use_profile(profile: Profile, **options: Any) -> Database:
+    """切换全局数据库对象使用的数据库配置
+
+    切换前会关闭当前数据库的连接, 所有模型类型通过 `db` 代理对象访问新的数据库
+
+    Args:
+        - `profile` (`Profile`): 数据库配置
+        - `options` (`Any`): 传递给 `create_database` 函数的参数
+
+    Returns:
+        `Database`: 新的数据库对象
+    """
+    if db.obj is not None and not db.is_closed():
+        db.close()
+
+    database = create_database(profile, **options)
+    db.initialize(database)
+    return database
+
+
+# 实例化数据库代理对象, 默认使用 SQLite 内存数据库
+db = DatabaseProxy()
+db.initialize(create_database("memory"))
 
 # 监听系统信号, 当系统退出时关闭数据库连接
 signal.signal(signal.SIGHUP, lambda sig, frame: db.close())
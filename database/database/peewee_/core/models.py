@@ -1,20 +1,50 @@
+from contextvars import ContextVar
 from datetime import datetime, UTC
-from typing import Any, List, Optional, cast
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Self, Sequence, Tuple, Type, Union, cast
 
 from peewee import (
     BigAutoField,
     BigIntegerField,
     DateTimeField,
+    Expression,
     Field,
     Model,
     ModelDelete,
     ModelSelect,
     ModelUpdate,
+    chunked,
 )
 
-from .context import context
+from .context import Tenant, context
 from .db import db
 
+# 批量操作时, 每批处理的默认记录数
+DEFAULT_BATCH_SIZE = 1000
+
+# 缓存当前租户及其对应的各模型类型的查询条件, 即 `(租户对象, {模型类型: 查询条件})`
+#
+# 同一个请求 (上下文) 内租户不变, 故每个模型类型的查询条件只需构建一次; 存储在 `ContextVar` 中,
+# 不同的线程或 asyncio 任务之间不会相互影响
+_tenant_filters: ContextVar[Optional[Tuple[Tenant, Dict[Type[Model], Expression]]]] = (
+    ContextVar("tenant_filters", default=None)
+)
+
+
+def tenant_index(*fields: str, unique: bool = False) -> Tuple[Tuple[str, ...], bool]:
+    """生成以租户字段开头的复合索引定义
+
+    多租户模型的所有查询都会带有 `org_id` 条件, 所以索引的第一个字段必须为 `org_id`,
+    否则查询无法有效利用索引
+
+    Args:
+        - `fields` (`str`): 租户字段之后的索引字段名
+        - `unique` (`bool`, optional): 是否为唯一索引. Defaults to `False`.
+
+    Returns:
+        `Tuple[Tuple[str, ...], bool]`: 索引定义, 可用于模型 `Meta` 类的 `indexes` 属性
+    """
+    return ("org_id", *fields), unique
+
 
 class BaseModel(Model):
     """模型超类, 其它模型类都必须从该类继承"""
@@ -27,6 +57,89 @@ class BaseModel(Model):
     # 定义主键字段
     id: int = cast(int, BigAutoField(primary_key=True))
 
+    @classmethod
+    def bulk_insert(
+        cls, rows: Iterable[Mapping[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> int:
+        """以字典形式批量插入记录
+
+        和 `create` 方法一样会为每行记录加入审计和租户字段, 但这些字段值对整批记录只计算一次;
+        记录按 `batch_size` 分批通过 `insert_many` 插入, 所有批次在同一个事务中执行
+
+        Args:
+            - `rows` (`Iterable[Mapping[str, Any]]`): 要插入的记录, 每行记录为 `字段名 -> 字段值` 字典
+            - `batch_size` (`int`, optional): 每批插入的记录数. Defaults to `1000`.
+
+        Returns:
+            `int`: 插入的记录数
+        """
+        stamps, defaults = _stamp_values(cls, created=True)
+
+        n = 0
+        with cls._meta.database.atomic():
+            for batch in chunked(rows, batch_size):
+                cls.insert_many([{**defaults, **row, **stamps} for row in batch]).execute()
+                n += len(batch)
+
+        return n
+
+    @classmethod
+    def bulk_create(
+        cls, model_list: Sequence[Self], batch_size: Optional[int] = DEFAULT_BATCH_SIZE
+    ) -> None:
+        """批量插入模型对象
+
+        插入前为每个模型对象设置审计和租户字段, 然后分批插入, 所有批次在同一个事务中执行
+
+        Args:
+            - `model_list` (`Sequence[Self]`): 要插入的模型对象
+            - `batch_size` (`Optional[int]`, optional): 每批插入的对象数. Defaults to `1000`.
+        """
+        stamps, defaults = _stamp_values(cls, created=True)
+
+        for model in model_list:
+            for name, value in defaults.items():
+                if getattr(model, name) is None:
+                    setattr(model, name, value)
+
+            for name, value in stamps.items():
+                setattr(model, name, value)
+
+        with cls._meta.database.atomic():
+            super().bulk_create(model_list, batch_size)
+
+    @classmethod
+    def bulk_update(
+        cls,
+        model_list: Sequence[Self],
+        fields: Sequence[Union[str, Field]],
+        batch_size: Optional[int] = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """批量更新模型对象
+
+        更新前为每个模型对象设置更新时间和更新人字段, 并将这些字段加入要更新的字段中,
+        然后分批更新, 所有批次在同一个事务中执行
+
+        Args:
+            - `model_list` (`Sequence[Self]`): 要更新的模型对象
+            - `fields` (`Sequence[Union[str, Field]]`): 要更新的字段
+            - `batch_size` (`Optional[int]`, optional): 每批更新的对象数. Defaults to `1000`.
+
+        Returns:
+            `int`: 更新的记录数
+        """
+        stamps, _ = _stamp_values(cls, created=False)
+
+        for model in model_list:
+            for name, value in stamps.items():
+                setattr(model, name, value)
+
+        names = {f if isinstance(f, str) else f.name for f in fields}
+        fields = [*fields, *(name for name in stamps if name not in names)]
+
+        with cls._meta.database.atomic():
+            return cast(int, super().bulk_update(model_list, fields, batch_size))
+
 
 class AuditByMixin(Model):
     created_by: int = cast(int, BigIntegerField(null=True))
@@ -50,20 +163,20 @@ class AuditByMixin(Model):
         return cast(int, super().save(force_insert, only))
 
     @classmethod
-    def create(cls, **query: Any) -> Model:
+    def create(cls, **query: Any) -> Self:
         """插入一条新纪录并返回模型对象
 
         Args:
             - `query` (`Dict[str, Any]`, optional): 要创建的数据字段和值
 
         Returns:
-            `Model`: 表示插入记录的模型对象
+            `Self`: 表示插入记录的模型对象
         """
         user = context.get_current_user()
         if user:
             query.update(created_by=user._get_id(), updated_by=user._get_id())
 
-        return cast(Model, super().create(**query))
+        return super().create(**query)
 
     @classmethod
     def update(cls, __data: Optional[Any] = None, **update: Any) -> ModelUpdate:
@@ -77,7 +190,7 @@ class AuditByMixin(Model):
             `ModelUpdate`: `update` 查询对象
         """
         user = context.get_current_user()
-        if user:
+        if user and not _has_field(__data, update, "updated_by"):
             update.update(updated_by=user._get_id())
 
         return cast(ModelUpdate, super().update(__data, **update))
@@ -113,14 +226,14 @@ class AuditAtMixin(Model):
         return cast(int, super().save(force_insert, only))
 
     @classmethod
-    def create(cls, **query: Any) -> Model:
+    def create(cls, **query: Any) -> Self:
         """插入一条新纪录并返回模型对象
 
         Args:
             - `query` (`Dict[str, Any]`, optional): 要创建的数据字段和值
 
         Returns:
-            `Model`: 表示插入记录的模型对象
+            `Self`: 表示插入记录的模型对象
         """
         # 设置记录的审计时间字段
         query.update(
@@ -129,7 +242,7 @@ class AuditAtMixin(Model):
         )
 
         # 创建记录并返回模型对象
-        return cast(Model, super().create(**query))
+        return super().create(**query)
 
     @classmethod
     def update(cls, __data: Optional[Any] = None, **update: Any) -> ModelUpdate:
@@ -143,7 +256,8 @@ class AuditAtMixin(Model):
             `ModelUpdate`: `update` 查询对象
         """
         # 在更新数据中加入 `updated_at` 字段值
-        update.update(updated_at=datetime.now(UTC))
+        if not _has_field(__data, update, "updated_at"):
+            update.update(updated_at=datetime.now(UTC))
         return cast(ModelUpdate, super().update(__data, **update))
 
 
@@ -153,22 +267,48 @@ class MultiTenantMixin(Model):
     org_id: int = cast(int, BigIntegerField())
 
     @classmethod
-    def select(cls, *fields: str) -> ModelSelect:
+    def tenant_filter(cls) -> Optional[Expression]:
+        """获取当前租户的查询条件
+
+        租户对象未发生变化时, 返回缓存的查询条件对象
+
+        Returns:
+            `Optional[Expression]`: 租户查询条件, 上下文中没有租户时返回 `None`
+        """
+        tenant = context.get_current_tenant()
+        if not tenant:
+            return None
+
+        cached = _tenant_filters.get()
+        if cached is None or cached[0] is not tenant:
+            # 租户发生变化, 重建缓存
+            cached = (tenant, {})
+            _tenant_filters.set(cached)
+
+        expr = cached[1].get(cls)
+        if expr is None:
+            # 字段的比较运算返回 `Expression` 对象, 类型声明中为 `bool`
+            expr = cached[1][cls] = cast(Expression, cls.org_id == tenant._get_id())
+
+        return expr
+
+    @classmethod
+    def select(cls, *fields: str) -> "ModelSelect[Self]":
         """创建一个 `select` 查询对象
 
         Args:
             - `fields` (`Tuple[str]`): 要查询的字段名称
 
         Returns:
-            `ModelSelect`: `select` 查询对象
+            `ModelSelect[Self]`: `select` 查询对象
         """
         # 获取查询对象
-        select: ModelSelect = super().select(*fields)
+        select = super().select(*fields)
 
         # 在查询对象中加入租户查询条件
-        tenant = context.get_current_tenant()
-        if tenant:
-            select = select.where(cls.org_id == tenant._get_id())
+        expr = cls.tenant_filter()
+        if expr is not None:
+            select = select.where(expr)
 
         return select
 
@@ -191,11 +331,11 @@ class MultiTenantMixin(Model):
         return cast(int, super().save(force_insert, only))
 
     @classmethod
-    def create(cls, **query: Any) -> Model:
+    def create(cls, **query: Any) -> Self:
         """创建实体时, 加入租户信息
 
         Returns:
-            Model: 被创建的实体对象
+            Self: 被创建的实体对象
         """
         # 获取上下文租户对象
         tenant = context.get_current_tenant()
@@ -204,7 +344,7 @@ class MultiTenantMixin(Model):
             query.update(org_id=tenant._get_id())
 
         # 创建实体
-        return cast(Model, super().create(**query))
+        return super().create(**query)
 
     @classmethod
     def update(cls, __data: Optional[Any] = None, **update: Any) -> ModelUpdate:
@@ -219,9 +359,9 @@ class MultiTenantMixin(Model):
         """
         query: ModelUpdate = super().update(__data, **update)
 
-        org = context.get_current_tenant()
-        if org:
-            query = query.where(cls.org_id == org._get_id())
+        expr = cls.tenant_filter()
+        if expr is not None:
+            query = query.where(expr)
 
         return query
 
@@ -234,8 +374,67 @@ class MultiTenantMixin(Model):
         """
         query: ModelDelete = super().delete()
 
+        expr = cls.tenant_filter()
+        if expr is not None:
+            query = query.where(expr)
+
+        return query
+
+
+def _has_field(data: Optional[Any], update: Mapping[str, Any], name: str) -> bool:
+    """判断更新数据中是否已包含指定字段
+
+    Args:
+        - `data` (`Optional[Any]`): 字典对象, 键为字段名或字段对象
+        - `update` (`Mapping[str, Any]`): 字段名和值
+        - `name` (`str`): 字段名
+
+    Returns:
+        `bool`: 是否包含指定字段
+    """
+    if name in update:
+        return True
+
+    if not data:
+        return False
+
+    return any(getattr(k, "name", k) == name for k in data)
+
+
+def _stamp_values(
+    model: Type[Model], created: bool
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """计算批量操作时要为每行记录设置的审计和租户字段值
+
+    Args:
+        - `model` (`Type[Model]`): 模型类型
+        - `created` (`bool`): 是否为插入操作, 否则为更新操作
+
+    Returns:
+        `Tuple[Dict[str, Any], Dict[str, Any]]`: 总是覆盖的字段值, 以及仅在记录未设置时使用的字段值
+    """
+    stamps: Dict[str, Any] = {}
+    defaults: Dict[str, Any] = {}
+
+    if issubclass(model, AuditAtMixin):
+        now = datetime.now(UTC)
+        if created:
+            # 和 `save` 方法一致, 保留记录已有的创建时间
+            defaults["created_at"] = now
+
+        stamps["updated_at"] = now
+
+    if issubclass(model, AuditByMixin):
+        user = context.get_current_user()
+        if user:
+            if created:
+                stamps["created_by"] = user._get_id()
+
+            stamps["updated_by"] = user._get_id()
+
+    if created and issubclass(model, MultiTenantMixin):
         tenant = context.get_current_tenant()
         if tenant:
-            query = query.where(org_id=tenant._get_id())
+            stamps["org_id"] = tenant._get_id()
 
-        return query
+    return stamps, defaults
@@ -3,7 +3,15 @@ from typing import cast
 
 from peewee import CharField, DeferredForeignKey, ForeignKeyField, IntegerField
 
-from .core import AuditAtMixin, AuditByMixin, BaseModel, MultiTenantMixin, Tenant, User
+from .core import (
+    AuditAtMixin,
+    AuditByMixin,
+    BaseModel,
+    MultiTenantMixin,
+    Tenant,
+    User,
+    tenant_index,
+)
 
 
 class Org(Tenant, BaseModel, AuditAtMixin):
@@ -32,6 +40,9 @@ class Department(BaseModel, AuditAtMixin, AuditByMixin, MultiTenantMixin):
         # 定义部门表名称
         table_name = "department"
 
+        # 定义部门表索引
+        indexes = (tenant_index("name"), tenant_index("level"))
+
     # 部门名称字段
     name: str = cast(str, CharField(null=False))
 
@@ -58,6 +69,9 @@ class Role(BaseModel, AuditAtMixin, MultiTenantMixin):
         # 定义角色表名称
         table_name = "role"
 
+        # 定义角色表索引
+        indexes = (tenant_index("name"),)
+
     # 角色名称字段
     name: str = cast(str, CharField(null=False))
 
@@ -76,6 +90,9 @@ class Employee(User, BaseModel, AuditAtMixin, AuditByMixin, MultiTenantMixin):
         # 定义员工表名称
         table_name = "employee"
 
+        # 定义员工表索引
+        indexes = (tenant_index("name"), tenant_index("department_id"))
+
     # 员工姓名字段
     name: str = cast(str, CharField(null=False))
 
@@ -1,6 +1,6 @@
 from datetime import date
 from random import randint
-from typing import List
+from typing import List, cast
 
 from factory import declarations, faker
 from factory.alchemy import SQLAlchemyModelFactory
@@ -8,7 +8,7 @@ from sqlalchemy import and_, select, update
 from sqlalchemy.orm import aliased
 
 from database.alchemy import Gender, Group, User, initialize_tables, session
-from database.alchemy.core import soft_deleted_select
+from database.alchemy.core import ExtQuery, soft_deleted_select
 from database.alchemy.model import UserGroup
 from database.misc import non_none
 
@@ -337,3 +337,33 @@ def test_soft_delete_legacy() -> None:
 
     user = session.query(User).filter(User.id == created_user.id).one_or_none()
     assert user is None
+
+
+def test_soft_delete_with_deleted() -> None:
+    """通过 `with_deleted` 执行选项查询已被软删除的记录
+
+    软删除条件由 `do_orm_execute` 事件统一附加, 所以普通的 `select` 语句也会排除软删除记录,
+    可通过 `with_deleted` 执行选项跳过该条件
+    """
+    created_user: User = UserFactory.create()
+    session.commit()
+
+    created_user.soft_delete()
+    session.commit()
+
+    # 普通 select 语句同样会排除软删除记录
+    user = session.scalars(select(User).where(User.id == created_user.id)).one_or_none()
+    assert user is None
+
+    # 通过执行选项包含软删除记录
+    user = session.scalars(
+        select(User)
+        .where(User.id == created_user.id)
+        .execution_options(with_deleted=True)
+    ).one_or_none()
+    assert user == created_user
+
+    # 传统查询方式, `session` 通过 `query_cls=ExtQuery` 创建, 查询对象均为 `ExtQuery` 类型
+    query = cast(ExtQuery, session.query(User))
+    user = query.filter(User.id == created_user.id).with_deleted().one_or_none()
+    assert user == created_user
@@ -0,0 +1,102 @@
+from typing import Any, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Load
+
+from database.alchemy import Gender, User, initialize_tables, session
+from database.alchemy.core import engine
+from database.alchemy.repository import (
+    GroupRepository,
+    UserRepository,
+    load_options,
+)
+
+
+def setup_function() -> None:
+    """
+    在每个测试执行前执行, 初始化所有数据表
+    """
+    initialize_tables()
+
+
+def teardown_function() -> None:
+    """
+    在每个测试结束后执行, 关闭连接
+    """
+    session.close()
+
+
+def _prepare(users: UserRepository, groups: GroupRepository, n: int) -> None:
+    """批量插入 `n` 个用户和 2 个组, 每个用户同时属于这 2 个组"""
+    users.bulk_insert(
+        ({"id_num": f"{i:018d}", "name": f"user-{i}", "gender": Gender.MALE} for i in range(n)),
+        batch_size=3,
+    )
+    groups.bulk_insert([{"name": "G1"}, {"name": "G2"}])
+    groups.bulk_add_users((u, g) for u in range(1, n + 1) for g in (1, 2))
+    session.commit()
+
+
+def test_bulk_insert() -> None:
+    """测试批量插入数据"""
+
+    users = UserRepository()
+
+    count = users.bulk_insert(
+        ({"id_num": f"{i:018d}", "name": f"user-{i}", "gender": Gender.FEMALE} for i in range(10)),
+        batch_size=4,
+    )
+    session.commit()
+
+    assert count == 10
+
+    result = users.find_all(User.name.like("user-%"))
+    assert len(result) == 10
+    assert result[0].gender == Gender.FEMALE
+
+    # 批量插入的记录同样会使用字段默认值
+    assert result[0].deleted is False
+
+    with pytest.raises(ValueError):
+        users.bulk_insert([], batch_size=0)
+
+
+def test_load_strategy() -> None:
+    """测试通过不同的加载策略加载关系属性
+
+    延迟加载会为每个用户执行一次查询 (N+1), 而 `selectin` 策略只需额外执行一次查询
+    """
+
+    users = UserRepository()
+    _prepare(users, GroupRepository(), 5)
+
+    statements: List[str] = []
+
+    def on_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        for strategy, expected in [("lazy", 6), ("selectin", 2), ("joined", 1)]:
+            session.expunge_all()
+            statements.clear()
+
+            result = users.find_with_groups(strategy=strategy)  # type: ignore[arg-type]
+            assert len(result) == 5
+            assert all([g.name for g in u.groups] == ["G1", "G2"] for u in result)
+
+            assert len(statements) == expected
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def test_load_options() -> None:
+    """测试通过属性路径生成多级加载选项"""
+
+    options = load_options(User, ["groups", "user_groups.group"], "selectin")
+    assert len(options) == 2
+    assert all(isinstance(o, Load) for o in options)
+
+    with pytest.raises(ValueError):
+        load_options(User, ["groups"], "unknown")  # type: ignore[arg-type]
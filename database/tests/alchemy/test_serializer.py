@@ -0,0 +1,106 @@
+import json
+from datetime import date
+
+from sqlalchemy import select
+
+from database.alchemy import Gender, Group, User, initialize_tables, session
+from database.alchemy.serializer import (
+    compile_serializer,
+    dumps,
+    serialize_all,
+    stream_json_array,
+    stream_query,
+)
+
+
+def setup_function() -> None:
+    """
+    在每个测试执行前执行, 初始化所有数据表
+    """
+    initialize_tables()
+
+
+def teardown_function() -> None:
+    """
+    在每个测试结束后执行, 关闭连接
+    """
+    session.close()
+
+
+def _create_users(n: int) -> None:
+    """创建 `n` 个用户"""
+    session.add_all(
+        User(
+            id_num=f"{i:018d}",
+            name=f"user-{i}",
+            gender=Gender.FEMALE,
+            birthday=date(1981, 3, i + 1),
+        )
+        for i in range(n)
+    )
+    session.commit()
+
+
+def test_compile_serializer() -> None:
+    """测试为实体类型生成序列化函数"""
+
+    _create_users(1)
+
+    user = session.scalars(select(User)).one()
+    data = compile_serializer(User)(user)
+
+    # 序列化结果和 `jsonify` 方法包含相同的字段
+    assert list(data.keys()) == list(user.jsonify().keys())
+
+    # 日期字段转为字符串, 枚举字段转为枚举值
+    assert data["id"] == user.id
+    assert data["created_at"] == user.created_at.isoformat()
+    assert data["gender"] == "F"
+    assert data["birthday"] == "1981-03-01"
+
+    # 序列化函数只编译一次
+    assert compile_serializer(User) is compile_serializer(User)
+
+    # 字段过期后, 通过属性读取并重新加载
+    session.expire(user)
+    assert compile_serializer(User, ("name",))(user) == {"name": "user-0"}
+
+
+def test_dumps() -> None:
+    """测试使用不同的后端序列化对象"""
+
+    group = Group(name="VIP")
+    session.add(group)
+    session.commit()
+
+    for backend in ("json", "auto"):
+        data = json.loads(dumps(serialize_all([group], Group), backend))  # type: ignore[arg-type]
+        assert data == [{"id": group.id, "created_at": group.created_at.isoformat(), "name": "VIP"}]
+
+
+def test_stream_json_array() -> None:
+    """测试将实体对象以 JSON 数组的形式流式输出"""
+
+    _create_users(5)
+
+    users = list(session.scalars(select(User)))
+
+    # 每批输出 2 个对象, 共输出 `[`, 3 批数据和 `]`
+    chunks = list(stream_json_array(users, User, chunk_size=2))
+    assert len(chunks) == 5
+
+    data = json.loads(b"".join(chunks))
+    assert [u["name"] for u in data] == [f"user-{i}" for i in range(5)]
+
+    # 空集合输出空数组
+    assert json.loads(b"".join(stream_json_array([], User))) == []
+
+
+def test_stream_query() -> None:
+    """测试将查询结果以 JSON 数组的形式流式输出"""
+
+    _create_users(5)
+
+    data = json.loads(b"".join(stream_query(select(User).order_by(User.id), User, chunk_size=2)))
+    assert len(data) == 5
+    assert data[4]["birthday"] == "1981-03-05"
@@ -1,4 +1,5 @@
-from typing import cast
+import asyncio
+from typing import List, cast
 
 from database.mongo.engine.core import context
 from database.peewee_.core.context import Tenant
@@ -34,3 +35,20 @@ def test_tenant_context() -> None:
         assert cast(FakeTenant, context.get_current_tenant()).mark == "Fake Tenant"
 
     assert context.get_current_tenant() is None
+
+
+def test_context_isolated_between_tasks() -> None:
+    tenants = [Tenant() for _ in range(3)]
+
+    async def run(tenant: Tenant) -> Tenant:
+        with context.with_tenant_context(tenant):  # type: ignore[arg-type, unused-ignore]
+            # 交出执行权, 让其它任务修改各自的上下文
+            await asyncio.sleep(0)
+            return context.get_current_tenant()  # type: ignore[return-value, unused-ignore]
+
+    async def main() -> List[Tenant]:
+        return await asyncio.gather(*[run(t) for t in tenants])
+
+    # 每个任务都只能看到自己设置的租户
+    assert asyncio.run(main()) == tenants
+    assert context.get_current_tenant() is None
@@ -13,7 +13,9 @@ from database.mongo.engine import (
     clear_db,
     context,
     ensure_indexes,
+    prefetch_references,
 )
+from database.mongo.engine.core import tenant_filter
 
 
 class BaseFactory(MongoEngineFactory):
@@ -138,3 +140,50 @@ def test_create_employee() -> None:
     assert employee == department.manager
 
     assert department == employee.department
+
+
+def test_prefetch_references() -> None:
+    """测试批量加载员工文档引用的部门和组织文档"""
+    departments = [cast(Department, DepartmentFactory.create()) for _ in range(3)]
+    for i in range(9):
+        employee: Employee = EmployeeFactory.create()
+        employee.department = departments[i % 3]
+        employee.save()
+
+    ids = [d.id for d in departments]
+
+    # 9 个员工各有 2 个待加载的引用, 部门和组织各通过一次查询加载
+    result = prefetch_references(Employee.objects(department__in=ids), "department", "org")
+    assert len(result.documents) == 9
+    assert result.references == 18
+    assert result.queries == 2
+    assert result.saved == 16
+    assert result.missing == 0
+
+    for employee in result.documents:
+        # 引用对象已缓存了被引用的文档
+        assert employee._data["department"]._cached_doc in departments
+        assert employee.org == context.get_current_tenant()
+
+    # 已加载的引用不会被重复加载
+    assert prefetch_references(result.documents, "department").queries == 0
+
+
+def test_tenant_filter() -> None:
+    """测试租户查询条件的缓存和租户复合索引"""
+    # 同一租户下, 所有查询集合对象共用同一个查询条件对象
+    q = tenant_filter()
+    assert Department.objects._query_obj is q
+    assert Employee.objects._query_obj is q
+
+    # 租户发生变化后, 查询条件重新构建
+    other_org: Org = OrgFactory.create()
+    with context.with_tenant_context(other_org):
+        assert tenant_filter() is not q
+        assert Department.objects.count() == 0
+
+    # 所有多租户文档的索引均以租户字段开头
+    for doc in (Department, Role, Employee):
+        specs = doc._meta["index_specs"]
+        assert specs
+        assert all(spec["fields"][0][0] == "org" for spec in specs)
@@ -1,7 +1,13 @@
 from datetime import date
 from typing import cast
 
-from database.mongo.pymongo import clear_all, create_user, find_user
+from database.mongo.pymongo import (
+    clear_all,
+    create_user,
+    find_user,
+    find_user_stream,
+    import_users,
+)
 from database.mongo.pymongo.pymongo import UserModel
 
 
@@ -37,3 +43,79 @@ def test_user_collection() -> None:
             },
         },
     ]
+
+
+def test_import_users() -> None:
+    users = [
+        cast(
+            UserModel,
+            {
+                "name": f"User{i}",
+                "birthday": date(1981, 3, i + 1),
+                "city": {"name": "Xi'an" if i % 2 else "Beijing"},
+            },
+        )
+        for i in range(5)
+    ]
+
+    # 5 个用户分 2 批插入, 共 2 个城市
+    result = import_users(users, chunk_size=3)
+    assert result.users == 5
+    assert result.batches == 2
+    assert result.cities_created == 2
+    assert result.cities_matched == 0
+
+    assert find_user(name="User1") == [
+        {
+            "name": "User1",
+            "birthday": date(1981, 3, 2),
+            "city": {
+                "country": "China",
+                "name": "Xi'an",
+            },
+        },
+    ]
+
+    # 再次导入时, 城市已存在
+    result = import_users(users[:1])
+    assert result.cities_created == 0
+    assert result.cities_matched == 1
+
+
+def test_find_user_stream() -> None:
+    import_users(
+        cast(
+            UserModel,
+            {
+                "name": "Alvin" if i % 2 else "Emma",
+                "birthday": date(1981, 3, i + 1),
+                "city": {"name": "Xi'an" if i % 3 else "Beijing"},
+            },
+        )
+        for i in range(6)
+    )
+
+    # 流式查询的结果和 `find_user` 函数一致
+    users = list(find_user_stream(name="Alvin", batch_size=2))
+    assert users == find_user(name="Alvin")
+    assert users[1] == {
+        "name": "Alvin",
+        "birthday": date(1981, 3, 4),
+        "city": {
+            "country": "China",
+            "name": "Beijing",
+        },
+    }
+
+    # 只返回指定的字段
+    # 只包含部分字段的结果不是完整的 `UserModel`, 转为 `dict` 后比较
+    users = list(find_user_stream(birthday=date(1981, 3, 2), fields=["name"]))
+    assert [dict(user) for user in users] == [{"name": "Alvin"}]
+
+    # 不指定过滤条件时返回所有用户
+    assert len(list(find_user_stream(fields=["name"]))) == 6
+
+    # 不返回任何字段
+    users = list(find_user_stream(birthday=date(1981, 3, 2), fields=[], with_id=True))
+    assert [list(user) for user in users] == [["_id"]]
+    assert [dict(user) for user in find_user_stream(birthday=date(1981, 3, 2), fields=[])] == [{}]
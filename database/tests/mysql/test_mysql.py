@@ -1,16 +1,22 @@
+import gc
 from datetime import date
+from typing import cast
 
 import pytest
 from pymysql import Connection  # type: ignore[import-untyped]
 
 from database.mysql import (
     delete_user,
+    get_all_tables,
     get_connection,
     get_pooled_connection,
     get_user,
     insert_user,
+    stream_rows,
+    stream_table,
     update_user,
 )
+from database.mysql.conn import pool
 
 
 def run_curd(conn: Connection) -> None:
@@ -98,4 +104,85 @@ def test_pooled_curd() -> None:
     通过连接池获取连接, 测试增删改查
     """
 
-    run_curd(get_pooled_connection())
+    with get_pooled_connection() as conn:
+        run_curd(conn)
+
+
+def test_stream_rows() -> None:
+    """
+    测试通过服务端游标分批读取查询结果
+    """
+
+    conn = get_connection()
+    try:
+        # 插入 5 条用户数据
+        ids = [
+            insert_user(conn, f"STREAM-{n}", f"User{n}", "M", date(1981, 3, n + 1))
+            for n in range(5)
+        ]
+
+        sql = r"SELECT `id`, `name`, `gender` FROM `user` WHERE `id_num` LIKE %s ORDER BY `id`"
+
+        # 以字典格式每批读取 2 行, 共读取 3 批
+        batches = list(stream_rows(conn, sql, ("STREAM-%",), batch_size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert batches[0][0]["id"] == ids[0]
+        assert batches[0][0]["name"] == "User0"
+
+        # 以元组格式读取
+        batches = list(stream_rows(conn, sql, ("STREAM-%",), batch_size=3, row_format="tuple"))
+        assert [len(b) for b in batches] == [3, 2]
+        assert batches[0][0] == (ids[0], "User0", "M")
+
+        # 以列格式读取
+        batches = list(stream_rows(conn, sql, ("STREAM-%",), batch_size=5, row_format="columns"))
+        assert len(batches) == 1
+        assert batches[0]["id"] == ids
+        assert batches[0]["name"] == [f"User{n}" for n in range(5)]
+
+        # 读取整表
+        assert sum(len(b) for b in stream_table(conn, "user", ["id"], batch_size=2)) >= 5
+
+        # 流式读取结束后, 连接可以继续执行其它语句
+        assert get_user(conn, ids[0])["name"] == "User0"
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def test_pool_stats() -> None:
+    """
+    测试连接池的统计信息
+    """
+
+    before = pool.stats()
+
+    with pool.connection() as conn:
+        # 获取连接后, 正在使用的连接数增加
+        assert pool.stats().in_use == before.in_use + 1
+        assert get_all_tables(cast(Connection, conn)) == ["user"]
+
+    after = pool.stats()
+
+    # 归还连接后, 正在使用的连接数恢复
+    assert after.in_use == before.in_use
+    assert after.checkouts == before.checkouts + 1
+    assert after.idle >= 1
+    assert after.max_wait >= 0
+
+
+def test_pool_stats_without_close() -> None:
+    """
+    测试未调用 `close` 的连接被回收后, 正在使用的连接数恢复
+    """
+
+    before = pool.stats()
+
+    conn = get_pooled_connection()
+    assert pool.stats().in_use == before.in_use + 1
+
+    # 代理对象被回收时归还连接
+    del conn
+    gc.collect()
+
+    assert pool.stats().in_use == before.in_use
@@ -1,4 +1,5 @@
-from typing import cast
+import asyncio
+from typing import List, cast
 
 from database.peewee_.core import Tenant, User, context
 
@@ -45,3 +46,44 @@ def test_current_user_context() -> None:
         assert user.mark == "Fake User"
 
     assert context.get_current_user() is None
+
+
+def test_context_isolated_between_tasks() -> None:
+    class FakeTenant(Tenant):
+        pass
+
+    tenants = [FakeTenant() for _ in range(3)]
+
+    async def run(tenant: Tenant) -> Tenant:
+        with context.with_tenant_context(tenant):
+            context.name = str(id(tenant))
+
+            # 交出执行权, 让其它任务修改各自的上下文
+            await asyncio.sleep(0)
+
+            assert context.name == str(id(tenant))
+            return context.get_current_tenant()
+
+    async def main() -> List[Tenant]:
+        return await asyncio.gather(*[run(t) for t in tenants])
+
+    # 每个任务都只能看到自己设置的租户和属性
+    assert asyncio.run(main()) == tenants
+
+    # 任务中的修改不会影响当前上下文
+    assert context.get_current_tenant() is None
+    assert context.name is None
+
+
+def test_nested_tenant_context() -> None:
+    outer, inner = Tenant(), Tenant()
+
+    with context.with_tenant_context(outer):
+        with context.with_tenant_context(inner):
+            assert context.tenant is inner
+            assert context["_tenant"] is inner
+
+        # 退出内层作用域后, 恢复外层作用域的租户
+        assert context.tenant is outer
+
+    assert context.tenant is None
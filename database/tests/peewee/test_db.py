@@ -0,0 +1,109 @@
+import threading
+import time
+from pathlib import Path
+from typing import cast
+
+import pytest
+from playhouse.pool import MaxConnectionsExceeded
+
+from database.peewee_.core import create_database
+from database.peewee_.core.db import MeteredPooledSqliteDatabase
+
+
+def test_sqlite_profile(tmp_path: Path) -> None:
+    """测试基于文件的 SQLite 数据库配置"""
+    db = create_database("sqlite", database=str(tmp_path / "test.db"))
+    with db.connection_context():
+        assert db.execute_sql("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        # `synchronous=NORMAL` 对应的值为 `1`
+        assert db.execute_sql("PRAGMA synchronous").fetchone()[0] == 1
+        assert db.execute_sql("PRAGMA cache_size").fetchone()[0] == -64 * 1024
+
+
+def test_pooled_sqlite_profile(tmp_path: Path) -> None:
+    """测试 SQLite 连接池的统计信息和过期连接回收"""
+    db = cast(
+        MeteredPooledSqliteDatabase,
+        create_database("pooled-sqlite", database=str(tmp_path / "test.db"), stale_timeout=1),
+    )
+
+    # 连接归还后再次获取, 会复用连接池中的连接
+    for _ in range(3):
+        with db.connection_context():
+            assert db.execute_sql("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    stats = db.stats()
+    assert stats.checkouts == 3
+    assert stats.opened == 1
+    assert stats.in_use == 0
+    assert stats.idle == 1
+
+    # 正在使用的连接即使超过最大存活时间也不会被回收
+    db.connect()
+    time.sleep(1.1)
+    assert db.reap() == 0
+
+    stats = db.stats()
+    assert stats.in_use == 1
+    assert stats.closed == 0
+    db.close()
+
+    # 归还后空闲连接已超过最大存活时间, 由 peewee 关闭
+    stats = db.stats()
+    assert stats.in_use == 0
+    assert stats.idle == 0
+    assert stats.closed == 1
+
+    # 空闲连接超过最大存活时间后被回收
+    with db.connection_context():
+        pass
+
+    time.sleep(1.1)
+    assert db.reap() == 1
+
+    stats = db.stats()
+    assert stats.idle == 0
+    assert stats.closed == 2
+
+
+def test_pool_wait(tmp_path: Path) -> None:
+    """测试连接池已满时, 等待其它连接归还的时间计入统计信息"""
+    db = cast(
+        MeteredPooledSqliteDatabase,
+        create_database("pooled-sqlite", database=str(tmp_path / "test.db"), max_connections=1, wait_timeout=1),
+    )
+
+    acquired = threading.Event()
+    release = threading.Event()
+
+    def hold() -> None:
+        # 在另一个线程中占用唯一的连接, 直到收到归还的通知
+        with db.connection_context():
+            acquired.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    acquired.wait()
+
+    # 连接池已满, 等待超时
+    with pytest.raises(MaxConnectionsExceeded):
+        db.connect()
+
+    stats = db.stats()
+    assert stats.timeouts == 1
+    assert stats.checkouts == 1
+    assert stats.max_wait >= 1
+
+    # 连接在等待期间被归还, 等待的时间计入获取连接的耗时
+    threading.Timer(0.2, release.set).start()
+    with db.connection_context():
+        pass
+    thread.join()
+
+    stats = db.stats()
+    assert stats.timeouts == 1
+    assert stats.checkouts == 2
+    assert stats.opened == 1
+    assert stats.total_wait >= 1.2
@@ -256,3 +256,81 @@ def test_sub_query() -> None:
     assert department.org_id == cast(Org, context.get_current_tenant()).id
     assert department.created_by == cast(Employee, context.get_current_user()).id
     assert department.manager == created_emp
+
+
+def test_tenant_filter() -> None:
+    """测试租户查询条件的缓存和租户复合索引"""
+    # 同一租户下, 每个模型类型的查询条件只构建一次
+    expr = Department.tenant_filter()
+    assert expr is not None
+    assert Department.tenant_filter() is expr
+    assert Employee.tenant_filter() is not expr
+
+    # 租户发生变化后, 查询条件重新构建
+    other_org = OrgFactory.create()
+    with context.with_tenant_context(other_org):
+        assert Department.tenant_filter() is not expr
+        assert Department.select().count() == 0
+
+    # 所有多租户模型的索引均以租户字段开头
+    for model in (Department, Role, Employee):
+        indexes = model._meta.indexes
+        assert indexes
+        assert all(fields[0] == "org_id" for fields, _ in indexes)
+
+
+def test_bulk_insert() -> None:
+    """测试以字典形式批量插入记录"""
+    org = cast(Org, context.get_current_tenant())
+    user = cast(Employee, context.get_current_user())
+
+    # 5 条记录分 2 批插入
+    n = Department.bulk_insert(
+        [{"name": f"BULK-INSERT-{i}", "level": i} for i in range(5)], batch_size=3
+    )
+    assert n == 5
+
+    departments = list(
+        Department.select()
+        .where(Department.name.startswith("BULK-INSERT-"))  # type: ignore[attr-defined, unused-ignore]
+        .order_by(Department.level)
+    )
+    assert [d.level for d in departments] == list(range(5))
+
+    # 每条记录都设置了审计和租户字段
+    for department in departments:
+        assert department.org_id == org.id
+        assert department.created_by == user.id
+        assert department.updated_by == user.id
+        assert department.created_at is not None
+        assert department.updated_at == department.created_at
+
+
+def test_bulk_create_and_update() -> None:
+    """测试批量插入和更新模型对象"""
+    org = cast(Org, context.get_current_tenant())
+    user = cast(Employee, context.get_current_user())
+
+    departments = [Department(name=f"BULK-CREATE-{i}", level=i) for i in range(5)]
+    Department.bulk_create(departments, batch_size=2)
+
+    for department in departments:
+        assert department.org_id == org.id
+        assert department.created_by == user.id
+        assert department.created_at is not None
+
+    ids = [d.id for d in Department.select().where(Department.name.startswith("BULK-CREATE-"))]  # type: ignore[attr-defined, unused-ignore]
+    assert len(ids) == 5
+
+    # 批量更新时, 同时更新审计字段
+    departments = list(Department.select().where(Department.id.in_(ids)))  # type: ignore[attr-defined, unused-ignore]
+    updated_at = departments[0].updated_at
+    for department in departments:
+        department.level += 10
+
+    assert Department.bulk_update(departments, ["level"], batch_size=2) == 5
+
+    for department in Department.select().where(Department.id.in_(ids)):  # type: ignore[attr-defined, unused-ignore]
+        assert department.level >= 10
+        assert department.updated_at >= updated_at
+        assert department.updated_at == departments[0].updated_at
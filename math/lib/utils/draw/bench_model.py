@@ -0,0 +1,118 @@
+"""
+模型绘制每帧耗时测试
+
+读取 `teapot.off` 茶壶模型, 以随时间旋转的矩阵作为 `get_matrix`, 对比 `draw_model` 绘制一帧所需的 CPU 计算:
+
+- `legacy`: 原有实现, 每个顶点调用一次 `get_matrix` 并通过 `polygon_map` 变换, 每个三角形调用一次 `shade`, 之后每个顶点
+  调用一次 `glColor3fv` 和 `glVertex3fv` 提交
+- `batch`: 每帧调用一次 `get_matrix`, 通过 `frame_arrays` 一次完成全部顶点的变换, 法向量和色板查找, 之后通过一次
+  `glDrawArrays` 提交
+
+测试无需显示设备和 OpenGL 上下文, 提交数据的 OpenGL 函数以只记录调用次数的空函数代替, 因此结果只包含 Python 和
+NumPy 的计算耗时, 不包含驱动和 GPU 的耗时
+
+执行方式:
+
+```bash
+python -m utils.draw.bench_model [帧数]
+```
+"""
+
+import math
+import statistics
+import sys
+import time
+from typing import Callable, List, Tuple, cast
+
+import numpy as np
+from utils.draw.model import frame_arrays
+from utils.draw.shading import shade
+from utils.draw.teapot import load_model
+from utils.transform import polygon_map
+from utils.typedef import Matrix, Triangle, Vector3D
+from utils.vector import multiply_matrix_vector
+
+
+def _get_matrix(ticks: int) -> Matrix:
+    """随时间绕 y 轴旋转的矩阵, 每秒旋转一周"""
+    angle = ticks / 1000 * 2 * math.pi
+    c, s = math.cos(angle), math.sin(angle)
+    return [(c, 0, -s), (0, 1, 0), (s, 0, c)]  # type: ignore[return-value]
+
+
+def _time(func: Callable[[int], int], frames: int) -> Tuple[float, float, int]:
+    """逐帧执行函数, 统计每帧耗时
+
+    Args:
+        `func` (`Callable[[int], int]`): 绘制一帧的函数, 参数为帧序号, 返回提交数据的 OpenGL 调用次数
+        `frames` (`int`): 帧数
+
+    Returns:
+        `Tuple[float, float, int]`: 每帧耗时的中位数和 p95 (毫秒), 以及每帧的 OpenGL 调用次数
+    """
+    calls = func(0)
+
+    times: List[float] = []
+    for i in range(frames):
+        start = time.perf_counter()
+        func(i)
+        times.append((time.perf_counter() - start) * 1000)
+
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95)], calls
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    faces = load_model()
+    arr = np.asarray(faces, dtype=np.float64)
+
+    def legacy(frame: int) -> int:
+        ticks = frame * 16
+        calls = 0
+
+        def gl_call(*args: object) -> None:
+            nonlocal calls
+            calls += 1
+
+        def do_matrix_transform(v: Vector3D) -> Vector3D:
+            m = _get_matrix(ticks)
+            return cast(Vector3D, multiply_matrix_vector(m, v))
+
+        transformed_faces: List[Triangle] = polygon_map(do_matrix_transform, faces)
+        for face in transformed_faces:
+            color = shade(face)
+            for vertex in face:
+                gl_call((color[0], color[1], color[2]))
+                gl_call(vertex)
+
+        return calls
+
+    def batch(frame: int) -> int:
+        vertices, colors = frame_arrays(arr, _get_matrix(frame * 16))
+
+        # 对应 `gl_draw_arrays` 中的 glVertexPointer, glColorPointer 和 glDrawArrays
+        assert vertices.flags.c_contiguous and colors.flags.c_contiguous
+        return 3
+
+    # 两种方式的结果需一致
+    vertices, colors = frame_arrays(arr, _get_matrix(123))
+    expected = polygon_map(lambda v: cast(Vector3D, multiply_matrix_vector(_get_matrix(123), v)), faces)
+    assert np.allclose(vertices, np.asarray(expected).reshape(-1, 3), atol=1e-5)
+    assert np.allclose(colors[::3], [shade(f)[:3] for f in expected], atol=1e-5)
+
+    print(f"teapot: {len(faces)} triangles, {frames} frames")
+    print(f"{'impl':<8}{'p50 ms':>10}{'p95 ms':>10}{'max FPS':>10}{'GL calls':>10}")
+
+    results = {}
+    for name, func in (("legacy", legacy), ("batch", batch)):
+        p50, p95, calls = _time(func, frames)
+        results[name] = p50
+        print(f"{name:<8}{p50:>10.3f}{p95:>10.3f}{1000 / p50:>10.0f}{calls:>10}")
+
+    print(f"speedup {results['legacy'] / results['batch']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
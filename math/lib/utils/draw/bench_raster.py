@@ -0,0 +1,109 @@
+"""
+离屏渲染帧率测试
+
+读取 `teapot.off` 茶壶模型, 以随时间绕 y 轴旋转的矩阵作为 `get_matrix`, 统计 `render_model` 每帧的耗时 (变换, 着色和
+光栅化), 对比如下两种光栅化方式:
+
+- `loop`: 逐个三角形处理, 每个三角形对其包围盒内的像素执行一次 NumPy 运算
+- `batch`: `Rasterizer`, 一次生成全部三角形的片段, 统一执行边函数判断和深度测试
+
+执行方式:
+
+```bash
+python -m utils.draw.bench_raster [帧数] [图像边长]
+```
+"""
+
+import math
+import statistics
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+from utils import mesh
+from utils.draw.raster import Image, Rasterizer
+from utils.draw.shading import shade_faces
+from utils.draw.teapot import load_mesh
+from utils.mesh import Faces
+
+
+def _get_matrix(ticks: int) -> np.ndarray:
+    """随时间绕 y 轴旋转的矩阵, 每秒旋转一周"""
+    return mesh.rotation_y(ticks / 1000 * 2 * math.pi).T
+
+
+def _loop_render(r: Rasterizer, faces: Faces, colors: np.ndarray) -> Image:
+    """逐个三角形光栅化, 投影, 剔除和深度测试的规则和 `Rasterizer` 一致"""
+    w, h = r.width, r.height
+    image = np.zeros((h, w, 3), dtype=np.uint8)
+    depth = np.full((h, w), np.inf)
+    rgb = (colors[:, :3] * 255 + 0.5).astype(np.uint8)
+
+    xs, ys, zs = r._project(faces)
+    for x, y, z, color in zip(xs, ys, zs, rgb):
+        area = (x[1] - x[0]) * (y[2] - y[0]) - (y[1] - y[0]) * (x[2] - x[0])
+        if area >= 0 or np.any(np.abs(z) > 1):
+            continue
+
+        x0, x1 = max(math.ceil(x.min() - 0.5), 0), min(math.floor(x.max() - 0.5), w - 1)
+        y0, y1 = max(math.ceil(y.min() - 0.5), 0), min(math.floor(y.max() - 0.5), h - 1)
+        if x0 > x1 or y0 > y1:
+            continue
+
+        cy, cx = np.mgrid[y0: y1 + 1, x0: x1 + 1] + 0.5
+        bary = [((x[k] - x[j]) * (cy - y[j]) - (y[k] - y[j]) * (cx - x[j])) / area for j, k in ((1, 2), (2, 0), (0, 1))]
+        pz = bary[0] * z[0] + bary[1] * z[1] + bary[2] * z[2]
+
+        region = depth[y0: y1 + 1, x0: x1 + 1]
+        mask = (bary[0] >= 0) & (bary[1] >= 0) & (bary[2] >= 0) & (pz < region)
+        region[mask] = pz[mask]
+        image[y0: y1 + 1, x0: x1 + 1][mask] = color
+
+    return image
+
+
+def _time(func: Callable[[int], object], frames: int) -> Tuple[float, float]:
+    """逐帧执行函数, 返回每帧耗时的中位数和 p95 (毫秒)"""
+    func(0)
+
+    times: List[float] = []
+    for i in range(frames):
+        start = time.perf_counter()
+        func(i)
+        times.append((time.perf_counter() - start) * 1000)
+
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95)]
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+    faces = load_mesh().faces
+    r = Rasterizer(size, size)
+
+    def frame(i: int) -> Tuple[Faces, np.ndarray]:
+        transformed = mesh.multiply_matrix_vector(_get_matrix(i * 33), faces)
+        return transformed, shade_faces(transformed)
+
+    # 两种方式的结果需一致
+    for i in (0, 7, 20):
+        assert np.array_equal(_loop_render(r, *frame(i)), r.render(*frame(i)))
+
+    print(f"teapot: {len(faces)} triangles, {size}x{size}, {frames} frames")
+    print(f"{'impl':<8}{'p50 ms':>10}{'p95 ms':>10}{'FPS':>8}")
+
+    results = {}
+    for name, render in (("loop", lambda i: _loop_render(r, *frame(i))), ("batch", lambda i: r.render(*frame(i)))):
+        p50, p95 = _time(render, frames)
+        results[name] = p50
+        print(f"{name:<8}{p50:>10.2f}{p95:>10.2f}{1000 / p50:>8.0f}")
+
+    shade_ms, _ = _time(frame, frames)
+    print(f"speedup {results['loop'] / results['batch']:.1f}x, transform + shading {shade_ms:.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
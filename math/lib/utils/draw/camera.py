@@ -2,6 +2,8 @@ import os
 from math import ceil
 from typing import List, Optional, Union, cast
 
+import numpy as np
+from numpy.typing import NDArray
 from pygame import Surface
 from pygame.image import save
 from pygame.time import Clock
@@ -12,7 +14,7 @@ class Camera:
 
     shots: Union[List[int], int]
     remaining_shots: Union[List[int], int]
-    window: Optional[Surface]
+    window: Optional[Union[Surface, NDArray[np.uint8]]]
 
     def __init__(
         self,
@@ -41,7 +43,8 @@ class Camera:
         if isinstance(shots, list):
             shots = sorted(shots)
             self.shots = shots
-            self.remaining_shots = shots
+            # 复制列表, 拍摄时只从剩余的拍摄时间中删除
+            self.remaining_shots = list(shots)
         else:
             self.shots = shots
             self.remaining_shots = shots
@@ -49,12 +52,13 @@ class Camera:
         self.total_ticks = 0
         self.made_comic_strip = False
         self.comic_strip = comic_strip
+        self.window = None
 
-    def set_window(self, window: Surface) -> None:
-        """_summary_
+    def set_window(self, window: Union[Surface, NDArray[np.uint8]]) -> None:
+        """设置拍摄的窗口
 
         Args:
-            window (Surface): _description_
+            `window` (`Union[Surface, NDArray[np.uint8]]`): pygame 窗口, 或离屏渲染的 `(高, 宽, 3)` 图像数组
         """
         self.window = window
 
@@ -103,7 +107,7 @@ class Camera:
 
         for i, im in enumerate(images):
             x_offset = (i % self.comic_strip) * width
-            y_offset = (i / self.comic_strip) * height
+            y_offset = (i // self.comic_strip) * height
             print("offsets", (x_offset, y_offset))
             new_im.paste(im, (x_offset, int(y_offset)))
 
@@ -122,7 +126,9 @@ class Camera:
                 and self.total_ticks >= self.remaining_shots[0]
             )
         else:
-            return self.get_fps() > 0 and (self.remaining_shots > 0)
+            # 离屏渲染无需等待窗口显示
+            ready = self.get_fps() > 0 or isinstance(self.window, np.ndarray)
+            return ready and (self.remaining_shots > 0)
 
     def shoot(self) -> None:
         """_summary_"""
@@ -134,15 +140,23 @@ class Camera:
             self.remaining_shots = self.remaining_shots - 1
 
         image_name = os.path.join(self.dir, self.name + str(idx) + ".png")
-        save(self.window, image_name)  # type: ignore
+        if isinstance(self.window, np.ndarray):
+            from PIL import Image
 
-    def tick(self) -> int:
-        """_summary_
+            Image.fromarray(self.window).save(image_name)
+        else:
+            save(self.window, image_name)  # type: ignore
+
+    def tick(self, elapsed: Optional[int] = None) -> int:
+        """前进一帧, 到达拍摄时间时保存图片
+
+        Args:
+            `elapsed` (`Optional[int]`, optional): 该帧经过的毫秒数, `None` 表示使用实际经过的时间. Defaults to `None`.
 
         Returns:
-            int: _description_
+            `int`: 该帧经过的毫秒数
         """
-        res = self.clock.tick()
+        res = self.clock.tick() if elapsed is None else elapsed
         self.total_ticks += res
         if self.should_shoot():
             self.shoot()
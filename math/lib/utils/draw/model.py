@@ -1,35 +1,60 @@
-from typing import Any, Callable, Optional, Sequence, Tuple, cast
+from typing import Callable, Optional, Sequence, Tuple
 
-import matplotlib as mpl
+import numpy as np
 import OpenGL.GL as gl
 import OpenGL.GLU as glu
 import pygame as game
 from matplotlib.colors import Colormap
-from utils.draw.camera import default_camera
-from utils.transform import polygon_map
+from numpy.typing import ArrayLike, NDArray
+from utils import mesh
+from utils.draw import camera
+from utils.draw.shading import blues, shade_faces
+from utils.mesh import Faces
 from utils.typedef import Matrix, Triangle, Vector3D
-from utils.vector import dot, multiply_matrix_vector, normal, unit
 
-_blues: Colormap = mpl.colormaps["Blues"]  # type: ignore
 
-
-def shade(
-    face: Triangle,
-    color_map: Colormap = _blues,
+def frame_arrays(
+    faces: Faces,
+    matrix: Optional[Matrix | ArrayLike] = None,
+    color_map: Colormap = blues,
     light: Vector3D = (1, 2, 3),
-) -> Tuple[Any, ...] | Any:
-    """计算 3D 图形的阴影色板
+) -> Tuple[NDArray[np.float32], NDArray[np.float32]]:
+    """计算绘制一帧所需的顶点数组和颜色数组
 
     Args:
-        `face` (`Triangle`): 要绘制的三角形平面
-        `color_map` (`Type[Colormap]`): 色板类型
-        `light` (`Vector3D`): 入射光线向量
+        `faces` (`Faces`): 三角形数组, 形状为 `(M, 3, 3)`
+        `matrix` (`Optional[Matrix | ArrayLike]`, optional): 变换矩阵, 含义和 `utils.vector.multiply_matrix_vector`
+        一致, `None` 表示不变换. Defaults to `None`.
+        `color_map` (`Colormap`, optional): 色板. Defaults to `blues`.
+        `light` (`Vector3D`, optional): 入射光线向量. Defaults to `(1, 2, 3)`.
 
     Returns:
-        `Tuple[Any, ...] | Any`: 颜色值
+        `Tuple[NDArray[np.float32], NDArray[np.float32]]`: 顶点数组和颜色数组, 形状均为 `(M * 3, 3)`, 每个三角形的
+        三个顶点使用该三角形的颜色
+    """
+    if matrix is not None:
+        faces = mesh.multiply_matrix_vector(matrix, faces)
+
+    colors = np.repeat(shade_faces(faces, color_map, light), 3, axis=0)
+    return np.ascontiguousarray(faces, dtype=np.float32).reshape(-1, 3), colors
+
+
+def gl_draw_arrays(vertices: NDArray[np.float32], colors: NDArray[np.float32]) -> None:
+    """通过顶点数组和颜色数组, 一次调用绘制全部三角形
+
+    Args:
+        `vertices` (`NDArray[np.float32]`): 顶点数组, 形状为 `(N, 3)`
+        `colors` (`NDArray[np.float32]`): 颜色数组, 形状为 `(N, 3)`
     """
-    # 根据入射光线和平面法线的对齐程度, 计算颜色深浅
-    return color_map(1 - dot(unit(normal(face)), unit(light)))
+    gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+    gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+
+    gl.glVertexPointer(3, gl.GL_FLOAT, 0, vertices)
+    gl.glColorPointer(3, gl.GL_FLOAT, 0, colors)
+    gl.glDrawArrays(gl.GL_TRIANGLES, 0, len(vertices))
+
+    gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+    gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
 
 
 def gl_axes() -> None:
@@ -55,7 +80,7 @@ GlRotatefArgs = Tuple[float, float, float, float]
 
 def draw_model(
     faces: Sequence[Triangle],
-    color_map: Colormap = _blues,
+    color_map: Colormap = blues,
     light: Vector3D = (1, 2, 3),
     gl_rotatef_args: Optional[GlRotatefArgs] = None,
     get_matrix: Optional[Callable[[int], Matrix]] = None,
@@ -64,7 +89,7 @@ def draw_model(
 
     Args:
         `faces` (`Sequence[Triangle]`): 多面体模型
-        `color_map` (Colormap, optional): 绘图用的色板. Defaults to `_blues`.
+        `color_map` (Colormap, optional): 绘图用的色板. Defaults to `blues`.
         `light` (`Vector3D`, optional): 光线向量. Defaults to `(1, 2, 3)`.
         `gl_rotatef_args` (`Optional[GlRotatefArgs]`, optional): `gl.glRotatef` 函数的参数. Defaults to `None`.
         `get_matrix` (`Optional[Callable[[int], Matrix]]`, optional): 获取向量矩阵的函数. Defaults to `None`.
@@ -78,8 +103,8 @@ def draw_model(
         game.DOUBLEBUF | game.OPENGL,  # 显示属性
     )
 
-    # 获取相机
-    cam = default_camera
+    # 获取相机, 在调用时获取, 以便调用前替换 `camera.default_camera`
+    cam = camera.default_camera
     # 设置相机视窗
     cam.set_window(win)
 
@@ -93,12 +118,14 @@ def draw_model(
     gl.glEnable(gl.GL_DEPTH_TEST)
     gl.glCullFace(gl.GL_BACK)
 
-    def do_matrix_transform(v: Vector3D) -> Vector3D:
-        if get_matrix:
-            m = get_matrix(game.time.get_ticks())
-            return cast(Vector3D, multiply_matrix_vector(m, v))
+    color_map = color_map or blues
+
+    # 模型只转为数组一次, 之后每帧对全部顶点执行一次矩阵运算
+    arr: Faces = np.asarray(faces, dtype=np.float64).reshape(-1, 3, 3)
 
-        return v
+    # 不随时间变换时, 每帧绘制的内容相同, 只需计算一次
+    if get_matrix is None:
+        vertices, colors = frame_arrays(arr, None, color_map, light)
 
     while cam.is_shooting():
         for event in game.event.get():
@@ -109,19 +136,11 @@ def draw_model(
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)  # type: ignore
         gl_axes()
 
-        gl.glBegin(gl.GL_TRIANGLES)
-
-        transformed_faces = polygon_map(do_matrix_transform, faces)
-
-        if not color_map:
-            color_map = mpl.cm.get_cmap("Blues")  # type: ignore[attr-defined]
+        if get_matrix:
+            # 每帧只获取一次矩阵
+            vertices, colors = frame_arrays(arr, get_matrix(game.time.get_ticks()), color_map, light)
 
-        for face in transformed_faces:
-            color = shade(face, color_map, light)
-            for vertex in face:
-                gl.glColor3fv((color[0], color[1], color[2]))
-                gl.glVertex3fv(vertex)
+        gl_draw_arrays(vertices, colors)
 
-        gl.glEnd()
         cam.tick()
         game.display.flip()
@@ -0,0 +1,288 @@
+"""不依赖 OpenGL 和显示设备的离屏渲染
+
+`Rasterizer` 使用和 `utils.draw.model.draw_model` 相同的投影 (`gluPerspective(45, 1, 0.1, 50)` 以及沿 z 轴移动 `-5`),
+背面剔除和深度测试, 通过 NumPy 将三角形渲染为 `(高, 宽, 3)` 形状的 RGB 图像数组:
+
+1. 全部顶点通过一次矩阵乘法投影到屏幕坐标
+2. 计算每个三角形三条边的边函数 (edge function) 系数, 以及深度值关于屏幕坐标的平面方程
+3. 一次生成全部三角形包围盒内的像素, 通过边函数判断像素是否在三角形内, 并计算像素的深度
+4. 按像素和深度排序, 每个像素取深度最小的片段写入图像和深度缓冲区
+
+`render_model` 和 `draw_model` 的参数一致, 将每一帧的图像交给 `Camera` 保存, 可以在没有显示设备的环境中生成图片
+"""
+
+from math import cos, radians, sin, tan
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib.colors import Colormap
+from numpy.typing import NDArray
+from utils import mesh
+from utils.draw import camera
+from utils.draw.camera import Camera
+from utils.draw.shading import blues, shade_faces
+from utils.mesh import Faces
+from utils.typedef import Matrix, Triangle, Vector3D
+
+# RGB 图像数组, 形状为 `(高, 宽, 3)`
+Image = NDArray[np.uint8]
+
+# glRotatef 函数参数类型, 和 `utils.draw.model.GlRotatefArgs` 一致
+GlRotatefArgs = Tuple[float, float, float, float]
+
+# 每批处理的最大片段数, 限制生成片段时的内存占用
+_MAX_FRAGMENTS = 1 << 20
+
+
+def perspective(fovy: float, aspect: float, near: float, far: float) -> NDArray[np.float64]:
+    """获取透视投影矩阵, 和 `gluPerspective` 一致
+
+    Args:
+        `fovy` (`float`): y 方向的视角 (角度)
+        `aspect` (`float`): 宽高比
+        `near` (`float`): 近平面距离
+        `far` (`float`): 远平面距离
+
+    Returns:
+        `NDArray[np.float64]`: `4x4` 投影矩阵, 作用于齐次坐标列向量
+    """
+    f = 1 / tan(radians(fovy) / 2)
+    return np.array(
+        [
+            [f / aspect, 0, 0, 0],
+            [0, f, 0, 0],
+            [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+            [0, 0, -1, 0],
+        ],
+        dtype=np.float64,
+    )
+
+
+def rotation(angle: float, x: float, y: float, z: float) -> NDArray[np.float64]:
+    """获取围绕任意轴旋转的矩阵, 和 `glRotatef` 一致
+
+    Args:
+        `angle` (`float`): 旋转角度 (角度)
+        `x` (`float`): 旋转轴的 x 分量
+        `y` (`float`): 旋转轴的 y 分量
+        `z` (`float`): 旋转轴的 z 分量
+
+    Returns:
+        `NDArray[np.float64]`: `4x4` 旋转矩阵, 作用于齐次坐标列向量
+    """
+    x, y, z = mesh.unit(np.array([x, y, z], dtype=np.float64))
+    c, s = cos(radians(angle)), sin(radians(angle))
+
+    m = np.eye(4, dtype=np.float64)
+    m[:3, :3] = [
+        [x * x * (1 - c) + c, x * y * (1 - c) - z * s, x * z * (1 - c) + y * s],
+        [y * x * (1 - c) + z * s, y * y * (1 - c) + c, y * z * (1 - c) - x * s],
+        [x * z * (1 - c) - y * s, y * z * (1 - c) + x * s, z * z * (1 - c) + c],
+    ]
+    return m
+
+
+class Rasterizer:
+    """通过 NumPy 将三角形渲染为图像数组的光栅化器"""
+
+    def __init__(
+        self,
+        width: int = 400,
+        height: int = 400,
+        gl_rotatef_args: Optional[GlRotatefArgs] = None,
+        background: Tuple[int, int, int] = (0, 0, 0),
+    ) -> None:
+        """构造器
+
+        Args:
+            `width` (`int`, optional): 图像宽度. Defaults to `400`.
+            `height` (`int`, optional): 图像高度. Defaults to `400`.
+            `gl_rotatef_args` (`Optional[GlRotatefArgs]`, optional): 对场景的旋转, 参数和 `gl.glRotatef` 一致.
+            Defaults to `None`.
+            `background` (`Tuple[int, int, int]`, optional): 背景颜色. Defaults to `(0, 0, 0)`.
+        """
+        self.width = width
+        self.height = height
+        self.background = np.array(background, dtype=np.uint8)
+
+        # 和 `draw_model` 一致: 透视投影, 沿 z 轴移动 -5, 再执行 `glRotatef`
+        view = mesh.affine(offset=(0, 0, -5))
+        if gl_rotatef_args:
+            view = view @ rotation(*gl_rotatef_args)
+
+        self.matrix: NDArray[np.float64] = perspective(45, width / height, 0.1, 50.0) @ view
+
+    def _project(self, faces: Faces) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+        """将三角形投影到屏幕坐标
+
+        Args:
+            `faces` (`Faces`): 三角形数组, 形状为 `(M, 3, 3)`
+
+        Returns:
+            `Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]`: 顶点的屏幕坐标 x, y (像素, y 轴
+            向下) 和深度 z (`-1` 到 `1`), 形状均为 `(M, 3)`
+        """
+        m = self.matrix
+        clip = faces @ m[:3, :3].T + m[:3, 3]
+        w = faces @ m[3, :3] + m[3, 3]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ndc = clip / w[..., None]
+
+        x = (ndc[..., 0] + 1) * (self.width / 2)
+        y = (1 - ndc[..., 1]) * (self.height / 2)
+        return x, y, np.where(w > 0, ndc[..., 2], np.inf)
+
+    def render(self, faces: Faces, colors: NDArray[np.floating]) -> Image:
+        """渲染一帧图像
+
+        和 OpenGL 的默认设置一致, 逆时针方向为三角形正面, 背面被剔除; 超出近平面或远平面的三角形整个被剔除, 而不进行裁剪
+
+        Args:
+            `faces` (`Faces`): 三角形数组, 形状为 `(M, 3, 3)`
+            `colors` (`NDArray[np.floating]`): 每个三角形的 RGB 颜色, 取值 `0~1`, 形状为 `(M, 3)`
+
+        Returns:
+            `Image`: 图像数组, 形状为 `(高, 宽, 3)`
+        """
+        w, h = self.width, self.height
+
+        image = np.empty((h * w, 3), dtype=np.uint8)
+        image[:] = self.background
+        depth = np.full(h * w, np.inf, dtype=np.float64)
+
+        x, y, z = self._project(np.asarray(faces, dtype=np.float64).reshape(-1, 3, 3))
+        rgb = (np.asarray(colors)[:, :3] * 255 + 0.5).astype(np.uint8)
+
+        # 三角形的有向面积, 屏幕 y 轴向下, 故逆时针 (正面) 的三角形面积为负数
+        area = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (y[:, 1] - y[:, 0]) * (x[:, 2] - x[:, 0])
+
+        # 包围盒内的像素, 以像素中心判断是否在三角形内
+        with np.errstate(invalid="ignore"):
+            x0 = np.maximum(np.ceil(x.min(axis=1) - 0.5), 0)
+            x1 = np.minimum(np.floor(x.max(axis=1) - 0.5), w - 1)
+            y0 = np.maximum(np.ceil(y.min(axis=1) - 0.5), 0)
+            y1 = np.minimum(np.floor(y.max(axis=1) - 0.5), h - 1)
+
+            visible = (area < 0) & np.all(np.abs(z) <= 1, axis=1) & (x0 <= x1) & (y0 <= y1)
+
+        tris = np.flatnonzero(visible)
+        if not len(tris):
+            return image.reshape(h, w, 3)
+
+        x, y, z, area = x[tris], y[tris], z[tris], area[tris]
+        x0, y0 = x0[tris].astype(np.intp), y0[tris].astype(np.intp)
+        bw = x1[tris].astype(np.intp) - x0 + 1
+        bh = y1[tris].astype(np.intp) - y0 + 1
+
+        # 顶点 i 的重心坐标 b_i = (a_i * px + b_i * py + c_i) / area, 由顶点 i 对边的边函数得到
+        j, k = [1, 2, 0], [2, 0, 1]
+        a = -(y[:, k] - y[:, j]) / area[:, None]
+        b = (x[:, k] - x[:, j]) / area[:, None]
+        c = -(a * x[:, j] + b * y[:, j])
+
+        # 像素深度为三个顶点深度以重心坐标加权, 同样为屏幕坐标的线性函数
+        da, db, dc = (a * z).sum(axis=1), (b * z).sum(axis=1), (c * z).sum(axis=1)
+
+        # 按顶点转置为一维数组, 之后按片段取系数时比按行取二维数组快得多
+        a, b, c = np.ascontiguousarray(a.T), np.ascontiguousarray(b.T), np.ascontiguousarray(c.T)
+
+        rgb = rgb[tris]
+
+        # 按片段数分批处理三角形, 每批生成全部三角形包围盒内的片段
+        counts = bw * bh
+        ends = np.cumsum(counts)
+        start = 0
+        while start < len(tris):
+            stop = max(int(np.searchsorted(ends, ends[start] - counts[start] + _MAX_FRAGMENTS, side="right")), start + 1)
+            n = counts[start:stop]
+
+            # 每个片段所属的三角形, 以及片段在包围盒内的位置
+            t = np.repeat(np.arange(start, stop), n)
+            dy, dx = np.divmod(np.arange(len(t)) - np.repeat(np.cumsum(n) - n, n), bw[t])
+            px, py = x0[t] + dx, y0[t] + dy
+            cx, cy = px + 0.5, py + 0.5
+
+            # 三个重心坐标均不小于 0 时, 像素中心在三角形内
+            inside = a[0][t] * cx + b[0][t] * cy + c[0][t] >= 0
+            for i in (1, 2):
+                inside &= a[i][t] * cx + b[i][t] * cy + c[i][t] >= 0
+
+            t, pix = t[inside], (py * w + px)[inside]
+            fz = da[t] * cx[inside] + db[t] * cy[inside] + dc[t]
+
+            # 只保留比深度缓冲区更近的片段
+            nearer = fz < depth[pix]
+            t, pix, fz = t[nearer], pix[nearer], fz[nearer]
+
+            # 深度在 -1~1 之间, 映射到 0~0.5 作为像素序号的小数部分, 一次排序即按像素和深度排序, 每个像素取深度最小的片段
+            order = np.argsort(pix + (fz + 1) * 0.25)
+            pix = pix[order]
+            first = np.ones(len(pix), dtype=bool)
+            first[1:] = pix[1:] != pix[:-1]
+
+            win = order[first]
+            depth[pix[first]] = fz[win]
+            image[pix[first]] = rgb[t[win]]
+
+            start = stop
+
+        return image.reshape(h, w, 3)
+
+
+def render_model(
+    faces: Sequence[Triangle],
+    color_map: Colormap = blues,
+    light: Vector3D = (1, 2, 3),
+    gl_rotatef_args: Optional[GlRotatefArgs] = None,
+    get_matrix: Optional[Callable[[int], Matrix]] = None,
+    size: Tuple[int, int] = (400, 400),
+    fps: int = 30,
+    frames: Optional[int] = None,
+    cam: Optional[Camera] = None,
+) -> Image:
+    """离屏渲染模型, 参数和 `utils.draw.model.draw_model` 一致
+
+    每帧的图像交给相机, 由相机按照设定的时间保存图片; 时间不取决于实际耗时, 而是按照 `fps` 计算, 每帧前进
+    `1000 / fps` 毫秒
+
+    Args:
+        `faces` (`Sequence[Triangle]`): 多面体模型
+        `color_map` (`Colormap`, optional): 绘图用的色板. Defaults to `blues`.
+        `light` (`Vector3D`, optional): 光线向量. Defaults to `(1, 2, 3)`.
+        `gl_rotatef_args` (`Optional[GlRotatefArgs]`, optional): `gl.glRotatef` 函数的参数. Defaults to `None`.
+        `get_matrix` (`Optional[Callable[[int], Matrix]]`, optional): 获取向量矩阵的函数. Defaults to `None`.
+        `size` (`Tuple[int, int]`, optional): 图像宽度和高度. Defaults to `(400, 400)`.
+        `fps` (`int`, optional): 每秒帧数. Defaults to `30`.
+        `frames` (`Optional[int]`, optional): 最多渲染的帧数, `None` 表示直到相机拍摄完毕. Defaults to `None`.
+        `cam` (`Optional[Camera]`, optional): 相机, `None` 表示 `camera.default_camera`. Defaults to `None`.
+
+    Raises:
+        `ValueError`: 相机没有设定拍摄时间, 且没有限制帧数
+
+    Returns:
+        `Image`: 最后一帧的图像
+    """
+    cam = cam or camera.default_camera
+    if frames is None and not cam.shots:
+        raise ValueError("Either frames or camera shots must be given")
+
+    color_map = color_map or blues
+    rasterizer = Rasterizer(size[0], size[1], gl_rotatef_args)
+
+    arr: Faces = np.asarray(faces, dtype=np.float64).reshape(-1, 3, 3)
+
+    # 不随时间变换时, 每帧的图像相同, 只需渲染一次
+    image = rasterizer.render(arr, shade_faces(arr, color_map, light)) if get_matrix is None else None
+
+    count = 0
+    while cam.is_shooting() and (frames is None or count < frames):
+        if get_matrix:
+            transformed = mesh.multiply_matrix_vector(get_matrix(cam.total_ticks), arr)
+            image = rasterizer.render(transformed, shade_faces(transformed, color_map, light))
+
+        cam.set_window(image)  # type: ignore[arg-type]
+        cam.tick(1000 // fps)
+        count += 1
+
+    return image  # type: ignore[return-value]
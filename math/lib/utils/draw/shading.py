@@ -0,0 +1,56 @@
+"""计算 3D 图形的阴影颜色
+
+本模块不依赖 OpenGL, 可同时用于 `utils.draw.model` 的 OpenGL 绘制和 `utils.draw.raster` 的离屏渲染
+"""
+
+from typing import Any, Tuple
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.colors import Colormap
+from numpy.typing import NDArray
+from utils import mesh
+from utils.mesh import Faces
+from utils.typedef import Triangle, Vector3D
+from utils.vector import dot, normal, unit
+
+blues: Colormap = mpl.colormaps["Blues"]  # type: ignore
+
+
+def shade(
+    face: Triangle,
+    color_map: Colormap = blues,
+    light: Vector3D = (1, 2, 3),
+) -> Tuple[Any, ...] | Any:
+    """计算 3D 图形的阴影色板
+
+    Args:
+        `face` (`Triangle`): 要绘制的三角形平面
+        `color_map` (`Type[Colormap]`): 色板类型
+        `light` (`Vector3D`): 入射光线向量
+
+    Returns:
+        `Tuple[Any, ...] | Any`: 颜色值
+    """
+    # 根据入射光线和平面法线的对齐程度, 计算颜色深浅
+    return color_map(1 - dot(unit(normal(face)), unit(light)))
+
+
+def shade_faces(
+    faces: Faces,
+    color_map: Colormap = blues,
+    light: Vector3D = (1, 2, 3),
+) -> NDArray[np.float32]:
+    """批量计算全部三角形的颜色, 和对每个三角形调用 `shade` 的结果一致
+
+    Args:
+        `faces` (`Faces`): 三角形数组, 形状为 `(M, 3, 3)`
+        `color_map` (`Colormap`, optional): 色板. Defaults to `blues`.
+        `light` (`Vector3D`, optional): 入射光线向量. Defaults to `(1, 2, 3)`.
+
+    Returns:
+        `NDArray[np.float32]`: RGB 颜色数组, 形状为 `(M, 3)`
+    """
+    # 全部法向量和光线向量的点积通过一次矩阵乘法完成, 色板也只需查找一次
+    intensity = 1 - mesh.unit(mesh.normal(faces)) @ mesh.unit(np.asarray(light, dtype=np.float64))
+    return np.asarray(color_map(intensity), dtype=np.float32)[:, :3]
@@ -1,59 +1,44 @@
 """绘制一个茶壶 3D 图形"""
 
-from functools import partial
 from math import pi
 from os import path
-from typing import Iterable, List, cast
+from typing import Iterable, List
 
-from utils.transform import rotate_x, triangulate
+import numpy as np
+from utils.mesh import Mesh, affine, rotation_x
+from utils.mesh.loader import load_mesh_cached, parse_off_polygons
 from utils.typedef import Triangle, Vector3D
-from utils.vector import add, as_vector3d, scale
 
-# 打开模型文件
-with open(path.join(path.dirname(__file__), "models/teapot.off")) as f:
-    lines = f.readlines()
+# 模型文件
+# 文件的第二行包含了向量, 面和边的数量, 之后每行保存一个向量, 格式为: x y z
+# 最后每行保存一个面 (多边形), 格式为: 4 向量1序号 向量2序号 向量3序号 向量4序号
+_MODEL_FILE = path.join(path.dirname(__file__), "models/teapot.off")
 
-# 读取模型文件的第一行, 包含了向量, 面和边的数量
-# 前 `vertex_count` 行保存向量, 格式为: x y z
-# 前 `vertex_count~face_count` 行保存面 (三角形), 格式为: 4 向量1行数 向量2行数 向量3行数
-vertex_count, face_count, edge_count = map(int, lines[1].split())
+# 读取模型后对向量执行的变换, 依次为:
+# 将向量的 x 轴和 z 轴移动一段距离, 将向量沿 x 轴顺时针转动 90°, 将向量长度放大 2 倍
+_TRANSFORM = affine(2 * np.eye(3)) @ affine(rotation_x(-pi / 2)) @ affine(offset=(-0.5, 0, -0.6))
 
 
-def load_vertices() -> List[Vector3D]:
-    """读取模型中的向量
+def load_mesh() -> Mesh:
+    """读取茶壶的网格模型
 
-    `teapot.off` 文件的每一行为一个三维向量
+    模型文件在第一次调用时读取, 之后返回同一个对象
 
     Returns:
-        `List[Vector3D]`: 读取的结果
+        `Mesh`: 网格模型, 顶点的顺序和模型文件中一致
     """
-    # 获取将向量放大两倍的函数
-    scale_by = partial(scale, 2)
-
-    # 获取将向量沿 y 轴顺时针转动 90° 的函数
-    rotate_x_by = partial(rotate_x, -pi / 2)
-
-    # 将向量的 x 轴和 z 轴移动一段距离的函数
-    translate_by = partial(add, (-0.5, 0, -0.6))
-
-    # 保存向量返回值
-    vs = []
+    return load_mesh_cached(_MODEL_FILE, _TRANSFORM)
 
-    # 从第三行开始, 逐行读取模型文件内容
-    for i in range(2, 2 + vertex_count):
-        # 从读取的行中获取一个三维向量
-        v = tuple(list(map(float, lines[i].split())))
 
-        # 对向量进行移动
-        v = as_vector3d(translate_by(cast(Vector3D, v)))
-        # 对向量转动 90°
-        v = rotate_x_by(v)
-        # 将向量长度放大 2 被
-        v = as_vector3d(scale_by(v))
+def load_vertices() -> List[Vector3D]:
+    """读取模型中的向量
 
-        vs.append(v)
+    `teapot.off` 文件的每一行为一个三维向量
 
-    return vs
+    Returns:
+        `List[Vector3D]`: 读取的结果
+    """
+    return [(x, y, z) for x, y, z in load_mesh().vertices.tolist()]
 
 
 def load_triangles() -> Iterable[List[Vector3D]]:
@@ -64,16 +49,15 @@ def load_triangles() -> Iterable[List[Vector3D]]:
     Returns:
         `Polygons`: 向量集合, 每组向量由 `4` 个三维向量组成
     """
-    # 读取模型向量
     vertices = load_vertices()
 
-    # 获取所有的平面定义行
-    for i in range(2 + vertex_count, 2 + vertex_count + face_count):
-        cols = lines[i].split()
+    # 网格模型只保存拆分后的三角形, 故重新读取模型文件中的多边形
+    with open(_MODEL_FILE) as f:
+        _, polygons = parse_off_polygons(f.read())
 
+    for polygon in polygons:
         # 每行数据格式为 4 324 306 304 317, 表示对应 324, 306, 304, 317 这几行数据表示的向量
-        # 即读取由四个向量组成的集合, 组成了空间中的一个四边形 (由两个三角形组成)
-        yield list(map(vertices.__getitem__, map(int, cols[1:])))
+        yield [vertices[i] for i in polygon]
 
 
 def load_model() -> List[Triangle]:
@@ -82,5 +66,4 @@ def load_model() -> List[Triangle]:
     Returns:
         `Polygons`: 多面体的组成向量集合
     """
-    # 读取所有的多面体向量
-    return [tri for quad in load_triangles() for tri in triangulate(quad)]
+    return load_mesh().to_triangles()
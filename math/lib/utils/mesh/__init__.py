@@ -0,0 +1,391 @@
+"""基于 NumPy 数组的网格模型和批量向量变换
+
+`utils.vector` 和 `utils.transform` 中的函数每次处理一个以 `tuple` 表示的向量, 变换一个多面体需要对每个三角形的每个向量
+调用一次; 本模块的函数以 `(N, 3)` 形状的数组表示 N 个三维向量, 每种变换均表示为一次矩阵运算, 一次处理全部向量
+"""
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from utils.typedef import Matrix, Number, Triangle, Vector3D
+
+# 表示 N 个三维向量的数组, 形状为 `(N, 3)`
+Vertices = NDArray[np.float64]
+
+# 表示 M 个三角形的数组, 形状为 `(M, 3, 3)`, 即每个三角形的三个三维向量
+Faces = NDArray[np.float64]
+
+# 表示 M 个三角形顶点序号的数组 (索引缓冲区), 形状为 `(M, 3)`
+Indices = NDArray[np.intp]
+
+
+def as_vertices(vs: ArrayLike) -> Vertices:
+    """将三维向量序列转为 `(N, 3)` 形状的数组
+
+    Args:
+        `vs` (`ArrayLike`): 三维向量序列
+
+    Returns:
+        `Vertices`: 向量数组
+    """
+    return np.asarray(vs, dtype=np.float64).reshape(-1, 3)
+
+
+def rotation_x(angle: Number) -> NDArray[np.float64]:
+    """获取围绕 x 轴旋转的矩阵, 和 `utils.transform.rotate_x` 的旋转方向一致
+
+    Args:
+        `angle` (`Number`): 要旋转的弧度
+
+    Returns:
+        `NDArray[np.float64]`: `3x3` 旋转矩阵, 作用于列向量
+    """
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[1, 0, 0], [0, c, -s], [0, s, c]], dtype=np.float64)
+
+
+def rotation_y(angle: Number) -> NDArray[np.float64]:
+    """获取围绕 y 轴旋转的矩阵, 和 `utils.transform.rotate_y` 的旋转方向一致
+
+    Args:
+        `angle` (`Number`): 要旋转的弧度
+
+    Returns:
+        `NDArray[np.float64]`: `3x3` 旋转矩阵, 作用于列向量
+    """
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, 0, -s], [0, 1, 0], [s, 0, c]], dtype=np.float64)
+
+
+def rotation_z(angle: Number) -> NDArray[np.float64]:
+    """获取围绕 z 轴旋转的矩阵, 和 `utils.transform.rotate_z` 的旋转方向一致
+
+    Args:
+        `angle` (`Number`): 要旋转的弧度
+
+    Returns:
+        `NDArray[np.float64]`: `3x3` 旋转矩阵, 作用于列向量
+    """
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]], dtype=np.float64)
+
+
+def translate(v_off: Vector3D | ArrayLike, vs: Vertices) -> Vertices:
+    """批量移动向量, 对应 `utils.vector.translate`
+
+    Args:
+        `v_off` (`Vector3D | ArrayLike`): 向量偏移量
+        `vs` (`Vertices`): 向量数组
+
+    Returns:
+        `Vertices`: 移动后的向量数组
+    """
+    return vs + np.asarray(v_off, dtype=np.float64)
+
+
+def scale(scalar: Number, vs: Vertices) -> Vertices:
+    """批量缩放向量, 对应 `utils.vector.scale`
+
+    Args:
+        `scalar` (`Number`): 放大倍数
+        `vs` (`Vertices`): 向量数组
+
+    Returns:
+        `Vertices`: 缩放后的向量数组
+    """
+    return vs * scalar
+
+
+def stretch(vs: Vertices, sx: float = 1.0, sy: float = 1.0, sz: float = 1.0) -> Vertices:
+    """批量拉伸向量, 对应 `utils.transform.stretch`
+
+    Args:
+        `vs` (`Vertices`): 向量数组
+        `sx` (`float`, optional): `x` 轴拉伸倍数. Defaults to `1.0`.
+        `sy` (`float`, optional): `y` 轴拉伸倍数. Defaults to `1.0`.
+        `sz` (`float`, optional): `z` 轴拉伸倍数. Defaults to `1.0`.
+
+    Returns:
+        `Vertices`: 拉伸后的向量数组
+    """
+    return vs * np.array([sx, sy, sz], dtype=np.float64)
+
+
+def rotate_x(angle: Number, vs: Vertices) -> Vertices:
+    """批量将向量围绕 x 轴旋转, 对应 `utils.transform.rotate_x`
+
+    Args:
+        `angle` (`Number`): 要旋转的弧度
+        `vs` (`Vertices`): 向量数组
+
+    Returns:
+        `Vertices`: 旋转后的向量数组
+    """
+    # 每行为一个向量, 故右乘旋转矩阵的转置
+    return vs @ rotation_x(angle).T
+
+
+def rotate_y(angle: Number, vs: Vertices) -> Vertices:
+    """批量将向量围绕 y 轴旋转, 对应 `utils.transform.rotate_y`
+
+    Args:
+        `angle` (`Number`): 要旋转的弧度
+        `vs` (`Vertices`): 向量数组
+
+    Returns:
+        `Vertices`: 旋转后的向量数组
+    """
+    return vs @ rotation_y(angle).T
+
+
+def rotate_z(angle: Number, vs: Vertices) -> Vertices:
+    """批量将向量围绕 z 轴旋转, 对应 `utils.transform.rotate_z`
+
+    Args:
+        `angle` (`Number`): 要旋转的弧度
+        `vs` (`Vertices`): 向量数组
+
+    Returns:
+        `Vertices`: 旋转后的向量数组
+    """
+    return vs @ rotation_z(angle).T
+
+
+def multiply_matrix_vector(matrix: Matrix | ArrayLike, vs: Vertices) -> Vertices:
+    """批量计算矩阵和向量的乘积, 对应 `utils.vector.multiply_matrix_vector`
+
+    和 `utils.vector.multiply_matrix_vector` 一致, `matrix` 的每一行为一个标准基向量经过变换后的结果, 即结果为
+    `vs[i][0] * matrix[0] + vs[i][1] * matrix[1] + ...`
+
+    Args:
+        `matrix` (`Matrix | ArrayLike`): 矩阵
+        `vs` (`Vertices`): 向量数组
+
+    Returns:
+        `Vertices`: 变换后的向量数组
+    """
+    return vs @ np.asarray(matrix, dtype=np.float64)
+
+
+def affine(matrix: Optional[ArrayLike] = None, offset: Optional[Vector3D | ArrayLike] = None) -> NDArray[np.float64]:
+    """构造仿射变换矩阵, 表示先执行线性变换 `matrix`, 再移动 `offset`
+
+    多个仿射变换矩阵相乘即可组合为一个变换, 例如 `affine(b) @ affine(offset=t)` 表示先移动 `t` 再执行线性变换 `b`
+
+    Args:
+        `matrix` (`Optional[ArrayLike]`, optional): `3x3` 线性变换矩阵, 作用于列向量 (和 `rotation_x` 等函数的返回值
+        一致), `None` 表示不变换. Defaults to `None`.
+        `offset` (`Optional[Vector3D | ArrayLike]`, optional): 向量偏移量, `None` 表示不移动. Defaults to `None`.
+
+    Returns:
+        `NDArray[np.float64]`: `4x4` 仿射变换矩阵, 作用于齐次坐标列向量
+    """
+    m = np.eye(4, dtype=np.float64)
+    if matrix is not None:
+        m[:3, :3] = np.asarray(matrix, dtype=np.float64)
+
+    if offset is not None:
+        m[:3, 3] = np.asarray(offset, dtype=np.float64)
+
+    return m
+
+
+def apply_affine(transform: ArrayLike, vs: Vertices) -> Vertices:
+    """批量对向量执行仿射变换
+
+    Args:
+        `transform` (`ArrayLike`): `4x4` 仿射变换矩阵, 参见 `affine`
+        `vs` (`Vertices`): 向量数组
+
+    Returns:
+        `Vertices`: 变换后的向量数组
+    """
+    m = np.asarray(transform, dtype=np.float64)
+    return vs @ m[:3, :3].T + m[:3, 3]
+
+
+def normal(faces: Faces) -> Vertices:
+    """批量计算三角形的法向量, 对应 `utils.vector.normal`
+
+    Args:
+        `faces` (`Faces`): 三角形数组, 形状为 `(M, 3, 3)`
+
+    Returns:
+        `Vertices`: 法向量数组, 形状为 `(M, 3)`
+    """
+    return np.cross(faces[:, 1] - faces[:, 0], faces[:, 2] - faces[:, 0])
+
+
+def unit(vs: Vertices) -> Vertices:
+    """批量计算和向量方向相同, 但长度为 `1` 的向量, 对应 `utils.vector.unit`
+
+    Args:
+        `vs` (`Vertices`): 向量数组
+
+    Returns:
+        `Vertices`: 长度为 `1` 的向量数组
+    """
+    return vs / np.linalg.norm(vs, axis=-1, keepdims=True)
+
+
+class Mesh:
+    """由顶点数组和索引缓冲区组成的网格模型
+
+    顶点以 `(N, 3)` 数组存储, 每个三角形以三个顶点的序号表示, 多个三角形共用的顶点只存储一次, 因此变换只需处理每个顶点一次;
+    所有变换均返回新的网格对象, 新对象和原对象共用索引缓冲区
+    """
+
+    def __init__(self, vertices: ArrayLike, indices: ArrayLike) -> None:
+        """构造器
+
+        Args:
+            `vertices` (`ArrayLike`): 顶点数组, 形状为 `(N, 3)`
+            `indices` (`ArrayLike`): 索引缓冲区, 形状为 `(M, 3)`
+
+        Raises:
+            `ValueError`: 索引超出顶点数组的范围
+        """
+        self.vertices: Vertices = as_vertices(vertices)
+        self.indices: Indices = np.asarray(indices, dtype=np.intp).reshape(-1, 3)
+
+        if self.indices.size and not (0 <= self.indices.min() and self.indices.max() < len(self.vertices)):
+            raise ValueError("Index out of range")
+
+    @classmethod
+    def from_triangles(cls, faces: Iterable[Triangle]) -> "Mesh":
+        """通过三角形序列创建网格模型, 重复的顶点只存储一次
+
+        Args:
+            `faces` (`Iterable[Triangle]`): 三角形序列
+
+        Returns:
+            `Mesh`: 网格模型
+        """
+        points = np.asarray(list(faces), dtype=np.float64).reshape(-1, 3)
+        vertices, inverse = np.unique(points, axis=0, return_inverse=True)
+        return cls(vertices, inverse.reshape(-1, 3))
+
+    def __len__(self) -> int:
+        """三角形数量"""
+        return len(self.indices)
+
+    @property
+    def faces(self) -> Faces:
+        """全部三角形的顶点, 形状为 `(M, 3, 3)`"""
+        return self.vertices[self.indices]
+
+    def to_triangles(self) -> List[Triangle]:
+        """转为三角形序列, 以便使用 `utils.vector` 和 `utils.transform` 中的函数
+
+        Returns:
+            `List[Triangle]`: 三角形序列
+        """
+        return [
+            (tuple(a), tuple(b), tuple(c))  # type: ignore[misc]
+            for a, b, c in self.faces.tolist()
+        ]
+
+    def _with(self, vertices: Vertices) -> "Mesh":
+        mesh = Mesh.__new__(Mesh)
+        mesh.vertices = vertices
+        mesh.indices = self.indices
+        return mesh
+
+    def transform(self, matrix: Matrix | ArrayLike) -> "Mesh":
+        """通过矩阵变换全部顶点, 矩阵的含义和 `multiply_matrix_vector` 一致
+
+        Args:
+            `matrix` (`Matrix | ArrayLike`): 矩阵
+
+        Returns:
+            `Mesh`: 变换后的网格模型
+        """
+        return self._with(multiply_matrix_vector(matrix, self.vertices))
+
+    def affine(self, transform: ArrayLike) -> "Mesh":
+        """通过仿射变换矩阵变换全部顶点
+
+        Args:
+            `transform` (`ArrayLike`): `4x4` 仿射变换矩阵, 参见 `affine`
+
+        Returns:
+            `Mesh`: 变换后的网格模型
+        """
+        return self._with(apply_affine(transform, self.vertices))
+
+    def translate(self, v_off: Vector3D | ArrayLike) -> "Mesh":
+        """移动全部顶点
+
+        Args:
+            `v_off` (`Vector3D | ArrayLike`): 向量偏移量
+
+        Returns:
+            `Mesh`: 移动后的网格模型
+        """
+        return self._with(translate(v_off, self.vertices))
+
+    def scale(self, scalar: Number) -> "Mesh":
+        """缩放全部顶点
+
+        Args:
+            `scalar` (`Number`): 放大倍数
+
+        Returns:
+            `Mesh`: 缩放后的网格模型
+        """
+        return self._with(scale(scalar, self.vertices))
+
+    def stretch(self, sx: float = 1.0, sy: float = 1.0, sz: float = 1.0) -> "Mesh":
+        """拉伸全部顶点
+
+        Args:
+            `sx` (`float`, optional): `x` 轴拉伸倍数. Defaults to `1.0`.
+            `sy` (`float`, optional): `y` 轴拉伸倍数. Defaults to `1.0`.
+            `sz` (`float`, optional): `z` 轴拉伸倍数. Defaults to `1.0`.
+
+        Returns:
+            `Mesh`: 拉伸后的网格模型
+        """
+        return self._with(stretch(self.vertices, sx, sy, sz))
+
+    def rotate_x(self, angle: Number) -> "Mesh":
+        """将全部顶点围绕 x 轴旋转
+
+        Args:
+            `angle` (`Number`): 要旋转的弧度
+
+        Returns:
+            `Mesh`: 旋转后的网格模型
+        """
+        return self._with(rotate_x(angle, self.vertices))
+
+    def rotate_y(self, angle: Number) -> "Mesh":
+        """将全部顶点围绕 y 轴旋转
+
+        Args:
+            `angle` (`Number`): 要旋转的弧度
+
+        Returns:
+            `Mesh`: 旋转后的网格模型
+        """
+        return self._with(rotate_y(angle, self.vertices))
+
+    def rotate_z(self, angle: Number) -> "Mesh":
+        """将全部顶点围绕 z 轴旋转
+
+        Args:
+            `angle` (`Number`): 要旋转的弧度
+
+        Returns:
+            `Mesh`: 旋转后的网格模型
+        """
+        return self._with(rotate_z(angle, self.vertices))
+
+    def normals(self) -> Vertices:
+        """计算全部三角形的法向量
+
+        Returns:
+            `Vertices`: 法向量数组, 形状为 `(M, 3)`
+        """
+        return normal(self.faces)
@@ -0,0 +1,84 @@
+"""
+网格变换性能测试
+
+读取 `teapot.off` 茶壶模型, 对比如下两种方式执行同样的变换 (绕 x 轴旋转, 绕 y 轴旋转, 拉伸, 缩放, 移动, 矩阵变换) 以及计算
+全部三角形单位法向量的耗时:
+
+- `tuple`: 通过 `utils.transform.polygon_map` 对每个三角形的每个向量逐个调用 `utils.vector` 和 `utils.transform` 中的函数
+- `mesh`: 通过 `Mesh` 对象, 每种变换对全部顶点执行一次矩阵运算
+
+执行方式:
+
+```bash
+python -m utils.mesh.bench [重复次数]
+```
+"""
+
+import sys
+import time
+from typing import Callable, List
+
+import numpy as np
+from utils import mesh
+from utils.draw.teapot import load_model
+from utils.mesh import Mesh
+from utils.transform import compose, polygon_map, rotate_x, rotate_y, stretch
+from utils.typedef import Triangle, Vector3D
+from utils.vector import as_vector3d, multiply_matrix_vector, normal, scale, to_radian, translate, unit
+
+# 测试使用的变换矩阵
+_MATRIX = [(1, 0.5, 0), (0, 1, 0.5), (0.5, 0, 1)]
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    """多次执行函数, 返回平均耗时 (毫秒)"""
+    func()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    faces = load_model()
+    m = Mesh.from_triangles(faces)
+
+    angle = to_radian(30)
+
+    transformer: Callable[[Vector3D], Vector3D] = compose(
+        lambda v: as_vector3d(multiply_matrix_vector(_MATRIX, v)),
+        lambda v: translate((0.5, 0, -0.5), [v])[0],
+        lambda v: scale(2, v),
+        lambda v: stretch(v, 1, 1.5, 1),
+        lambda v: rotate_y(angle, v),
+        lambda v: rotate_x(angle, v),
+    )
+
+    def run_tuple() -> List[Vector3D]:
+        transformed: List[Triangle] = polygon_map(transformer, faces)
+        return [unit(normal(f)) for f in transformed]
+
+    def run_mesh() -> object:
+        transformed = m.rotate_x(angle).rotate_y(angle).stretch(1, 1.5, 1).scale(2).translate((0.5, 0, -0.5)).transform(_MATRIX)
+        return mesh.unit(transformed.normals())
+
+    # 两种方式的结果需一致
+    assert np.allclose(np.array(run_tuple()), run_mesh())  # type: ignore[arg-type]
+
+    tuple_ms = _time(run_tuple, repeat)
+    mesh_ms = _time(run_mesh, repeat)
+    build_ms = _time(lambda: Mesh.from_triangles(faces), repeat)
+
+    print(f"teapot: {len(faces)} triangles, {len(m.vertices)} unique vertices")
+    print(f"{'impl':<8}{'ms/run':>10}")
+    print(f"{'tuple':<8}{tuple_ms:>10.3f}")
+    print(f"{'mesh':<8}{mesh_ms:>10.3f}")
+    print(f"speedup {tuple_ms / mesh_ms:.0f}x, Mesh.from_triangles {build_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
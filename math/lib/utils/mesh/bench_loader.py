@@ -0,0 +1,122 @@
+"""
+模型文件读取性能测试
+
+对比如下几种方式读取 OFF 模型文件, 得到变换后的三角形:
+
+- `legacy`: 原有 `utils.draw.teapot` 的实现, 逐行解析, 对每个向量依次调用移动, 旋转和缩放三个函数, 再通过
+  `triangulate` 拆分多边形
+- `parse`: `load_mesh(cache=False)`, 通过 NumPy 一次解析全部顶点和多边形, 变换以一个仿射矩阵完成
+- `cached`: `load_mesh`, 读取 `.npz` 缓存 (需计算文件内容的哈希值)
+
+分别测试 `teapot.off` 茶壶模型, 以及生成的网格平面模型 (默认 `300x300` 个四边形)
+
+执行方式:
+
+```bash
+python -m utils.mesh.bench_loader [网格平面边长] [重复次数]
+```
+"""
+
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+from math import pi
+from os import path
+from typing import Callable, List
+
+import numpy as np
+from utils.draw import teapot
+from utils.mesh import Mesh, affine, rotation_x
+from utils.mesh.loader import load_mesh
+from utils.transform import rotate_x, triangulate
+from utils.typedef import Triangle, Vector3D
+from utils.vector import add, as_vector3d, scale
+
+# 和 `utils.draw.teapot` 一致的变换
+_TRANSFORM = affine(2 * np.eye(3)) @ affine(rotation_x(-pi / 2)) @ affine(offset=(-0.5, 0, -0.6))
+
+
+def _legacy_load(file: str) -> List[Triangle]:
+    """原有实现, 逐行解析模型文件"""
+    with open(file) as f:
+        lines = f.readlines()
+
+    vertex_count, face_count, _ = map(int, lines[1].split())
+
+    scale_by = partial(scale, 2)
+    rotate_x_by = partial(rotate_x, -pi / 2)
+    translate_by = partial(add, (-0.5, 0, -0.6))
+
+    vertices: List[Vector3D] = []
+    for i in range(2, 2 + vertex_count):
+        v = tuple(map(float, lines[i].split()))
+        v = as_vector3d(translate_by(v))  # type: ignore[arg-type]
+        v = rotate_x_by(v)
+        vertices.append(as_vector3d(scale_by(v)))
+
+    triangles: List[Triangle] = []
+    for i in range(2 + vertex_count, 2 + vertex_count + face_count):
+        quad = list(map(vertices.__getitem__, map(int, lines[i].split()[1:])))
+        triangles.extend(triangulate(quad))
+
+    return triangles
+
+
+def _write_grid(file: str, n: int) -> None:
+    """生成由 `n x n` 个四边形组成的网格平面模型"""
+    xs, ys = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    vertices = np.stack([xs.ravel() / n, ys.ravel() / n, np.sin(xs.ravel() / n * pi)], axis=-1)
+
+    i = np.arange(n)[:, None] * (n + 1) + np.arange(n)[None, :]
+    quads = np.stack([i, i + n + 1, i + n + 2, i + 1], axis=-1).reshape(-1, 4)
+
+    with open(file, "w") as f:
+        f.write(f"OFF\n{len(vertices)} {len(quads)} 0\n")
+        np.savetxt(f, vertices, fmt="%.6f")
+        np.savetxt(f, np.hstack([np.full((len(quads), 1), 4), quads]), fmt="%d")
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    """多次执行函数, 返回平均耗时 (毫秒)"""
+    func()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _bench(name: str, file: str, cache_dir: str, repeat: int) -> None:
+    m: Mesh = load_mesh(file, _TRANSFORM, cache=False)
+
+    # 两种方式的结果需一致
+    assert np.allclose(np.array(_legacy_load(file)), m.faces)
+
+    legacy_ms = _time(lambda: _legacy_load(file), repeat)
+    parse_ms = _time(lambda: load_mesh(file, _TRANSFORM, cache=False), repeat)
+    cached_ms = _time(lambda: load_mesh(file, _TRANSFORM, cache_dir=cache_dir), repeat)
+
+    size_kb = os.stat(file).st_size / 1024
+    print(f"{name}: {len(m.vertices)} vertices, {len(m)} triangles, {size_kb:.0f} KB")
+    print(f"  {'legacy':<8}{legacy_ms:>10.2f} ms")
+    print(f"  {'parse':<8}{parse_ms:>10.2f} ms  ({legacy_ms / parse_ms:.1f}x)")
+    print(f"  {'cached':<8}{cached_ms:>10.2f} ms  ({legacy_ms / cached_ms:.1f}x)")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _bench("teapot", teapot._MODEL_FILE, tmp, repeat * 10)
+
+        grid = path.join(tmp, "grid.off")
+        _write_grid(grid, n)
+        _bench(f"grid {n}x{n}", grid, tmp, repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""读取 OFF 和 OBJ 格式的模型文件
+
+模型文件被解析为 `Mesh` 网格模型, 多边形按照和 `utils.transform.triangulate` 相同的顺序拆分为三角形; 解析和变换的结果
+以 `.npz` 文件缓存在模型文件所在目录的 `__pycache__` 目录中, 缓存以模型文件内容和变换矩阵的哈希值作为 key, 文件内容
+或变换矩阵改变后自动失效
+"""
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from os import path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from utils.mesh import Indices, Mesh, Vertices, apply_affine
+
+# 缓存格式版本, 缓存格式或解析结果改变时需要修改, 使原有缓存失效
+_CACHE_VERSION = b"1"
+
+
+def _fan(sizes: NDArray[np.intp], tokens: NDArray[np.intp]) -> Indices:
+    """将多边形拆分为三角形, 顺序和 `utils.transform.triangulate` 一致
+
+    Args:
+        `sizes` (`NDArray[np.intp]`): 每个多边形的顶点数
+        `tokens` (`NDArray[np.intp]`): 依次排列的多边形数据, 每个多边形为顶点数以及各个顶点的序号
+
+    Returns:
+        `Indices`: 三角形顶点序号数组, 形状为 `(M, 3)`
+    """
+    # 每个多边形第一个顶点序号在 `tokens` 中的位置
+    firsts = np.cumsum(sizes + 1) - sizes
+
+    # 第 j 个多边形拆分为 `sizes[j] - 2` 个三角形, 其中第 i 个为 (v[0], v[i + 1], v[i]); 不足三个顶点的多边形被忽略
+    counts = np.maximum(sizes - 2, 0)
+    polygon = np.repeat(np.arange(len(sizes)), counts)
+    i = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+
+    first = firsts[polygon]
+    return np.stack([tokens[first], tokens[first + i + 1], tokens[first + i]], axis=-1)
+
+
+def _triangulate(polygons: List[List[int]]) -> Indices:
+    """将多边形逐个拆分为三角形, 顺序和 `utils.transform.triangulate` 一致
+
+    Args:
+        `polygons` (`List[List[int]]`): 多边形顶点序号列表
+
+    Returns:
+        `Indices`: 三角形顶点序号数组, 形状为 `(M, 3)`
+    """
+    tris = [(p[0], p[i + 1], p[i]) for p in polygons for i in range(1, len(p) - 1)]
+    return np.array(tris, dtype=np.intp).reshape(-1, 3)
+
+
+def _content_lines(text: str) -> List[str]:
+    """去除注释和空行"""
+    lines = (line.split("#", 1)[0].strip() for line in text.splitlines())
+    return [line for line in lines if line]
+
+
+def _off_sections(text: str) -> Tuple[List[str], List[str]]:
+    """获取 OFF 文件中的顶点行和多边形行
+
+    Args:
+        `text` (`str`): 文件内容
+
+    Raises:
+        `ValueError`: 文件格式错误
+
+    Returns:
+        `Tuple[List[str], List[str]]`: 顶点行和多边形行
+    """
+    lines = _content_lines(text)
+    if not lines or not lines[0].startswith("OFF"):
+        raise ValueError("Not an OFF file")
+
+    # 数量可以和 `OFF` 写在同一行
+    counts, start = lines[0][3:].split(), 1
+    if not counts:
+        counts, start = lines[1].split(), 2
+
+    vertex_count, face_count = int(counts[0]), int(counts[1])
+
+    vertex_lines = lines[start: start + vertex_count]
+    face_lines = lines[start + vertex_count: start + vertex_count + face_count]
+    if len(vertex_lines) != vertex_count or len(face_lines) != face_count:
+        raise ValueError("Unexpected end of OFF file")
+
+    return vertex_lines, face_lines
+
+
+def _parse_vertices(lines: List[str]) -> Vertices:
+    """一次解析全部顶点行, 只读取每行的前三列"""
+    if not lines:
+        return np.empty((0, 3), dtype=np.float64)
+
+    return np.loadtxt(lines, dtype=np.float64, usecols=(0, 1, 2), ndmin=2)
+
+
+def parse_off_polygons(text: str) -> Tuple[Vertices, List[List[int]]]:
+    """解析 OFF 格式的模型文件内容, 保留原始的多边形
+
+    Args:
+        `text` (`str`): 文件内容
+
+    Raises:
+        `ValueError`: 文件格式错误
+
+    Returns:
+        `Tuple[Vertices, List[List[int]]]`: 顶点数组和多边形顶点序号列表
+    """
+    vertex_lines, face_lines = _off_sections(text)
+
+    polygons = []
+    for line in face_lines:
+        cols = line.split()
+        polygons.append(list(map(int, cols[1: 1 + int(cols[0])])))
+
+    return _parse_vertices(vertex_lines), polygons
+
+
+def parse_off(text: str) -> Tuple[Vertices, Indices]:
+    """解析 OFF 格式的模型文件内容
+
+    文件第一行为 `OFF`, 之后一行为顶点数, 面数和边数, 然后每行为一个顶点 (`x y z`), 最后每行为一个多边形 (`顶点数 序号1
+    序号2 ...`, 序号从 `0` 开始); 顶点和多边形之后的颜色等数据会被忽略
+
+    Args:
+        `text` (`str`): 文件内容
+
+    Raises:
+        `ValueError`: 文件格式错误
+
+    Returns:
+        `Tuple[Vertices, Indices]`: 顶点数组和三角形顶点序号数组
+    """
+    vertex_lines, face_lines = _off_sections(text)
+    vertices = _parse_vertices(vertex_lines)
+
+    # 一次解析全部多边形行, 只需逐行读取每个多边形的顶点数
+    sizes = np.array([line.split(None, 1)[0] for line in face_lines], dtype=np.intp)
+    tokens = np.array(" ".join(face_lines).split(), dtype=np.intp)
+
+    if len(tokens) == (sizes + 1).sum():
+        return vertices, _fan(sizes, tokens)
+
+    # 多边形之后带有颜色等额外数据时, 逐行解析
+    _, polygons = parse_off_polygons(text)
+    return vertices, _triangulate(polygons)
+
+
+def parse_obj(text: str) -> Tuple[Vertices, Indices]:
+    """解析 OBJ 格式的模型文件内容
+
+    只读取顶点 (`v x y z`) 和面 (`f v1 v2 ...`, 每项可以为 `v`, `v/vt`, `v/vt/vn` 或 `v//vn` 形式), 序号从 `1` 开始,
+    负数序号表示相对于已读取顶点的位置; 其它数据 (纹理坐标, 法向量, 材质等) 会被忽略
+
+    Args:
+        `text` (`str`): 文件内容
+
+    Raises:
+        `ValueError`: 文件格式错误
+
+    Returns:
+        `Tuple[Vertices, Indices]`: 顶点数组和三角形顶点序号数组
+    """
+    vertex_lines: List[str] = []
+    polygons: List[List[int]] = []
+
+    for line in _content_lines(text):
+        if line.startswith("v "):
+            vertex_lines.append(line[2:])
+        elif line.startswith("f "):
+            count = len(vertex_lines)
+            polygon = []
+            for item in line[2:].split():
+                i = int(item.split("/", 1)[0])
+                polygon.append(i - 1 if i > 0 else count + i)
+
+            polygons.append(polygon)
+
+    return _parse_vertices(vertex_lines), _triangulate(polygons)
+
+
+# 文件扩展名和解析函数的对应关系
+_PARSERS = {
+    ".off": parse_off,
+    ".obj": parse_obj,
+}
+
+
+def _cache_file(file: str, data: bytes, transform: Optional[ArrayLike], cache_dir: str) -> str:
+    """计算缓存文件的路径, 文件名包含模型文件内容和变换矩阵的哈希值"""
+    digest = hashlib.sha256(_CACHE_VERSION)
+    digest.update(data)
+    if transform is not None:
+        digest.update(np.asarray(transform, dtype=np.float64).tobytes())
+
+    return path.join(cache_dir, f"{path.basename(file)}.{digest.hexdigest()[:16]}.npz")
+
+
+def _read_cache(cache_file: str) -> Optional[Mesh]:
+    """读取缓存, 缓存不存在或已损坏 (例如写入时被中断而不完整) 时返回 `None`"""
+    try:
+        with np.load(cache_file) as data:
+            return Mesh(data["vertices"], data["indices"])
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
+
+
+def _write_cache(cache_file: str, m: Mesh) -> None:
+    """写入缓存, 先写入临时文件再重命名, 避免其它进程读取到不完整的文件; 无法写入时忽略"""
+    try:
+        os.makedirs(path.dirname(cache_file), exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=path.dirname(cache_file))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, vertices=m.vertices, indices=m.indices)
+
+            os.replace(tmp, cache_file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+
+def load_mesh(
+    file: str,
+    transform: Optional[ArrayLike] = None,
+    cache: bool = True,
+    cache_dir: Optional[str] = None,
+) -> Mesh:
+    """读取模型文件, 根据扩展名确定文件格式
+
+    Args:
+        `file` (`str`): 模型文件路径, 扩展名为 `.off` 或 `.obj`
+        `transform` (`Optional[ArrayLike]`, optional): 读取后对全部顶点执行的 `4x4` 仿射变换矩阵, 参见
+        `utils.mesh.affine`, `None` 表示不变换. Defaults to `None`.
+        `cache` (`bool`, optional): 是否使用缓存. Defaults to `True`.
+        `cache_dir` (`Optional[str]`, optional): 缓存目录, `None` 表示模型文件所在目录的 `__pycache__` 目录.
+        Defaults to `None`.
+
+    Raises:
+        `ValueError`: 不支持的文件格式, 或文件格式错误
+
+    Returns:
+        `Mesh`: 网格模型, 顶点的顺序和文件中一致
+    """
+    parser = _PARSERS.get(path.splitext(file)[1].lower())
+    if not parser:
+        raise ValueError(f"Unsupported model file: {file}")
+
+    with open(file, "rb") as f:
+        data = f.read()
+
+    cache_file = ""
+    if cache:
+        cache_file = _cache_file(file, data, transform, cache_dir or path.join(path.dirname(file), "__pycache__"))
+
+        m = _read_cache(cache_file)
+        if m is not None:
+            return m
+
+    vertices, indices = parser(data.decode("utf-8"))
+    if transform is not None:
+        vertices = apply_affine(transform, vertices)
+
+    m = Mesh(vertices, indices)
+    if cache_file:
+        _write_cache(cache_file, m)
+
+    return m
+
+
+# 已读取的模型, 参见 `load_mesh_cached`
+_loaded: Dict[Tuple[str, bytes], Mesh] = {}
+
+
+def load_mesh_cached(file: str, transform: Optional[ArrayLike] = None) -> Mesh:
+    """读取模型文件, 同一进程中相同文件和变换矩阵只读取一次
+
+    网格模型的变换均返回新的对象, 因此可以安全地共用同一个对象
+
+    Args:
+        `file` (`str`): 模型文件路径
+        `transform` (`Optional[ArrayLike]`, optional): 仿射变换矩阵, 参见 `load_mesh`. Defaults to `None`.
+
+    Returns:
+        `Mesh`: 网格模型
+    """
+    key = (path.abspath(file), b"" if transform is None else np.asarray(transform, dtype=np.float64).tobytes())
+
+    m = _loaded.get(key)
+    if m is None:
+        m = _loaded[key] = load_mesh(file, transform)
+
+    return m
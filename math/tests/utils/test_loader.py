@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+from utils import mesh
+from utils.draw.teapot import load_model, load_triangles
+from utils.mesh.loader import load_mesh, parse_obj, parse_off, parse_off_polygons
+from utils.transform import triangulate
+
+# 测试用的 OFF 文件, 包含注释, 三角形, 四边形和五边形
+_OFF = """OFF
+# vertices, faces, edges
+6 3 0
+0 0 0
+1 0 0
+1 1 0
+0 1 0
+0 0 1
+1 0 1  # comment
+3 0 1 2
+4 0 2 3 4
+5 5 4 3 2 1
+"""
+
+# 测试用的 OBJ 文件, 包含纹理坐标, 法向量以及负数序号
+_OBJ = """# cube corner
+v 0 0 0
+v 1 0 0
+v 1 1 0
+vt 0 0
+vn 0 0 1
+f 1/1/1 2/1/1 3/1/1
+v 0 1 0
+f -4//1 -2//1 -1//1
+"""
+
+
+def _expected(vertices: np.ndarray, polygons: List[List[int]]) -> np.ndarray:
+    """通过 `triangulate` 逐个拆分多边形, 作为期望的三角形"""
+    return np.array([tri for p in polygons for tri in triangulate([tuple(vertices[i]) for i in p])])
+
+
+def test_parse_off() -> None:
+    """测试解析 OFF 文件, 多边形的拆分顺序和 `triangulate` 一致"""
+    vertices, indices = parse_off(_OFF)
+    assert vertices.shape == (6, 3)
+    assert indices.shape == (1 + 2 + 3, 3)
+
+    _, polygons = parse_off_polygons(_OFF)
+    assert polygons == [[0, 1, 2], [0, 2, 3, 4], [5, 4, 3, 2, 1]]
+    assert vertices[indices] == pytest.approx(_expected(vertices, polygons))
+
+    # 多边形之后带有颜色数据
+    colored = _OFF.replace("3 0 1 2", "3 0 1 2 255 0 0")
+    assert np.array_equal(parse_off(colored)[1], indices)
+
+    with pytest.raises(ValueError):
+        parse_off("OBJ\n")
+
+    with pytest.raises(ValueError):
+        parse_off("OFF\n6 3 0\n0 0 0\n")
+
+
+def test_parse_obj() -> None:
+    """测试解析 OBJ 文件"""
+    vertices, indices = parse_obj(_OBJ)
+    assert vertices.shape == (4, 3)
+    assert indices.tolist() == [[0, 2, 1], [0, 3, 2]]
+
+
+def test_load_mesh(tmp_path: Path) -> None:
+    """测试读取模型文件并缓存结果, 文件内容或变换矩阵改变后重新解析"""
+    file = tmp_path / "model.off"
+    file.write_text(_OFF)
+
+    cache_dir = tmp_path / "cache"
+    transform = mesh.affine(offset=(1, 2, 3))
+
+    m = load_mesh(str(file), transform, cache_dir=str(cache_dir))
+    vertices, indices = parse_off(_OFF)
+    assert m.vertices == pytest.approx(vertices + (1, 2, 3))
+    assert np.array_equal(m.indices, indices)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # 读取缓存的结果和解析结果一致
+    cached = load_mesh(str(file), transform, cache_dir=str(cache_dir))
+    assert np.array_equal(cached.vertices, m.vertices)
+    assert np.array_equal(cached.indices, m.indices)
+
+    load_mesh(str(file), cache_dir=str(cache_dir))
+    assert len(list(cache_dir.iterdir())) == 2
+
+    file.write_text(_OFF.replace("1 1 0", "2 2 0"))
+    changed = load_mesh(str(file), transform, cache_dir=str(cache_dir))
+    assert changed.vertices[2] == pytest.approx([3, 4, 3])
+    assert len(list(cache_dir.iterdir())) == 3
+
+    # 不使用缓存
+    assert np.array_equal(load_mesh(str(file), transform, cache=False).vertices, changed.vertices)
+
+    with pytest.raises(ValueError):
+        load_mesh(str(tmp_path / "model.stl"))
+
+
+def test_load_mesh_corrupted_cache(tmp_path: Path) -> None:
+    """测试缓存文件损坏时重新解析模型文件, 并重新写入缓存"""
+    file = tmp_path / "model.off"
+    file.write_text(_OFF)
+
+    cache_dir = tmp_path / "cache"
+    m = load_mesh(str(file), cache_dir=str(cache_dir))
+
+    cache_file = next(cache_dir.iterdir())
+    data = cache_file.read_bytes()
+
+    # 截断为不同长度, 以及内容全部损坏的缓存文件
+    for corrupted in (data[: len(data) // 2], data[:-10], data[:10], b"", b"x" * len(data)):
+        cache_file.write_bytes(corrupted)
+
+        loaded = load_mesh(str(file), cache_dir=str(cache_dir))
+        assert np.array_equal(loaded.vertices, m.vertices)
+        assert np.array_equal(loaded.indices, m.indices)
+        assert cache_file.read_bytes() == data
+
+
+def test_load_teapot() -> None:
+    """测试读取茶壶模型"""
+    polygons = list(load_triangles())
+    model = load_model()
+
+    assert len(polygons) == 448
+    assert len(model) == 880
+    assert np.array(model) == pytest.approx(np.array([tri for p in polygons for tri in triangulate(p)]))
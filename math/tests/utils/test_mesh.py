@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from utils import mesh
+from utils.mesh import Mesh
+from utils.transform import rotate_x, rotate_y, rotate_z, stretch
+from utils.vector import multiply_matrix_vector, normal, scale, to_radian, translate, unit
+
+# 测试用的三角形, 两个三角形共用两个顶点
+_FACES = [
+    ((1, 10, -22), (11, 13, 16), (21, 23, 26)),
+    ((1, 10, -22), (21, 23, 26), (3, -4, 5)),
+]
+
+
+def test_batch_transform() -> None:
+    """测试批量变换函数和逐个向量变换的结果一致"""
+    vs = [v for face in _FACES for v in face]
+    arr = mesh.as_vertices(vs)
+
+    angle = to_radian(30)
+    for batch, single in [
+        (mesh.rotate_x, rotate_x),
+        (mesh.rotate_y, rotate_y),
+        (mesh.rotate_z, rotate_z),
+    ]:
+        assert batch(angle, arr) == pytest.approx(np.array([single(angle, v) for v in vs]))
+
+    assert mesh.translate((1, 2, 3), arr) == pytest.approx(np.array(translate((1, 2, 3), vs)))
+    assert mesh.scale(2.5, arr) == pytest.approx(np.array([scale(2.5, v) for v in vs]))
+    assert mesh.stretch(arr, 2, 3, 4) == pytest.approx(np.array([stretch(v, 2, 3, 4) for v in vs]))
+
+    matrix = [(1, 3, 5), (10, 13, 15), (29, 33, 13)]
+    assert mesh.multiply_matrix_vector(matrix, arr) == pytest.approx(
+        np.array([multiply_matrix_vector(matrix, v) for v in vs])
+    )
+
+    faces = np.array(_FACES, dtype=np.float64)
+    assert mesh.normal(faces) == pytest.approx(np.array([normal(f) for f in _FACES]))
+    assert mesh.unit(mesh.normal(faces)) == pytest.approx(np.array([unit(normal(f)) for f in _FACES]))
+
+
+def test_mesh() -> None:
+    """测试通过三角形创建网格模型, 重复的顶点只存储一次, 变换后可以转回三角形序列"""
+    m = Mesh.from_triangles(_FACES)
+
+    assert len(m) == 2
+    assert m.vertices.shape == (4, 3)
+    assert m.to_triangles() == [tuple(tuple(map(float, v)) for v in face) for face in _FACES]
+
+    # 变换返回新的网格对象, 共用索引缓冲区
+    moved = m.translate((1, 1, 1)).rotate_z(to_radian(90)).scale(2)
+    assert moved.indices is m.indices
+    assert moved.faces == pytest.approx(
+        np.array([[scale(2, rotate_z(to_radian(90), translate((1, 1, 1), [v])[0])) for v in f] for f in _FACES])
+    )
+    assert m.normals() == pytest.approx(np.array([normal(f) for f in _FACES]))
+
+    with pytest.raises(ValueError):
+        Mesh(m.vertices, [[0, 1, 4]])
+
+
+def test_affine() -> None:
+    """测试仿射变换矩阵的组合和先移动, 再旋转, 再缩放的结果一致"""
+    vs = [v for face in _FACES for v in face]
+    arr = mesh.as_vertices(vs)
+
+    angle = to_radian(30)
+    transform = mesh.affine(2 * np.eye(3)) @ mesh.affine(mesh.rotation_x(angle)) @ mesh.affine(offset=(1, 2, 3))
+
+    expected = np.array([scale(2, rotate_x(angle, translate((1, 2, 3), [v])[0])) for v in vs])
+    assert mesh.apply_affine(transform, arr) == pytest.approx(expected)
+    assert Mesh.from_triangles(_FACES).affine(transform).faces == pytest.approx(expected.reshape(-1, 3, 3))
@@ -0,0 +1,45 @@
+from typing import cast
+
+import numpy as np
+import pytest
+from utils.draw.model import frame_arrays
+from utils.draw.shading import shade, shade_faces
+from utils.transform import polygon_map
+from utils.typedef import Vector3D
+from utils.vector import multiply_matrix_vector
+
+# 测试用的三角形
+_FACES = [
+    ((1, 10, -22), (11, 13, 16), (21, 23, 26)),
+    ((1, 10, -22), (21, 23, 26), (3, -4, 5)),
+    ((0, 0, 0), (1, 0, 0), (0, 1, 0)),
+]
+
+# 测试用的变换矩阵
+_MATRIX = [(1, 0.5, 0), (0, 1, 0.5), (0.5, 0, 1)]
+
+
+def test_shade_faces() -> None:
+    """测试批量计算的颜色和逐个三角形调用 `shade` 的结果一致"""
+    colors = shade_faces(np.array(_FACES, dtype=np.float64), light=(2, -1, 3))
+
+    assert colors.shape == (3, 3)
+    assert colors == pytest.approx(np.array([shade(f, light=(2, -1, 3))[:3] for f in _FACES]), abs=1e-6)
+
+
+def test_frame_arrays() -> None:
+    """测试一帧的顶点数组和颜色数组"""
+    arr = np.array(_FACES, dtype=np.float64)
+
+    vertices, colors = frame_arrays(arr)
+    assert vertices.dtype == np.float32 and colors.dtype == np.float32
+    assert vertices == pytest.approx(arr.reshape(-1, 3))
+
+    vertices, colors = frame_arrays(arr, _MATRIX)
+    expected = polygon_map(lambda v: cast(Vector3D, multiply_matrix_vector(_MATRIX, v)), _FACES)
+
+    assert vertices.shape == colors.shape == (9, 3)
+    assert vertices == pytest.approx(np.array(expected).reshape(-1, 3), abs=1e-5)
+
+    # 每个三角形的三个顶点使用相同的颜色
+    assert colors == pytest.approx(np.repeat([shade(f)[:3] for f in expected], 3, axis=0), abs=1e-6)
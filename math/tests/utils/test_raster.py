@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+from utils.draw.camera import Camera
+from utils.draw.raster import Rasterizer, perspective, render_model, rotation
+from utils.draw.teapot import load_model
+from utils.transform import rotate_y
+from utils.typedef import Matrix
+from utils.vector import to_radian
+
+# 正对相机的三角形 (逆时针方向为正面)
+_FACE = ((-1, -1, 0), (1, -1, 0), (0, 1, 0))
+
+# 红色和绿色
+_RED = np.array([[1, 0, 0]], dtype=np.float64)
+_GREEN = np.array([[0, 1, 0]], dtype=np.float64)
+
+
+def _get_matrix(ticks: int) -> Matrix:
+    """随时间绕 y 轴旋转的矩阵"""
+    return [rotate_y(ticks / 1000, v) for v in [(1, 0, 0), (0, 1, 0), (0, 0, 1)]]  # type: ignore[return-value]
+
+
+def test_matrix() -> None:
+    """测试投影矩阵和旋转矩阵"""
+    p = perspective(90, 1, 1, 10)
+    assert p @ [0, 0, -1, 1] == pytest.approx([0, 0, -1, 1])
+    assert p @ [0, 0, -10, 1] == pytest.approx([0, 0, 10, 10])
+
+    assert rotation(90, 0, 0, 2) @ [1, 0, 0, 1] == pytest.approx([0, 1, 0, 1])
+    assert rotation(30, 0, 1, 0)[:3, :3] @ [1, 2, 3] == pytest.approx(rotate_y(to_radian(-30), (1, 2, 3)))
+
+
+def test_render() -> None:
+    """测试渲染三角形, 背面被剔除"""
+    r = Rasterizer(100, 100)
+
+    image = r.render(np.array([_FACE], dtype=np.float64), _RED)
+    assert image.shape == (100, 100, 3)
+    assert image[50, 50].tolist() == [255, 0, 0]
+    assert image[0, 0].tolist() == [0, 0, 0]
+
+    # 三角形底边在下方, 顶点在上方
+    assert image[60, 50].tolist() == [255, 0, 0]
+    assert image[40, 40].tolist() == [0, 0, 0]
+
+    back = np.array([_FACE[::-1]], dtype=np.float64)
+    assert not r.render(back, _RED).any()
+
+
+def test_depth() -> None:
+    """测试深度测试, 无论绘制顺序, 距离相机较近的三角形可见"""
+    r = Rasterizer(100, 100)
+
+    far = np.array(_FACE, dtype=np.float64)
+    near = far * 0.5 + (0, 0, 1)
+
+    for faces, colors in [
+        (np.stack([far, near]), np.vstack([_RED, _GREEN])),
+        (np.stack([near, far]), np.vstack([_GREEN, _RED])),
+    ]:
+        image = r.render(faces, colors)
+        assert image[50, 50].tolist() == [0, 255, 0]
+        assert image[70, 50].tolist() == [255, 0, 0]
+
+
+def test_render_model(tmp_path: Path) -> None:
+    """测试离屏渲染模型, 通过相机保存图片和连环画"""
+    cam = Camera("teapot", [0, 100, 200], dir_=str(tmp_path), comic_strip=2)
+
+    image = render_model(load_model(), get_matrix=_get_matrix, size=(80, 60), cam=cam)
+    assert image.shape == (60, 80, 3)
+    assert image.any()
+
+    assert not cam.is_shooting()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "teapot0.png", "teapot1.png", "teapot2.png", "teapot_comic_strip.png",
+    ]
+
+    # 每个时间点的图片不同
+    shots = [np.asarray(Image.open(tmp_path / f"teapot{i}.png")) for i in range(3)]
+    assert not np.array_equal(shots[0], shots[1])
+
+    assert Image.open(tmp_path / "teapot_comic_strip.png").size == (160, 120)
+
+    with pytest.raises(ValueError):
+        render_model(load_model(), cam=Camera("none", dir_=str(tmp_path)))
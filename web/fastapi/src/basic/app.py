@@ -1,5 +1,38 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List
+
 from fastapi import FastAPI
 
+# 应用关闭时执行的异步回调, 由各模块通过 `on_shutdown` 注册
+_shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+
+def on_shutdown(hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """注册应用关闭时执行的异步回调, 可作为装饰器使用
+
+    Args:
+        - `hook` (`Callable[[], Awaitable[None]]`): 异步回调函数
+
+    Returns:
+        `Callable[[], Awaitable[None]]`: 回调函数本身
+    """
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """应用的生命周期, 应用关闭时依次执行注册的回调
+
+    Args:
+        - `app` (`FastAPI`): 应用对象
+    """
+    yield
+
+    for hook in _shutdown_hooks:
+        await hook()
+
+
 description = """
 ## Basic of FastAPI
 
@@ -16,4 +49,5 @@ app = FastAPI(
     description=description,
     version="1.0.0",
     docs_url="/docs",
+    lifespan=lifespan,
 )
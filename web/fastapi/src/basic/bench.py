@@ -0,0 +1,208 @@
+"""
+模型存储接口压力测试
+
+首先在当前进程中对比原有存储 (单个字典, 由 `multiprocessing.RLock` 保护) 和当前的分片存储创建和查询模型的耗时,
+然后通过 uvicorn 启动应用 (可指定 worker 数量), 使用 `httpx.AsyncClient` 以不同并发数请求如下接口, 统计每秒处理的请求数:
+
+- `create`: `POST /api/user`, 每次创建一个用户
+- `batch`: `POST /api/users`, 每次创建 100 个用户
+- `get`: `GET /api/user/{id}`, 查询已创建的用户
+
+执行方式:
+
+```bash
+python -m basic.bench [每轮请求数] [worker 数量]
+```
+"""
+
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .model import BaseModel, User
+from .storage import Storage
+
+# 批量创建接口每次请求创建的用户数
+_BATCH_SIZE = 100
+
+# 测试的并发数
+_CONCURRENCY = (1, 8, 32, 128)
+
+
+class _LockedStorage:
+    """原有的存储实现, 所有模型存储在一个字典中, 由 `multiprocessing.RLock` 保护"""
+
+    def __init__(self) -> None:
+        """构造器"""
+        self._lock = multiprocessing.RLock()
+        self._store: Dict[int, BaseModel] = {}
+        self._last_id = 1
+
+    def create(self, model: BaseModel) -> BaseModel:
+        """存储模型对象"""
+        with self._lock:
+            model.id = self._last_id
+            self._store[model.id] = model
+            self._last_id += 1
+
+        return model
+
+    def get(self, id: int) -> Optional[BaseModel]:
+        """查询模型对象"""
+        return self._store.get(id)
+
+
+async def _bench_storage(n: int) -> None:
+    """在当前进程中对比两种存储实现的耗时
+
+    Args:
+        - `n` (`int`): 创建和查询的模型数量
+    """
+    users = [User(name=f"User{i}") for i in range(n)]
+
+    locked = _LockedStorage()
+    start = time.perf_counter()
+    for user in users:
+        locked.create(user.model_copy())
+    locked_create = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(1, n + 1):
+        locked.get(i)
+    locked_get = time.perf_counter() - start
+
+    storage: Storage[BaseModel] = Storage()
+    start = time.perf_counter()
+    for user in users:
+        await storage.create(user.model_copy())
+    sharded_create = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await storage.create_many([user.model_copy() for user in users])
+    sharded_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(1, n + 1):
+        await storage.get(i)
+    sharded_get = time.perf_counter() - start
+
+    print(f"{'storage':<16}{'create us':>10}{'get us':>10}")
+    print(f"{'locked':<16}{locked_create / n * 1e6:>10.2f}{locked_get / n * 1e6:>10.2f}")
+    print(f"{'sharded':<16}{sharded_create / n * 1e6:>10.2f}{sharded_get / n * 1e6:>10.2f}")
+    print(f"{'sharded batch':<16}{sharded_batch / n * 1e6:>10.2f}{'':>10}")
+    print()
+
+
+def _free_port() -> int:
+    """获取一个空闲的端口号"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 10.0) -> None:
+    """等待服务器启动完毕
+
+    Args:
+        - `client` (`httpx.AsyncClient`): 客户端对象
+        - `timeout` (`float`, optional): 最长等待时间 (秒). Defaults to `10.0`.
+
+    Raises:
+        - `TimeoutError`: 服务器未在指定时间内启动
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get("/docs")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+
+    raise TimeoutError("Server not ready")
+
+
+async def _run(
+    n: int, concurrency: int, request: Callable[[int], Awaitable[httpx.Response]]
+) -> float:
+    """以指定并发数发送请求
+
+    Args:
+        - `n` (`int`): 请求总数
+        - `concurrency` (`int`): 并发数
+        - `request` (`Callable[[int], Awaitable[httpx.Response]]`): 发送第 i 个请求的函数
+
+    Returns:
+        `float`: 每秒处理的请求数
+    """
+    counter = iter(range(n))
+
+    async def worker() -> None:
+        for i in counter:
+            resp = await request(i)
+            assert resp.status_code in (200, 404), resp.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return n / (time.perf_counter() - start)
+
+
+async def _bench(base_url: str, n: int) -> None:
+    limits = httpx.Limits(max_connections=max(_CONCURRENCY))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        await _wait_ready(client)
+
+        user = {"name": "Alvin", "gender": "male", "birthday": "1981-03-17"}
+        batch = [user] * _BATCH_SIZE
+
+        cases: List[Tuple[str, int, Callable[[int], Awaitable[Any]]]] = [
+            ("create", 1, lambda i: client.post("/api/user", json=user)),
+            ("batch", _BATCH_SIZE, lambda i: client.post("/api/users", json=batch)),
+            ("get", 1, lambda i: client.get(f"/api/user/{i % 1000 + 1}")),
+        ]
+
+        print(f"{'case':<8}{'concurrency':>12}{'req/s':>10}{'users/s':>10}")
+        for name, size, request in cases:
+            for concurrency in _CONCURRENCY:
+                rps = await _run(n, concurrency, request)
+                print(f"{name:<8}{concurrency:>12}{rps:>10.0f}{rps * size:>10.0f}")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    asyncio.run(_bench_storage(100_000))
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "basic:app",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        print(f"{workers} worker(s), {n} requests per round")
+        asyncio.run(_bench(f"http://127.0.0.1:{port}", n))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+路由响应序列化性能测试
+
+在当前进程中直接通过 ASGI 接口调用应用 (不经过网络和 HTTP 客户端), 对比如下两种实现处理同样请求的延迟和 CPU 时间:
+
+- `legacy`: 原有实现, 路由返回字典 (模型先通过 `model_dump` 转为字典), 由 FastAPI 按返回值类型验证和转换后,
+  再通过标准库 `json` 模块序列化
+- `fast`: 当前实现, 路由直接返回 `FastJSONResponse`, 模型对象和列表由 pydantic-core 及缓存的 `TypeAdapter` 序列化,
+  再通过 orjson 嵌入响应内容
+
+测试的请求如下:
+
+- `hello`: `GET /api/hello?name=Alvin`
+- `get`: `GET /api/user/{id}`
+- `get_many`: `GET /api/users?ids=...`, 每次查询 100 个用户
+- `create`: `POST /api/user`
+
+执行方式:
+
+```bash
+python -m basic.bench_response [每种请求的次数]
+```
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Annotated, Any, Callable, Dict, List, Tuple
+from urllib.parse import urlencode
+
+from fastapi import FastAPI, Query, Response, status
+from loguru import logger
+
+from basic import app
+from basic.model import User, _storage
+from basic.storage import Storage
+
+# 批量查询接口每次查询的用户数
+_BATCH_SIZE = 100
+
+# 预先创建的用户数
+_USERS = 1000
+
+
+_legacy = FastAPI()
+_legacy_storage: Storage[User] = Storage()
+
+
+@_legacy.get("/api/hello")
+async def _legacy_hello(response: Response, name: Annotated[str, Query(min_length=2)], gender: str = "M") -> Dict[str, Any]:
+    title = "Mr" if gender == "M" else "Ms"
+    return {"status": "success", "payload": {"message": f"Hello {title}. {name}"}}
+
+
+@_legacy.get("/api/user/{id}")
+async def _legacy_get_user(response: Response, id: int) -> Dict[str, Any]:
+    user = await _legacy_storage.get(id)
+    if not user:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return {"status": "error", "payload": {"message": "User not found"}}
+
+    return {"status": "success", "payload": {"user": user.model_dump()}}
+
+
+@_legacy.get("/api/users")
+async def _legacy_get_users(response: Response, ids: Annotated[List[int], Query()]) -> Dict[str, Any]:
+    users = await _legacy_storage.get_many(ids)
+    return {"status": "success", "payload": {"users": [u.model_dump() if u else None for u in users]}}
+
+
+@_legacy.post("/api/user")
+async def _legacy_create_user(response: Response, user: User) -> Dict[str, Any]:
+    user = await _legacy_storage.create(user)
+    return {"status": "success", "payload": {"user": user.model_dump()}}
+
+
+async def _call(asgi: Any, method: str, url: str, body: bytes = b"") -> Tuple[int, bytes]:
+    """通过 ASGI 接口调用应用
+
+    Args:
+        - `asgi` (`Any`): ASGI 应用
+        - `method` (`str`): 请求方法
+        - `url` (`str`): 请求路径和查询参数
+        - `body` (`bytes`, optional): 请求体. Defaults to `b""`.
+
+    Returns:
+        `Tuple[int, bytes]`: 响应码和响应体
+    """
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 10000),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    result: Dict[str, Any] = {"body": b""}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            result["body"] += message.get("body", b"")
+
+    await asgi(scope, receive, send)
+    return result["status"], result["body"]
+
+
+async def _measure(asgi: Any, n: int, request: Callable[[int], Tuple[str, str, bytes]]) -> Dict[str, Any]:
+    """发送 n 次请求, 统计延迟和 CPU 时间
+
+    Args:
+        - `asgi` (`Any`): ASGI 应用
+        - `n` (`int`): 请求次数
+        - `request` (`Callable[[int], Tuple[str, str, bytes]]`): 生成第 i 个请求的 `(方法, 路径, 请求体)` 的函数
+
+    Returns:
+        `Dict[str, Any]`: 测试结果
+    """
+    # 预热, 排除首次请求构建验证器等开销
+    for i in range(100):
+        await _call(asgi, *request(i))
+
+    latencies: List[float] = []
+    body = b""
+    cpu = time.process_time()
+    for i in range(n):
+        method, url, data = request(i)
+
+        start = time.perf_counter()
+        code, body = await _call(asgi, method, url, data)
+        latencies.append(time.perf_counter() - start)
+
+        assert code == 200, body
+
+    cpu = time.process_time() - cpu
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1e6,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1e6,
+        "cpu": cpu / n * 1e6,
+        "body": body,
+    }
+
+
+async def _bench(n: int) -> None:
+    user = {"name": "Alvin", "gender": "male", "birthday": "1981-03-17", "email": "alvin@fakemail.com"}
+    for _ in range(_USERS):
+        await _storage.create(User.model_validate(user))
+        await _legacy_storage.create(User.model_validate(user))
+
+    ids = urlencode([("ids", i) for i in range(1, _BATCH_SIZE + 1)])
+    body = json.dumps(user).encode()
+
+    cases: List[Tuple[str, Callable[[int], Tuple[str, str, bytes]]]] = [
+        ("hello", lambda i: ("GET", "/api/hello?name=Alvin", b"")),
+        ("get", lambda i: ("GET", f"/api/user/{i % _USERS + 1}", b"")),
+        ("get_many", lambda i: ("GET", f"/api/users?{ids}", b"")),
+        ("create", lambda i: ("POST", "/api/user", body)),
+    ]
+
+    print(f"{'case':<10}{'impl':<8}{'p50 us':>9}{'p99 us':>9}{'cpu us/req':>12}")
+    for name, request in cases:
+        results = {}
+        for impl, asgi in (("legacy", _legacy), ("fast", app)):
+            r = await _measure(asgi, n, request)
+            results[impl] = r
+            print(f"{name:<10}{impl:<8}{r['p50']:>9.1f}{r['p99']:>9.1f}{r['cpu']:>12.1f}")
+
+        # 两种实现的响应内容需一致 (新创建用户的 `id` 除外)
+        if name != "create":
+            assert json.loads(results["legacy"]["body"]) == json.loads(results["fast"]["body"])
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    # 关闭路由输出的日志, 避免日志输出影响测试结果
+    logger.remove()
+    asyncio.run(_bench(n))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
+import os
 from datetime import date
 from enum import Enum
-from multiprocessing import RLock
-from typing import Annotated, Any, Dict, Optional, TypeVar
+from typing import Annotated, List, Optional
 
-from fastapi import Response, status
+from fastapi import Query, status
 from pydantic import BaseModel as BModel
 from pydantic import Field, SerializationInfo, field_serializer, field_validator
 
-from .app import app
+from .app import app, on_shutdown
+from .response import FastJSONResponse, fragment
+from .storage import Storage
 
 
 class Gender(str, Enum):
@@ -68,83 +70,54 @@ class User(BaseModel):
     ] = None
 
     @field_serializer("birthday")
-    def serialize_birthday(self, birthday: date, _info: SerializationInfo) -> str:
+    def serialize_birthday(
+        self, birthday: Optional[date], _info: SerializationInfo
+    ) -> Optional[str]:
         """自定义 `birthday` 字段的序列号
 
         当调用 `model_dump` 方法时，将会调用此方法将 `birthday` 字段序列化为字符串。
 
         Args:
-            - `birthday` (`date`): 用户的生日
+            - `birthday` (`Optional[date]`): 用户的生日
             - `_info` (`SerializationInfo`): 序列化信息
 
         Returns:
-            `str`: 序列化后的字符串
+            `Optional[str]`: 序列化后的字符串, 未设置生日时返回 `None`
         """
-        return birthday.isoformat()
+        return birthday.isoformat() if birthday else None
 
     @field_validator("birthday")
     @classmethod
-    def validate_birthday(cls, birthday: date) -> date:
+    def validate_birthday(cls, birthday: Optional[date]) -> Optional[date]:
         """自定义 `birthday` 字段的验证器
 
         当验证模型对象时, 调用此方法对 `birthday` 字段进行验证
 
         Args:
-            - `birthday` (`date`): 用户的生日
+            - `birthday` (`Optional[date]`): 用户的生日
 
         Returns:
-            `date`: 验证后正确的用户生日值
+            `Optional[date]`: 验证后正确的用户生日值
         """
+        if birthday is None:
+            return None
+
         assert birthday <= date.today(), "Birthday cannot be in the future"
         assert birthday.year >= 1910, "Birthday cannot be less than 1910"
         return birthday
 
 
-# 定义模型泛型类型
-_ModelType = TypeVar("_ModelType", bound=BaseModel)
-
-
-class Storage:
-    """模型存储类型"""
-
-    def __init__(self) -> None:
-        self._lock = RLock()
-        # 用于存储模型的字典
-        self._store: Dict[int, BaseModel] = {}
-        self._last_id = 1
-
-    def create(self, model: _ModelType) -> _ModelType:
-        """存储模型对象
-
-        Args:
-            - `model` (`_ModelType`): 新模型对象
-
-        Returns:
-            `_ModelType`: 已存储的模型对象
-        """
-        if model.id is not None:
-            raise ValueError("Model already persisted")
-
-        with self._lock:
-            model.id = self._last_id
-            self._store[model.id] = model
-            self._last_id += 1
-
-        return model
-
-    def get(self, id: int) -> Optional[BaseModel]:
-        """根据 `id` 查询对应的模型对象
-
-        Args:
-            - `id` (`int`): 模型 id 属性值
-
-        Returns:
-            `Optional[BaseModel]`: 返回模型的查询结果
-        """
-        return self._store.get(id)
+# 快照文件路径, 通过环境变量设置, 未设置时数据只保存在内存中
+_storage: Storage[User] = Storage(
+    snapshot_file=os.environ.get("STORAGE_SNAPSHOT") or None,
+    models=[User],
+)
 
 
-_storage = Storage()
+@on_shutdown
+async def _flush_storage() -> None:
+    """应用关闭前等待快照文件写入完成, 以免丢失尚在队列中的模型对象"""
+    await _storage.flush()
 
 
 @app.get(
@@ -152,23 +125,29 @@ _storage = Storage()
     summary="Model Demo",
     description="Get User Model",
     tags=["Model"],
+    response_class=FastJSONResponse,
 )
-async def get_user(response: Response, id: int) -> Dict[str, Any]:
-    may_user = _storage.get(id)
+async def get_user(id: int) -> FastJSONResponse:
+    may_user = await _storage.get(id)
 
     if not may_user or not isinstance(may_user, User):
-        response.status_code = status.HTTP_404_NOT_FOUND
-        return {
-            "status": "error",
-            "payload": {"message": "User not found"},
-        }
+        return FastJSONResponse(
+            {
+                "status": "error",
+                "payload": {"message": "User not found"},
+            },
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
 
-    return {
-        "status": "success",
-        "payload": {
-            "user": may_user.model_dump(),
-        },
-    }
+    # 模型对象由 pydantic 直接序列化为 JSON, 无需先转为字典
+    return FastJSONResponse(
+        {
+            "status": "success",
+            "payload": {
+                "user": may_user,
+            },
+        }
+    )
 
 
 @app.post(
@@ -176,19 +155,91 @@ async def get_user(response: Response, id: int) -> Dict[str, Any]:
     summary="Model Demo",
     description="Create User Model",
     tags=["Model"],
+    response_class=FastJSONResponse,
 )
-async def create_user(response: Response, user: User) -> Dict[str, Any]:
+async def create_user(user: User) -> FastJSONResponse:
     try:
-        user = _storage.create(user)
-        return {
+        user = await _storage.create(user)
+        return FastJSONResponse(
+            {
+                "status": "success",
+                "payload": {
+                    "user": user,
+                },
+            }
+        )
+    except ValueError:
+        return FastJSONResponse(
+            {
+                "status": "error",
+                "payload": {"message": "User already exists"},
+            },
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+
+# 批量操作一次最多处理的模型数量
+_MAX_BATCH = 1000
+
+
+@app.get(
+    "/api/users",
+    summary="Model Demo",
+    description="Get User Models in batch",
+    tags=["Model"],
+    response_class=FastJSONResponse,
+)
+async def get_users(
+    ids: Annotated[List[int], Query(max_length=_MAX_BATCH)],
+) -> FastJSONResponse:
+    users = await _storage.get_many(ids)
+
+    return FastJSONResponse(
+        {
             "status": "success",
             "payload": {
-                "user": user.model_dump(),
+                # 不存在的用户返回 `None`, 整个列表通过缓存的 `TypeAdapter` 一次序列化
+                "users": fragment(
+                    [user if isinstance(user, User) else None for user in users],
+                    List[Optional[User]],
+                ),
             },
         }
+    )
+
+
+@app.post(
+    "/api/users",
+    summary="Model Demo",
+    description="Create User Models in batch",
+    tags=["Model"],
+    response_class=FastJSONResponse,
+)
+async def create_users(users: List[User]) -> FastJSONResponse:
+    if len(users) > _MAX_BATCH:
+        return FastJSONResponse(
+            {
+                "status": "error",
+                "payload": {"message": f"At most {_MAX_BATCH} users in a batch"},
+            },
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        created = await _storage.create_many(list(users))
+        return FastJSONResponse(
+            {
+                "status": "success",
+                "payload": {
+                    "users": fragment(created, List[User]),
+                },
+            }
+        )
     except ValueError:
-        response.status_code = status.HTTP_409_CONFLICT
-        return {
-            "status": "error",
-            "payload": {"message": "User already exists"},
-        }
+        return FastJSONResponse(
+            {
+                "status": "error",
+                "payload": {"message": "User already exists"},
+            },
+            status_code=status.HTTP_409_CONFLICT,
+        )
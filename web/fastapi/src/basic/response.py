@@ -0,0 +1,143 @@
+import json
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel as BModel
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter[Any]:
+    """获取指定类型的 `TypeAdapter` 对象
+
+    创建 `TypeAdapter` 对象需构建序列化器, 开销较大, 故对每个类型只创建一次
+
+    Args:
+        - `tp` (`Any`): 类型, 例如 `List[User]`
+
+    Returns:
+        `TypeAdapter[Any]`: 对应的 `TypeAdapter` 对象
+    """
+    return TypeAdapter(tp)
+
+
+class JsonFragment:
+    """已序列化的 JSON 片段, 作为响应内容的一部分原样输出"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes) -> None:
+        """构造器
+
+        Args:
+            - `data` (`bytes`): JSON 数据
+        """
+        self.data = data
+
+
+def fragment(value: Any, tp: Any = None) -> JsonFragment:
+    """通过 pydantic 将值序列化为 JSON 片段
+
+    模型对象通过其自身的序列化器 (即 `model_dump_json` 使用的序列化器) 直接生成 JSON, 其它值通过 `tp` 类型对应的
+    `TypeAdapter` 生成 JSON, 均由 pydantic-core 完成, 无需先转为字典
+
+    Args:
+        - `value` (`Any`): 要序列化的值
+        - `tp` (`Any`, optional): 值的类型, 例如 `List[User]`, 为 `None` 时值必须为模型对象. Defaults to `None`.
+
+    Returns:
+        `JsonFragment`: JSON 片段
+    """
+    if tp is None:
+        assert isinstance(value, BModel)
+        return JsonFragment(value.__pydantic_serializer__.to_json(value))
+
+    return JsonFragment(type_adapter(tp).dump_json(value))
+
+
+def _to_json(value: Any) -> bytes:
+    """将 JSON 序列化时无法直接处理的值通过 pydantic 序列化为 JSON 数据
+
+    Args:
+        - `value` (`Any`): 要序列化的值
+
+    Returns:
+        `bytes`: JSON 数据
+
+    Raises:
+        - `TypeError`: 无法序列化的值
+    """
+    if isinstance(value, JsonFragment):
+        return value.data
+
+    if isinstance(value, BModel):
+        return value.__pydantic_serializer__.to_json(value)
+
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _default(value: Any) -> Any:
+    """处理 orjson 序列化时无法直接处理的值, 生成的 JSON 数据直接嵌入输出
+
+    Args:
+        - `value` (`Any`): 要序列化的值
+
+    Returns:
+        `Any`: 可以被 orjson 序列化的值
+
+    Raises:
+        - `TypeError`: 无法序列化的值
+    """
+    return orjson.Fragment(_to_json(value))
+
+
+def _json_default(value: Any) -> Any:
+    """处理标准库 `json` 模块序列化时无法直接处理的值
+
+    Args:
+        - `value` (`Any`): 要序列化的值
+
+    Returns:
+        `Any`: 可以被 `json` 模块序列化的值
+
+    Raises:
+        - `TypeError`: 无法序列化的值
+    """
+    return json.loads(_to_json(value))
+
+
+class FastJSONResponse(JSONResponse):
+    """通过 orjson 生成响应内容的 JSON 响应类型
+
+    - 响应内容中的模型对象和 `JsonFragment` 对象直接嵌入 orjson 的输出, 不会转为字典
+    - 路由函数直接返回此类型对象时, FastAPI 不会再对响应内容进行验证和 `jsonable_encoder` 转换
+    - 未安装 orjson 时, 退化为通过标准库 `json` 模块生成响应内容
+    """
+
+    def render(self, content: Any) -> bytes:
+        """生成响应内容
+
+        Args:
+            - `content` (`Any`): 响应内容
+
+        Returns:
+            `bytes`: JSON 数据
+        """
+        if isinstance(content, BModel):
+            return content.__pydantic_serializer__.to_json(content)
+
+        if orjson is not None:
+            return orjson.dumps(content, default=_default)
+
+        return json.dumps(
+            content,
+            default=_json_default,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
@@ -1,8 +1,9 @@
-from typing import Annotated, Any, Dict
+from typing import Annotated
 
-from fastapi import Path, Query, Response, status
+from fastapi import Path, Query, status
 
 from .app import app
+from .response import FastJSONResponse
 from loguru import logger
 
 
@@ -28,32 +29,31 @@ QueryGender = Query(
     summary="Route Demo",
     description="Simple GET request demo",
     tags=["Route"],
+    response_class=FastJSONResponse,
 )
 async def get_hello_by_args_in_query(
-    response: Response,
     name: Annotated[str, QueryName],
     gender: Annotated[str, QueryGender] = "M",
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     """根据查询参数执行 GET 请求
 
     Args:
-        - `response` (`Response`): 响应对象
         - `name` (`Annotated[str, QueryName]`): Name 请求参数
         - `gender` (`Annotated[str, QueryGender]`, optional): Gender 请求参数. Defaults to "M".
 
     Returns:
-        `Dict[str, Any]`: 响应的 JSON 数据
+        `FastJSONResponse`: 响应对象, 直接返回响应对象可跳过 FastAPI 对返回值的验证和转换
     """
     name = name.strip()
     if not name:
-        # 如果 name 参数无效, 则修改响应码为 400
-        response.status_code = status.HTTP_400_BAD_REQUEST
-
-        # 返回错误响应 JSON
-        return {
-            "status": "error",
-            "payload": {"message": "Name is required"},
-        }
+        # 如果 name 参数无效, 则返回响应码为 400 的错误响应 JSON
+        return FastJSONResponse(
+            {
+                "status": "error",
+                "payload": {"message": "Name is required"},
+            },
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
 
     # 根据 gender 参数生成 title 值
     title = "Mr" if gender == "M" else "Ms"
@@ -61,10 +61,12 @@ async def get_hello_by_args_in_query(
     logger.info(f"access '/api/hello' route, querystring is 'name={name}, gender={gender}")
 
     # 返回 JSON 数据
-    return {
-        "status": "success",
-        "payload": {"message": f"Hello {title}. {name}"},
-    }
+    return FastJSONResponse(
+        {
+            "status": "success",
+            "payload": {"message": f"Hello {title}. {name}"},
+        }
+    )
 
 
 # 定义 Name 路径参数
@@ -82,39 +84,40 @@ PathName = Path(
     summary="Route Demo",
     description="Simple GET request demo",
     tags=["Route"],
+    response_class=FastJSONResponse,
 )
 async def get_hello_by_args_in_path(
-    response: Response,
     name: Annotated[str, PathName],
     gender: Annotated[str, QueryGender] = "M",
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     """根据路径参数执行 GET 请求
 
     Args:
-        - `response` (`Response`): 响应对象
         - `name` (`Annotated[str, QueryName]`): Name 路径参数
         - `gender` (`Annotated[str, QueryGender]`, optional): Gender 请求参数. Defaults to "M".
 
     Returns:
-        `Dict[str, Any]`: 响应的 JSON 数据
+        `FastJSONResponse`: 响应对象, 直接返回响应对象可跳过 FastAPI 对返回值的验证和转换
     """
     name = name.strip()
 
     if not name:
-        # 如果 name 参数无效, 则修改响应码为 400
-        response.status_code = status.HTTP_400_BAD_REQUEST
-
-        # 返回错误响应 JSON
-        return {
-            "status": "error",
-            "payload": {"message": "Name is required"},
-        }
+        # 如果 name 参数无效, 则返回响应码为 400 的错误响应 JSON
+        return FastJSONResponse(
+            {
+                "status": "error",
+                "payload": {"message": "Name is required"},
+            },
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
 
     # 根据 gender 参数生成 title 值
     title = "Mr" if gender == "M" else "Ms"
 
     # 返回 JSON 数据
-    return {
-        "status": "success",
-        "payload": {"message": f"Hello {title}. {name}"},
-    }
+    return FastJSONResponse(
+        {
+            "status": "success",
+            "payload": {"message": f"Hello {title}. {name}"},
+        }
+    )
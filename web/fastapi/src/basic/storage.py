@@ -0,0 +1,194 @@
+import asyncio
+import itertools
+import json
+import os
+import threading
+from typing import Dict, Generic, Iterable, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel as BModel
+
+# 默认的分片数量
+DEFAULT_SHARDS = 16
+
+# 定义模型泛型类型, 模型需具备 `id` 属性
+_ModelType = TypeVar("_ModelType", bound=BModel)
+
+
+class Storage(Generic[_ModelType]):
+    """基于内存的模型存储类型
+
+    模型按 `id` 分散存储在多个分片中, 每个分片由一个独立的锁保护 (锁分段), 锁只在读写字典时短暂持有,
+    不会跨越 `await`, 因此不会阻塞事件循环, 也可以在线程池中执行的同步路由中安全使用
+
+    如果指定了快照文件, 则每次写入的模型会以 JSON Lines 格式追加到文件中, 由后台任务批量写入磁盘,
+    存储对象创建时会从快照文件中恢复数据
+    """
+
+    def __init__(
+        self,
+        shards: int = DEFAULT_SHARDS,
+        snapshot_file: Optional[str] = None,
+        models: Iterable[Type[_ModelType]] = (),
+    ) -> None:
+        """构造器
+
+        Args:
+            - `shards` (`int`, optional): 分片数量. Defaults to `16`.
+            - `snapshot_file` (`Optional[str]`, optional): 快照文件路径, `None` 表示不保存快照. Defaults to `None`.
+            - `models` (`Iterable[Type[_ModelType]]`, optional): 需从快照文件中恢复的模型类型. Defaults to `()`.
+        """
+        self._shards: List[Dict[int, _ModelType]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+        # `itertools.count` 的 `next` 操作由 C 实现, 在 GIL 保护下是原子的, 无需加锁
+        self._ids = itertools.count(1)
+
+        self._snapshot_file = snapshot_file
+        self._models: Dict[str, Type[_ModelType]] = {m.__name__: m for m in models}
+
+        # 等待写入快照文件的行, 以及执行写入的后台任务
+        self._pending: List[str] = []
+        self._writer: Optional[asyncio.Task[None]] = None
+
+        if snapshot_file and os.path.exists(snapshot_file):
+            self._load(snapshot_file)
+
+    def _shard(self, id: int) -> int:
+        return id % len(self._shards)
+
+    def _put(self, model: _ModelType) -> None:
+        """将模型对象存入对应分片
+
+        Args:
+            - `model` (`_ModelType`): 已分配 `id` 的模型对象
+        """
+        n = self._shard(model.id)  # type: ignore[attr-defined]
+        with self._locks[n]:
+            self._shards[n][model.id] = model  # type: ignore[attr-defined]
+
+    def _load(self, snapshot_file: str) -> None:
+        """从快照文件中恢复模型对象
+
+        Args:
+            - `snapshot_file` (`str`): 快照文件路径
+        """
+        last_id = 0
+        with open(snapshot_file, "r", encoding="utf-8") as fp:
+            for line in fp:
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                model_cls = self._models.get(record["model"])
+                if model_cls is None:
+                    continue
+
+                model = model_cls.model_validate(record["data"])
+                self._put(model)
+                last_id = max(last_id, model.id)  # type: ignore[attr-defined]
+
+        self._ids = itertools.count(last_id + 1)
+
+    def _append(self, models: Iterable[_ModelType]) -> None:
+        """将模型对象加入快照写入队列
+
+        Args:
+            - `models` (`Iterable[_ModelType]`): 模型对象
+        """
+        if not self._snapshot_file:
+            return
+
+        self._pending.extend(
+            f'{{"model": "{type(m).__name__}", "data": {m.model_dump_json()}}}\n' for m in models
+        )
+
+        # 写入任务未运行时启动新任务, 任务运行期间加入的行会在下一轮写入
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._write())
+
+    async def _write(self) -> None:
+        """后台任务, 在线程池中将队列中的行批量追加到快照文件"""
+        while self._pending:
+            lines, self._pending = self._pending, []
+            await asyncio.to_thread(self._write_lines, lines)
+
+    def _write_lines(self, lines: List[str]) -> None:
+        assert self._snapshot_file is not None
+
+        with open(self._snapshot_file, "a", encoding="utf-8") as fp:
+            fp.writelines(lines)
+
+    async def flush(self) -> None:
+        """等待所有模型对象写入快照文件"""
+        while self._writer is not None and not self._writer.done():
+            await self._writer
+
+    async def create(self, model: _ModelType) -> _ModelType:
+        """存储模型对象
+
+        Args:
+            - `model` (`_ModelType`): 新模型对象
+
+        Returns:
+            `_ModelType`: 已存储的模型对象
+
+        Raises:
+            - `ValueError`: 模型对象已被存储
+        """
+        if model.id is not None:  # type: ignore[attr-defined]
+            raise ValueError("Model already persisted")
+
+        model.id = next(self._ids)  # type: ignore[attr-defined]
+        self._put(model)
+
+        if self._snapshot_file:
+            self._append((model,))
+
+        return model
+
+    async def create_many(self, models: List[_ModelType]) -> List[_ModelType]:
+        """批量存储模型对象
+
+        Args:
+            - `models` (`List[_ModelType]`): 新模型对象列表
+
+        Returns:
+            `List[_ModelType]`: 已存储的模型对象列表
+
+        Raises:
+            - `ValueError`: 存在已被存储的模型对象, 此时所有模型对象均不会被存储
+        """
+        if any(m.id is not None for m in models):  # type: ignore[attr-defined]
+            raise ValueError("Model already persisted")
+
+        for model in models:
+            model.id = next(self._ids)  # type: ignore[attr-defined]
+            self._put(model)
+
+        self._append(models)
+        return models
+
+    async def get(self, id: int) -> Optional[_ModelType]:
+        """根据 `id` 查询对应的模型对象
+
+        Args:
+            - `id` (`int`): 模型 id 属性值
+
+        Returns:
+            `Optional[_ModelType]`: 返回模型的查询结果
+        """
+        return self._shards[self._shard(id)].get(id)
+
+    async def get_many(self, ids: Iterable[int]) -> List[Optional[_ModelType]]:
+        """批量查询模型对象
+
+        Args:
+            - `ids` (`Iterable[int]`): 模型 id 属性值
+
+        Returns:
+            `List[Optional[_ModelType]]`: 和 `ids` 一一对应的查询结果, 不存在的模型为 `None`
+        """
+        return [self._shards[self._shard(id)].get(id) for id in ids]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
@@ -0,0 +1,4 @@
+from . import route as _  # noqa
+from .app import app
+
+__all__ = ["app"]
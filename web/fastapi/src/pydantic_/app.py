@@ -0,0 +1,17 @@
+from fastapi import FastAPI
+
+description = """
+## Pydantic with FastAPI
+
+This demo show how to use pydantic models in FastAPI, include:
+
+- Bulk ingestion of NDJSON request body
+- Streaming validation with reused `TypeAdapter`
+"""
+
+app = FastAPI(
+    title="Pydantic with FastAPI",
+    description=description,
+    version="1.0.0",
+    docs_url="/docs",
+)
@@ -0,0 +1,134 @@
+"""
+NDJSON 批量导入接口性能测试
+
+通过 `httpx.ASGITransport` 在当前进程中向应用发送包含 10^6 行用户数据的请求 (请求体由生成器逐块产生,
+其中 1% 的行无法通过验证), 对比如下两种实现的吞吐量和内存占用:
+
+- `buffered`: 一次性读取整个请求体后按行拆分, 每行通过 `User.model_validate_json` 验证, 并返回完整的 JSON 结果
+- `stream`: 当前的 `POST /api/users/bulk` 接口, 以流的方式读取请求体, 通过复用的 `TypeAdapter` 分批验证
+
+每种实现在独立的子进程中执行, 以便分别统计进程的峰值内存 (RSS)
+
+执行方式:
+
+```bash
+python -m pydantic_.bench [行数]
+```
+"""
+
+import asyncio
+import json
+import multiprocessing as mp
+import resource
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+from fastapi import Request
+from pydantic import ValidationError
+
+from pydantic_ import app
+from pydantic_.models import User
+
+# 请求体每个数据块包含的行数
+_CHUNK_LINES = 1000
+
+# 每隔多少行插入一行无效数据
+_INVALID_EVERY = 100
+
+
+@app.post("/bench/users/buffered", include_in_schema=False)
+async def _ingest_buffered(request: Request) -> Dict[str, Any]:
+    """原有实现, 读取整个请求体后逐行验证"""
+    body = await request.body()
+
+    users: List[User] = []
+    errors: List[Dict[str, Any]] = []
+    for lineno, line in enumerate(body.splitlines(), 1):
+        if not line.strip():
+            continue
+
+        try:
+            users.append(User.model_validate_json(line))
+        except ValidationError as e:
+            errors.append({"line": lineno, "errors": e.errors(include_url=False, include_input=False)})
+
+    return {"accepted": len(users), "rejected": len(errors), "errors": errors}
+
+
+async def _body(n: int) -> AsyncIterator[bytes]:
+    """逐块生成请求体
+
+    Args:
+        - `n` (`int`): 行数
+
+    Yields:
+        `bytes`: 请求体数据块
+    """
+    lines: List[str] = []
+    for i in range(n):
+        if i % _INVALID_EVERY == _INVALID_EVERY - 1:
+            lines.append(json.dumps({"org_id": 0, "name": f"User{i}"}))
+        else:
+            lines.append(json.dumps({"org_id": i % 10 + 1, "name": f"User{i}", "phone": "010-12345678"}))
+
+        if len(lines) == _CHUNK_LINES:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def _request(mode: str, n: int) -> Dict[str, Any]:
+    url = "/bench/users/buffered" if mode == "buffered" else "/api/users/bulk"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        resp = await client.post(url, content=_body(n))
+        seconds = time.perf_counter() - start
+
+    assert resp.status_code == 200, resp.text
+    if mode == "buffered":
+        accepted, rejected = resp.json()["accepted"], resp.json()["rejected"]
+    else:
+        summary = json.loads(resp.text.splitlines()[-1])["summary"]
+        accepted, rejected = summary["accepted"], summary["rejected"]
+
+    return {"accepted": accepted, "rejected": rejected, "seconds": seconds, "bytes": len(resp.content)}
+
+
+def _run(mode: str, n: int, results: Any) -> None:
+    """子进程入口, 执行测试并返回结果和峰值内存"""
+    # 预热, 排除首次请求创建验证器等开销
+    asyncio.run(_request(mode, 1000))
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    r = asyncio.run(_request(mode, n))
+    r["rss_before"] = rss_before / 1024
+    r["rss_peak"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put(r)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"{n} lines, {n // _INVALID_EVERY} invalid")
+    print(f"{'mode':<10}{'accepted':>10}{'rejected':>10}{'seconds':>9}{'lines/s':>10}{'resp KB':>9}{'base MB':>9}{'peak MB':>9}")
+    for mode in ("buffered", "stream"):
+        results: Any = mp.Queue()
+        p = mp.Process(target=_run, args=(mode, n, results))
+        p.start()
+        r = results.get()
+        p.join()
+
+        print(
+            f"{mode:<10}{r['accepted']:>10}{r['rejected']:>10}{r['seconds']:>9.2f}{n / r['seconds']:>10.0f}"
+            f"{r['bytes'] / 1024:>9.0f}{r['rss_before']:>9.1f}{r['rss_peak']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# 每批验证的行数
+DEFAULT_BATCH_SIZE = 1000
+
+# 最多记录的错误行数, 超过后只计数, 以保证内存占用有上限
+DEFAULT_MAX_ERRORS = 1000
+
+# 每行的最大字节数, 超过的行不会被缓存和验证, 直接作为错误行
+DEFAULT_MAX_LINE_LENGTH = 1024 * 1024
+
+_M = TypeVar("_M", bound=BaseModel)
+
+# 处理验证通过的模型对象的函数
+Sink = Callable[[List[_M]], Awaitable[None]]
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Type[_M]) -> TypeAdapter[_M]:
+    """获取模型类型的 `TypeAdapter` 对象
+
+    创建 `TypeAdapter` 对象需构建验证器, 开销较大, 故对每个模型类型只创建一次, 在所有请求间复用
+
+    Args:
+        - `model` (`Type[_M]`): 模型类型
+
+    Returns:
+        `TypeAdapter[_M]`: 用于验证模型的对象
+    """
+    return TypeAdapter(model)
+
+
+@dataclass
+class LineError:
+    """一行数据的验证错误"""
+
+    # 行号, 从 1 开始
+    line: int
+
+    # 错误信息, 即 `ValidationError.errors()` 的结果
+    errors: List[Dict[str, Any]]
+
+
+@dataclass
+class IngestResult:
+    """批量导入结果"""
+
+    # 验证通过的行数
+    accepted: int = 0
+
+    # 验证失败的行数
+    rejected: int = 0
+
+    # 验证失败的行, 最多记录 `max_errors` 条
+    errors: List[LineError] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        """导入结果摘要
+
+        Returns:
+            `Dict[str, Any]`: 导入结果摘要
+        """
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "truncated": self.rejected > len(self.errors),
+        }
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_line_length: int = DEFAULT_MAX_LINE_LENGTH
+) -> AsyncIterator[Optional[bytes]]:
+    """将字节流按行拆分, 不会将整个字节流读入内存
+
+    跨越多个数据块的行先以片段列表的形式保存, 行结束时再一次拼接; 片段总长度超过 `max_line_length` 时丢弃已保存的片段,
+    并忽略该行之后的内容直到行结束, 因此缺少换行符的请求体不会使内存占用无限增长
+
+    Args:
+        - `chunks` (`AsyncIterable[bytes]`): 字节流, 例如 `Request.stream()`
+        - `max_line_length` (`int`, optional): 每行的最大字节数. Defaults to `1048576`.
+
+    Yields:
+        `Optional[bytes]`: 每行内容, 不包含换行符; 超过最大长度的行为 `None`
+    """
+    # 不完整的行的片段及其总长度, 以及不完整的行是否已超过最大长度
+    pieces: List[bytes] = []
+    size = 0
+    too_long = False
+
+    async for chunk in chunks:
+        lines = chunk.split(b"\n")
+
+        # 数据块中没有换行符, 整个数据块都属于不完整的行
+        if len(lines) == 1:
+            if not too_long:
+                pieces.append(chunk)
+                size += len(chunk)
+                if size > max_line_length:
+                    pieces, size, too_long = [], 0, True
+
+            continue
+
+        # 第一段和之前保存的片段组成完整的行
+        first = lines[0]
+        if too_long or size + len(first) > max_line_length:
+            yield None
+        else:
+            yield b"".join((*pieces, first)) if pieces else first
+
+        for line in lines[1:-1]:
+            yield line if len(line) <= max_line_length else None
+
+        # 最后一段可能是不完整的行, 留到下一个数据块再处理
+        last = lines[-1]
+        too_long = len(last) > max_line_length
+        pieces = [last] if last and not too_long else []
+        size = len(pieces[0]) if pieces else 0
+
+    if too_long:
+        yield None
+    elif pieces:
+        yield b"".join(pieces)
+
+
+class NdjsonIngester(Generic[_M]):
+    """以流的方式读取 NDJSON (每行一个 JSON 对象) 数据, 并分批验证为模型对象
+
+    每行通过复用的 `TypeAdapter` 单独验证, 以便定位错误的行; 验证通过的模型对象每满一批交给 `sink` 处理,
+    处理后即可释放, 因此内存占用只和批大小及记录的错误数有关, 和请求体大小无关
+    """
+
+    def __init__(
+        self,
+        model: Type[_M],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_errors: int = DEFAULT_MAX_ERRORS,
+        max_line_length: int = DEFAULT_MAX_LINE_LENGTH,
+    ) -> None:
+        """构造器
+
+        Args:
+            - `model` (`Type[_M]`): 模型类型
+            - `batch_size` (`int`, optional): 每批验证的行数. Defaults to `1000`.
+            - `max_errors` (`int`, optional): 最多记录的错误行数. Defaults to `1000`.
+            - `max_line_length` (`int`, optional): 每行的最大字节数. Defaults to `1048576`.
+        """
+        self._adapter = _adapter(model)
+        self._batch_size = batch_size
+        self._max_errors = max_errors
+        self._max_line_length = max_line_length
+
+    def _validate(
+        self, batch: List[Tuple[int, Optional[bytes]]], result: IngestResult
+    ) -> List[_M]:
+        """验证一批数据, 验证失败的行记录到导入结果中
+
+        Args:
+            - `batch` (`List[Tuple[int, Optional[bytes]]]`): `(行号, 行内容)` 列表, 超过最大长度的行内容为 `None`
+            - `result` (`IngestResult`): 导入结果, 用于记录错误
+
+        Returns:
+            `List[_M]`: 验证通过的模型对象
+        """
+        validate_json = self._adapter.validate_json
+
+        models: List[_M] = []
+        for lineno, line in batch:
+            if line is None:
+                error = {
+                    "loc": (),
+                    "msg": f"Line should have at most {self._max_line_length} bytes",
+                    "type": "line_too_long",
+                }
+                self._reject(result, lineno, [error])
+                continue
+
+            try:
+                models.append(validate_json(line))
+            except ValidationError as e:
+                self._reject(result, lineno, e.errors(include_url=False))
+
+        result.accepted += len(models)
+        return models
+
+    def _reject(self, result: IngestResult, lineno: int, errors: List[Any]) -> None:
+        """记录验证失败的行
+
+        Args:
+            - `result` (`IngestResult`): 导入结果
+            - `lineno` (`int`): 行号
+            - `errors` (`List[Any]`): 错误信息
+        """
+        result.rejected += 1
+        if len(result.errors) < self._max_errors:
+            # 错误信息中的 `input` 和 `ctx` 可能包含无法序列化为 JSON 的对象, 故只保留必要的字段
+            result.errors.append(
+                LineError(
+                    line=lineno,
+                    errors=[{"loc": e["loc"], "msg": e["msg"], "type": e["type"]} for e in errors],
+                )
+            )
+
+    async def ingest(
+        self, chunks: AsyncIterable[bytes], sink: Optional[Sink[_M]] = None
+    ) -> IngestResult:
+        """读取并验证 NDJSON 数据
+
+        Args:
+            - `chunks` (`AsyncIterable[bytes]`): 字节流
+            - `sink` (`Optional[Sink[_M]]`, optional): 处理每批验证通过的模型对象的函数. Defaults to `None`.
+
+        Returns:
+            `IngestResult`: 导入结果
+        """
+        result = IngestResult()
+
+        batch: List[Tuple[int, Optional[bytes]]] = []
+        lineno = 0
+        async for line in iter_lines(chunks, self._max_line_length):
+            lineno += 1
+
+            # 忽略空行
+            if line is not None and not line.strip():
+                continue
+
+            batch.append((lineno, line))
+            if len(batch) >= self._batch_size:
+                models = self._validate(batch, result)
+                if sink is not None and models:
+                    await sink(models)
+
+                batch = []
+
+        if batch:
+            models = self._validate(batch, result)
+            if sink is not None and models:
+                await sink(models)
+
+        return result
+
+
+def iter_summary(result: IngestResult) -> Iterator[bytes]:
+    """将导入结果转为 NDJSON 格式, 每个错误行一行, 最后一行为结果摘要
+
+    Args:
+        - `result` (`IngestResult`): 导入结果
+
+    Yields:
+        `bytes`: 每行内容
+    """
+    for error in result.errors:
+        yield json.dumps({"line": error.line, "errors": error.errors}).encode() + b"\n"
+
+    yield json.dumps({"summary": result.summary()}).encode() + b"\n"
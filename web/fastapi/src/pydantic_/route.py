@@ -0,0 +1,82 @@
+from typing import Annotated, Type
+
+from fastapi import Query, Request
+from fastapi.responses import StreamingResponse
+
+from .app import app
+from .ingest import DEFAULT_BATCH_SIZE, NdjsonIngester, iter_summary
+from .models import BaseModel, Org, User
+
+# 批量导入接口响应的内容类型
+_NDJSON = "application/x-ndjson"
+
+# 定义每批验证的行数查询参数
+QueryBatchSize = Query(
+    title="Batch size",
+    description="Number of lines validated in one batch",
+    gt=0,
+    le=10000,
+)
+
+
+async def _ingest(request: Request, model: Type[BaseModel], batch_size: int) -> StreamingResponse:
+    """读取请求体中的 NDJSON 数据并逐批验证, 返回 NDJSON 格式的错误行和结果摘要
+
+    请求体以流的方式读取, 不会整体读入内存; 验证失败的行最多记录 `DEFAULT_MAX_ERRORS` 条
+
+    Args:
+        - `request` (`Request`): 请求对象
+        - `model` (`Type[BaseModel]`): 模型类型
+        - `batch_size` (`int`): 每批验证的行数
+
+    Returns:
+        `StreamingResponse`: 响应对象
+    """
+    ingester = NdjsonIngester(model, batch_size=batch_size)
+    result = await ingester.ingest(request.stream())
+
+    return StreamingResponse(iter_summary(result), media_type=_NDJSON)
+
+
+@app.post(
+    "/api/orgs/bulk",
+    summary="Bulk ingest orgs",
+    description="Ingest orgs from NDJSON request body, one org per line",
+    tags=["Ingest"],
+)
+async def ingest_orgs(
+    request: Request,
+    batch_size: Annotated[int, QueryBatchSize] = DEFAULT_BATCH_SIZE,
+) -> StreamingResponse:
+    """批量导入组织, 请求体每行为一个组织的 JSON 对象
+
+    Args:
+        - `request` (`Request`): 请求对象
+        - `batch_size` (`Annotated[int, QueryBatchSize]`, optional): 每批验证的行数. Defaults to `1000`.
+
+    Returns:
+        `StreamingResponse`: NDJSON 格式的错误行和结果摘要
+    """
+    return await _ingest(request, Org, batch_size)
+
+
+@app.post(
+    "/api/users/bulk",
+    summary="Bulk ingest users",
+    description="Ingest users from NDJSON request body, one user per line",
+    tags=["Ingest"],
+)
+async def ingest_users(
+    request: Request,
+    batch_size: Annotated[int, QueryBatchSize] = DEFAULT_BATCH_SIZE,
+) -> StreamingResponse:
+    """批量导入用户, 请求体每行为一个用户的 JSON 对象
+
+    Args:
+        - `request` (`Request`): 请求对象
+        - `batch_size` (`Annotated[int, QueryBatchSize]`, optional): 每批验证的行数. Defaults to `1000`.
+
+    Returns:
+        `StreamingResponse`: NDJSON 格式的错误行和结果摘要
+    """
+    return await _ingest(request, User, batch_size)
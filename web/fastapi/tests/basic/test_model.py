@@ -53,3 +53,23 @@ def test_create_and_query_model(client: TestClient) -> None:
             },
         },
     }
+
+
+def test_create_and_query_models_in_batch(client: TestClient) -> None:
+    users = [
+        User(name="Alvin", gender=Gender.MALE, birthday=date(1981, 3, 17)),
+        User(name="Emma", gender=Gender.FEMALE),
+    ]
+
+    response = client.post("/api/users", json=[u.model_dump() for u in users])
+    assert response.status_code == 200
+
+    created = response.json()["payload"]["users"]
+    assert [u["name"] for u in created] == ["Alvin", "Emma"]
+
+    ids = [u["id"] for u in created]
+    response = client.get("/api/users", params={"ids": [*ids, 0]})
+    assert response.status_code == 200
+
+    # 不存在的用户返回 `None`
+    assert response.json()["payload"]["users"] == [*created, None]
@@ -0,0 +1,33 @@
+import json
+from datetime import date
+from typing import List, Optional
+
+from basic.model import User
+from basic.response import FastJSONResponse, fragment, type_adapter
+
+
+def test_fast_json_response() -> None:
+    alvin = User(id=1, name="Alvin", birthday=date(1981, 3, 17))
+    emma = User(id=2, name="Emma")
+
+    # 同一类型的 `TypeAdapter` 只创建一次
+    assert type_adapter(List[Optional[User]]) is type_adapter(List[Optional[User]])
+
+    response = FastJSONResponse(
+        {
+            "user": alvin,
+            "users": fragment([emma, None], List[Optional[User]]),
+            "message": "你好",
+        },
+        status_code=201,
+    )
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(bytes(response.body)) == {
+        "user": {"id": 1, "name": "Alvin", "gender": "male", "birthday": "1981-03-17", "email": None},
+        "users": [{"id": 2, "name": "Emma", "gender": "male", "birthday": None, "email": None}, None],
+        "message": "你好",
+    }
+
+    # 直接以模型对象作为响应内容
+    assert FastJSONResponse(emma).body == emma.model_dump_json().encode()
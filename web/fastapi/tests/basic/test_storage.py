@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from basic import app, model
+from basic.model import User
+from basic.storage import Storage
+
+
+@pytest.mark.asyncio
+async def test_storage_create_and_get() -> None:
+    storage: Storage[User] = Storage(shards=4)
+
+    alvin = await storage.create(User(name="Alvin"))
+    users = await storage.create_many([User(name="Emma"), User(name="Lucy")])
+
+    assert [alvin.id, *[u.id for u in users]] == [1, 2, 3]
+    assert await storage.get(1) is alvin
+    assert await storage.get_many([3, 4]) == [users[1], None]
+    assert len(storage) == 3
+
+    # 已存储的模型对象不能再次存储
+    with pytest.raises(ValueError):
+        await storage.create(alvin)
+
+
+@pytest.mark.asyncio
+async def test_storage_snapshot(tmp_path: Path) -> None:
+    snapshot_file = str(tmp_path / "snapshot.jsonl")
+
+    storage: Storage[User] = Storage(snapshot_file=snapshot_file, models=[User])
+    await storage.create_many([User(name="Alvin"), User(name="Emma")])
+    await storage.create(User(name="Lucy"))
+    await storage.flush()
+
+    # 从快照文件中恢复数据, 新模型对象的 `id` 从已恢复的最大 `id` 之后开始分配
+    restored: Storage[User] = Storage(snapshot_file=snapshot_file, models=[User])
+    assert len(restored) == 3
+    assert (await restored.get(2)) == User(id=2, name="Emma")
+    assert (await restored.create(User(name="Tom"))).id == 4
+
+
+def test_storage_flush_on_shutdown(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    snapshot_file = str(tmp_path / "snapshot.jsonl")
+
+    storage: Storage[User] = Storage(snapshot_file=snapshot_file, models=[User])
+    monkeypatch.setattr(model, "_storage", storage)
+
+    # 应用关闭时, 等待队列中的模型对象写入快照文件
+    with TestClient(app) as client:
+        assert client.post("/api/user", json={"name": "Alvin"}).status_code == 200
+
+    restored: Storage[User] = Storage(snapshot_file=snapshot_file, models=[User])
+    assert len(restored) == 1
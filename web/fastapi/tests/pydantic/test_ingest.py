@@ -0,0 +1,89 @@
+import json
+from typing import AsyncIterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from pydantic_ import app
+from pydantic_.ingest import NdjsonIngester, iter_lines
+from pydantic_.models import User
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    """将字节串按指定大小拆分为数据块"""
+    for i in range(0, len(data), size):
+        yield data[i: i + size]
+
+
+@pytest.mark.asyncio
+async def test_ingest_in_batches() -> None:
+    """测试分批验证 NDJSON 数据, 行可能被拆分到不同的数据块中, 错误行需记录正确的行号"""
+    lines = [json.dumps({"org_id": 1, "name": f"User{i}"}) for i in range(10)]
+    lines[3] = json.dumps({"org_id": 0, "name": "User3"})
+    lines[7] = "not json"
+    lines[8] = lines[8] + "," + lines[8]
+
+    # 数据块大小和行长度不对齐, 以验证跨数据块的行能被正确拼接
+    data = "\n".join(lines).encode()
+    assert [line async for line in iter_lines(_chunks(data, 7))] == [line.encode() for line in lines]
+
+    batches: List[List[User]] = []
+
+    async def sink(users: List[User]) -> None:
+        batches.append(users)
+
+    ingester = NdjsonIngester(User, batch_size=4, max_errors=2)
+    result = await ingester.ingest(_chunks(data, 7), sink)
+
+    assert result.accepted == 7
+    assert result.rejected == 3
+    assert [e.line for e in result.errors] == [4, 8]
+    assert result.errors[0].errors[0]["loc"] == ("org_id",)
+    assert result.summary() == {"accepted": 7, "rejected": 3, "truncated": True}
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert batches[0][0].name == "User0"
+
+
+@pytest.mark.asyncio
+async def test_ingest_long_lines() -> None:
+    """测试超过最大长度的行被作为错误行, 其内容不会被缓存"""
+    short = json.dumps({"org_id": 1, "name": "Alvin"})
+    lines = [short, "x" * 100, short, "y" * 30, short, "z" * 100]
+    data = "\n".join(lines).encode()
+
+    # 超长的行可能在数据块中间, 也可能跨越多个数据块或位于数据末尾
+    for size in (7, 40, len(data)):
+        assert [line async for line in iter_lines(_chunks(data, size), max_line_length=40)] == [
+            short.encode(), None, short.encode(), b"y" * 30, short.encode(), None,
+        ]
+
+    ingester = NdjsonIngester(User, max_line_length=40)
+    result = await ingester.ingest(_chunks(data, 7))
+
+    assert result.accepted == 3
+    assert [(e.line, e.errors[0]["type"]) for e in result.errors] == [
+        (2, "line_too_long"), (4, "json_invalid"), (6, "line_too_long"),
+    ]
+
+
+def test_bulk_ingest_route() -> None:
+    """测试批量导入接口, 响应为 NDJSON 格式的错误行和结果摘要"""
+    client = TestClient(app)
+
+    body = "\n".join([
+        json.dumps({"name": "Alvin"}),
+        "",
+        json.dumps({"name": "A"}),
+    ])
+    response = client.post("/api/orgs/bulk", content=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert results == [
+        {
+            "line": 3,
+            "errors": [{"loc": ["name"], "msg": "String should have at least 2 characters", "type": "string_too_short"}],
+        },
+        {"summary": {"accepted": 1, "rejected": 1, "truncated": False}},
+    ]
@@ -9,6 +9,7 @@ import time
 from typing import Any, Dict, Tuple
 
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import async_templated
 from werkzeug import Response
@@ -18,6 +19,9 @@ from flask import Flask, jsonify, request
 # 实例化 Flask 对象
 app = Flask(__name__, static_folder="static", template_folder="templates")
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 # 设置密钥
 app.config["SECRET_KEY"] = "secret!!!"
 
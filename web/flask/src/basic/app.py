@@ -10,6 +10,7 @@ import time
 from typing import Any, Dict, Tuple
 
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import templated
 
@@ -18,6 +19,9 @@ from flask import Flask, Response, jsonify
 # 创建 Flask 对象，并指定静态文件存储路径以及 html 模板存储路径
 app: Flask = Flask(__name__, static_folder="static", template_folder="templates")
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 # 将 gunicorn 服务器的 log 接入到 flask log 中
 gunicorn_logger = logging.getLogger("gunicorn.error")
 app.logger.handlers = gunicorn_logger.handlers
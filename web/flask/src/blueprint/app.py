@@ -6,6 +6,7 @@ if not is_debug():
     monkey.patch_all()
 
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets
 
@@ -21,6 +22,9 @@ app = Flask(
 # 在 jinja 模板中增加 assets 对象
 app.jinja_env.globals["assets"] = Assets(app)
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 
 def register_blueprint() -> None:
     """
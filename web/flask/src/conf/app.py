@@ -8,6 +8,7 @@ if not is_debug():
 import os
 
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets, templated
 
@@ -18,6 +19,9 @@ app: Flask = Flask(__name__, template_folder="templates", static_folder="static"
 
 app.jinja_env.globals["assets"] = Assets(app)
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 # 获取 ENV 环境变量
 env = os.environ.get("ENV")
 
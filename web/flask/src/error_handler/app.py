@@ -9,6 +9,7 @@ from traceback import format_tb
 from typing import Any, Dict, NoReturn, Tuple
 
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets, templated
 
@@ -20,6 +21,9 @@ app = Flask(__name__, template_folder="templates", static_folder="static")
 # 为 jinja 注入 assets 对象
 app.jinja_env.globals["assets"] = Assets(app)
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 
 class NothingError(Exception):
     """定义测试用的异常类"""
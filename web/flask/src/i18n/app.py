@@ -11,6 +11,7 @@ from flask_babel import Babel
 from flask_babel import lazy_gettext as _
 from flask_babel import refresh
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets, templated
 
@@ -22,6 +23,9 @@ app = Flask(__name__, static_folder="static", template_folder="templates")
 # 为 jinja 注入 assets 对象
 app.jinja_env.globals["assets"] = Assets(app)
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 # 加载配置文件
 app.config.from_pyfile("conf.py")
 
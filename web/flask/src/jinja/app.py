@@ -8,6 +8,8 @@ if not is_debug():
 from typing import Any, Dict, Tuple
 
 from utils.paths import get_watch_files_for_develop
+from utils.search import DEFAULT_PER_PAGE, SearchIndex
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets, templated
 from werkzeug import Response
@@ -20,6 +22,9 @@ app = Flask(__name__, template_folder="templates", static_folder="static")
 # 为 jinja 注入 assets 对象
 app.jinja_env.globals["assets"] = Assets(app)
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 # 为 jinja 注入 url 函数
 app.jinja_env.globals["url"] = lambda url: "/" + url
 
@@ -33,27 +38,44 @@ def index() -> Dict[str, Any]:
     return {}
 
 
+# 可检索的文档, 以标题和描述作为被检索的文本
+_DOCUMENTS: SearchIndex[Dict[str, str]] = SearchIndex()
+
+for _doc in [
+    {
+        "title": "Welcome | Jinja2 (The Python Template Engine)",
+        "description": "Jinja is a fast, expressive, extensible templating engine. "
+        "Special placeholders in the template allow writing code similar "
+        "to Python syntax. Then the template is passed data to render the "
+        "final document.",
+        "url": "http://jinja.pocoo.org",
+    },
+]:
+    _DOCUMENTS.add(_doc["url"], _doc, text=f"{_doc['title']}\n{_doc['description']}")
+
+# 每页最多的结果数
+_MAX_PER_PAGE = 100
+
+
 @app.route("/api/search", methods=["GET"])
 def search() -> Tuple[Response, int]:
     """
-    获取检索结果
+    获取检索结果, 结果按相关度排序并分页
     """
     key = request.args.get("key")
     if not key:
         return jsonify(message="Invalid key word"), 400
 
+    page = request.args.get("page", 1, type=int)
+    per_page = min(request.args.get("per_page", DEFAULT_PER_PAGE, type=int), _MAX_PER_PAGE)
+
+    result = _DOCUMENTS.search(key, page=page, per_page=per_page)
     return (
         jsonify(
-            results=[
-                {
-                    "title": "Welcome | Jinja2 (The Python Template Engine)",
-                    "description": "Jinja is a fast, expressive, extensible templating engine. "
-                    "Special placeholders in the template allow writing code similar "
-                    "to Python syntax. Then the template is passed data to render the "
-                    "final document.",
-                    "url": "http://jinja.pocoo.org",
-                }
-            ]
+            results=result.items,
+            total=result.total,
+            page=result.page,
+            pages=result.pages,
         ),
         200,
     )
@@ -11,6 +11,7 @@ from flask_login import LoginManager
 from login.form import LoginForm
 from login.model import UserModel
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets
 from werkzeug.wrappers import Response
@@ -26,6 +27,9 @@ app.config["SECRET_KEY"] = "secret!!!"
 # 为 jinja 注入 assets 对象
 app.jinja_env.globals["assets"] = Assets(app)
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 # 实例化登陆管理器
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -1,7 +1,8 @@
 from functools import wraps
 from typing import Any, Callable, Optional, Tuple, Union
 
-from quart import render_template, request
+from quart import current_app, render_template, request
+from utils.cache import DEFAULT_TTL, CacheStore, PageCache, VaryFunc
 from utils.web import TemplateResolveError
 
 
@@ -68,3 +69,45 @@ def templated(template: Optional[str] = None) -> Callable[..., Any]:
         return wrapper
 
     return decorator
+
+
+def cached_templated(
+    template: Optional[str] = None,
+    ttl: float = DEFAULT_TTL,
+    vary: Optional[VaryFunc] = None,
+    store: Optional[CacheStore] = None,
+) -> Callable[..., Any]:
+    """带缓存的模板文件装饰器
+
+    按 endpoint, 路由参数, 查询参数以及 `vary` 函数的返回值缓存渲染结果, 缓存有效期内不再执行控制器函数和渲染模板;
+    响应带有 ETag, 浏览器再次请求时可获得 304 响应
+
+    Args:
+        - `template` (`Optional[str]`): 模板名称, `None` 表示根据规则取默认模板
+        - `ttl` (`float`, optional): 缓存时间 (秒). Defaults to `60.0`.
+        - `vary` (`Optional[VaryFunc]`, optional): 计算额外缓存 key 的函数, 例如返回当前用户. Defaults to `None`.
+        - `store` (`Optional[CacheStore]`, optional): 页面缓存存储, `None` 表示使用进程内缓存. Defaults to `None`.
+
+    Returns:
+        `Callable[..., Any]`: 被装饰方法
+    """
+    cache = PageCache(ttl, vary, store)
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        """定义装饰器方法"""
+
+        @wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            """定义包装函数 (异步执行)"""
+            key, page = cache.lookup(request)
+            if page is None:
+                result = await return_or_render(template, await fn(*args, **kwargs))
+                page = cache.save(key, request, result)
+                if page is None:
+                    return result
+
+            return cache.response(page, request, current_app.response_class)
+
+        return wrapper
+
+    return decorator
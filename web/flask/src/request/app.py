@@ -5,9 +5,11 @@ if not is_debug():
 
     monkey.patch_all()
 
-from typing import Any, Callable, Dict, List, Set, Union
+from typing import Any, Callable, Dict, List, Union
 
 from utils.paths import get_watch_files_for_develop
+from utils.search import DEFAULT_PER_PAGE, SearchIndex
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets, HttpMethodOverrideMiddleware, templated
 from werkzeug import Response
@@ -24,8 +26,14 @@ app.wsgi_app = HttpMethodOverrideMiddleware(app.wsgi_app)  # type: ignore
 # 为 jinja 注入 assets 对象
 app.jinja_env.globals["assets"] = Assets(app)
 
-# 保存输入内容的 set 集合
-_NAMES: Set[str] = set()
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
+# 保存输入内容的检索索引, 文档的 key 和值均为输入的名称
+_NAMES: SearchIndex[str] = SearchIndex()
+
+# 每页最多的结果数
+_MAX_PER_PAGE = 100
 
 
 def _search_result() -> Dict[str, Any]:
@@ -37,15 +45,20 @@ def _search_result() -> Dict[str, Any]:
 
     # 获取查询参数
     kwd = request.args.get("kwd", "")
-    if kwd:
-        # 查询匹配的结果
-        results = list(filter(lambda n: n.find(kwd) >= 0, _NAMES))
-    else:
-        # 获取全部结果
-        results = list(_NAMES)
+    page = request.args.get("page", 1, type=int)
+    per_page = min(request.args.get("per_page", DEFAULT_PER_PAGE, type=int), _MAX_PER_PAGE)
+
+    # 查询匹配的结果, 关键字为空时获取全部结果
+    result = _NAMES.search(kwd, page=page, per_page=per_page)
 
     # 返回查询结果
-    return {"name": kwd, "results": results}
+    return {
+        "name": kwd,
+        "results": result.items,
+        "total": result.total,
+        "page": result.page,
+        "pages": result.pages,
+    }
 
 
 def _add_name() -> Response:
@@ -58,8 +71,8 @@ def _add_name() -> Response:
     # 从请求的表单中获取要增加的项
     name = request.form.get("name")
     if name:
-        # 增加
-        _NAMES.add(name)
+        # 增加, 并更新索引
+        _NAMES.add(name, name)
 
     return redirect("/")
 
@@ -76,7 +89,7 @@ def _change_name() -> Response:
 
     # 获取原有的查询项值并删除
     old_value = request.form.get("old_value")
-    if old_value in _NAMES:
+    if old_value:
         _NAMES.remove(old_value)
 
     # 增加新的查询项值
@@ -84,7 +97,7 @@ def _change_name() -> Response:
     if not new_value:
         raise BadRequest("invalid form data")
 
-    _NAMES.add(new_value)
+    _NAMES.add(new_value, new_value)
 
     return redirect("/")
 
@@ -97,7 +110,7 @@ def _delete_name() -> Response:
     """
 
     value = request.args.get("value")
-    if value in _NAMES:
+    if value:
         _NAMES.remove(value)
 
     return redirect("/")
@@ -125,13 +138,13 @@ def index() -> Union[Dict[str, Any], Response]:
 
 def get_names() -> List[str]:
     """获取保存的名称集合"""
-    return list(_NAMES) if _NAMES else []
+    return _NAMES.keys()
 
 
 def clear_names() -> None:
     """清空保存的名称集合"""
     global _NAMES
-    _NAMES = set()
+    _NAMES = SearchIndex()
 
 
 # 暴露给 wsgi 服务器的应用对象
@@ -5,11 +5,16 @@ if not is_debug():
 
     monkey.patch_all()
 
-from multiprocessing import RLock
-from typing import Any, Dict, List, Tuple
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
 
 from flask_socketio import SocketIO, disconnect, join_room, leave_room
+from socketio_.broker import SqliteManager
+from socketio_.rooms import MemoryRoomStore, RoomDeltas, RoomStore, SqliteRoomStore
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets, templated
 
@@ -21,6 +26,9 @@ app = Flask(__name__, static_folder="static", template_folder="templates")
 # 为 jinja 注入 assets 对象实例
 app.jinja_env.globals["assets"] = Assets(app)
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 # 设置安全密钥
 app.config["SECRET_KEY"] = "secret!!!"
 
@@ -33,13 +41,34 @@ _TOKEN = (
 
 _NAMESPACE = "/my-chat"
 
-_ROOMS: Dict[str, List[Tuple[str, str]]] = {}
+# 多个 worker 进程共享的 SQLite 数据库文件路径, 未设置时聊天室只保存在当前进程中, 只能以单个 worker 运行
+_BROKER_DB = os.environ.get("SOCKETIO_BROKER_DB", "")
+
+_client_manager: Optional[SqliteManager] = None
+_rooms: RoomStore
+
+if _BROKER_DB:
+    # 通过 SQLite 数据库在 worker 进程间转发 emit 和房间操作, 并共享聊天室信息
+    _client_manager = SqliteManager(_BROKER_DB, channel="my-chat")
+    _rooms = SqliteRoomStore(_BROKER_DB)
+else:
+    _rooms = MemoryRoomStore()
+
+# 合并发送聊天室变化的时间间隔 (秒)
+_DELTA_INTERVAL = 0.05
 
-_lock = RLock()
+# 清理已结束的 worker 进程中客户端的时间间隔 (秒)
+_PURGE_INTERVAL = 30.0
+
+_deltas = RoomDeltas()
+
+_delta_task_lock = threading.Lock()
+_delta_task_started = False
 
 # 实例化 socketio 对象
 sio = SocketIO(
     app,
+    client_manager=_client_manager,
     engineio_logger=True,
     manage_session=False,
     cors_allowed_origins="*",
@@ -65,81 +94,142 @@ def on_connect(auth: Dict[str, Any]) -> None:
     if auth.get("token", "") != _TOKEN:
         app.logger.info(f'A socketio client ("{sid}") has invalid token, disconnected')
         disconnect(sid)
+        return
+
+    _ensure_delta_task()
 
 
 def emit_rooms_event() -> None:
-    sio.emit("rooms", {"result": {"rooms": list(_ROOMS.keys())}}, namespace=_NAMESPACE)
+    """向当前客户端发送完整的聊天室列表, 以及列表对应的版本号"""
+    rooms, version = _rooms.snapshot()
+    sio.emit(
+        "rooms",
+        {"result": {"rooms": rooms, "version": version}},
+        namespace=_NAMESPACE,
+        to=request.sid,  # type: ignore
+    )
+
+
+def _emit_rooms_delta_loop() -> None:
+    """后台任务, 定期将合并后的聊天室变化广播给所有客户端
+
+    同时定期移除已结束的 worker 进程 (例如异常退出或被 wsgi 服务器重启) 中的客户端, 任务启动时先执行一次
+    """
+    purge_at = 0.0
+    while True:
+        if time.monotonic() >= purge_at:
+            purge_at = time.monotonic() + _PURGE_INTERVAL
+            for room_name, version in _rooms.purge_dead_workers():
+                on_room_left(room_name, version)
+
+        sio.sleep(_DELTA_INTERVAL)
+
+        delta = _deltas.drain()
+        if delta is not None:
+            sio.emit("roomsDelta", {"result": delta}, namespace=_NAMESPACE)
+
+
+def _ensure_delta_task() -> None:
+    """在第一个客户端连接或第一次发生聊天室变化时启动广播任务"""
+    global _delta_task_started
+
+    with _delta_task_lock:
+        if not _delta_task_started:
+            sio.start_background_task(_emit_rooms_delta_loop)
+            _delta_task_started = True
+
+
+def on_room_joined(room_name: str, version: int) -> None:
+    """客户端加入聊天室后, 如果聊天室是新创建的, 则记录变化
+
+    Args:
+        - `room_name` (`str`): 聊天室名称
+        - `version` (`int`): 聊天室被创建时的版本号, `0` 表示聊天室已存在
+    """
+    if version:
+        _ensure_delta_task()
+        _deltas.created(room_name, version)
+
+
+def on_room_left(room_name: str, version: int) -> None:
+    """客户端离开聊天室后, 如果聊天室已被删除, 则记录变化
+
+    Args:
+        - `room_name` (`str`): 聊天室名称
+        - `version` (`int`): 聊天室被删除时的版本号, `0` 表示聊天室仍存在
+    """
+    if version:
+        _ensure_delta_task()
+        _deltas.deleted(room_name, version)
+
+
+@sio.on("disconnect", namespace=_NAMESPACE)
+def on_disconnect(*args: Any) -> None:
+    sid: str = request.sid  # type: ignore
+    app.logger.info(f'A socketio client ("{sid}") was disconnected')
+
+    # 将断开连接的客户端移出其加入的所有聊天室
+    for room_name, version in _rooms.leave_all(sid):
+        on_room_left(room_name, version)
 
 
 @sio.on("rooms", namespace=_NAMESPACE)
 def on_rooms() -> None:
-    with _lock:
-        emit_rooms_event()
+    emit_rooms_event()
 
 
 @sio.on("joinRoom", namespace=_NAMESPACE)
 def on_join_room(data: Dict[str, Any]) -> None:
-    with _lock:
-        room_name: str = data.get("roomName", "")
-        if not room_name:
-            sio.emit(
-                "joinRoom",
-                {"result": {"error": "Invalid room name"}},
-                namespace=_NAMESPACE,
-            )
-
-        user_name: str = data.get("userName", "")
-        if not user_name:
-            sio.emit(
-                "joinRoom",
-                {"result": {"error": "Invalid user name"}},
-                namespace=_NAMESPACE,
-            )
-
-        sid: str = request.sid  # type: ignore
-
-        if room_name not in _ROOMS:
-            _ROOMS[room_name] = []
-
-            _ROOMS[room_name].append((sid, user_name))
-            join_room(room_name, sid, namespace=_NAMESPACE)
-        else:
-            if (sid, user_name) not in _ROOMS[room_name]:
-                _ROOMS[room_name].append((sid, user_name))
-                join_room(room_name, sid, namespace=_NAMESPACE)
-            else:
-                sio.emit(
-                    "joinRoom",
-                    {"result": {"error": "User already in the room"}},
-                    namespace=_NAMESPACE,
-                )
-                return
-
-        emit_rooms_event()
+    room_name: str = data.get("roomName", "")
+    if not room_name:
+        sio.emit(
+            "joinRoom",
+            {"result": {"error": "Invalid room name"}},
+            namespace=_NAMESPACE,
+        )
+        return
+
+    user_name: str = data.get("userName", "")
+    if not user_name:
+        sio.emit(
+            "joinRoom",
+            {"result": {"error": "Invalid user name"}},
+            namespace=_NAMESPACE,
+        )
+        return
+
+    sid: str = request.sid  # type: ignore
+
+    change = _rooms.join(room_name, sid, user_name)
+    if not change.changed:
+        sio.emit(
+            "joinRoom",
+            {"result": {"error": "User already in the room"}},
+            namespace=_NAMESPACE,
+        )
+        return
+
+    join_room(room_name, sid, namespace=_NAMESPACE)
+    on_room_joined(room_name, change.version)
 
 
 @sio.on("leaveRoom", namespace=_NAMESPACE)
 def on_leave_room(data: Dict[str, Any]) -> None:
-    with _lock:
-        room_name: str = data.get("roomName", "")
-        if not room_name:
-            sio.emit(
-                "leaveRoom",
-                {"result": {"error": "Invalid room name"}},
-                namespace=_NAMESPACE,
-            )
-
-        sid: str = request.sid  # type: ignore
-
-        if room_name not in _ROOMS:
-            _ROOMS[room_name] = []
-
-        _ROOMS[room_name] = [
-            (sid, user_name) for sid, user_name in _ROOMS[room_name] if sid != sid
-        ]
-        leave_room(room_name, sid, namespace=_NAMESPACE)
+    room_name: str = data.get("roomName", "")
+    if not room_name:
+        sio.emit(
+            "leaveRoom",
+            {"result": {"error": "Invalid room name"}},
+            namespace=_NAMESPACE,
+        )
+        return
+
+    sid: str = request.sid  # type: ignore
 
-        emit_rooms_event()
+    change = _rooms.leave(room_name, sid)
+    if change.changed:
+        leave_room(room_name, sid, namespace=_NAMESPACE)
+        on_room_left(room_name, change.version)
 
 
 # 暴露给 wsgi 服务器的应用对象
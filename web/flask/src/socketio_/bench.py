@@ -0,0 +1,183 @@
+"""
+多 worker 消息扇出性能测试
+
+启动若干个 worker 进程, 每个进程创建一个使用 `SqliteManager` 的 Socket.IO 服务对象, 并在其中注册一部分虚拟客户端
+(共 10k 个, 不建立真实的网络连接, 发送数据包的方法被替换为计数), 然后在主进程中通过只写的 `SqliteManager`
+发送事件, 统计所有 worker 将事件投递给本进程客户端的吞吐量和延迟:
+
+- `broadcast`: 事件发送给命名空间下的所有客户端
+- `room`: 事件发送给某个房间 (每个房间 10 个客户端), 房间的成员分布在所有 worker 中
+
+执行方式:
+
+```bash
+python -m socketio_.bench [客户端数] [事件数]
+```
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import socketio
+from socketio_.broker import SqliteManager
+
+_NAMESPACE = "/bench"
+
+_CHANNEL = "bench"
+
+# 每个房间的客户端数
+_ROOM_SIZE = 10
+
+
+def _worker(
+    db: str,
+    index: int,
+    workers: int,
+    sockets: int,
+    messages: int,
+    ready: Any,
+    results: Any,
+) -> None:
+    """worker 进程, 注册虚拟客户端并等待事件
+
+    Args:
+        - `db` (`str`): 数据库文件路径
+        - `index` (`int`): worker 序号
+        - `workers` (`int`): worker 总数
+        - `sockets` (`int`): 所有 worker 的客户端总数
+        - `messages` (`int`): 主进程将发送的事件数
+        - `ready` (`Any`): 通知主进程 worker 已准备好的信号量
+        - `results` (`Any`): 向主进程返回结果的队列
+    """
+    # 关闭服务对象初始化时输出的日志
+    logging.getLogger("socketio.server").setLevel(logging.WARNING)
+    logging.getLogger("engineio.server").setLevel(logging.WARNING)
+
+    sio = socketio.Server(
+        async_mode="threading",
+        client_manager=SqliteManager(db, channel=_CHANNEL, poll_interval=0.001),
+    )
+    manager = sio.manager
+
+    deliveries = 0
+
+    def send_eio_packet(eio_sid: str, pkt: Any) -> None:
+        nonlocal deliveries
+        deliveries += 1
+
+    sio._send_eio_packet = send_eio_packet
+
+    # 第 i 个客户端由第 `i % workers` 个 worker 负责, 并加入第 `i // _ROOM_SIZE` 个房间
+    for i in range(index, sockets, workers):
+        eio_sid = f"eio-{i}"
+        sid = manager.connect(eio_sid, _NAMESPACE)
+        manager.enter_room(sid, _NAMESPACE, f"room-{i // _ROOM_SIZE}", eio_sid=eio_sid)
+
+    latencies: List[float] = []
+    handle_emit = manager._handle_emit
+
+    def timed_handle_emit(message: Dict[str, Any]) -> None:
+        handle_emit(message)
+
+        # 从主进程发送事件到本进程完成投递的时间
+        latencies.append(time.time() - message["data"][0]["ts"])
+        if len(latencies) == messages:
+            results.put((deliveries, latencies))
+
+    manager._handle_emit = timed_handle_emit
+    manager.initialize()
+
+    ready.release()
+    time.sleep(3600)
+
+
+def _run_case(
+    workers: int, sockets: int, messages: int, room: bool
+) -> Dict[str, float]:
+    """执行一次测试
+
+    Args:
+        - `workers` (`int`): worker 进程数
+        - `sockets` (`int`): 客户端总数
+        - `messages` (`int`): 发送的事件数
+        - `room` (`bool`): 是否发送给房间, `False` 表示广播
+
+    Returns:
+        `Dict[str, float]`: 测试结果
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = os.path.join(tmp_dir, "broker.db")
+
+        # 先创建数据表, 避免多个进程同时建表
+        emitter = SqliteManager(db, channel=_CHANNEL, write_only=True)
+
+        ready = mp.Semaphore(0)
+        results: Any = mp.Queue()
+        processes = [
+            mp.Process(
+                target=_worker,
+                args=(db, i, workers, sockets, messages, ready, results),
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for p in processes:
+            p.start()
+
+        for _ in processes:
+            ready.acquire()
+
+        rooms = sockets // _ROOM_SIZE
+        start = time.perf_counter()
+        for i in range(messages):
+            target: Optional[str] = f"room-{i % rooms}" if room else None
+            emitter.emit("message", {"ts": time.time(), "i": i}, namespace=_NAMESPACE, room=target)
+
+        deliveries = 0
+        latencies: List[float] = []
+        for _ in processes:
+            n, values = results.get(timeout=600)
+            deliveries += n
+            latencies.extend(values)
+
+        seconds = time.perf_counter() - start
+
+        for p in processes:
+            p.kill()
+            p.join()
+
+    latencies.sort()
+    return {
+        "deliveries": deliveries,
+        "seconds": seconds,
+        "rate": deliveries / seconds,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    sockets = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"{sockets} sockets, {messages} events")
+    print(f"{'case':<10}{'workers':>8}{'deliveries':>12}{'seconds':>9}{'deliv/s':>12}{'p50 ms':>9}{'p99 ms':>9}")
+    for case in ("broadcast", "room"):
+        for workers in (1, 2, 4):
+            # 发送给房间的事件投递数少, 故发送更多事件
+            n = messages if case == "broadcast" else messages * 50
+            r = _run_case(workers, sockets, n, case == "room")
+            print(
+                f"{case:<10}{workers:>8}{r['deliveries']:>12.0f}{r['seconds']:>9.2f}"
+                f"{r['rate']:>12.0f}{r['p50']:>9.1f}{r['p99']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
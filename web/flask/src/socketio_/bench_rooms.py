@@ -0,0 +1,258 @@
+"""
+聊天室成员索引和增量广播性能测试
+
+在 1k 个聊天室的规模下, 模拟客户端不断加入和离开聊天室, 对比如下两种实现:
+
+- `full`: 原有实现, 成员以 `(sid, 用户名)` 列表存储, 每次变化后向所有客户端广播完整的聊天室列表
+- `delta`: 当前实现, 通过 `MemoryRoomStore` 索引成员, 并由 `RoomDeltas` 合并一段时间内的变化后广播增量
+
+广播通过 Socket.IO 服务对象发送给虚拟客户端 (发送数据包的方法被替换为计数), 统计广播次数, 发送的字节数,
+成员操作耗时以及从聊天室变化到客户端收到通知的延迟
+
+执行方式:
+
+```bash
+python -m socketio_.bench_rooms [操作次数] [客户端数]
+```
+"""
+
+import logging
+import random
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import socketio
+from socketio_.rooms import MemoryRoomStore, RoomDeltas
+
+_NAMESPACE = "/bench"
+
+# 聊天室数量
+_ROOMS = 1000
+
+# 聊天室的平均成员数
+_ROOM_SIZE = 20
+
+# 合并发送聊天室变化的时间间隔 (秒), 和 `socketio_.app` 一致
+_DELTA_INTERVAL = 0.05
+
+# 每秒执行的成员操作数
+_OPS_PER_SECOND = 5000
+
+
+class _ListRoomStore:
+    """原有的聊天室存储, 成员以列表形式保存"""
+
+    def __init__(self) -> None:
+        """构造器"""
+        self._rooms: Dict[str, List[Tuple[str, str]]] = {}
+
+    def join(self, room: str, sid: str, user: str) -> bool:
+        """将客户端加入聊天室"""
+        members = self._rooms.setdefault(room, [])
+        if (sid, user) in members:
+            return False
+
+        members.append((sid, user))
+        return True
+
+    def leave(self, room: str, sid: str) -> bool:
+        """将客户端移出聊天室"""
+        members = self._rooms.get(room, [])
+        self._rooms[room] = [(s, u) for s, u in members if s != sid]
+        return True
+
+    def rooms(self) -> List[str]:
+        """获取所有聊天室名称"""
+        return list(self._rooms.keys())
+
+
+def _make_server(clients: int) -> Tuple[socketio.Server, Dict[str, int]]:
+    """创建 Socket.IO 服务对象并注册虚拟客户端
+
+    Args:
+        - `clients` (`int`): 客户端数
+
+    Returns:
+        `Tuple[socketio.Server, Dict[str, int]]`: 服务对象和发送统计
+    """
+    # 关闭服务对象初始化时输出的日志
+    logging.getLogger("engineio.server").setLevel(logging.WARNING)
+
+    sio = socketio.Server(async_mode="threading")
+    counters = {"packets": 0, "bytes": 0}
+
+    def send_eio_packet(eio_sid: str, pkt: Any) -> None:
+        counters["packets"] += 1
+        counters["bytes"] += len(pkt.data)
+
+    sio._send_eio_packet = send_eio_packet
+
+    for i in range(clients):
+        sio.manager.connect(f"eio-{i}", _NAMESPACE)
+
+    return sio, counters
+
+
+def _operations(n: int) -> List[Tuple[str, str, str]]:
+    """生成成员操作序列, 先加入直到平均每个聊天室有 `_ROOM_SIZE` 个成员, 之后加入和离开各占一半
+
+    Args:
+        - `n` (`int`): 操作次数
+
+    Returns:
+        `List[Tuple[str, str, str]]`: `(操作, 聊天室, sid)` 列表
+    """
+    rnd = random.Random(0)
+    joined: List[Tuple[str, str]] = []
+
+    ops: List[Tuple[str, str, str]] = []
+    for i in range(n):
+        if len(joined) >= _ROOMS * _ROOM_SIZE and rnd.random() < 0.5:
+            room, sid = joined.pop(rnd.randrange(len(joined)))
+            ops.append(("leave", room, sid))
+        else:
+            room, sid = f"room-{rnd.randrange(_ROOMS)}", f"sid-{i}"
+            joined.append((room, sid))
+            ops.append(("join", room, sid))
+
+    return ops
+
+
+def _time_store(store: Any, ops: List[Tuple[str, str, str]]) -> float:
+    """测试成员操作本身的耗时
+
+    Args:
+        - `store` (`Any`): 聊天室存储对象
+        - `ops` (`List[Tuple[str, str, str]]`): 成员操作序列
+
+    Returns:
+        `float`: 平均每次操作的耗时 (秒)
+    """
+    start = time.perf_counter()
+    for op, room, sid in ops:
+        if op == "join":
+            store.join(room, sid, sid)
+        else:
+            store.leave(room, sid)
+
+    return (time.perf_counter() - start) / len(ops)
+
+
+def _run_full(ops: List[Tuple[str, str, str]], clients: int) -> Dict[str, float]:
+    """测试原有实现"""
+    sio, counters = _make_server(clients)
+    store = _ListRoomStore()
+
+    latencies: List[float] = []
+    emits = 0
+
+    for op, room, sid in ops:
+        start = time.perf_counter()
+        if op == "join":
+            store.join(room, sid, sid)
+        else:
+            store.leave(room, sid)
+
+        # 每次变化后广播完整的聊天室列表
+        sio.emit("rooms", {"result": {"rooms": store.rooms()}}, namespace=_NAMESPACE)
+        emits += 1
+        latencies.append(time.perf_counter() - start)
+
+    return {**counters, "emits": emits, "latencies": latencies}  # type: ignore
+
+
+def _run_delta(ops: List[Tuple[str, str, str]], clients: int) -> Dict[str, float]:
+    """测试当前实现, 按固定速率执行成员操作, 后台线程定期广播合并后的变化"""
+    sio, counters = _make_server(clients)
+    store = MemoryRoomStore()
+    deltas = RoomDeltas()
+
+    # 记录每个聊天室发生变化的时间, 用于计算通知延迟
+    changed_at: Dict[str, float] = {}
+    latencies: List[float] = []
+    emits = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def flush() -> None:
+        nonlocal emits
+        while True:
+            stopped = done.wait(_DELTA_INTERVAL)
+
+            with lock:
+                delta = deltas.drain()
+                pending = dict(changed_at)
+                changed_at.clear()
+
+            if delta is not None:
+                sio.emit("roomsDelta", {"result": delta}, namespace=_NAMESPACE)
+                emits += 1
+
+                now = time.perf_counter()
+                latencies.extend(now - t for t in pending.values())
+
+            if stopped:
+                return
+
+    flusher = threading.Thread(target=flush)
+    flusher.start()
+
+    interval = 1 / _OPS_PER_SECOND
+    begin = time.perf_counter()
+    for i, (op, room, sid) in enumerate(ops):
+        # 按固定速率执行操作, 模拟真实的请求到达
+        delay = begin + i * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        start = time.perf_counter()
+        if op == "join":
+            version = store.join(room, sid, sid).version
+        else:
+            version = store.leave(room, sid).version
+
+        # 版本号不为 `0` 时, 说明聊天室被创建或删除
+        with lock:
+            if version:
+                if op == "join":
+                    deltas.created(room, version)
+                else:
+                    deltas.deleted(room, version)
+
+                changed_at.setdefault(room, start)
+
+    done.set()
+    flusher.join()
+
+    return {**counters, "emits": emits, "latencies": latencies}  # type: ignore
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    ops = _operations(n)
+
+    print(f"{n} operations, {_ROOMS} rooms, {clients} clients")
+    print(f"{'mode':<8}{'emits':>8}{'packets':>12}{'MB sent':>10}{'store us/op':>13}{'p50 ms':>9}{'p99 ms':>9}")
+    for mode, run, store in (
+        ("full", _run_full, _ListRoomStore()),
+        ("delta", _run_delta, MemoryRoomStore()),
+    ):
+        r: Dict[str, Any] = run(ops, clients)
+        store_seconds = _time_store(store, ops)
+
+        latencies = sorted(r["latencies"]) or [0.0]
+        print(
+            f"{mode:<8}{r['emits']:>8}{r['packets']:>12}{r['bytes'] / 1024 / 1024:>10.1f}"
+            f"{store_seconds * 1e6:>13.2f}"
+            f"{statistics.median(latencies) * 1000:>9.1f}"
+            f"{latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
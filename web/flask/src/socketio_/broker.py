@@ -0,0 +1,131 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator, List, Tuple
+
+from socketio import PubSubManager
+
+# 轮询新消息的默认间隔 (秒)
+DEFAULT_POLL_INTERVAL = 0.01
+
+# 消息在数据库中保留的默认时间 (秒), 超过该时间的消息会被删除
+DEFAULT_RETENTION = 60.0
+
+
+class SqliteManager(PubSubManager):
+    """基于 SQLite 数据库文件的 Socket.IO 客户端管理器
+
+    作用和 `socketio.RedisManager` 相同, 但不依赖 Redis 服务: 各 worker 进程将消息写入同一个 SQLite 数据库文件的消息表,
+    并轮询读取其它进程写入的消息, 从而使 emit, 加入/离开房间等操作在所有 worker 进程间生效, 适合在单机上运行多个 worker
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        channel: str = "socketio",
+        write_only: bool = False,
+        logger: Any = None,
+        json: Any = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        retention: float = DEFAULT_RETENTION,
+    ) -> None:
+        """构造器
+
+        Args:
+            - `path` (`str`): 数据库文件路径
+            - `channel` (`str`, optional): 频道名称, 同一频道的管理器之间互相通信. Defaults to `"socketio"`.
+            - `write_only` (`bool`, optional): 是否只发送消息, 用于在 Socket.IO 服务之外的进程中发送事件. Defaults to `False`.
+            - `logger` (`Any`, optional): 日志对象, `None` 表示使用服务对象的日志. Defaults to `None`.
+            - `json` (`Any`, optional): 用于编解码消息的 JSON 模块. Defaults to `None`.
+            - `poll_interval` (`float`, optional): 没有新消息时轮询的间隔 (秒). Defaults to `0.01`.
+            - `retention` (`float`, optional): 消息保留时间 (秒). Defaults to `60.0`.
+        """
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+
+        self._poll_interval = poll_interval
+        self._retention = retention
+
+        # 使用自动提交模式, 连接在发送消息的协程和监听消息的后台任务之间共享, 通过锁保证串行访问
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS socketio_messages ("
+            "  id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            "  channel TEXT NOT NULL,"
+            "  created_at REAL NOT NULL,"
+            "  payload TEXT NOT NULL"
+            ")"
+        )
+        self._lock = threading.Lock()
+
+        # 只接收创建管理器之后发布的消息
+        row = self._conn.execute("SELECT MAX(id) FROM socketio_messages").fetchone()
+        self._last_id: int = row[0] or 0
+
+    def _publish(self, data: Any) -> None:
+        """将消息写入消息表
+
+        Args:
+            - `data` (`Any`): 消息内容
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO socketio_messages (channel, created_at, payload) VALUES (?, ?, ?)",
+                (self.channel, time.time(), self.json.dumps(data)),
+            )
+
+    def _fetch(self) -> List[Tuple[int, str]]:
+        """读取其它进程发布的新消息
+
+        Returns:
+            `List[Tuple[int, str]]`: `(消息 id, 消息内容)` 列表
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, payload FROM socketio_messages WHERE id > ? AND channel = ? ORDER BY id",
+                (self._last_id, self.channel),
+            ).fetchall()
+
+    def _purge(self) -> None:
+        """删除超过保留时间的消息"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM socketio_messages WHERE created_at < ?",
+                (time.time() - self._retention,),
+            )
+
+    def _sleep(self, seconds: float) -> None:
+        """等待一段时间, 服务对象存在时使用其异步模式 (例如 gevent) 对应的等待方法
+
+        Args:
+            - `seconds` (`float`): 等待时间 (秒)
+        """
+        if self.server is not None:
+            self.server.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _listen(self) -> Iterator[str]:
+        """轮询消息表, 返回新发布的消息
+
+        Yields:
+            `str`: JSON 格式的消息内容
+        """
+        purged_at = time.monotonic()
+        while True:
+            rows = self._fetch()
+            for id_, payload in rows:
+                self._last_id = id_
+                yield payload
+
+            now = time.monotonic()
+            if now - purged_at > self._retention:
+                self._purge()
+                purged_at = now
+
+            if not rows:
+                self._sleep(self._poll_interval)
@@ -0,0 +1,538 @@
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+
+@dataclass(frozen=True)
+class RoomChange:
+    """加入或离开聊天室的结果"""
+
+    # 成员是否发生变化, 客户端已在 (或不在) 聊天室中时为 `False`
+    changed: bool
+
+    # 聊天室因本次操作被创建 (或删除) 时, 为这次变化的版本号, 否则为 `0`
+    version: int = 0
+
+
+# 不涉及聊天室创建和删除的结果, 大部分操作都返回这两个对象之一, 无需每次创建
+_UNCHANGED = RoomChange(False)
+_MEMBER_CHANGED = RoomChange(True)
+
+# 当前进程的 pid 和 worker id, worker id 在进程中第一次使用时生成, fork 出的子进程会生成新的 id
+_worker: Tuple[int, str] = (0, "")
+
+
+def _worker_id() -> str:
+    """获取当前 worker 进程的 id
+
+    pid 可能被重复使用, 故每个进程生成一个随机 id, 用于区分先后使用同一个 pid 的进程
+
+    Returns:
+        `str`: worker id
+    """
+    global _worker
+
+    pid = os.getpid()
+    if _worker[0] != pid:
+        _worker = (pid, uuid.uuid4().hex)
+
+    return _worker[1]
+
+
+def _is_alive(pid: int) -> bool:
+    """判断其它 worker 进程是否仍在运行
+
+    Args:
+        - `pid` (`int`): 进程 id
+
+    Returns:
+        `bool`: 进程是否存在, pid 和当前进程相同时, 说明原进程已结束且 pid 被当前进程重复使用, 返回 `False`
+    """
+    if pid == os.getpid():
+        return False
+
+    try:
+        # 信号 `0` 只检查进程是否存在, 不会发送任何信号
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # 进程存在, 但属于其它用户
+        return True
+
+    return True
+
+
+class RoomStore(ABC):
+    """聊天室及成员存储的基类
+
+    每个聊天室保存 `(sid, 用户名)` 形式的成员列表, 聊天室在第一个成员加入时创建, 最后一个成员离开时删除
+
+    聊天室的每次创建和删除都会使存储的版本号加一, 版本号和成员变化在同一个操作中原子地完成,
+    客户端可以据此判断多个 worker 进程发送的增量通知的先后顺序
+    """
+
+    @abstractmethod
+    def join(self, room: str, sid: str, user: str) -> RoomChange:
+        """将客户端加入聊天室
+
+        Args:
+            - `room` (`str`): 聊天室名称
+            - `sid` (`str`): 客户端 id
+            - `user` (`str`): 用户名
+
+        Returns:
+            `RoomChange`: 是否加入成功 (客户端已在聊天室中时为 `False`), 以及聊天室因此被创建时的版本号
+        """
+
+    @abstractmethod
+    def leave(self, room: str, sid: str) -> RoomChange:
+        """将客户端移出聊天室
+
+        Args:
+            - `room` (`str`): 聊天室名称
+            - `sid` (`str`): 客户端 id
+
+        Returns:
+            `RoomChange`: 客户端是否在聊天室中, 以及聊天室因此被删除时的版本号
+        """
+
+    @abstractmethod
+    def leave_all(self, sid: str) -> List[Tuple[str, int]]:
+        """将客户端移出其加入的所有聊天室, 用于客户端断开连接时
+
+        Args:
+            - `sid` (`str`): 客户端 id
+
+        Returns:
+            `List[Tuple[str, int]]`: 客户端离开的聊天室名称, 以及聊天室因此被删除时的版本号 (未删除时为 `0`)
+        """
+
+    @abstractmethod
+    def count(self, room: str) -> int:
+        """获取聊天室成员数
+
+        Args:
+            - `room` (`str`): 聊天室名称
+
+        Returns:
+            `int`: 成员数, 聊天室不存在时返回 `0`
+        """
+
+    @abstractmethod
+    def rooms(self) -> List[str]:
+        """获取所有聊天室名称
+
+        Returns:
+            `List[str]`: 聊天室名称列表
+        """
+
+    @abstractmethod
+    def snapshot(self) -> Tuple[List[str], int]:
+        """获取所有聊天室名称, 以及和其对应的版本号
+
+        Returns:
+            `Tuple[List[str], int]`: 聊天室名称列表和版本号
+        """
+
+    @abstractmethod
+    def members(self, room: str) -> List[Tuple[str, str]]:
+        """获取聊天室成员
+
+        Args:
+            - `room` (`str`): 聊天室名称
+
+        Returns:
+            `List[Tuple[str, str]]`: `(sid, 用户名)` 列表
+        """
+
+    def purge_dead_workers(self) -> List[Tuple[str, int]]:
+        """移除已结束的 worker 进程中的客户端
+
+        worker 进程异常退出或被重启时, 其中的客户端不会触发断开连接的处理, 需由仍在运行的进程清理;
+        只在当前进程中保存的存储无需清理
+
+        Returns:
+            `List[Tuple[str, int]]`: 有成员被移除的聊天室名称, 以及聊天室因此被删除时的版本号 (未删除时为 `0`)
+        """
+        return []
+
+
+class MemoryRoomStore(RoomStore):
+    """进程内的聊天室存储, 只能用于单个 worker 进程
+
+    同时维护 `聊天室 -> {sid: 用户名}` 和 `sid -> 聊天室集合` 两个索引, 加入, 离开以及断开连接时的清理均无需遍历成员列表
+    """
+
+    def __init__(self) -> None:
+        """构造器"""
+        # 字典保持插入顺序, 即聊天室的创建顺序和成员的加入顺序
+        self._members: Dict[str, Dict[str, str]] = {}
+        self._sid_rooms: Dict[str, Set[str]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def _bump(self) -> int:
+        """聊天室被创建或删除时增加版本号, 调用方需持有锁
+
+        Returns:
+            `int`: 新的版本号
+        """
+        self._version += 1
+        return self._version
+
+    def join(self, room: str, sid: str, user: str) -> RoomChange:
+        with self._lock:
+            members = self._members.get(room)
+            if members is None:
+                members = self._members[room] = {}
+            elif sid in members:
+                return _UNCHANGED
+
+            members[sid] = user
+            self._sid_rooms.setdefault(sid, set()).add(room)
+            return RoomChange(True, self._bump()) if len(members) == 1 else _MEMBER_CHANGED
+
+    def _remove(self, room: str, sid: str) -> Optional[int]:
+        """从聊天室成员索引中移除客户端, 调用方需持有锁
+
+        Args:
+            - `room` (`str`): 聊天室名称
+            - `sid` (`str`): 客户端 id
+
+        Returns:
+            `Optional[int]`: 客户端不在聊天室中时返回 `None`, 否则返回聊天室因此被删除时的版本号 (未删除时为 `0`)
+        """
+        members = self._members.get(room)
+        if members is None or members.pop(sid, None) is None:
+            return None
+
+        if members:
+            return 0
+
+        del self._members[room]
+        return self._bump()
+
+    def leave(self, room: str, sid: str) -> RoomChange:
+        with self._lock:
+            version = self._remove(room, sid)
+            if version is None:
+                return _UNCHANGED
+
+            rooms = self._sid_rooms[sid]
+            rooms.discard(room)
+            if not rooms:
+                del self._sid_rooms[sid]
+
+            return RoomChange(True, version) if version else _MEMBER_CHANGED
+
+    def leave_all(self, sid: str) -> List[Tuple[str, int]]:
+        with self._lock:
+            return [
+                (room, self._remove(room, sid) or 0)
+                for room in self._sid_rooms.pop(sid, set())
+            ]
+
+    def count(self, room: str) -> int:
+        with self._lock:
+            return len(self._members.get(room, ()))
+
+    def rooms(self) -> List[str]:
+        with self._lock:
+            return list(self._members.keys())
+
+    def snapshot(self) -> Tuple[List[str], int]:
+        with self._lock:
+            return list(self._members.keys()), self._version
+
+    def members(self, room: str) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._members.get(room, {}).items())
+
+
+class SqliteRoomStore(RoomStore):
+    """基于 SQLite 数据库文件的聊天室存储, 多个 worker 进程访问同一个数据库文件即可共享聊天室
+
+    加入和离开聊天室时, 成员变化, 聊天室是否被创建 (或删除) 的判断以及版本号的更新在同一个写事务中完成,
+    多个进程同时加入同一个新聊天室时, 只有一个进程会得到聊天室被创建的结果
+
+    每个成员记录加入时所在的 worker 进程, worker 进程记录其所在的主机和 pid, 通过 `purge_dead_workers`
+    移除同一主机上已结束的 worker 进程中的成员
+    """
+
+    def __init__(self, path: str) -> None:
+        """构造器
+
+        Args:
+            - `path` (`str`): 数据库文件路径
+        """
+        # 使用自动提交模式, 由 `_transaction` 显式开启事务; 连接在 gevent 的多个协程间共享, 通过锁保证串行访问
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        # 按 `rowid` (即加入顺序) 排列聊天室和成员
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS room_members ("
+            "  room TEXT NOT NULL,"
+            "  sid TEXT NOT NULL,"
+            "  user TEXT NOT NULL,"
+            "  owner TEXT NOT NULL,"
+            "  PRIMARY KEY (room, sid)"
+            ")"
+        )
+        # 用于客户端断开连接时查找其加入的聊天室
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_room_members_sid ON room_members (sid)")
+        # 用于 worker 进程结束后查找其中的成员
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_room_members_owner ON room_members (owner)")
+        # 加入过聊天室的 worker 进程
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS room_workers ("
+            "  owner TEXT PRIMARY KEY,"
+            "  host TEXT NOT NULL,"
+            "  pid INTEGER NOT NULL"
+            ")"
+        )
+        # 聊天室列表的版本号, 只有一行记录
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS room_version ("
+            "  id INTEGER PRIMARY KEY CHECK (id = 0),"
+            "  version INTEGER NOT NULL"
+            ")"
+        )
+        self._conn.execute("INSERT OR IGNORE INTO room_version (id, version) VALUES (0, 0)")
+        self._lock = threading.Lock()
+
+        # 已在数据库中登记 worker 进程的 pid
+        self._registered_pid = 0
+
+    @contextmanager
+    def _transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """在事务中访问数据库
+
+        写事务使用 `BEGIN IMMEDIATE` 在开始时即获取数据库的写锁, 多个进程的写事务依次执行
+
+        Args:
+            - `immediate` (`bool`, optional): 是否为写事务. Defaults to `True`.
+
+        Yields:
+            `sqlite3.Connection`: 数据库连接
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection) -> int:
+        """聊天室被创建或删除时增加版本号, 需在写事务中调用
+
+        Args:
+            - `conn` (`sqlite3.Connection`): 数据库连接
+
+        Returns:
+            `int`: 新的版本号
+        """
+        row = conn.execute(
+            "UPDATE room_version SET version = version + 1 WHERE id = 0 RETURNING version"
+        ).fetchone()
+        return int(row[0])
+
+    @classmethod
+    def _bump_if_empty(cls, conn: sqlite3.Connection, room: str) -> int:
+        """成员离开后, 如果聊天室已没有成员, 则增加版本号, 需在写事务中调用
+
+        Args:
+            - `conn` (`sqlite3.Connection`): 数据库连接
+            - `room` (`str`): 聊天室名称
+
+        Returns:
+            `int`: 聊天室被删除时返回新的版本号, 否则返回 `0`
+        """
+        row = conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM room_members WHERE room = ?)", (room,)
+        ).fetchone()
+        return 0 if row[0] else cls._bump(conn)
+
+    def _register(self) -> str:
+        """在数据库中登记当前 worker 进程
+
+        Returns:
+            `str`: worker id
+        """
+        owner = _worker_id()
+
+        pid = os.getpid()
+        if self._registered_pid != pid:
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO room_workers (owner, host, pid) VALUES (?, ?, ?)",
+                    (owner, socket.gethostname(), pid),
+                )
+
+            self._registered_pid = pid
+
+        return owner
+
+    def join(self, room: str, sid: str, user: str) -> RoomChange:
+        owner = self._register()
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO room_members (room, sid, user, owner) VALUES (?, ?, ?, ?)",
+                (room, sid, user, owner),
+            )
+            if cursor.rowcount == 0:
+                return _UNCHANGED
+
+            # 聊天室只有当前客户端一个成员时, 说明聊天室是本次创建的
+            row = conn.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM room_members WHERE room = ? LIMIT 2)", (room,)
+            ).fetchone()
+            return RoomChange(True, self._bump(conn)) if row[0] == 1 else _MEMBER_CHANGED
+
+    def leave(self, room: str, sid: str) -> RoomChange:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM room_members WHERE room = ? AND sid = ?", (room, sid)
+            )
+            if cursor.rowcount == 0:
+                return _UNCHANGED
+
+            version = self._bump_if_empty(conn, room)
+            return RoomChange(True, version) if version else _MEMBER_CHANGED
+
+    def leave_all(self, sid: str) -> List[Tuple[str, int]]:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "DELETE FROM room_members WHERE sid = ? RETURNING room", (sid,)
+            ).fetchall()
+
+            return [(room, self._bump_if_empty(conn, room)) for room, in rows]
+
+    def purge_dead_workers(self) -> List[Tuple[str, int]]:
+        with self._transaction() as conn:
+            # 只能检查同一主机上的进程是否存在
+            workers = conn.execute(
+                "SELECT owner, pid FROM room_workers WHERE host = ? AND owner != ?",
+                (socket.gethostname(), _worker_id()),
+            ).fetchall()
+
+            # 按聊天室去重, 并保持成员被移除的顺序
+            rooms: Dict[str, None] = {}
+            for owner, pid in workers:
+                if _is_alive(pid):
+                    continue
+
+                rows = conn.execute(
+                    "DELETE FROM room_members WHERE owner = ? RETURNING room", (owner,)
+                ).fetchall()
+                rooms.update((room, None) for room, in rows)
+                conn.execute("DELETE FROM room_workers WHERE owner = ?", (owner,))
+
+            return [(room, self._bump_if_empty(conn, room)) for room in rooms]
+
+    def count(self, room: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM room_members WHERE room = ?", (room,)
+            ).fetchone()
+
+        return int(row[0])
+
+    def _rooms(self, conn: sqlite3.Connection) -> List[str]:
+        """按创建顺序查询所有聊天室名称"""
+        rows = conn.execute(
+            "SELECT room FROM room_members GROUP BY room ORDER BY MIN(rowid)"
+        ).fetchall()
+
+        return [room for room, in rows]
+
+    def rooms(self) -> List[str]:
+        with self._lock:
+            return self._rooms(self._conn)
+
+    def snapshot(self) -> Tuple[List[str], int]:
+        # 在同一个读事务中查询, 聊天室列表和版本号对应数据库的同一个状态
+        with self._transaction(immediate=False) as conn:
+            rooms = self._rooms(conn)
+            row = conn.execute("SELECT version FROM room_version WHERE id = 0").fetchone()
+
+        return rooms, int(row[0])
+
+    def members(self, room: str) -> List[Tuple[str, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sid, user FROM room_members WHERE room = ? ORDER BY rowid",
+                (room,),
+            ).fetchall()
+
+        return [(sid, user) for sid, user in rows]
+
+
+class RoomDeltas:
+    """合并一段时间内聊天室的创建和删除, 以便以增量事件的形式通知客户端
+
+    每个聊天室只保留版本号最大的变化; 多个 worker 进程各自发送增量, 到达客户端的顺序可能和变化发生的顺序不同,
+    客户端只应用比已知版本号更大的变化. 同一个聊天室先创建后删除时也需要通知客户端, 因为其它进程可能已发送了
+    两次变化之间的变化
+    """
+
+    def __init__(self) -> None:
+        """构造器"""
+        self._changes: Dict[str, Tuple[int, bool]] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, room: str, version: int, exists: bool) -> None:
+        """记录聊天室的变化, 只保留版本号更大的变化"""
+        with self._lock:
+            current = self._changes.get(room)
+            if current is None or current[0] < version:
+                self._changes[room] = (version, exists)
+
+    def created(self, room: str, version: int) -> None:
+        """记录聊天室被创建
+
+        Args:
+            - `room` (`str`): 聊天室名称
+            - `version` (`int`): 这次变化的版本号
+        """
+        self._record(room, version, True)
+
+    def deleted(self, room: str, version: int) -> None:
+        """记录聊天室被删除
+
+        Args:
+            - `room` (`str`): 聊天室名称
+            - `version` (`int`): 这次变化的版本号
+        """
+        self._record(room, version, False)
+
+    def drain(self) -> Optional[Dict[str, Union[List[str], Dict[str, int]]]]:
+        """取出并清空已记录的变化
+
+        Returns:
+            `Optional[Dict[str, Union[List[str], Dict[str, int]]]]`: `{"added": [...], "removed": [...], "versions": {...}}`
+            形式的增量, `versions` 为每个聊天室变化的版本号, 没有变化时返回 `None`
+        """
+        with self._lock:
+            if not self._changes:
+                return None
+
+            changes, self._changes = self._changes, {}
+
+        return {
+            "added": [room for room, (_, exists) in changes.items() if exists],
+            "removed": [room for room, (_, exists) in changes.items() if not exists],
+            "versions": {room: version for room, (version, _) in changes.items()},
+        }
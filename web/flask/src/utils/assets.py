@@ -0,0 +1,291 @@
+"""
+静态资源构建工具
+
+遍历静态资源目录, 为每个文件生成带内容 hash 的文件名 (例如 `css/index-a7666c5b.css`),
+并预先生成 gzip/brotli/zstd 压缩文件, 最后将 `原文件名 -> 带 hash 的文件名` 写入 `manifest.json` 文件
+
+`Assets` 类读取 `manifest.json` 文件后, 运行时无需再计算文件 hash, 且带 hash 的文件内容不会改变,
+可以使用长期缓存
+
+执行方式:
+
+```bash
+python -m utils.assets <静态资源目录> [<静态资源目录> ...]
+```
+"""
+
+import os
+import re
+import shutil
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import xxhash
+
+from flask import json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+# 描述文件名称
+MANIFEST_FILE = "manifest.json"
+
+# 文件名中 hash 值的长度
+HASH_LENGTH = 8
+
+# 压缩文件的扩展名
+VARIANT_SUFFIXES = (".gz", ".br", ".zst")
+
+# 小于该字节数的文件不进行压缩
+MIN_COMPRESS_SIZE = 256
+
+# 需要预先压缩的文件类型, 图片等文件本身已经过压缩, 再次压缩的收益很小
+COMPRESSIBLE_TYPES = frozenset(
+    [
+        ".css",
+        ".js",
+        ".mjs",
+        ".map",
+        ".json",
+        ".html",
+        ".svg",
+        ".txt",
+        ".xml",
+        ".ico",
+        ".ttf",
+        ".otf",
+    ]
+)
+
+
+def _gzip(data: bytes) -> bytes:
+    """以 gzip 格式压缩数据
+
+    Args:
+        - `data` (`bytes`): 原始数据
+
+    Returns:
+        `bytes`: 压缩后的数据
+    """
+    # `wbits=31` 表示输出 gzip 格式, 且不写入文件修改时间, 使相同内容的压缩结果保持一致
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """获取可用的压缩算法
+
+    Returns:
+        `Dict[str, Callable[[bytes], bytes]]`: `压缩文件扩展名 -> 压缩函数` 字典
+    """
+    compressors: Dict[str, Callable[[bytes], bytes]] = {".gz": _gzip}
+
+    # brotli 和 zstd 压缩为可选功能, 需安装对应的依赖
+    if brotli is not None:
+        compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+
+    if zstandard is not None:
+        compressors[".zst"] = zstandard.ZstdCompressor(level=19).compress
+
+    return compressors
+
+
+@dataclass
+class BuildResult:
+    """静态资源构建结果"""
+
+    # `原文件名 -> 带 hash 的文件名` 字典
+    manifest: Dict[str, str] = field(default_factory=dict)
+
+    # 生成的压缩文件数量
+    compressed: int = 0
+
+    # 原文件的总字节数
+    total_bytes: int = 0
+
+
+def fingerprint(filename: str, digest: str) -> str:
+    """生成带 hash 值的文件名
+
+    Args:
+        - `filename` (`str`): 原文件名, 例如 `css/index.css`
+        - `digest` (`str`): 文件内容的 hash 值
+
+    Returns:
+        `str`: 带 hash 值的文件名, 例如 `css/index-a7666c5b.css`
+    """
+    name, ext = os.path.splitext(filename)
+    return f"{name}-{digest[:HASH_LENGTH]}{ext}"
+
+
+def _is_fingerprint(filename: str, target: str) -> bool:
+    """判断文件名是否为 `fingerprint` 函数为原文件生成的带 hash 的文件名
+
+    Args:
+        - `filename` (`str`): 原文件名, 例如 `css/index.css`
+        - `target` (`str`): 带 hash 的文件名, 例如 `css/index-a7666c5b.css`
+
+    Returns:
+        `bool`: 是否由 `fingerprint` 函数生成
+    """
+    name, ext = os.path.splitext(filename)
+    return re.fullmatch(f"{re.escape(name)}-[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}", target) is not None
+
+
+def _remove_built(static_folder: str, target: str) -> None:
+    """删除之前构建生成的带 hash 的文件及其压缩文件
+
+    Args:
+        - `static_folder` (`str`): 静态资源目录
+        - `target` (`str`): 带 hash 的文件名
+    """
+    for stale in [target, *(target + suffix for suffix in VARIANT_SUFFIXES)]:
+        if os.path.exists(os.path.join(static_folder, stale)):
+            os.remove(os.path.join(static_folder, stale))
+
+
+def _list_files(static_folder: str, excludes: Iterable[str]) -> List[str]:
+    """列举静态资源目录下的所有源文件
+
+    Args:
+        - `static_folder` (`str`): 静态资源目录
+        - `excludes` (`Iterable[str]`): 需要排除的文件, 即之前构建生成的文件
+
+    Returns:
+        `List[str]`: 相对于静态资源目录的文件名列表, 使用 `/` 作为路径分隔符
+    """
+    excludes = set(excludes)
+
+    files: List[str] = []
+    for root, _, names in os.walk(static_folder):
+        for name in names:
+            filename = os.path.relpath(os.path.join(root, name), static_folder).replace(os.sep, "/")
+            if filename == MANIFEST_FILE or filename in excludes or filename.endswith(VARIANT_SUFFIXES):
+                continue
+
+            files.append(filename)
+
+    return sorted(files)
+
+
+def _build_file(
+    static_folder: str, filename: str, compressors: Dict[str, Callable[[bytes], bytes]]
+) -> Tuple[str, int, int]:
+    """为一个文件生成带 hash 的副本和压缩文件
+
+    Args:
+        - `static_folder` (`str`): 静态资源目录
+        - `filename` (`str`): 相对于静态资源目录的文件名
+        - `compressors` (`Dict[str, Callable[[bytes], bytes]]`): 可用的压缩算法
+
+    Returns:
+        `Tuple[str, int, int]`: 带 hash 的文件名, 原文件字节数以及生成的压缩文件数量
+    """
+    with open(os.path.join(static_folder, filename), "rb") as fp:
+        data = fp.read()
+
+    target = fingerprint(filename, xxhash.xxh64(data).hexdigest())
+    target_file = os.path.join(static_folder, target)
+
+    # 文件内容不变时, 带 hash 的文件名也不变, 无需重复生成
+    if not os.path.exists(target_file):
+        shutil.copyfile(os.path.join(static_folder, filename), target_file)
+
+    compressed = 0
+    if len(data) >= MIN_COMPRESS_SIZE and os.path.splitext(filename)[1].lower() in COMPRESSIBLE_TYPES:
+        for suffix, compress in compressors.items():
+            variant = target_file + suffix
+            if not os.path.exists(variant):
+                result = compress(data)
+
+                # 压缩后体积没有减小的文件无需保留
+                if len(result) >= len(data):
+                    continue
+
+                with open(variant, "wb") as fp:
+                    fp.write(result)
+
+            compressed += 1
+
+    return target, len(data), compressed
+
+
+def build_assets(static_folder: str, workers: Optional[int] = None) -> BuildResult:
+    """构建静态资源目录, 生成带 hash 的文件, 压缩文件和 `manifest.json` 文件
+
+    各文件的 hash 计算和压缩在线程池中并行执行 (hash 和压缩算法在处理数据时会释放 GIL)
+
+    Args:
+        - `static_folder` (`str`): 静态资源目录
+        - `workers` (`Optional[int]`, optional): 并行的线程数, `None` 表示根据 CPU 数量决定. Defaults to `None`.
+
+    Returns:
+        `BuildResult`: 构建结果
+    """
+    manifest_file = os.path.join(static_folder, MANIFEST_FILE)
+
+    # 之前构建生成的文件不作为源文件
+    previous: Dict[str, str] = {}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, "r") as fp:
+            previous = json.loads(fp.read())
+
+    files = _list_files(static_folder, previous.values())
+    compressors = _compressors()
+
+    result = BuildResult()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for filename, (target, size, compressed) in zip(
+            files,
+            executor.map(lambda f: _build_file(static_folder, f, compressors), files),
+        ):
+            result.manifest[filename] = target
+            result.total_bytes += size
+            result.compressed += compressed
+
+    for filename, target in previous.items():
+        if filename in result.manifest:
+            if result.manifest[filename] != target:
+                # 源文件内容发生变化, 删除之前生成的文件
+                _remove_built(static_folder, target)
+        elif os.path.exists(os.path.join(static_folder, target)) and not _is_fingerprint(filename, target):
+            # 由其它工具构建生成的文件没有源文件, 目标文件仍存在时保留原有的描述
+            result.manifest[filename] = target
+        else:
+            # 源文件已被删除, 删除之前生成的文件, 且不再保留其描述
+            _remove_built(static_folder, target)
+
+    # 先写入临时文件再替换, 避免其它进程读取到不完整的描述文件
+    tmp_file = f"{manifest_file}.tmp"
+    with open(tmp_file, "w") as fp:
+        fp.write(json.dumps(result.manifest, indent=2, sort_keys=True))
+
+    os.replace(tmp_file, manifest_file)
+    return result
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage: python -m utils.assets <static_folder> [<static_folder> ...]")
+        sys.exit(1)
+
+    for static_folder in sys.argv[1:]:
+        result = build_assets(static_folder)
+        print(
+            f"{static_folder}: {len(result.manifest)} files, "
+            f"{result.total_bytes} bytes, {result.compressed} compressed variants"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+子串检索性能测试
+
+生成 10^6 个随机名称, 对比如下两种实现:
+
+- `scan`: 原有实现, 名称保存在 set 集合中, 每次检索通过 `filter` 扫描全部名称
+- `index`: `SearchIndex`, 基于 n-gram 倒排索引检索, 结果按相关度排序后返回第一页
+
+分别统计不同长度关键字的检索延迟, 增加和删除名称的耗时, 以及建立索引的耗时和内存占用 (进程 RSS 的增长)
+
+执行方式:
+
+```bash
+python -m utils.bench_search [名称数] [每种关键字的检索次数]
+```
+"""
+
+import random
+import resource
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Set, Tuple
+
+from utils.search import SearchIndex
+
+# 组成名称的音节
+_SYLLABLES = [
+    "al", "an", "ber", "bo", "ca", "da", "el", "em", "fa", "go", "ha", "in", "jo", "ka", "li", "lu",
+    "ma", "mi", "na", "no", "or", "pa", "qu", "ra", "ri", "sa", "si", "ta", "to", "um", "va", "vin",
+    "wa", "xi", "ya", "zo",
+]
+
+
+def _names(n: int, rnd: random.Random) -> List[str]:
+    """生成随机名称, 由名和姓两个单词组成
+
+    Args:
+        - `n` (`int`): 名称数
+        - `rnd` (`random.Random`): 随机数生成器
+
+    Returns:
+        `List[str]`: 名称列表
+    """
+
+    def word() -> str:
+        return "".join(rnd.choice(_SYLLABLES) for _ in range(rnd.randint(2, 4))).capitalize()
+
+    names: Set[str] = set()
+    while len(names) < n:
+        names.add(f"{word()} {word()}")
+
+    return list(names)
+
+
+def _rss_mb() -> float:
+    """当前进程的峰值 RSS (MB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _time(func: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """多次执行函数, 统计耗时
+
+    Args:
+        - `func` (`Callable[[], object]`): 被测试的函数
+        - `repeat` (`int`): 执行次数
+
+    Returns:
+        `Tuple[float, float]`: 耗时的中位数和最大值 (毫秒)
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(times), max(times)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    rnd = random.Random(0)
+    names = _names(n, rnd)
+
+    rss = _rss_mb()
+    start = time.perf_counter()
+    scan_names: Set[str] = set(names)
+    scan_build = time.perf_counter() - start
+    scan_rss = _rss_mb() - rss
+
+    rss = _rss_mb()
+    start = time.perf_counter()
+    index: SearchIndex[str] = SearchIndex()
+    for name in names:
+        index.add(name, name)
+    index_build = time.perf_counter() - start
+    index_rss = _rss_mb() - rss
+
+    print(f"{n} names")
+    print(f"{'impl':<8}{'build s':>9}{'RSS MB':>9}")
+    print(f"{'scan':<8}{scan_build:>9.2f}{scan_rss:>9.0f}")
+    print(f"{'index':<8}{index_build:>9.2f}{index_rss:>9.0f}")
+    print()
+
+    # 不同长度的关键字, 取自已有名称, 保证有匹配结果; 另外测试没有匹配结果的关键字
+    keywords: Dict[str, List[str]] = {"miss": ["qqqz", "xyzzy"]}
+    for length in (2, 3, 4, 6, 9):
+        samples = []
+        for name in rnd.sample(names, 5):
+            pos = rnd.randrange(max(len(name) - length, 0) + 1)
+            samples.append(name[pos: pos + length].lower())
+        keywords[f"len {length}"] = samples
+
+    print(f"{'keyword':<10}{'hits':>9}{'scan p50 ms':>13}{'scan max ms':>13}{'index p50 ms':>14}{'index max ms':>14}")
+    for label, samples in keywords.items():
+        hits = 0
+        scan_times: List[Tuple[float, float]] = []
+        index_times: List[Tuple[float, float]] = []
+        for kwd in samples:
+            # 原有实现区分大小写, 为保证结果一致, 扫描时同样忽略大小写
+            def scan(kwd: str = kwd) -> List[str]:
+                return list(filter(lambda n: n.lower().find(kwd) >= 0, scan_names))
+
+            hits += index.search(kwd).total
+            assert index.search(kwd).total == len(scan())
+
+            scan_times.append(_time(scan, max(repeat // 10, 1)))
+            index_times.append(_time(lambda kwd=kwd: index.search(kwd), repeat))  # type: ignore[misc]
+
+        print(
+            f"{label:<10}{hits // len(samples):>9}"
+            f"{statistics.median(t[0] for t in scan_times):>13.2f}{max(t[1] for t in scan_times):>13.2f}"
+            f"{statistics.median(t[0] for t in index_times):>14.3f}{max(t[1] for t in index_times):>14.3f}"
+        )
+
+    print()
+
+    # 增加和删除名称的耗时
+    extra = [f"Extra {i} Name" for i in range(10000)]
+    start = time.perf_counter()
+    for name in extra:
+        index.add(name, name)
+    add_us = (time.perf_counter() - start) / len(extra) * 1e6
+
+    start = time.perf_counter()
+    for name in extra:
+        index.remove(name)
+    remove_us = (time.perf_counter() - start) / len(extra) * 1e6
+
+    print(f"index add {add_us:.1f} us/name, remove {remove_us:.1f} us/name")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+静态文件服务性能测试
+
+通过 gunicorn (gevent worker, 和 `start.sh` 的启动方式一致) 启动测试应用, 对比如下两种方式处理静态文件请求的吞吐量:
+
+- `default`: Flask 默认的静态文件路由, 每次请求都会访问文件系统, 且总是返回原文件
+- `static_files`: `StaticFiles` 扩展, 缓存文件 stat 信息, 并根据 `Accept-Encoding` 头返回预压缩文件
+
+每种方式分别测试普通请求, 接受压缩的请求以及 `Range` 请求
+
+执行方式:
+
+```bash
+python -m utils.bench_static [请求数] [并发数]
+```
+"""
+
+import gzip
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Literal, Tuple
+from urllib.request import Request, urlopen
+
+from utils.static import StaticFiles
+
+from flask import Flask
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 测试应用的模式
+Mode = Literal["default", "static_files"]
+
+# 测试文件的路径
+_FILENAME = "css/bench.css"
+
+# 测试文件的字节数
+_FILE_SIZE = 100 * 1024
+
+# 测试应用使用的静态资源目录, 通过环境变量传递给 gunicorn 进程
+_STATIC_FOLDER_ENV = "BENCH_STATIC_FOLDER"
+
+
+def create_app(mode: Mode = "default") -> Flask:
+    """创建测试应用
+
+    Args:
+        - `mode` (`Mode`, optional): 处理静态文件的方式. Defaults to `"default"`.
+
+    Returns:
+        `Flask`: Flask 实例对象
+    """
+    app = Flask(__name__, static_folder=os.environ[_STATIC_FOLDER_ENV], static_url_path="/static")
+    if mode == "static_files":
+        StaticFiles(app)
+
+    return app
+
+
+def _prepare(static_folder: str) -> None:
+    """生成测试文件以及对应的预压缩文件
+
+    Args:
+        - `static_folder` (`str`): 静态资源目录
+    """
+    line = b".bench-%d { color: #%06x; margin: %dpx; }\n"
+    data = b"".join(line % (i, i, i % 100) for i in range(_FILE_SIZE // 40))
+
+    path = os.path.join(static_folder, _FILENAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fp:
+        fp.write(data)
+
+    with open(path + ".gz", "wb") as fp:
+        fp.write(gzip.compress(data, 9))
+
+    if brotli is not None:
+        with open(path + ".br", "wb") as fp:
+            fp.write(brotli.compress(data, quality=11))
+
+
+def _free_port() -> int:
+    """获取一个空闲的端口号"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _wait_ready(url: str, timeout: float = 10.0) -> None:
+    """等待服务器启动完毕
+
+    Args:
+        - `url` (`str`): 用于检测的地址
+        - `timeout` (`float`, optional): 最长等待时间 (秒). Defaults to `10.0`.
+
+    Raises:
+        - `TimeoutError`: 服务器未在指定时间内启动
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urlopen(url) as resp:
+                resp.read()
+                return
+        except OSError:
+            time.sleep(0.1)
+
+    raise TimeoutError(f"Server not ready: {url}")
+
+
+def _run_case(url: str, headers: Dict[str, str], n: int, concurrency: int) -> Tuple[float, int]:
+    """并发发送请求
+
+    Args:
+        - `url` (`str`): 请求地址
+        - `headers` (`Dict[str, str]`): 请求头
+        - `n` (`int`): 请求总数
+        - `concurrency` (`int`): 并发数
+
+    Returns:
+        `Tuple[float, int]`: 每秒处理的请求数以及单次响应的字节数
+    """
+
+    def fetch(_: int) -> int:
+        with urlopen(Request(url, headers=headers)) as resp:
+            return len(resp.read())
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # 预热
+        list(executor.map(fetch, range(concurrency)))
+
+        start = time.perf_counter()
+        sizes = list(executor.map(fetch, range(n)))
+        seconds = time.perf_counter() - start
+
+    return n / seconds, sizes[-1]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    gunicorn = shutil.which("gunicorn") or os.path.join(os.path.dirname(sys.executable), "gunicorn")
+
+    cases: List[Tuple[str, Dict[str, str]]] = [
+        ("plain", {}),
+        ("gzip", {"Accept-Encoding": "gzip"}),
+        ("br", {"Accept-Encoding": "br, gzip"}),
+        ("range", {"Range": "bytes=0-4095"}),
+    ]
+
+    with tempfile.TemporaryDirectory() as static_folder:
+        _prepare(static_folder)
+
+        env = {**os.environ, _STATIC_FOLDER_ENV: static_folder}
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        print(f"{'mode':<14}{'case':<8}{'bytes':>10}{'req/s':>10}")
+        for mode in ("default", "static_files"):
+            port = _free_port()
+            server = subprocess.Popen(
+                [
+                    gunicorn,
+                    "-w", "2",
+                    "--threads", "50",
+                    "-k", "gevent",
+                    "-b", f"127.0.0.1:{port}",
+                    "--log-level", "warning",
+                    f"utils.bench_static:create_app('{mode}')",
+                ],
+                cwd=src_dir,
+                env=env,
+            )
+            try:
+                url = f"http://127.0.0.1:{port}/static/{_FILENAME}"
+                _wait_ready(url)
+
+                for name, headers in cases:
+                    rps, size = _run_case(url, headers, n, concurrency)
+                    print(f"{mode:<14}{name:<8}{size:>10}{rps:>10.0f}")
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
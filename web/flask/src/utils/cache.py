@@ -0,0 +1,413 @@
+import dataclasses
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import xxhash
+
+from flask import json
+
+# 根据当前请求计算额外缓存 key 的函数, 例如返回当前登录用户或语言, 使不同用户的页面分别缓存
+VaryFunc = Callable[[], Any]
+
+# 默认的缓存时间 (秒)
+DEFAULT_TTL = 60.0
+
+# 内存缓存默认最多保存的页面数
+DEFAULT_MAX_ENTRIES = 1024
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    """缓存的页面渲染结果"""
+
+    # 渲染得到的 HTML
+    body: str
+
+    # 响应状态码
+    status: int
+
+    # 强 ETag 值 (不含引号)
+    etag: str
+
+    # 过期时间 (Unix 时间戳)
+    expires: float
+
+    @classmethod
+    def create(cls, body: str, status: int, ttl: float) -> "CachedPage":
+        """创建缓存页面, 并根据页面内容计算 ETag
+
+        Args:
+            - `body` (`str`): 渲染得到的 HTML
+            - `status` (`int`): 响应状态码
+            - `ttl` (`float`): 缓存时间 (秒)
+
+        Returns:
+            `CachedPage`: 缓存页面对象
+        """
+        return cls(
+            body=body,
+            status=status,
+            etag=xxhash.xxh64(body.encode("utf-8")).hexdigest(),
+            expires=time.time() + ttl,
+        )
+
+    @property
+    def expired(self) -> bool:
+        """缓存是否已过期"""
+        return time.time() >= self.expires
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """页面缓存统计信息快照"""
+
+    # 命中缓存的次数
+    hits: int = 0
+
+    # 未命中缓存的次数 (包括缓存已过期的情况)
+    misses: int = 0
+
+    # 写入缓存的次数
+    stores: int = 0
+
+    # 因缓存命中且 ETag 匹配而返回 304 的次数
+    not_modified: int = 0
+
+    # 因超过最大数量而被淘汰的缓存数
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """缓存命中率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheStore(ABC):
+    """页面缓存存储的基类, 负责记录统计信息"""
+
+    def __init__(self) -> None:
+        """构造器"""
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {f.name: 0 for f in dataclasses.fields(CacheStats)}
+
+    def record(self, name: str, n: int = 1) -> None:
+        """累加一项统计数据
+
+        Args:
+            - `name` (`str`): 统计项名称, 即 `CacheStats` 的字段名
+            - `n` (`int`, optional): 累加的值. Defaults to `1`.
+        """
+        with self._stats_lock:
+            self._stats[name] += n
+
+    def stats(self) -> CacheStats:
+        """获取统计信息快照
+
+        对于多进程共享的存储, 统计信息只包含当前进程的数据
+
+        Returns:
+            `CacheStats`: 统计信息
+        """
+        with self._stats_lock:
+            return CacheStats(**self._stats)
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        """获取未过期的缓存页面, 并记录是否命中
+
+        Args:
+            - `key` (`str`): 缓存 key
+
+        Returns:
+            `Optional[CachedPage]`: 缓存页面, 未命中时返回 `None`
+        """
+        page = self._load(key)
+        if page is not None and page.expired:
+            self.delete(key)
+            page = None
+
+        self.record("misses" if page is None else "hits")
+        return page
+
+    def set(self, key: str, page: CachedPage) -> None:
+        """写入缓存页面
+
+        Args:
+            - `key` (`str`): 缓存 key
+            - `page` (`CachedPage`): 缓存页面
+        """
+        self._save(key, page)
+        self.record("stores")
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[CachedPage]:
+        """读取缓存页面, 由子类实现"""
+
+    @abstractmethod
+    def _save(self, key: str, page: CachedPage) -> None:
+        """保存缓存页面, 由子类实现"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """删除缓存页面, 由子类实现"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空缓存, 由子类实现"""
+
+
+class MemoryStore(CacheStore):
+    """进程内的页面缓存, 超过最大数量时淘汰最久未使用的页面"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """构造器
+
+        Args:
+            - `max_entries` (`int`, optional): 最多保存的页面数. Defaults to `1024`.
+        """
+        super().__init__()
+
+        self._max_entries = max_entries
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, key: str) -> Optional[CachedPage]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+
+            return page
+
+    def _save(self, key: str, page: CachedPage) -> None:
+        evicted = 0
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+
+            while len(self._pages) > self._max_entries:
+                self._pages.popitem(last=False)
+                evicted += 1
+
+        if evicted:
+            self.record("evictions", evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pages.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+
+class FileStore(CacheStore):
+    """基于本地目录的页面缓存, 可在 gunicorn 的多个 worker 进程之间共享
+
+    每个页面保存为一个文件, 第一行为 JSON 格式的元数据, 其后为 HTML 内容; 写入时先写临时文件再替换,
+    其它进程不会读取到不完整的文件
+    """
+
+    def __init__(self, directory: str) -> None:
+        """构造器
+
+        Args:
+            - `directory` (`str`): 缓存文件目录
+        """
+        super().__init__()
+
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.cache")
+
+    def _load(self, key: str) -> Optional[CachedPage]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as fp:
+                meta = json.loads(fp.readline())
+                return CachedPage(body=fp.read(), **meta)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key: str, page: CachedPage) -> None:
+        path = self._path(key)
+        meta = {"status": page.status, "etag": page.etag, "expires": page.expires}
+
+        # 临时文件名包含进程号, 避免多个进程同时写入同一个临时文件
+        tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as fp:
+            fp.write(json.dumps(meta))
+            fp.write("\n")
+            fp.write(page.body)
+
+        os.replace(tmp_file, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self._directory):
+            if name.endswith(".cache"):
+                try:
+                    os.remove(os.path.join(self._directory, name))
+                except OSError:
+                    pass
+
+
+# 默认使用的进程内缓存
+default_store = MemoryStore()
+
+
+def make_cache_key(
+    endpoint: Optional[str],
+    view_args: Optional[Dict[str, Any]],
+    query: Iterable[Tuple[str, str]],
+    vary: Optional[VaryFunc] = None,
+) -> str:
+    """根据请求计算缓存 key
+
+    Args:
+        - `endpoint` (`Optional[str]`): 请求的 endpoint
+        - `view_args` (`Optional[Dict[str, Any]]`): 路由参数
+        - `query` (`Iterable[Tuple[str, str]]`): 查询参数
+        - `vary` (`Optional[VaryFunc]`, optional): 计算额外缓存 key 的函数. Defaults to `None`.
+
+    Returns:
+        `str`: 缓存 key
+    """
+    parts = [
+        endpoint or "",
+        repr(sorted((view_args or {}).items())),
+        repr(sorted(query)),
+        repr(vary()) if vary is not None else "",
+    ]
+
+    # 缓存 key 会用作文件名, 故使用 hash 值
+    return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def is_cacheable(method: str, result: Any) -> bool:
+    """判断渲染结果是否可以缓存, 只缓存 GET/HEAD 请求成功渲染的页面
+
+    Args:
+        - `method` (`str`): 请求方法
+        - `result` (`Any`): `return_or_render` 函数的返回值
+
+    Returns:
+        `bool`: 是否可以缓存
+    """
+    return (
+        method in ("GET", "HEAD")
+        and isinstance(result, tuple)
+        and len(result) == 2
+        and isinstance(result[0], str)
+        and result[1] == 200
+    )
+
+
+def make_page_response(
+    store: CacheStore, page: CachedPage, if_none_match: Any, response_class: Callable[..., Any]
+) -> Any:
+    """根据缓存页面生成响应, 请求的 `If-None-Match` 头和页面 ETag 匹配时返回 304 响应
+
+    Args:
+        - `store` (`CacheStore`): 页面缓存存储, 用于记录统计信息
+        - `page` (`CachedPage`): 缓存页面
+        - `if_none_match` (`Any`): 请求的 `If-None-Match` 头 (`werkzeug.datastructures.ETags` 对象)
+        - `response_class` (`Callable[..., Any]`): 响应类型
+
+    Returns:
+        `Any`: 响应对象
+    """
+    if if_none_match.contains(page.etag):
+        store.record("not_modified")
+        response = response_class(status=304)
+    else:
+        response = response_class(page.body, status=page.status, mimetype="text/html")
+
+    response.set_etag(page.etag)
+
+    # 浏览器每次都需要通过 ETag 验证页面是否发生变化
+    response.cache_control.no_cache = True
+    return response
+
+
+class PageCache:
+    """`cached_templated` 系列装饰器共用的页面缓存逻辑
+
+    装饰器只负责执行路由函数和渲染模板 (同步或异步), 缓存 key 的计算, 缓存的读写以及响应的生成都由该类完成;
+    `request` 参数可以是 Flask 或 Quart 的请求对象
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL, vary: Optional[VaryFunc] = None, store: Optional[CacheStore] = None
+    ) -> None:
+        """构造器
+
+        Args:
+            - `ttl` (`float`, optional): 缓存时间 (秒). Defaults to `60.0`.
+            - `vary` (`Optional[VaryFunc]`, optional): 计算额外缓存 key 的函数. Defaults to `None`.
+            - `store` (`Optional[CacheStore]`, optional): 页面缓存存储, `None` 表示使用进程内缓存. Defaults to `None`.
+        """
+        self._ttl = ttl
+        self._vary = vary
+        self._store = store or default_store
+
+    def lookup(self, request: Any) -> Tuple[Optional[str], Optional[CachedPage]]:
+        """根据请求计算缓存 key 并查找缓存页面
+
+        Args:
+            - `request` (`Any`): 请求对象
+
+        Returns:
+            `Tuple[Optional[str], Optional[CachedPage]]`: 缓存 key 和缓存页面, 请求方法不是 GET/HEAD 时
+            缓存 key 为 `None`, 表示不使用缓存
+        """
+        if request.method not in ("GET", "HEAD"):
+            return None, None
+
+        key = make_cache_key(
+            request.endpoint, request.view_args, request.args.items(multi=True), self._vary
+        )
+        return key, self._store.get(key)
+
+    def save(self, key: Optional[str], request: Any, result: Any) -> Optional[CachedPage]:
+        """缓存路由函数的渲染结果
+
+        Args:
+            - `key` (`Optional[str]`): `lookup` 方法返回的缓存 key
+            - `request` (`Any`): 请求对象
+            - `result` (`Any`): `return_or_render` 函数的返回值
+
+        Returns:
+            `Optional[CachedPage]`: 缓存页面, 渲染结果不可缓存时返回 `None`
+        """
+        if key is None or not is_cacheable(request.method, result):
+            return None
+
+        page = CachedPage.create(result[0], result[1], self._ttl)
+        self._store.set(key, page)
+        return page
+
+    def response(self, page: CachedPage, request: Any, response_class: Callable[..., Any]) -> Any:
+        """根据缓存页面生成响应
+
+        Args:
+            - `page` (`CachedPage`): 缓存页面
+            - `request` (`Any`): 请求对象
+            - `response_class` (`Callable[..., Any]`): 响应类型
+
+        Returns:
+            `Any`: 响应对象
+        """
+        return make_page_response(self._store, page, request.if_none_match, response_class)
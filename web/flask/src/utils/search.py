@@ -0,0 +1,241 @@
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+# 默认的 n-gram 长度
+DEFAULT_GRAM_SIZE = 3
+
+# 默认每页的结果数
+DEFAULT_PER_PAGE = 20
+
+_T = TypeVar("_T")
+
+# 排序键, 依次为: 匹配类型, 匹配位置, 文本长度, 文档 key
+_RankKey = Tuple[int, int, int, str]
+
+
+@dataclass(frozen=True)
+class SearchPage(Generic[_T]):
+    """一页检索结果"""
+
+    # 当前页的结果
+    items: List[_T]
+
+    # 匹配的结果总数
+    total: int
+
+    # 页码, 从 1 开始
+    page: int
+
+    # 每页的结果数
+    per_page: int
+
+    @property
+    def pages(self) -> int:
+        """总页数, 没有结果时为 `1`"""
+        return max((self.total + self.per_page - 1) // self.per_page, 1)
+
+
+class SearchIndex(Generic[_T]):
+    """基于 n-gram 倒排索引的子串检索
+
+    每个文档的文本 (忽略大小写) 被拆分为长度为 n 的片段, 索引记录每个片段出现在哪些文档中; 检索时取关键字所有片段
+    对应文档集合的交集作为候选, 再逐个确认候选文档确实包含关键字, 只需检查极少数文档, 而无需扫描全部文档
+
+    关键字短于 n 时无法利用索引, 此时退化为扫描全部文档
+
+    文档可以随时增加和删除, 只需更新该文档文本包含的片段
+    """
+
+    def __init__(self, n: int = DEFAULT_GRAM_SIZE) -> None:
+        """构造器
+
+        Args:
+            - `n` (`int`, optional): n-gram 长度. Defaults to `3`.
+        """
+        self._n = n
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+        # 文档 key 到文档 id 的映射
+        self._keys: Dict[str, int] = {}
+
+        # 文档 id 到文档 key, 忽略大小写的文本以及文档值的映射
+        self._doc_keys: Dict[int, str] = {}
+        self._texts: Dict[int, str] = {}
+        self._values: Dict[int, _T] = {}
+
+        # 倒排索引, 片段到包含该片段的文档 id 集合的映射
+        self._postings: Dict[str, Set[int]] = {}
+
+    def _grams(self, text: str) -> Set[str]:
+        """将文本拆分为 n-gram 片段
+
+        Args:
+            - `text` (`str`): 文本
+
+        Returns:
+            `Set[str]`: 片段集合
+        """
+        n = self._n
+        return {text[i: i + n] for i in range(len(text) - n + 1)}
+
+    def add(self, key: str, value: _T, text: Optional[str] = None) -> bool:
+        """增加文档, key 已存在时替换原有的文档
+
+        Args:
+            - `key` (`str`): 文档 key
+            - `value` (`_T`): 文档值, 作为检索结果返回
+            - `text` (`Optional[str]`, optional): 被检索的文本, `None` 表示检索 `key`. Defaults to `None`.
+
+        Returns:
+            `bool`: 是否为新增的文档
+        """
+        folded = (key if text is None else text).casefold()
+
+        with self._lock:
+            exists = self._remove(key)
+
+            id = next(self._ids)
+            self._keys[key] = id
+            self._doc_keys[id] = key
+            self._texts[id] = folded
+            self._values[id] = value
+
+            for gram in self._grams(folded):
+                self._postings.setdefault(gram, set()).add(id)
+
+        return not exists
+
+    def remove(self, key: str) -> bool:
+        """删除文档
+
+        Args:
+            - `key` (`str`): 文档 key
+
+        Returns:
+            `bool`: 文档是否存在
+        """
+        with self._lock:
+            return self._remove(key)
+
+    def _remove(self, key: str) -> bool:
+        id = self._keys.pop(key, None)
+        if id is None:
+            return False
+
+        del self._doc_keys[id]
+        del self._values[id]
+
+        folded = self._texts.pop(id)
+        for gram in self._grams(folded):
+            posting = self._postings[gram]
+            posting.discard(id)
+
+            # 删除不再被任何文档包含的片段
+            if not posting:
+                del self._postings[gram]
+
+        return True
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> List[str]:
+        """获取所有文档 key
+
+        Returns:
+            `List[str]`: 文档 key 列表
+        """
+        with self._lock:
+            return list(self._keys)
+
+    def _matches(self, keyword: str) -> List[int]:
+        """获取包含关键字的文档 id
+
+        关键字不短于 n 时, 从索引中取关键字所有片段对应文档集合的交集作为候选, 再确认候选文档确实包含关键字;
+        否则扫描全部文档
+
+        Args:
+            - `keyword` (`str`): 忽略大小写的关键字
+
+        Returns:
+            `List[int]`: 文档 id 列表
+        """
+        texts = self._texts
+        if len(keyword) < self._n:
+            return [id for id, text in texts.items() if keyword in text]
+
+        # 从包含文档最少的片段开始求交集, 使中间结果尽可能小
+        postings: List[Set[int]] = []
+        for gram in self._grams(keyword):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+
+            postings.append(posting)
+
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+
+        # 关键字长度为 n 时, 关键字本身就是片段, 候选文档一定包含关键字
+        if len(keyword) == self._n:
+            return list(candidates)
+
+        return [id for id in candidates if keyword in texts[id]]
+
+    def _rank(self, keyword: str, id: int) -> _RankKey:
+        """计算文档的排序键, 值越小排名越靠前
+
+        匹配类型依次为: 完全匹配, 前缀匹配, 单词开头匹配, 其它位置匹配; 匹配类型相同时, 匹配位置靠前和文本较短的文档排名靠前
+
+        Args:
+            - `keyword` (`str`): 忽略大小写的关键字
+            - `id` (`int`): 包含关键字的文档 id
+
+        Returns:
+            `_RankKey`: 排序键
+        """
+        text = self._texts[id]
+        pos = text.find(keyword)
+
+        if pos == 0:
+            kind = 0 if len(text) == len(keyword) else 1
+        else:
+            kind = 2 if not text[pos - 1].isalnum() else 3
+
+        return (kind, pos, len(text), self._doc_keys[id])
+
+    def search(self, keyword: str, page: int = 1, per_page: int = DEFAULT_PER_PAGE) -> SearchPage[_T]:
+        """检索包含关键字的文档, 结果按相关度排序后分页返回
+
+        Args:
+            - `keyword` (`str`): 关键字, 忽略大小写, 为空字符串时返回所有文档
+            - `page` (`int`, optional): 页码, 从 1 开始. Defaults to `1`.
+            - `per_page` (`int`, optional): 每页的结果数. Defaults to `20`.
+
+        Returns:
+            `SearchPage[_T]`: 一页检索结果
+        """
+        page = max(page, 1)
+        per_page = max(per_page, 1)
+        keyword = keyword.casefold()
+
+        with self._lock:
+            matches = self._matches(keyword)
+
+            # 只需取出排名前 `page * per_page` 的结果, 无需对所有结果排序
+            top = heapq.nsmallest(page * per_page, matches, key=lambda id: self._rank(keyword, id))
+            items = [self._values[id] for id in top[(page - 1) * per_page:]]
+
+        return SearchPage(items=items, total=len(matches), page=page, per_page=per_page)
@@ -0,0 +1,269 @@
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+from werkzeug.wrappers import Response as WerkzeugResponse
+from werkzeug.wsgi import wrap_file
+
+from flask import Flask, request
+
+# 预压缩文件的内容编码和文件扩展名, 按优先级排列
+PRECOMPRESSED_ENCODINGS: Tuple[Tuple[str, str], ...] = (
+    ("br", ".br"),
+    ("zstd", ".zst"),
+    ("gzip", ".gz"),
+)
+
+# 非调试模式下, 文件 stat 信息的默认缓存时间 (秒)
+DEFAULT_STAT_TTL = 5.0
+
+# 文件 stat 信息缓存的默认最大条目数
+DEFAULT_MAX_ENTRIES = 1024
+
+
+@dataclass(frozen=True)
+class _FileInfo:
+    """静态文件的一种表示 (原文件或预压缩文件)"""
+
+    # 文件路径
+    path: str
+
+    # 文件字节数
+    size: int
+
+    # 文件修改时间 (秒)
+    mtime: float
+
+    # 强 ETag 值 (不含引号)
+    etag: str
+
+
+@dataclass(frozen=True)
+class _StaticEntry:
+    """缓存的静态文件信息"""
+
+    # 原文件
+    file: _FileInfo
+
+    # 文件的 MIME 类型
+    mimetype: str
+
+    # `内容编码 -> 预压缩文件` 字典
+    variants: Dict[str, _FileInfo] = field(default_factory=dict)
+
+
+def _stat(path: str, suffix: str = "") -> Optional[_FileInfo]:
+    """获取文件信息
+
+    Args:
+        - `path` (`str`): 文件路径
+        - `suffix` (`str`, optional): 附加在 ETag 中的后缀, 用于区分同一文件的不同表示. Defaults to `""`.
+
+    Returns:
+        `Optional[_FileInfo]`: 文件信息, 文件不存在时返回 `None`
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    if not os.path.isfile(path):
+        return None
+
+    # 以文件修改时间 (纳秒) 和文件大小作为强 ETag, 文件内容发生变化时 ETag 随之变化
+    return _FileInfo(
+        path=path,
+        size=st.st_size,
+        mtime=st.st_mtime,
+        etag=f"{st.st_mtime_ns:x}-{st.st_size:x}{suffix}",
+    )
+
+
+class StaticFiles:
+    """静态文件服务扩展
+
+    替换 Flask 默认的静态文件路由, 和默认路由相比:
+
+    1. 文件的 stat 信息会被缓存, 不会每次请求都访问文件系统
+    2. 根据请求的 `Accept-Encoding` 头选择预压缩的 `.br`/`.zst`/`.gz` 文件 (可通过 `python -m utils.assets` 生成)
+    3. 文件内容通过 `wsgi.file_wrapper` 返回, gunicorn 等 WSGI 服务器会使用 `os.sendfile` 零拷贝发送文件
+    4. 支持 `Range` 请求和强 ETag, 浏览器可以断点续传, 并通过 `If-None-Match` 获得 304 响应
+    """
+
+    def __init__(
+        self,
+        app: Optional[Flask] = None,
+        stat_ttl: Optional[float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """构造器
+
+        Args:
+            - `app` (`Optional[Flask]`, optional): Flask 实例对象. Defaults to `None`.
+            - `stat_ttl` (`Optional[float]`, optional): 文件 stat 信息的缓存时间 (秒), `None` 表示调试模式下不缓存,
+              否则缓存 `5` 秒. Defaults to `None`.
+            - `max_entries` (`int`, optional): 文件 stat 信息缓存的最大条目数, 超出时淘汰最久未使用的条目.
+              Defaults to `1024`.
+        """
+        self._stat_ttl = stat_ttl
+        self._max_entries = max_entries
+        self._static_folder = ""
+
+        # 文件 stat 信息缓存, `文件名 -> (缓存时间, 文件信息)`, 只缓存存在的文件,
+        # 以免不存在的文件名 (例如扫描请求) 使缓存无限增长
+        self._cache: "OrderedDict[str, Tuple[float, _StaticEntry]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._app: Optional[Flask] = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """在 Flask 实例上注册扩展, 替换默认的静态文件路由
+
+        Args:
+            - `app` (`Flask`): Flask 实例对象
+        """
+        if not app.static_folder or "static" not in app.view_functions:
+            return
+
+        if self._stat_ttl is None:
+            self._stat_ttl = 0.0 if app.debug else DEFAULT_STAT_TTL
+
+        self._app = app
+        self._static_folder = app.static_folder
+        app.view_functions["static"] = self.send_static
+        app.extensions["static_files"] = self
+
+    def clear_cache(self) -> None:
+        """清除文件 stat 信息缓存"""
+        with self._lock:
+            self._cache.clear()
+
+    def _lookup(self, filename: str) -> Optional[_StaticEntry]:
+        """获取静态文件信息, 优先从缓存中获取
+
+        Args:
+            - `filename` (`str`): 相对于静态资源目录的文件名
+
+        Returns:
+            `Optional[_StaticEntry]`: 静态文件信息, 文件不存在时返回 `None`
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(filename)
+            if cached is not None and now - cached[0] < (self._stat_ttl or 0.0):
+                self._cache.move_to_end(filename)
+                return cached[1]
+
+        path = safe_join(self._static_folder, filename)
+        file = _stat(path) if path else None
+        if file is None:
+            return None
+
+        # 检查同名的预压缩文件
+        variants: Dict[str, _FileInfo] = {}
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            variant = _stat(file.path + suffix, f"-{encoding}")
+
+            # 预压缩文件比原文件旧时, 说明其内容已过期, 不能使用
+            if variant is not None and variant.mtime >= file.mtime:
+                variants[encoding] = variant
+
+        mimetype, _ = mimetypes.guess_type(filename)
+        entry = _StaticEntry(
+            file=file,
+            mimetype=mimetype or "application/octet-stream",
+            variants=variants,
+        )
+
+        if self._stat_ttl:
+            with self._lock:
+                self._cache[filename] = (now, entry)
+                self._cache.move_to_end(filename)
+
+                while len(self._cache) > self._max_entries:
+                    self._cache.popitem(last=False)
+
+        return entry
+
+    def _select(self, entry: _StaticEntry) -> Tuple[Optional[str], _FileInfo]:
+        """根据请求的 `Accept-Encoding` 头选择文件的表示
+
+        Args:
+            - `entry` (`_StaticEntry`): 静态文件信息
+
+        Returns:
+            `Tuple[Optional[str], _FileInfo]`: 内容编码 (`None` 表示原文件) 以及文件信息
+        """
+        if entry.variants:
+            accept = request.accept_encodings
+            for encoding, _ in PRECOMPRESSED_ENCODINGS:
+                if encoding in entry.variants and accept[encoding] > 0:
+                    return encoding, entry.variants[encoding]
+
+        return None, entry.file
+
+    def send_static(self, filename: str) -> WerkzeugResponse:
+        """静态文件路由函数
+
+        Args:
+            - `filename` (`str`): 相对于静态资源目录的文件名
+
+        Returns:
+            `Response`: 响应对象
+
+        Raises:
+            - `NotFound`: 文件不存在
+        """
+        assert self._app is not None
+
+        entry = self._lookup(filename)
+        if entry is None:
+            raise NotFound()
+
+        encoding, file = self._select(entry)
+        try:
+            fp = open(file.path, "rb")
+        except OSError:
+            # 缓存的文件信息已过期 (例如文件已被删除)
+            with self._lock:
+                self._cache.pop(filename, None)
+
+            raise NotFound()
+
+        # 通过 `wsgi.file_wrapper` 返回文件内容, 如果 WSGI 服务器支持, 则会使用 `os.sendfile` 发送文件
+        data = wrap_file(request.environ, fp)
+
+        response = self._app.response_class(
+            data, mimetype=entry.mimetype, direct_passthrough=True
+        )
+        response.content_length = file.size
+        response.last_modified = file.mtime  # type: ignore[assignment]
+        response.set_etag(file.etag)
+
+        if encoding is not None:
+            response.content_encoding = encoding
+
+        if entry.variants:
+            # 响应内容和请求的 `Accept-Encoding` 头有关, 以免缓存服务器返回错误的表示
+            response.vary.add("Accept-Encoding")
+
+        max_age = self._app.get_send_file_max_age(filename)
+        if max_age is not None:
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.no_cache = True
+
+        # 处理 `If-None-Match`, `If-Modified-Since` 和 `Range` 请求头
+        return response.make_conditional(
+            request.environ, accept_ranges=True, complete_length=file.size
+        )
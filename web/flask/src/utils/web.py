@@ -1,12 +1,13 @@
 import os
 import time
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union
 from urllib.parse import parse_qs
 
 import xxhash
+from utils.cache import DEFAULT_TTL, CacheStore, PageCache, VaryFunc
 
-from flask import Flask, json, render_template, request
+from flask import Flask, Response, current_app, json, render_template, request
 
 
 class TemplateResolveError(Exception):
@@ -100,12 +101,104 @@ def async_templated(template: Optional[str] = None) -> Callable[..., Any]:
     return decorator
 
 
+def cached_templated(
+    template: Optional[str] = None,
+    ttl: float = DEFAULT_TTL,
+    vary: Optional[VaryFunc] = None,
+    store: Optional[CacheStore] = None,
+) -> Callable[..., Any]:
+    """带缓存的模板文件装饰器
+
+    和 `templated` 装饰器相同, 但会按 endpoint, 路由参数, 查询参数以及 `vary` 函数的返回值缓存渲染结果,
+    缓存有效期内不再执行路由函数和渲染模板; 响应带有 ETag, 浏览器再次请求时可获得 304 响应
+
+    Args:
+        - `template` (`Optional[str]`): 模板名称, `None` 表示根据规则取默认模板
+        - `ttl` (`float`, optional): 缓存时间 (秒). Defaults to `60.0`.
+        - `vary` (`Optional[VaryFunc]`, optional): 计算额外缓存 key 的函数, 例如返回当前用户. Defaults to `None`.
+        - `store` (`Optional[CacheStore]`, optional): 页面缓存存储, `None` 表示使用进程内缓存,
+          多个 worker 进程间共享缓存可使用 `FileStore`. Defaults to `None`.
+
+    Returns:
+        `Callable[..., Any]`: 被装饰方法
+    """
+    cache = PageCache(ttl, vary, store)
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        """定义装饰器方法"""
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            """定义包装函数"""
+            key, page = cache.lookup(request)
+            if page is None:
+                result = return_or_render(template, fn(*args, **kwargs))
+                page = cache.save(key, request, result)
+                if page is None:
+                    return result
+
+            return cache.response(page, request, current_app.response_class)
+
+        return wrapper
+
+    return decorator
+
+
+def async_cached_templated(
+    template: Optional[str] = None,
+    ttl: float = DEFAULT_TTL,
+    vary: Optional[VaryFunc] = None,
+    store: Optional[CacheStore] = None,
+) -> Callable[..., Any]:
+    """带缓存的模板文件装饰器 (用于异步路由函数)
+
+    参见 `cached_templated` 装饰器
+
+    Args:
+        - `template` (`Optional[str]`): 模板名称, `None` 表示根据规则取默认模板
+        - `ttl` (`float`, optional): 缓存时间 (秒). Defaults to `60.0`.
+        - `vary` (`Optional[VaryFunc]`, optional): 计算额外缓存 key 的函数, 例如返回当前用户. Defaults to `None`.
+        - `store` (`Optional[CacheStore]`, optional): 页面缓存存储, `None` 表示使用进程内缓存. Defaults to `None`.
+
+    Returns:
+        `Callable[..., Any]`: 被装饰方法
+    """
+    cache = PageCache(ttl, vary, store)
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        """定义装饰器方法"""
+
+        @wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            """定义包装函数"""
+            key, page = cache.lookup(request)
+            if page is None:
+                result = return_or_render(template, await fn(*args, **kwargs))
+                page = cache.save(key, request, result)
+                if page is None:
+                    return result
+
+            return cache.response(page, request, current_app.response_class)
+
+        return wrapper
+
+    return decorator
+
+
 class AssetError(Exception):
     """HTML 模板无法解析异常"""
 
 
+# 带 hash 的静态资源文件的缓存时间 (秒), 即一年
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
 class Assets:
-    """访问静态资源的工具类"""
+    """访问静态资源的工具类
+
+    如果静态资源目录中存在 `manifest.json` 文件 (通过 `python -m utils.assets` 构建生成),
+    则直接使用其中带 hash 的文件名, 并为这些文件的响应设置长期缓存
+    """
 
     def __init__(self, app: Flask) -> None:
         # 获取静态文件路径
@@ -115,7 +208,10 @@ class Assets:
         self._static_url_path = app.static_url_path
 
         # 静态文件文件缓存
-        self._asset_file_cache = {}
+        self._asset_file_cache: Dict[str, str] = {}
+
+        # 描述文件中带 hash 的文件名, 这些文件的内容不会改变
+        self._immutable_files: Set[str] = set()
 
         # 是否调试模式
         self._debug = app.debug
@@ -131,6 +227,33 @@ class Assets:
                 # 读取描述文件内容
                 self._asset_file_cache = json.loads(fp.read())
 
+            self._immutable_files = {
+                uri for uri in self._asset_file_cache.values() if "?" not in uri
+            }
+
+            app.after_request(self._set_cache_headers)
+
+    def _set_cache_headers(self, response: Response) -> Response:
+        """为带 hash 的静态资源文件的响应设置长期缓存
+
+        Args:
+            - `response` (`Response`): 响应对象
+
+        Returns:
+            `Response`: 响应对象
+        """
+        if (
+            request.endpoint == "static"
+            and response.status_code == 200
+            and request.view_args
+            and request.view_args.get("filename") in self._immutable_files
+        ):
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+
+        return response
+
     def image(self, key: str, fixed: bool = False) -> str:
         """读取图片静态资源
 
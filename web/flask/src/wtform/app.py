@@ -8,6 +8,7 @@ if not is_debug():
 from typing import Any, Dict, Tuple, Union
 
 from utils.paths import get_watch_files_for_develop
+from utils.static import StaticFiles
 from utils.trace import attach_logger
 from utils.web import Assets, templated
 from werkzeug import Response
@@ -24,6 +25,9 @@ app.config["SECRET_KEY"] = "secret!!!"
 # 为 jinja 注入 assets 对象
 app.jinja_env.globals["assets"] = Assets(app)
 
+# 由 StaticFiles 扩展处理静态文件请求, 支持预压缩文件和 Range 请求
+StaticFiles(app)
+
 
 class ExpressForm(Form):
     """Flask use WT-Forms to validate form
@@ -25,6 +25,13 @@ function show_help() {
 }
 
 
+function use_socketio_broker() {
+    # 多个 worker 进程共享的 SQLite 数据库文件, 启动前删除上次运行遗留的数据
+    export SOCKETIO_BROKER_DB="${SOCKETIO_BROKER_DB:-/tmp/flask-socketio-broker.db}"
+    rm -f "$SOCKETIO_BROKER_DB" "$SOCKETIO_BROKER_DB-wal" "$SOCKETIO_BROKER_DB-shm"
+}
+
+
 function main() {
     app='basic'
     wsgi='waitress'
@@ -88,10 +95,10 @@ function main() {
         if [ "$wsgi" == 'gunicorn' ]; then
             # https://gunicorn.org/#quickstart
             if [ "$app" == 'socketio_' ]; then
-                # 如果通过 gunicorn 启动 websocket, 则 worker 数量必须为 1, 否则无法进行正常的负载均衡
-                # 要解决这个问题, 可以在前面加上 Nginx 进行真正的负载均衡, 或者使用 uwsgi 服务器
+                # 多个 worker 进程通过 SQLite 数据库文件共享聊天室并转发消息 (参见 `socketio_/broker.py`)
+                # 客户端只使用 websocket 传输, 连接建立后始终由同一个 worker 处理, 无需会话粘滞
                 # https://flask-socketio.readthedocs.io/en/latest/deployment.html#gunicorn-web-server
-                worker=1
+                use_socketio_broker
                 worker_class='geventwebsocket.gunicorn.workers.GeventWebSocketWorker'
             else
                 worker_class='gevent'
@@ -102,7 +109,7 @@ function main() {
             use_websocket=''
             if [ "$app" == 'socketio_' ]; then
                 use_websocket='--http-websockets'
-                worker=1
+                use_socketio_broker
             else
                 worker=4
             fi
@@ -59,4 +59,12 @@ def test_search_result(client: FlaskClient) -> None:
                 "url": "http://jinja.pocoo.org",
             }
         ],
+        "total": 1,
+        "page": 1,
+        "pages": 1,
     }
+
+    # 没有匹配的结果
+    resp = client.get(f"/api/search?key={quote('flask')}")
+    assert resp.status_code == 200
+    assert resp.json == {"results": [], "total": 0, "page": 1, "pages": 1}
@@ -107,3 +107,21 @@ def test_get_index(client: FlaskClient) -> None:
     resp = client.get(resp.headers.get("Location"))
     assert resp.status_code == 200
     assert b'<span class="content">Alvin</span>' in resp.data
+
+
+def test_search_index(client: FlaskClient) -> None:
+    """测试 GET 请求, 查询结果按相关度排序并分页"""
+
+    for name in ["Calvin", "Alvin", "Emma"]:
+        client.post("/", data={"name": name})
+
+    resp = client.get(f'/?kwd={quote("alvin")}')
+    assert resp.status_code == 200
+    assert resp.data.index(b"Alvin</span>") < resp.data.index(b"Calvin</span>")
+    assert b"Emma</span>" not in resp.data
+
+    # 每页 1 个结果时, 第 2 页为 Calvin
+    resp = client.get(f'/?kwd={quote("alvin")}&page=2&per_page=1')
+    assert resp.status_code == 200
+    assert b'<span class="content">Calvin</span>' in resp.data
+    assert b"2 / 2 (2)" in resp.data
@@ -0,0 +1,141 @@
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from socketio_.broker import SqliteManager
+from socketio_.rooms import MemoryRoomStore, RoomChange, RoomDeltas, RoomStore, SqliteRoomStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> RoomStore:
+    """定义获取聊天室存储对象的 fixture"""
+    if request.param == "memory":
+        return MemoryRoomStore()
+
+    return SqliteRoomStore(str(tmp_path / "rooms.db"))
+
+
+def test_room_store(store: RoomStore) -> None:
+    """测试加入和离开聊天室"""
+    # 聊天室被创建时返回新的版本号
+    assert store.join("room1", "sid1", "Alvin") == RoomChange(True, 1)
+    assert store.join("room1", "sid2", "Emma") == RoomChange(True)
+    assert store.join("room2", "sid1", "Alvin") == RoomChange(True, 2)
+
+    # 同一个客户端不能重复加入
+    assert store.join("room1", "sid1", "Alvin") == RoomChange(False)
+
+    assert store.rooms() == ["room1", "room2"]
+    assert store.snapshot() == (["room1", "room2"], 2)
+    assert store.members("room1") == [("sid1", "Alvin"), ("sid2", "Emma")]
+
+    # 离开聊天室只移除当前客户端
+    assert store.leave("room1", "sid1") == RoomChange(True)
+    assert store.leave("room1", "sid1") == RoomChange(False)
+    assert store.members("room1") == [("sid2", "Emma")]
+
+    # 最后一个成员离开后聊天室被删除
+    assert store.leave("room2", "sid1") == RoomChange(True, 3)
+    assert store.snapshot() == (["room1"], 3)
+
+
+def test_room_store_leave_all(store: RoomStore) -> None:
+    """测试客户端断开连接时离开所有聊天室"""
+    store.join("room1", "sid1", "Alvin")
+    store.join("room2", "sid1", "Alvin")
+    store.join("room2", "sid2", "Emma")
+
+    # 只有 `room1` 被删除
+    assert sorted(store.leave_all("sid1")) == [("room1", 3), ("room2", 0)]
+    assert store.leave_all("sid1") == []
+
+    assert store.count("room1") == 0
+    assert store.count("room2") == 1
+    assert store.rooms() == ["room2"]
+
+
+def test_room_deltas() -> None:
+    """测试合并聊天室变化"""
+    deltas = RoomDeltas()
+    assert deltas.drain() is None
+
+    deltas.created("room1", 1)
+    deltas.created("room2", 2)
+    deltas.deleted("room3", 3)
+
+    # 同一个聊天室只保留版本号最大的变化
+    deltas.deleted("room2", 4)
+    deltas.created("room3", 2)
+    assert deltas.drain() == {
+        "added": ["room1"],
+        "removed": ["room2", "room3"],
+        "versions": {"room1": 1, "room2": 4, "room3": 3},
+    }
+    assert deltas.drain() is None
+
+
+def test_sqlite_room_store_shared(tmp_path: Path) -> None:
+    """测试多个存储对象 (模拟多个 worker 进程) 通过同一个数据库文件共享聊天室"""
+    db = str(tmp_path / "rooms.db")
+
+    SqliteRoomStore(db).join("room1", "sid1", "Alvin")
+    assert SqliteRoomStore(db).members("room1") == [("sid1", "Alvin")]
+
+    # 多个存储对象同时加入同一个新聊天室时, 只有一个得到聊天室被创建的结果
+    stores = [SqliteRoomStore(db) for _ in range(4)]
+    with ThreadPoolExecutor(len(stores)) as executor:
+        changes = list(
+            executor.map(lambda i: stores[i].join("room2", f"sid{i}", "Emma"), range(len(stores)))
+        )
+
+    assert sorted(change.version for change in changes) == [0, 0, 0, 2]
+    assert stores[0].count("room2") == 4
+
+
+def test_sqlite_room_store_purge_dead_workers(tmp_path: Path) -> None:
+    """测试移除已结束的 worker 进程中的成员"""
+    db = str(tmp_path / "rooms.db")
+
+    store = SqliteRoomStore(db)
+    store.join("room1", "sid1", "Alvin")
+    store.join("room2", "sid1", "Alvin")
+    store.join("room2", "sid2", "Emma")
+
+    # 当前进程仍在运行, 不会移除任何成员
+    assert store.purge_dead_workers() == []
+
+    # 将 `sid1` 改为由一个已结束的进程加入
+    proc = subprocess.Popen([sys.executable, "-c", ""])
+    proc.wait()
+    with sqlite3.connect(db) as conn:
+        conn.execute("INSERT INTO room_workers (owner, host, pid) SELECT 'dead', host, ? FROM room_workers", (proc.pid,))
+        conn.execute("UPDATE room_members SET owner = 'dead' WHERE sid = 'sid1'")
+
+    # `room1` 只有 `sid1` 一个成员, 被删除
+    assert store.purge_dead_workers() == [("room1", 3), ("room2", 0)]
+    assert store.purge_dead_workers() == []
+    assert store.snapshot() == (["room2"], 3)
+    assert store.members("room2") == [("sid2", "Emma")]
+
+    # 只保存在当前进程中的存储无需清理
+    assert MemoryRoomStore().purge_dead_workers() == []
+
+
+def test_sqlite_manager_publish(tmp_path: Path) -> None:
+    """测试通过数据库文件在多个客户端管理器之间转发消息"""
+    db = str(tmp_path / "broker.db")
+
+    receiver = SqliteManager(db, channel="test")
+    other = SqliteManager(db, channel="other")
+    sender = SqliteManager(db, channel="test", write_only=True)
+
+    sender._publish({"method": "emit", "event": "message"})
+    other._publish({"method": "emit", "event": "ignored"})
+
+    # 只接收同一频道的消息
+    message = next(receiver._listen())
+    assert receiver.json.loads(message) == {"method": "emit", "event": "message"}
+    assert receiver._fetch() == []
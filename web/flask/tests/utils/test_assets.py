@@ -0,0 +1,88 @@
+import gzip
+import json
+import os
+from pathlib import Path
+
+from utils.assets import build_assets
+from utils.web import IMMUTABLE_MAX_AGE, Assets
+
+from flask import Flask
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_build_assets(tmp_path: Path) -> None:
+    """测试构建静态资源目录"""
+    css = "body { color: red; }\n" * 100
+    _write(tmp_path / "css" / "index.css", css)
+    _write(tmp_path / "script" / "index.js", "var a = 1;")
+
+    result = build_assets(str(tmp_path))
+    assert set(result.manifest) == {"css/index.css", "script/index.js"}
+
+    # 生成带 hash 的文件, 内容和原文件一致
+    target = result.manifest["css/index.css"]
+    assert target.startswith("css/index-") and target.endswith(".css")
+    assert (tmp_path / target).read_text() == css
+
+    # 较大的文本文件生成压缩文件, 较小的文件不压缩
+    assert gzip.decompress((tmp_path / f"{target}.gz").read_bytes()).decode() == css
+    assert not os.path.exists(tmp_path / f"{result.manifest['script/index.js']}.gz")
+
+    # 写入描述文件
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest == result.manifest
+
+    # 再次构建时, 生成的文件不会被作为源文件
+    assert build_assets(str(tmp_path)).manifest == result.manifest
+
+    # 源文件内容变化后, 删除之前生成的文件
+    _write(tmp_path / "css" / "index.css", css + "a { color: blue; }\n")
+    new_target = build_assets(str(tmp_path)).manifest["css/index.css"]
+    assert new_target != target
+    assert not os.path.exists(tmp_path / target)
+    assert not os.path.exists(tmp_path / f"{target}.gz")
+
+    # 源文件被删除后, 删除之前生成的文件和描述
+    os.remove(tmp_path / "css" / "index.css")
+    manifest = build_assets(str(tmp_path)).manifest
+    assert "css/index.css" not in manifest
+    assert not os.path.exists(tmp_path / new_target)
+    assert not os.path.exists(tmp_path / f"{new_target}.gz")
+
+    # 由其它工具生成的文件没有源文件, 目标文件存在时保留其描述, 不存在时删除
+    _write(tmp_path / "bundle.min.js", "var b = 2;")
+    manifest["bundle.js"] = "bundle.min.js"
+    manifest["gone.js"] = "gone.min.js"
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+    manifest = build_assets(str(tmp_path)).manifest
+    assert manifest["bundle.js"] == "bundle.min.js"
+    assert "gone.js" not in manifest
+
+
+def test_assets_immutable_cache(tmp_path: Path) -> None:
+    """测试带 hash 的静态资源文件使用长期缓存"""
+    _write(tmp_path / "css" / "index.css", "body { color: red; }")
+    _write(tmp_path / "css" / "other.css", "body { color: blue; }")
+    result = build_assets(str(tmp_path))
+
+    app = Flask(__name__, static_folder=str(tmp_path), static_url_path="/static")
+    with app.test_request_context():
+        assets = Assets(app)
+        assert assets.css("index.css") == f"/static/{result.manifest['css/index.css']}"
+
+    client = app.test_client()
+
+    resp = client.get(f"/static/{result.manifest['css/index.css']}")
+    assert resp.status_code == 200
+    assert resp.cache_control.immutable
+    assert resp.cache_control.max_age == IMMUTABLE_MAX_AGE
+
+    # 不带 hash 的文件不使用长期缓存
+    resp = client.get("/static/css/other.css")
+    assert resp.status_code == 200
+    assert not resp.cache_control.immutable
@@ -0,0 +1,110 @@
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from utils.cache import CachedPage, FileStore, MemoryStore
+from utils.web import async_cached_templated, cached_templated
+
+from flask import Flask, request
+
+
+def _make_app(template_folder: Path, store: MemoryStore, calls: List[str]) -> Flask:
+    (template_folder / "index.html").write_text("<p>{{ name }}</p>")
+
+    app = Flask(__name__, template_folder=str(template_folder))
+
+    @app.route("/<name>", methods=["GET", "POST"])
+    @cached_templated("index.html", vary=lambda: request.headers.get("X-User"), store=store)
+    def index(name: str) -> Dict[str, Any]:
+        calls.append(name)
+        return {"name": name}
+
+    @app.route("/async/<name>")
+    @async_cached_templated("index.html", store=store)
+    async def async_index(name: str) -> Dict[str, Any]:
+        calls.append(name)
+        return {"name": name}
+
+    return app
+
+
+def test_cached_templated(tmp_path: Path) -> None:
+    """测试缓存模板渲染结果, 以及 ETag 和 304 响应"""
+    store = MemoryStore()
+    calls: List[str] = []
+    client = _make_app(tmp_path, store, calls).test_client()
+
+    resp = client.get("/alvin")
+    assert resp.status_code == 200
+    assert resp.data == b"<p>alvin</p>"
+    etag, weak = resp.get_etag()
+    assert etag and not weak
+
+    # 第二次请求命中缓存, 不再执行路由函数
+    resp = client.get("/alvin")
+    assert resp.data == b"<p>alvin</p>"
+    assert calls == ["alvin"]
+
+    resp = client.get("/alvin", headers={"If-None-Match": f'"{etag}"'})
+    assert resp.status_code == 304
+    assert calls == ["alvin"]
+
+    # 查询参数, `vary` 函数的返回值不同时分别缓存
+    client.get("/alvin?page=2")
+    client.get("/alvin", headers={"X-User": "emma"})
+    assert calls == ["alvin", "alvin", "alvin"]
+
+    # POST 请求不使用缓存
+    client.post("/alvin")
+    assert len(calls) == 4
+
+    stats = store.stats()
+    assert stats.hits == 2
+    assert stats.misses == 3
+    assert stats.stores == 3
+    assert stats.not_modified == 1
+    assert stats.hit_rate == 0.4
+
+
+def test_async_cached_templated(tmp_path: Path) -> None:
+    """测试异步路由函数的缓存"""
+    store = MemoryStore()
+    calls: List[str] = []
+    client = _make_app(tmp_path, store, calls).test_client()
+
+    assert client.get("/async/alvin").data == b"<p>alvin</p>"
+    assert client.get("/async/alvin").data == b"<p>alvin</p>"
+    assert calls == ["alvin"]
+
+
+def test_memory_store_expire_and_evict() -> None:
+    """测试内存缓存的过期和淘汰"""
+    store = MemoryStore(max_entries=2)
+
+    store.set("a", CachedPage.create("a", 200, ttl=60))
+    store.set("b", CachedPage.create("b", 200, ttl=60))
+    store.get("a")
+
+    # 超过最大数量时淘汰最久未使用的 `b`
+    store.set("c", CachedPage.create("c", 200, ttl=60))
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert store.stats().evictions == 1
+
+    store.set("d", CachedPage.create("d", 200, ttl=0.01))
+    time.sleep(0.02)
+    assert store.get("d") is None
+
+
+def test_file_store(tmp_path: Path) -> None:
+    """测试基于本地目录的缓存可在多个存储对象间共享"""
+    page = CachedPage.create("<p>中文</p>", 200, ttl=60)
+
+    FileStore(str(tmp_path)).set("key", page)
+
+    other = FileStore(str(tmp_path))
+    assert other.get("key") == page
+    assert other.get("missing") is None
+
+    other.clear()
+    assert other.get("key") is None
@@ -0,0 +1,36 @@
+from utils.search import SearchIndex
+
+
+def test_search_index() -> None:
+    """测试检索索引的增加, 删除, 排序和分页"""
+    index: SearchIndex[str] = SearchIndex()
+
+    for name in ["Alvin", "Calvin", "Alvina", "Mr. Alvin Qu", "Emma", "Al"]:
+        assert index.add(name, name)
+
+    # key 已存在时替换原有的文档
+    assert not index.add("Emma", "Emma")
+    assert len(index) == 6
+
+    # 依次为: 完全匹配, 前缀匹配, 单词开头匹配, 其它位置匹配; 忽略大小写
+    result = index.search("alvin")
+    assert result.items == ["Alvin", "Alvina", "Mr. Alvin Qu", "Calvin"]
+    assert result.total == 4
+
+    # 分页
+    result = index.search("alvin", page=2, per_page=3)
+    assert result.items == ["Calvin"]
+    assert (result.total, result.page, result.pages) == (4, 2, 2)
+
+    # 关键字短于 n-gram 长度时扫描全部文档
+    assert index.search("al").items == ["Al", "Alvin", "Alvina", "Mr. Alvin Qu", "Calvin"]
+
+    # 关键字为空时返回全部文档
+    assert index.search("").total == 6
+
+    # 删除文档后索引同步更新
+    assert index.remove("Alvin")
+    assert not index.remove("Alvin")
+    assert "Alvin" not in index
+    assert index.search("alvin").items == ["Alvina", "Mr. Alvin Qu", "Calvin"]
+    assert index.search("xyz").items == []
@@ -0,0 +1,114 @@
+import gzip
+from pathlib import Path
+
+from utils.static import StaticFiles
+
+from flask import Flask
+
+
+def _make_app(static_folder: Path) -> Flask:
+    app = Flask(__name__, static_folder=str(static_folder), static_url_path="/static")
+    StaticFiles(app, stat_ttl=60)
+    return app
+
+
+def test_send_static_file(tmp_path: Path) -> None:
+    """测试发送静态文件, 以及 ETag 和 304 响应"""
+    (tmp_path / "index.css").write_text("body { color: red; }")
+
+    client = _make_app(tmp_path).test_client()
+
+    resp = client.get("/static/index.css")
+    assert resp.status_code == 200
+    assert resp.data == b"body { color: red; }"
+    assert resp.mimetype == "text/css"
+
+    # 强 ETag
+    etag, weak = resp.get_etag()
+    assert etag and not weak
+
+    resp = client.get("/static/index.css", headers={"If-None-Match": f'"{etag}"'})
+    assert resp.status_code == 304
+
+    assert client.get("/static/missing.css").status_code == 404
+    assert client.get("/static/../secret.txt").status_code == 404
+
+
+def test_send_precompressed_file(tmp_path: Path) -> None:
+    """测试根据 `Accept-Encoding` 头选择预压缩文件"""
+    content = b"var a = 1;\n" * 100
+    (tmp_path / "index.js").write_bytes(content)
+    (tmp_path / "index.js.gz").write_bytes(gzip.compress(content))
+
+    client = _make_app(tmp_path).test_client()
+
+    resp = client.get("/static/index.js", headers={"Accept-Encoding": "gzip, deflate"})
+    assert resp.status_code == 200
+    assert resp.content_encoding == "gzip"
+    assert "Accept-Encoding" in resp.vary
+    assert gzip.decompress(resp.data) == content
+    gzip_etag, _ = resp.get_etag()
+
+    # 客户端不支持压缩时, 返回原文件, 且 ETag 不同
+    resp = client.get("/static/index.js", headers={"Accept-Encoding": "identity"})
+    assert resp.content_encoding is None
+    assert resp.data == content
+    assert resp.get_etag()[0] != gzip_etag
+
+
+def test_send_range(tmp_path: Path) -> None:
+    """测试 `Range` 请求"""
+    (tmp_path / "data.txt").write_bytes(b"0123456789")
+
+    client = _make_app(tmp_path).test_client()
+
+    resp = client.get("/static/data.txt", headers={"Range": "bytes=2-5"})
+    assert resp.status_code == 206
+    assert resp.data == b"2345"
+    assert resp.headers["Content-Range"] == "bytes 2-5/10"
+
+    resp = client.get("/static/data.txt", headers={"Range": "bytes=20-"})
+    assert resp.status_code == 416
+
+
+def test_stat_cache(tmp_path: Path) -> None:
+    """测试文件 stat 信息缓存"""
+    app = _make_app(tmp_path)
+    client = app.test_client()
+
+    (tmp_path / "new.txt").write_text("new")
+
+    # 文件 stat 信息被缓存后, 不再访问文件系统
+    assert client.get("/static/new.txt").status_code == 200
+    (tmp_path / "new.txt").unlink()
+    (tmp_path / "other.txt").write_text("other")
+
+    assert client.get("/static/other.txt").status_code == 200
+
+    # 缓存的文件已被删除时, 返回 404 并清除缓存
+    assert client.get("/static/new.txt").status_code == 404
+
+    # 清除缓存后重新获取文件信息
+    app.extensions["static_files"].clear_cache()
+    assert client.get("/static/new.txt").status_code == 404
+
+
+def test_stat_cache_limit(tmp_path: Path) -> None:
+    """测试不存在的文件不被缓存, 且缓存条目数不超过上限"""
+    app = Flask(__name__, static_folder=str(tmp_path), static_url_path="/static")
+    static_files = StaticFiles(app, stat_ttl=60, max_entries=2)
+    client = app.test_client()
+
+    for i in range(3):
+        (tmp_path / f"{i}.txt").write_text(str(i))
+
+    # 不存在的文件不会被缓存, 之后创建的文件可以立即被访问
+    assert client.get("/static/later.txt").status_code == 404
+    (tmp_path / "later.txt").write_text("later")
+    assert client.get("/static/later.txt").status_code == 200
+
+    # 超出上限时淘汰最久未使用的条目
+    for i in range(3):
+        assert client.get(f"/static/{i}.txt").status_code == 200
+
+    assert list(static_files._cache) == ["1.txt", "2.txt"]
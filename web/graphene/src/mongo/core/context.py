@@ -1,82 +1,115 @@
+from contextvars import ContextVar, Token
 from types import TracebackType
-from typing import Any, Optional, Type, cast
-
-from werkzeug.local import Local
+from typing import Any, Dict, Optional, Type, cast
 
 
 class Tenant:
     """租户接口"""
 
 
+# 当前租户, 由 `TenantContext` 在进入和退出作用域时设置和恢复
+_current_tenant: ContextVar[Optional[Tenant]] = ContextVar("current_tenant", default=None)
+
+# 其它任意属性, 存储在字典中; 字典可能被多个上下文 (例如 asyncio 任务) 共享, 故不能原地修改,
+# 每次修改时都要复制一个新字典, 以保证一个上下文中的修改不会影响到其它上下文
+_attributes: ContextVar[Dict[str, Any]] = ContextVar("context_attributes")
+
+# 固定属性名称和存储该属性的 `ContextVar` 对象, 其中 `_tenant` 用于兼容原有的属性名称
+_FIXED: Dict[str, ContextVar[Any]] = {
+    "tenant": _current_tenant,
+    "_tenant": _current_tenant,
+}
+
+# 表示属性不存在
+_MISSING = object()
+
+# 尚未设置任何属性时使用的空字典, 只读
+_EMPTY: Dict[str, Any] = {}
+
+
 class Context:
-    """上下文类型
+    """记录当前上下文的类型
+
+    上下文属性存储在 `contextvars.ContextVar` 中, 所以:
 
-    上下文对象相当于一个可以存储任意键值对的容器
+    1. 每个线程, asyncio 任务以及 gevent 协程 (greenlet) 都有独立的上下文, 新创建的 asyncio
+       任务会复制创建时的上下文, 之后的修改互不影响
+    2. 租户是访问最频繁的属性, 单独使用一个 `ContextVar` 存储, 读取时只需一次 `ContextVar.get`
+    3. 其它属性读取不存在的属性时直接返回默认值, 无需通过捕获 `AttributeError` 异常处理
     """
 
-    def __init__(self) -> None:
-        """实例化线程安全的上下文对象"""
-        self.__dict__["_ctx"] = Local()
+    # 上下文对象本身不存储任何状态
+    __slots__ = ()
 
     def __getattr__(self, key: str, default: Any = None) -> Any:
-        """获取上下文属性值
-
-        即 `属性值 = context.<属性名称>`
+        """获取上下文属性
 
         Args:
-            - `key` (`str`): 属性名称
+            - `key` (`str`): 属性名
             - `default` (`Any`, optional): 属性默认值. Defaults to `None`.
 
         Returns:
-            Any: 属性值
+            `Any`: 属性值
         """
-        local = self.__dict__["_ctx"]
-        try:
-            return local.__getattr__(key)
-        except AttributeError:
-            return default
+        var = _FIXED.get(key)
+        if var is not None:
+            return var.get()
 
-    def __setattr__(self, key: str, value: Any) -> None:
-        """设置上下文属性值
+        return _attributes.get(_EMPTY).get(key, default)
 
-        即 `context.<属性名称> = 属性值`
+    def __setattr__(self, key: str, value: Any) -> None:
+        """设置上下文属性
 
         Args:
-            - `key` (`str`): 属性名称
+            - `key` (`str`): 属性名
             - `value` (`Any`): 属性值
         """
-        local = self.__dict__["_ctx"]
-        local.__setattr__(key, value)
+        var = _FIXED.get(key)
+        if var is not None:
+            var.set(value)
+            return
 
-    def __delattr__(self, key: str) -> None:
-        """删除上下文属性值
+        attrs = _attributes.get(_EMPTY).copy()
+        attrs[key] = value
+        _attributes.set(attrs)
 
-        即 `del context.<属性名称>`
+    def __delattr__(self, key: str) -> None:
+        """删除属性值
 
         Args:
-            - `key` (`str`): 属性名称
+            - `key` (`str`): 属性名
+
+        Raises:
+            - `AttributeError`: 属性不存在
         """
-        local = self.__dict__["_ctx"]
-        local.__delattr__(key)
+        var = _FIXED.get(key)
+        if var is not None:
+            if var.get() is None:
+                raise AttributeError(key)
 
-    def __setitem__(self, key: str, value: Any) -> None:
-        """通过下标设置上下文属性值
+            var.set(None)
+            return
 
-        即 `context[<属性名称>] = 属性值`
+        attrs = _attributes.get(_EMPTY).copy()
+        if attrs.pop(key, _MISSING) is _MISSING:
+            raise AttributeError(key)
+
+        _attributes.set(attrs)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """以下标形式设置上下文属性
 
         Args:
-            - `key` (`str`): 属性名称
+            - `key` (`str`): 属性名
             - `value` (`Any`): 属性值
         """
         self.__setattr__(key, value)
 
     def __getitem__(self, key: str) -> Any:
-        """通过下标获取上下文属性值
-
-        即 `属性值 = context[<属性名称>]`
+        """以下标形式获取上下文属性
 
         Args:
-            - `key` (`str`): 属性名称
+            - `key` (`str`): 属性名
 
         Returns:
             `Any`: 属性值
@@ -84,39 +117,48 @@ class Context:
         return self.__getattr__(key)
 
     def __delitem__(self, key: str) -> None:
-        """通过下标删除上下文属性值
-
-        即 `del context[<属性名称>]`
+        """以下标形式删除上下文属性
 
         Args:
-            - `key` (`str`): 属性名称
+            - `key` (`str`): 属性值
         """
         self.__delattr__(key)
 
     def delete(self, key: str) -> None:
-        """显式删除属性值
+        """以函数方式删除属性值
 
         Args:
-            key (str): 属性名称
+            - `key` (`str`): 属性名称
         """
         self.__delattr__(key)
 
     def clear(self) -> None:
-        """删除所有属性值, 即释放本地现场变量"""
-        local = cast(Local, self._ctx)
-        local.__release_local__()
-        self.__dict__["_ctx"] = Local()
+        """清除上下文中的所有属性"""
+        for var in _FIXED.values():
+            var.set(None)
+
+        _attributes.set({})
+
+    @property
+    def tenant(self) -> Optional[Tenant]:
+        """当前租户
+
+        Returns:
+            `Optional[Tenant]`: 租户对象
+        """
+        return _current_tenant.get()
 
     class TenantContext:
-        """多租户上下文"""
+        """多租户上下文类型"""
 
         def __init__(self, ctx: "Context", tenant: Tenant) -> None:
             self._ctx = ctx
             self._tenant = tenant
+            self._token: Optional[Token[Optional[Tenant]]] = None
 
         def __enter__(self) -> None:
-            """进入上下文作用域"""
-            self._ctx["_tenant"] = self._tenant
+            """进入作用于范围, 记录租户对象"""
+            self._token = _current_tenant.set(self._tenant)
 
         def __exit__(
             self,
@@ -124,16 +166,29 @@ class Context:
             exc_value: Optional[Exception],
             exc_tb: Optional[TracebackType],
         ) -> None:
-            """退出上下文作用域"""
-            self._ctx.delete("_tenant")
+            """退出作用域范围, 恢复进入作用域前的租户对象"""
+            if self._token is not None:
+                _current_tenant.reset(self._token)
+                self._token = None
+
+    def with_tenant_context(self, org: Tenant) -> TenantContext:
+        """产生一个租户上下文对象
+
+        Args:
+            - `org` (`Tenant`): 租户对象
 
-    def with_tenant_context(self, tenant: Tenant) -> TenantContext:
-        """获取租户上下文对象"""
-        return self.TenantContext(self, tenant)
+        Returns:
+            `TenantContext`: 租户上下文对象
+        """
+        return self.TenantContext(self, org)
 
     def get_current_tenant(self) -> Tenant:
-        """获取上下文中存储的租户"""
-        return cast(Tenant, self["_tenant"])
+        """获取上下文中存储的当前租户
+
+        Returns:
+            `Tenant`: 租户对象
+        """
+        return cast(Tenant, _current_tenant.get())
 
 
 # 实例化上下文对象
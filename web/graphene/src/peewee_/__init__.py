@@ -1,6 +1,4 @@
-from peewee import PostgresqlDatabase
-
-from .core import context, make_cursor, parse_cursor, pg_db
+from .core import connection_scope, context, make_cursor, parse_cursor, pg_db, use_pool
 from .models import Department as DepartmentModel
 from .models import Employee as EmployeeModel
 from .models import Gender as GenderModel
@@ -14,6 +12,7 @@ __all__ = [
     "make_cursor",
     "parse_cursor",
     "pg_db",
+    "connection_scope",
     "DepartmentModel",
     "EmployeeModel",
     "GenderModel",
@@ -23,12 +22,11 @@ __all__ = [
     "initialize_tables",
 ]
 
-pg_db.initialize(
-    PostgresqlDatabase(
-        database="study_python_graphene",
-        host="localhost",
-        port=5432,
-        user="root",
-        password="password",
-    )
+# 使用连接池管理 PostgreSQL 数据库连接, `schema` 执行每次请求时获取连接, 执行结束后归还
+use_pool(
+    database="study_python_graphene",
+    host="localhost",
+    port=5432,
+    user="root",
+    password="password",
 )
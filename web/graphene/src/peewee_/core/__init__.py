@@ -1,5 +1,5 @@
 from .context import Tenant, User, context
-from .db import pg_db
+from .db import connection_scope, pg_db, use_pool
 from .models import AuditAtMixin, AuditByMixin, BaseModel, MultiTenantMixin
 from .types import (
     BaseConnection,
@@ -15,6 +15,8 @@ __all__: list[str] = [
     "User",
     "context",
     "pg_db",
+    "connection_scope",
+    "use_pool",
     "AuditAtMixin",
     "AuditByMixin",
     "BaseModel",
@@ -1,7 +1,6 @@
+from contextvars import ContextVar, Token
 from types import TracebackType
-from typing import Any, Optional, Type, cast
-
-from werkzeug.local import Local
+from typing import Any, Dict, Optional, Type, cast
 
 
 class Tenant:
@@ -25,12 +24,44 @@ class User:
         return 0
 
 
+# 当前租户, 由 `TenantContext` 在进入和退出作用域时设置和恢复
+_current_tenant: ContextVar[Optional[Tenant]] = ContextVar("current_tenant", default=None)
+
+# 当前用户, 由 `CurrentUserContext` 在进入和退出作用域时设置和恢复
+_current_user: ContextVar[Optional[User]] = ContextVar("current_user", default=None)
+
+# 其它任意属性, 存储在字典中; 字典可能被多个上下文 (例如 asyncio 任务) 共享, 故不能原地修改,
+# 每次修改时都要复制一个新字典, 以保证一个上下文中的修改不会影响到其它上下文
+_attributes: ContextVar[Dict[str, Any]] = ContextVar("context_attributes")
+
+# 固定属性名称和存储该属性的 `ContextVar` 对象, 其中 `_tenant` 和 `_user` 用于兼容原有的属性名称
+_FIXED: Dict[str, ContextVar[Any]] = {
+    "tenant": _current_tenant,
+    "user": _current_user,
+    "_tenant": _current_tenant,
+    "_user": _current_user,
+}
+
+# 表示属性不存在
+_MISSING = object()
+
+# 尚未设置任何属性时使用的空字典, 只读
+_EMPTY: Dict[str, Any] = {}
+
+
 class Context:
-    """记录线程本地上下文的类型"""
+    """记录当前上下文的类型
+
+    上下文属性存储在 `contextvars.ContextVar` 中, 所以:
+
+    1. 每个线程, asyncio 任务以及 gevent 协程 (greenlet) 都有独立的上下文, 新创建的 asyncio
+       任务会复制创建时的上下文, 之后的修改互不影响
+    2. 租户和用户是访问最频繁的属性, 各自使用一个 `ContextVar` 存储, 读取时只需一次 `ContextVar.get`
+    3. 其它属性读取不存在的属性时直接返回默认值, 无需通过捕获 `AttributeError` 异常处理
+    """
 
-    def __init__(self) -> None:
-        """构造器"""
-        self.__dict__["_ctx"] = Local()
+    # 上下文对象本身不存储任何状态
+    __slots__ = ()
 
     def __getattr__(self, key: str, default: Any = None) -> Any:
         """获取上下文属性
@@ -42,11 +73,11 @@ class Context:
         Returns:
             `Any`: 属性值
         """
-        local = self.__dict__["_ctx"]
-        try:
-            return local.__getattr__(key)
-        except AttributeError:
-            return default
+        var = _FIXED.get(key)
+        if var is not None:
+            return var.get()
+
+        return _attributes.get(_EMPTY).get(key, default)
 
     def __setattr__(self, key: str, value: Any) -> None:
         """设置上下文属性
@@ -55,17 +86,37 @@ class Context:
             - `key` (`str`): 属性名
             - `value` (`Any`): 属性值
         """
-        local = self.__dict__["_ctx"]
-        local.__setattr__(key, value)
+        var = _FIXED.get(key)
+        if var is not None:
+            var.set(value)
+            return
+
+        attrs = _attributes.get(_EMPTY).copy()
+        attrs[key] = value
+        _attributes.set(attrs)
 
     def __delattr__(self, key: str) -> None:
         """删除属性值
 
         Args:
             - `key` (`str`): 属性名
+
+        Raises:
+            - `AttributeError`: 属性不存在
         """
-        local = self.__dict__["_ctx"]
-        local.__delattr__(key)
+        var = _FIXED.get(key)
+        if var is not None:
+            if var.get() is None:
+                raise AttributeError(key)
+
+            var.set(None)
+            return
+
+        attrs = _attributes.get(_EMPTY).copy()
+        if attrs.pop(key, _MISSING) is _MISSING:
+            raise AttributeError(key)
+
+        _attributes.set(attrs)
 
     def __setitem__(self, key: str, value: Any) -> None:
         """以下标形式设置上下文属性
@@ -105,9 +156,28 @@ class Context:
 
     def clear(self) -> None:
         """清除上下文中的所有属性"""
-        local: Local = self._ctx
-        local.__release_local__()
-        self.__dict__["_ctx"] = Local()
+        for var in _FIXED.values():
+            var.set(None)
+
+        _attributes.set({})
+
+    @property
+    def tenant(self) -> Optional[Tenant]:
+        """当前租户
+
+        Returns:
+            `Optional[Tenant]`: 租户对象
+        """
+        return _current_tenant.get()
+
+    @property
+    def user(self) -> Optional[User]:
+        """当前用户
+
+        Returns:
+            `Optional[User]`: 用户对象
+        """
+        return _current_user.get()
 
     class TenantContext:
         """多租户上下文类型"""
@@ -115,10 +185,11 @@ class Context:
         def __init__(self, ctx: "Context", tenant: Tenant) -> None:
             self._ctx = ctx
             self._tenant = tenant
+            self._token: Optional[Token[Optional[Tenant]]] = None
 
         def __enter__(self) -> None:
             """进入作用于范围, 记录租户对象"""
-            self._ctx["_tenant"] = self._tenant
+            self._token = _current_tenant.set(self._tenant)
 
         def __exit__(
             self,
@@ -126,8 +197,10 @@ class Context:
             exc_value: Optional[Exception],
             exc_tb: Optional[TracebackType],
         ) -> None:
-            """退出作用域范围, 删除租户对象"""
-            self._ctx.delete("_tenant")
+            """退出作用域范围, 恢复进入作用域前的租户对象"""
+            if self._token is not None:
+                _current_tenant.reset(self._token)
+                self._token = None
 
     class CurrentUserContext:
         """当前用户上下文类型"""
@@ -135,10 +208,11 @@ class Context:
         def __init__(self, ctx: "Context", user: User) -> None:
             self._ctx = ctx
             self._user = user
+            self._token: Optional[Token[Optional[User]]] = None
 
         def __enter__(self) -> None:
             """进入作用于范围, 记录用户对象"""
-            self._ctx["_user"] = self._user
+            self._token = _current_user.set(self._user)
 
         def __exit__(
             self,
@@ -146,8 +220,10 @@ class Context:
             exc_value: Optional[Exception],
             exc_tb: Optional[TracebackType],
         ) -> None:
-            """退出作用于范围, 删除用户对象"""
-            self._ctx.delete("_user")
+            """退出作用于范围, 恢复进入作用域前的用户对象"""
+            if self._token is not None:
+                _current_user.reset(self._token)
+                self._token = None
 
     def with_tenant_context(self, org: Tenant) -> TenantContext:
         """产生一个租户上下文对象
@@ -177,7 +253,7 @@ class Context:
         Returns:
             `Tenant`: 租户对象
         """
-        return cast(Tenant, self["_tenant"])
+        return cast(Tenant, _current_tenant.get())
 
     def get_current_user(self) -> User:
         """获取上下文中存储的当前用户
@@ -185,7 +261,7 @@ class Context:
         Returns:
             `User`: 用户对象
         """
-        return cast(User, self.__getattr__("_user"))
+        return cast(User, _current_user.get())
 
 
 # 实例化上下文对象
@@ -1,9 +1,114 @@
 import signal
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Generator, Optional
+
+from peewee import Proxy, _ConnectionState
+from playhouse.pool import PooledPostgresqlDatabase
+
+# 连接池默认最大连接数
+DEFAULT_MAX_CONNECTIONS = 20
+
+# 连接池中的连接默认最大存活时间 (秒), 超过该时间的连接在获取或归还时会被关闭
+DEFAULT_STALE_TIMEOUT = 300
+
+# 当前上下文的数据库连接状态, 由 `connection_scope` 在获取连接时设置, 退出时恢复
+_connection_state: ContextVar[Optional[_ConnectionState]] = ContextVar("connection_state", default=None)
+
+
+class _ContextConnectionState(_ConnectionState):
+    """将连接状态存储在 `ContextVar` 中的连接状态类型
+
+    peewee 默认按线程保存连接状态, 同一事件循环中并发执行的多个 asyncio 任务会共享同一个连接: 后开始的任务认为连接
+    已打开而直接使用, 先结束的任务则会在其仍在使用时关闭连接. 将状态存储在 `ContextVar` 中后, 每个线程和 asyncio
+    任务都有独立的连接状态
+    """
+
+    def __init__(self) -> None:
+        """构造器, 连接状态均存储在 `_connection_state` 中, 对象本身不保存任何属性"""
+
+    @staticmethod
+    def _current() -> _ConnectionState:
+        """获取当前上下文的连接状态, 尚未设置时为当前上下文创建一个
+
+        Returns:
+            `_ConnectionState`: 连接状态对象
+        """
+        state = _connection_state.get()
+        if state is None:
+            state = _ConnectionState()
+            _connection_state.set(state)
+
+        return state
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._current(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._current(), name, value)
 
-from peewee import Proxy
 
 # 创建 pg 数据库连接
 pg_db = Proxy()
 
+
+def use_pool(
+    database: str,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    stale_timeout: int = DEFAULT_STALE_TIMEOUT,
+    **options: Any,
+) -> PooledPostgresqlDatabase:
+    """通过连接池管理 `pg_db` 代理对象的 PostgreSQL 数据库连接
+
+    连接只有在调用 `close` 方法后才会归还连接池, 所以对数据库的访问都应在 `connection_scope` 中进行
+
+    Args:
+        - `database` (`str`): 数据库名称
+        - `max_connections` (`int`, optional): 连接池最大连接数. Defaults to `20`.
+        - `stale_timeout` (`int`, optional): 连接池中连接的最大存活时间 (秒). Defaults to `300`.
+        - `options` (`Any`): 其它数据库连接参数, 例如 `host`, `user` 和 `password`
+
+    Returns:
+        `PooledPostgresqlDatabase`: 数据库对象
+    """
+    if pg_db.obj is not None and not pg_db.is_closed():
+        pg_db.close()
+
+    db = PooledPostgresqlDatabase(
+        database,
+        max_connections=max_connections,
+        stale_timeout=stale_timeout,
+        **options,
+    )
+    # 每个 asyncio 任务使用独立的连接状态
+    db._state = _ContextConnectionState()
+
+    pg_db.initialize(db)
+    return db
+
+
+@contextmanager
+def connection_scope() -> Generator[None, None, None]:
+    """在上下文范围内使用一个数据库连接
+
+    当前上下文尚未打开连接时, 进入上下文时从连接池获取连接, 退出上下文时将连接归还连接池;
+    已打开连接时 (例如在外层事务中) 直接使用该连接, 退出时不关闭
+
+    获取连接前为当前上下文设置新的连接状态, 即使创建当前 asyncio 任务时复制的上下文中已有连接状态, 也不会和其它任务
+    共享连接
+    """
+    if not pg_db.is_closed():
+        yield
+        return
+
+    token = _connection_state.set(_ConnectionState())
+    pg_db.connect()
+    try:
+        yield
+    finally:
+        pg_db.close()
+        _connection_state.reset(token)
+
+
 # 监听系统关闭信号, 同时关闭数据库
 signal.signal(signal.SIGHUP, lambda sig, frame: pg_db.close())
@@ -1,5 +1,9 @@
+from typing import Any, cast
+
 from graphene import Schema
+from graphql import ExecutionResult
 
+from .core import connection_scope
 from .mutations import DepartmentMutation, EmployeeMutation
 
 from .queries import DepartmentQuery, EmployeeQuery
@@ -25,8 +29,20 @@ class RootMutation(
     """
 
 
+class PooledSchema(Schema):
+    """每次执行查询时从连接池获取数据库连接, 执行结束后将连接归还连接池"""
+
+    def execute(self, *args: Any, **kwargs: Any) -> ExecutionResult:
+        with connection_scope():
+            return cast(ExecutionResult, super().execute(*args, **kwargs))
+
+    async def execute_async(self, *args: Any, **kwargs: Any) -> ExecutionResult:
+        with connection_scope():
+            return cast(ExecutionResult, await super().execute_async(*args, **kwargs))
+
+
 # 创建 schema 对象
-schema = Schema(
+schema = PooledSchema(
     query=RootQuery,
     mutation=RootMutation,
 )